@@ -6,6 +6,7 @@ Usage:
     python3 debug_ups_api.py --country US --weight 2.0 --debug
     python3 debug_ups_api.py --country DE --weight 0.5 --production
     python3 debug_ups_api.py --test-all
+    python3 debug_ups_api.py --country US --weight 2.0 --base-url http://127.0.0.1:8089  # mock server
 """
 
 import argparse
@@ -243,6 +244,7 @@ Examples:
 
     parser.add_argument('--test-all', action='store_true', help='Run all test scenarios')
     parser.add_argument('--production', action='store_true', help='Use production environment')
+    parser.add_argument('--base-url', type=str, help='Override UPS host (e.g. http://127.0.0.1:8089 for the mock server)')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
 
     args = parser.parse_args()
@@ -254,12 +256,12 @@ Examples:
     print("=" * 80)
     print("🚀 UPS API DEBUG TOOL")
     print("=" * 80)
-    print(f"Environment: {'PRODUCTION' if args.production else 'TEST'}")
+    print(f"Environment: {args.base_url or ('PRODUCTION' if args.production else 'TEST')}")
     print(f"Log file: {log_file}")
 
     # Check credentials
     creds_file = Path.home() / '.credentials' / 'yoyaku' / 'api-keys' / 'ups.env'
-    if not creds_file.exists():
+    if not creds_file.exists() and not args.base_url:
         print(f"\n❌ ERROR: Credentials file not found: {creds_file}")
         print("\nPlease create the file with:")
         print("   UPS_STANDARD_CLIENT_ID=...")
@@ -275,7 +277,7 @@ Examples:
 
     # Initialize client
     try:
-        client = UPSAPIClient(production=args.production)
+        client = UPSAPIClient(production=args.production, base_url=args.base_url)
         print("✅ UPS API client initialized")
     except Exception as e:
         print(f"\n❌ ERROR initializing client: {e}")
@@ -3,9 +3,10 @@ Discord Bot Main Application
 Handles Discord connection, commands, and event loop
 """
 
+import asyncio
 import discord
 from discord.ext import commands
-from typing import Optional
+from typing import Optional, Dict, Any
 import logging
 from dotenv import load_dotenv
 
@@ -13,8 +14,15 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from src.engine.engine import PricingEngine, ORIGIN_PARIS
+from src.engine.tariff_store import SQLiteDataLoader
+from src.engine.validator import ValidationReport
+from src.engine.breakpoints import BreakpointTable, load_csv as load_breakpoints
 from .config import config
 from .formatter import PricingFormatter
+from .pagination import QuotePageStore
+from .prewarm import RatePrewarmer, load_lanes
+from .loop_monitor import LoopMonitor
+from .worker_pool import PricingWorkerPool
 
 
 # Setup logging
@@ -43,15 +51,138 @@ class PricingBot(commands.Bot):
 
         # Initialize pricing engine with YOYAKU Paris origin
         logger.info("📦 Loading pricing engine...")
-        self.pricing_engine = PricingEngine(origin=ORIGIN_PARIS)
+        loader = None
+        if config.tariff_store_file:
+            loader = SQLiteDataLoader(config.tariff_store_file)
+            loader.load_all()
+        self.pricing_engine = PricingEngine(loader=loader, origin=ORIGIN_PARIS)
         logger.info("✅ Pricing engine loaded (origin: Paris)")
 
+        # Engine calls run in a bounded pool, off the event loop
+        self.pricing_pool = PricingWorkerPool(
+            self.pricing_engine,
+            mode=config.pricing_pool_mode,
+            max_workers=config.pricing_pool_workers,
+            max_queue=config.pricing_pool_queue
+        )
+
+        # Cheapest-service breakpoint tables by ISO2 (precomputed file, then lazily filled)
+        self.breakpoint_tables: Dict[str, BreakpointTable] = {}
+        if config.breakpoints_file.exists():
+            self.breakpoint_tables = load_breakpoints(config.breakpoints_file)
+            logger.info(f"📈 Loaded breakpoints for {len(self.breakpoint_tables)} countries")
+
         # Formatter for Discord embeds
-        self.formatter = PricingFormatter()
+        self.formatter = PricingFormatter(cache_size=config.embed_cache_size)
+
+        # /price results being paged through (rendered on demand, no re-pricing)
+        self.quote_pages = QuotePageStore(ttl=config.price_pages_ttl)
+
+        # UPS API client, shared across commands so circuit breakers and
+        # token cache survive between requests (created on first use)
+        self._ups_client = None
+
+        # Event-loop lag probe + blocking stage detection
+        self.loop_monitor = LoopMonitor(
+            interval=config.loop_probe_interval_ms / 1000.0,
+            block_threshold=config.loop_block_threshold_ms / 1000.0,
+            asyncio_debug=config.loop_debug
+        )
+
+        # Background refresh of live UPS rates for the top lanes
+        self.prewarmer = RatePrewarmer(
+            self.get_ups_client,
+            load_lanes(config.ups_prewarm_lanes_file),
+            refresh_interval=config.ups_prewarm_interval,
+            max_requests_per_sec=config.ups_prewarm_rate
+        )
 
         # Dev guild for testing (optional)
         self.dev_guild = discord.Object(id=config.dev_guild_id) if config.dev_guild_id else None
 
+    def get_ups_client(self):
+        """
+        Return the shared UPS API client
+
+        Raises:
+            RuntimeError: If UPS credentials are missing or incomplete
+        """
+        if self._ups_client is None:
+            from src.integrations.ups_api import UPSAPIClient
+            self._ups_client = UPSAPIClient(
+                cache_ttl=config.ups_rate_cache_ttl,
+                base_url=config.ups_base_url
+            )
+        return self._ups_client
+
+    async def get_breakpoints(self, destination: str) -> Optional[BreakpointTable]:
+        """
+        Return the cheapest-service breakpoint table for a destination
+
+        Uses the precomputed table when available, otherwise computes it in
+        the pricing pool and keeps it for later calls.
+
+        Returns:
+            BreakpointTable, or None if the destination is unknown
+
+        Raises:
+            PoolBusyError: If the table must be computed and the pool is full
+        """
+        country_iso2 = self.pricing_engine.resolver.resolve(destination)
+        if not country_iso2:
+            return None
+
+        table = self.breakpoint_tables.get(country_iso2)
+        if table is None:
+            table = await self.pricing_pool.call("breakpoints", country_iso2)
+            self.breakpoint_tables[country_iso2] = table
+
+        return table
+
+    async def reload_tariffs(self, force: bool = False) -> Optional[ValidationReport]:
+        """
+        Reload the tariffs without restarting the bot
+
+        The new data is loaded and validated off the event loop; the running
+        engine is only swapped if validation passes. Breakpoint tables are
+        dropped and recomputed lazily from the new data.
+
+        Args:
+            force: Accept warnings the running data did not have
+
+        Raises:
+            TariffValidationError: If the new data would degrade results
+        """
+        report = await asyncio.to_thread(self.pricing_engine.reload, force)
+
+        self.breakpoint_tables = {}
+        self.pricing_pool.refresh()
+
+        logger.info(f"🔄 Tariffs reloaded ({len(report.warnings) if report else 0} integrity warnings)")
+        return report
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Collect runtime stats for the /stats command
+
+        Returns:
+            Dict of stat sections (only sections with data are included)
+        """
+        stats: Dict[str, Any] = {
+            'event_loop': self.loop_monitor.stats(),
+            'pricing_pool': self.pricing_pool.stats(),
+            'embed_cache': self.formatter.render_cache.stats(),
+        }
+
+        if self._ups_client is not None:
+            stats['ups_breakers'] = self._ups_client.breaker_stats()
+            stats['ups_cache'] = self._ups_client.rate_cache.stats()
+
+        if self.prewarmer.lanes:
+            stats['ups_prewarm'] = self.prewarmer.stats()
+
+        return stats
+
     async def setup_hook(self):
         """
         Setup hook called before bot connects to Discord
@@ -76,6 +207,17 @@ class PricingBot(commands.Bot):
             await self.tree.sync()
             logger.info("✅ Commands synced globally")
 
+        # Start background tasks
+        self.loop_monitor.start()
+        self.prewarmer.start()
+
+    async def close(self):
+        """Stop background tasks before disconnecting"""
+        await self.prewarmer.stop()
+        await self.loop_monitor.stop()
+        self.pricing_pool.shutdown()
+        await super().close()
+
     async def on_ready(self):
         """Event triggered when bot successfully connects to Discord"""
         logger.info("=" * 50)
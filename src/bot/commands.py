@@ -1,15 +1,21 @@
 """
 Discord Slash Commands
-Implements /price, /carriers, and /help commands
+Implements /price, /freight, /explain, /breakpoints, /carriers, /stats, /reload and /help commands
 """
 
 import discord
 from discord import app_commands
+import asyncio
 import re
 import logging
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, Tuple, TYPE_CHECKING
 from decimal import Decimal
 
+from src.engine.freight import FREIGHT_MAX_WEIGHT_KG
+from src.engine.validator import TariffValidationError
+from .pagination import OfferPagesView, StoredQuote
+from .worker_pool import PoolBusyError
+
 if TYPE_CHECKING:
     from .bot import PricingBot
 
@@ -31,21 +37,33 @@ def setup_commands(bot: 'PricingBot'):
     @app_commands.describe(
         weight="Weight (e.g., '2kg', '5', '10.5kg')",
         destination="Destination country (e.g., 'Japan', 'DE', 'Allemagne')",
-        carriers="(Optional) Filter carriers (e.g., 'fedex,spring')"
+        carriers="(Optional) Filter carriers (e.g., 'fedex,spring')",
+        parcels="(Optional) Additional parcel weights for multi-box shipments (e.g., '3,1.5kg')",
+        dimensions="(Optional) Box size in cm, L x W x H, applied to every parcel (e.g., '40x30x20')",
+        postal_code="(Optional) Destination postal code, selects the zone in multi-zone countries (e.g., 'K1A 0B1')"
     )
     async def price(
         interaction: discord.Interaction,
         weight: str,
         destination: str,
-        carriers: Optional[str] = None
+        carriers: Optional[str] = None,
+        parcels: Optional[str] = None,
+        dimensions: Optional[str] = None,
+        postal_code: Optional[str] = None
     ):
         """
         /price command handler
 
+        Long offer lists are paginated: the page buttons re-render from the
+        stored list (bot.quote_pages), without re-pricing or UPS calls.
+
         Examples:
             /price 2kg Japan
             /price 5 Germany carriers:fedex
             /price 10.5kg US
+            /price 2kg Japan parcels:3,1.5  (3-box shipment: 2 + 3 + 1.5 kg)
+            /price 2kg US dimensions:40x30x20  (volumetric weight)
+            /price 2kg Canada postal_code:K1A0B1  (zone of the postal code only)
         """
         # Defer response (gives us 15 minutes instead of 3 seconds)
         await interaction.response.defer()
@@ -78,13 +96,56 @@ def setup_commands(bot: 'PricingBot'):
                 )
                 return
 
+            # Parse additional parcels (optional multi-parcel shipment)
+            parcel_weights = [weight_kg]
+            if parcels:
+                extra_weights = parse_parcels(parcels)
+                if extra_weights is None or any(w <= 0 or w > 70 for w in extra_weights):
+                    await interaction.followup.send(
+                        embed=bot.formatter.create_error_embed(
+                            f"❌ Invalid parcels: `{parcels}`\n"
+                            f"Use comma-separated weights up to 70kg each, like: `3,1.5kg`"
+                        )
+                    )
+                    return
+                parcel_weights.extend(extra_weights)
+
+            is_multi_parcel = len(parcel_weights) > 1
+
+            # Parse box dimensions (optional, enables volumetric weight)
+            dimensions_cm = None
+            if dimensions:
+                dimensions_cm = parse_dimensions(dimensions)
+                if dimensions_cm is None:
+                    await interaction.followup.send(
+                        embed=bot.formatter.create_error_embed(
+                            f"❌ Invalid dimensions: `{dimensions}`\n"
+                            f"Use L x W x H in cm, like: `40x30x20`"
+                        )
+                    )
+                    return
+
+            total_weight_kg = sum(parcel_weights)
+
             # Parse carrier filter (optional)
             carrier_filter = None
             if carriers:
                 carrier_filter = [c.strip().upper() for c in carriers.split(',')]
 
             # Query pricing engine (CSV data - UPS WWE, FedEx, Spring, La Poste)
-            offers = bot.pricing_engine.price(destination, weight_kg, debug=False)
+            # Runs in the worker pool so the event loop stays responsive
+            # Suspended services come back with their cheapest alternative (same pass)
+            try:
+                quote = await bot.pricing_pool.call(
+                    "quote", destination, parcel_weights,
+                    parcel_dimensions=[dimensions_cm] * len(parcel_weights) if dimensions_cm else None,
+                    postal_code=postal_code
+                )
+            except PoolBusyError:
+                await interaction.followup.send(embed=bot.formatter.create_busy_embed())
+                return
+
+            offers = quote.offers
 
             # Resolve country name for display
             country_iso2 = bot.pricing_engine.resolver.resolve(destination)
@@ -95,49 +156,51 @@ def setup_commands(bot: 'PricingBot'):
                     country_name = f"{resolved_name} ({country_iso2})"
 
             # Add UPS API real-time rates (if available)
-            try:
-                from src.integrations.ups_api import UPSAPIClient
-                from src.engine.engine import PriceOffer
-
-                ups_client = UPSAPIClient()
-                ups_api_rates = ups_client.get_shipping_rates(
-                    weight_kg=weight_kg,
-                    destination_country=country_iso2
-                )
-
-                # Convert UPS API results to PriceOffer format
-                for rate in ups_api_rates:
-                    # Determine carrier name based on API type
-                    carrier_name = "UPS (Real-time)" if rate['api_type'] == 'WWE' else "UPS Standard"
-
-                    ups_offer = PriceOffer(
-                        carrier_code="UPS_API",
-                        carrier_name=carrier_name,
-                        service_code=rate['service_code'],
-                        service_label=rate['service_name'],
-                        freight=rate['price'],
-                        surcharges=Decimal('0'),  # API returns total price
-                        total=rate['price'],
-                        currency=rate['currency'],
-                        scope_code=f"UPS_API_{rate['api_type']}",
-                        band_details=f"API Quote - {rate.get('delivery_days', 'N/A')} days"
+            # The live API quotes a single package: skipped for multi-parcel shipments
+            if not is_multi_parcel:
+                try:
+                    from src.engine.engine import PriceOffer
+
+                    # Blocking HTTP calls (token + up to 4 rating requests): off the event loop
+                    ups_client = bot.get_ups_client()
+                    ups_api_rates = await asyncio.to_thread(
+                        ups_client.get_shipping_rates,
+                        weight_kg=weight_kg,
+                        destination_country=country_iso2,
+                        dimensions_cm=dimensions_cm,
+                        **({"destination_postal": postal_code} if postal_code else {})
                     )
-                    offers.append(ups_offer)
-
-                logger.info(f"✅ Added {len(ups_api_rates)} UPS API real-time rates")
-            except Exception as e:
-                logger.warning(f"⚠️ UPS API unavailable: {e}")
-                # Continue without API rates
-
-            # Track if there were suspended services (for warning display)
-            has_suspended_services = any(o.is_suspended for o in offers)
 
-            # Filter out suspended services (show only available options)
-            # The general warning banner is sufficient - no need to show unusable services
-            available_offers = [o for o in offers if not o.is_suspended]
-
-            # Sort available offers by price
-            available_offers.sort(key=lambda o: float(o.total))
+                    # Convert UPS API results to PriceOffer format
+                    for rate in ups_api_rates:
+                        # Determine carrier name based on API type
+                        carrier_name = "UPS (Real-time)" if rate['api_type'] == 'WWE' else "UPS Standard"
+
+                        ups_offer = PriceOffer(
+                            carrier_code="UPS_API",
+                            carrier_name=carrier_name,
+                            service_code=rate['service_code'],
+                            service_label=rate['service_name'],
+                            freight=rate['price'],
+                            surcharges=Decimal('0'),  # API returns total price
+                            total=rate['price'],
+                            currency=rate['currency'],
+                            scope_code=f"UPS_API_{rate['api_type']}",
+                            band_details=f"API Quote - {rate.get('delivery_days', 'N/A')} days"
+                        )
+                        offers.append(ups_offer)
+
+                    logger.info(f"✅ Added {len(ups_api_rates)} UPS API real-time rates")
+                except Exception as e:
+                    logger.warning(f"⚠️ UPS API unavailable: {e}")
+                    # Continue without API rates
+
+            # Suspended services are not priced: they are listed with their alternative instead
+            suspended = quote.suspended
+
+            # Sort offers by price (UPS live rates appended), one line per zone price
+            available_offers = sorted(offers, key=lambda o: float(o.total))
+            available_offers = bot.formatter.collapse_zones(available_offers)
 
             # Rename UPS carriers to distinguish services clearly
             for offer in available_offers:
@@ -163,21 +226,140 @@ def setup_commands(bot: 'PricingBot'):
             if carrier_filter:
                 available_offers = [
                     o for o in available_offers
-                    if o.carrier_code.upper() in carrier_filter or
-                       any(cf in o.carrier_name.upper() for cf in carrier_filter)
+                    if matches_carrier(o.carrier_code, o.carrier_name, carrier_filter)
+                ]
+                suspended = [
+                    s for s in suspended
+                    if matches_carrier(s.carrier_code, s.carrier_name, carrier_filter)
                 ]
 
-            # Pass has_suspended flag to formatter for warning display
             offers = available_offers
 
-            # Create and send embed
+            # Keep the final list server-side: the page buttons render from it
+            quote = StoredQuote(
+                offers=offers,
+                weight_kg=total_weight_kg,
+                destination=destination,
+                country_name=country_name,
+                parcel_weights=parcel_weights if is_multi_parcel else None,
+                suspended=suspended
+            )
+
+            # Create and send embed (first page only)
+            with bot.loop_monitor.stage("price", "embed"):
+                embed = quote.render(bot.formatter, page=0)
+
+            page_count = bot.formatter.page_count(offers)
+            if page_count == 1:
+                await interaction.followup.send(embed=embed)
+                return
+
+            view = OfferPagesView(
+                bot.quote_pages, bot.formatter, bot.quote_pages.put(quote), page_count, interaction.user.id
+            )
+            view.message = await interaction.followup.send(embed=embed, view=view, wait=True)
+
+        except Exception as e:
+            await interaction.followup.send(
+                embed=bot.formatter.create_error_embed(f"❌ Error: {str(e)}")
+            )
+            raise  # Re-raise for logging
+
+    @bot.tree.command(
+        name="freight",
+        description="Get freight quotes for heavy pallets (FedEx freight services, up to 1000kg per piece)"
+    )
+    @app_commands.describe(
+        weight="Weight of the first piece (e.g., '320kg', '450')",
+        destination="Destination country (e.g., 'US', 'Japan')",
+        pieces="(Optional) Additional piece weights for multi-piece shipments (e.g., '180,250kg')",
+        dimensions="(Optional) Pallet size in cm, L x W x H, applied to every piece (e.g., '120x80x100')",
+        postal_code="(Optional) Destination postal code, selects the zone in multi-zone countries"
+    )
+    async def freight(
+        interaction: discord.Interaction,
+        weight: str,
+        destination: str,
+        pieces: Optional[str] = None,
+        dimensions: Optional[str] = None,
+        postal_code: Optional[str] = None
+    ):
+        """
+        /freight command handler
+
+        The whole shipment is priced on its total chargeable weight
+        (volumetric included, rounded up to the kg) with one freight band.
+
+        Examples:
+            /freight 320kg US
+            /freight 300 Japan pieces:250,180
+            /freight 200kg US dimensions:120x80x150
+        """
+        await interaction.response.defer()
+
+        try:
+            weight_kg = parse_weight(weight)
+            if weight_kg is None or weight_kg <= 0 or weight_kg > FREIGHT_MAX_WEIGHT_KG:
+                await interaction.followup.send(
+                    embed=bot.formatter.create_error_embed(
+                        f"❌ Invalid weight: `{weight}`\n"
+                        f"Use a weight up to {FREIGHT_MAX_WEIGHT_KG:g}kg per piece, like: `320kg`"
+                    )
+                )
+                return
+
+            piece_weights = [weight_kg]
+            if pieces:
+                extra_weights = parse_parcels(pieces)
+                if extra_weights is None or any(w <= 0 or w > FREIGHT_MAX_WEIGHT_KG for w in extra_weights):
+                    await interaction.followup.send(
+                        embed=bot.formatter.create_error_embed(
+                            f"❌ Invalid pieces: `{pieces}`\n"
+                            f"Use comma-separated weights up to {FREIGHT_MAX_WEIGHT_KG:g}kg each, like: `180,250kg`"
+                        )
+                    )
+                    return
+                piece_weights.extend(extra_weights)
+
+            dimensions_cm = None
+            if dimensions:
+                dimensions_cm = parse_dimensions(dimensions)
+                if dimensions_cm is None:
+                    await interaction.followup.send(
+                        embed=bot.formatter.create_error_embed(
+                            f"❌ Invalid dimensions: `{dimensions}`\n"
+                            f"Use L x W x H in cm, like: `120x80x100`"
+                        )
+                    )
+                    return
+
+            try:
+                offers = await bot.pricing_pool.call(
+                    "price_freight", destination, piece_weights,
+                    piece_dimensions=[dimensions_cm] * len(piece_weights) if dimensions_cm else None,
+                    postal_code=postal_code
+                )
+            except PoolBusyError:
+                await interaction.followup.send(embed=bot.formatter.create_busy_embed())
+                return
+
+            country_iso2 = bot.pricing_engine.resolver.resolve(destination)
+            country_name = destination
+            if country_iso2:
+                resolved_name = bot.pricing_engine.resolver.get_name(country_iso2)
+                if resolved_name:
+                    country_name = f"{resolved_name} ({country_iso2})"
+
+            available_offers = bot.formatter.collapse_zones(offers)
+
             embed = bot.formatter.create_offers_embed(
-                offers,
-                weight_kg,
+                available_offers,
+                sum(piece_weights),
                 destination,
-                country_name
+                country_name,
+                parcel_weights=piece_weights if len(piece_weights) > 1 else None,
+                is_freight=True
             )
-
             await interaction.followup.send(embed=embed)
 
         except Exception as e:
@@ -186,6 +368,160 @@ def setup_commands(bot: 'PricingBot'):
             )
             raise  # Re-raise for logging
 
+    @bot.tree.command(
+        name="explain",
+        description="Explain a quote: why each service was priced or skipped"
+    )
+    @app_commands.describe(
+        weight="Weight (e.g., '2kg', '5', '10.5kg')",
+        destination="Destination country (e.g., 'Japan', 'DE', 'Allemagne')",
+        parcels="(Optional) Additional parcel or piece weights (e.g., '3,1.5kg')",
+        dimensions="(Optional) Box size in cm, L x W x H, applied to every parcel (e.g., '40x30x20')",
+        postal_code="(Optional) Destination postal code (e.g., 'K1A 0B1')",
+        freight="(Optional) Explain a freight quote (/freight) instead of a parcel quote"
+    )
+    async def explain(
+        interaction: discord.Interaction,
+        weight: str,
+        destination: str,
+        parcels: Optional[str] = None,
+        dimensions: Optional[str] = None,
+        postal_code: Optional[str] = None,
+        freight: bool = False
+    ):
+        """
+        /explain command handler
+
+        Examples:
+            /explain 2kg Germany
+            /explain 2kg Canada postal_code:K1A0B1
+            /explain 150kg DE freight:True
+        """
+        await interaction.response.defer()
+
+        try:
+            max_weight_kg = FREIGHT_MAX_WEIGHT_KG if freight else 70
+
+            weight_kg = parse_weight(weight)
+            if weight_kg is None or weight_kg <= 0 or weight_kg > max_weight_kg:
+                await interaction.followup.send(
+                    embed=bot.formatter.create_error_embed(
+                        f"❌ Invalid weight: `{weight}`\n"
+                        f"Use a positive weight up to {max_weight_kg:g}kg, like: `2kg`, `5`, `10.5kg`"
+                    )
+                )
+                return
+
+            parcel_weights = [weight_kg]
+            if parcels:
+                extra_weights = parse_parcels(parcels)
+                if extra_weights is None or any(w <= 0 or w > max_weight_kg for w in extra_weights):
+                    await interaction.followup.send(
+                        embed=bot.formatter.create_error_embed(
+                            f"❌ Invalid parcels: `{parcels}`\n"
+                            f"Use comma-separated weights up to {max_weight_kg:g}kg each, like: `3,1.5kg`"
+                        )
+                    )
+                    return
+                parcel_weights.extend(extra_weights)
+
+            dimensions_cm = None
+            if dimensions:
+                dimensions_cm = parse_dimensions(dimensions)
+                if dimensions_cm is None:
+                    await interaction.followup.send(
+                        embed=bot.formatter.create_error_embed(
+                            f"❌ Invalid dimensions: `{dimensions}`\n"
+                            f"Use L x W x H in cm, like: `40x30x20`"
+                        )
+                    )
+                    return
+
+            try:
+                trace = await bot.pricing_pool.call(
+                    "explain", destination, parcel_weights,
+                    freight=freight,
+                    parcel_dimensions=[dimensions_cm] * len(parcel_weights) if dimensions_cm else None,
+                    postal_code=postal_code
+                )
+            except PoolBusyError:
+                await interaction.followup.send(embed=bot.formatter.create_busy_embed())
+                return
+
+            country_name = destination
+            if trace.dest_iso2:
+                country_name = f"{trace.country_name or destination} ({trace.dest_iso2})"
+
+            embed = bot.formatter.create_explain_embed(trace, country_name)
+            await interaction.followup.send(embed=embed)
+
+        except Exception as e:
+            await interaction.followup.send(
+                embed=bot.formatter.create_error_embed(f"❌ Error: {str(e)}")
+            )
+            raise
+
+    @bot.tree.command(
+        name="breakpoints",
+        description="Show the cheapest service for each weight range"
+    )
+    @app_commands.describe(
+        destination="Destination country (e.g., 'Germany', 'DE')",
+        weight="(Optional) Weight to highlight (e.g., '1.2kg')"
+    )
+    async def breakpoints(
+        interaction: discord.Interaction,
+        destination: str,
+        weight: Optional[str] = None
+    ):
+        """
+        /breakpoints command handler
+
+        Examples:
+            /breakpoints Germany
+            /breakpoints DE 1.2kg
+        """
+        await interaction.response.defer()
+
+        try:
+            weight_kg = None
+            if weight:
+                weight_kg = parse_weight(weight)
+                if weight_kg is None:
+                    await interaction.followup.send(
+                        embed=bot.formatter.create_error_embed(
+                            f"❌ Invalid weight format: `{weight}`\n"
+                            f"Use formats like: `2kg`, `5`, `10.5kg`"
+                        )
+                    )
+                    return
+
+            try:
+                table = await bot.get_breakpoints(destination)
+            except PoolBusyError:
+                await interaction.followup.send(embed=bot.formatter.create_busy_embed())
+                return
+
+            if table is None:
+                await interaction.followup.send(
+                    embed=bot.formatter.create_error_embed(f"❌ Unknown destination: `{destination}`")
+                )
+                return
+
+            country_name = bot.pricing_engine.resolver.get_name(table.country_iso2) or destination
+            embed = bot.formatter.create_breakpoints_embed(
+                table,
+                f"{country_name} ({table.country_iso2})",
+                weight_kg=weight_kg
+            )
+            await interaction.followup.send(embed=embed)
+
+        except Exception as e:
+            await interaction.followup.send(
+                embed=bot.formatter.create_error_embed(f"❌ Error: {str(e)}")
+            )
+            raise
+
     @bot.tree.command(
         name="carriers",
         description="List all available shipping carriers"
@@ -205,7 +541,7 @@ def setup_commands(bot: 'PricingBot'):
             for carrier_id, carrier in bot.pricing_engine.loader.carriers.items():
                 # Count services for this carrier
                 services_count = sum(
-                    1 for s in bot.pricing_engine.loader.services.values()
+                    1 for s in bot.pricing_engine.loader.services_on().values()
                     if s.carrier_id == carrier_id
                 )
 
@@ -228,6 +564,50 @@ def setup_commands(bot: 'PricingBot'):
             )
             raise
 
+    @bot.tree.command(
+        name="stats",
+        description="Show bot runtime stats (event loop, UPS API health)"
+    )
+    async def stats(interaction: discord.Interaction):
+        """
+        /stats command handler
+
+        Shows event-loop lag, UPS circuit breaker states and latencies
+        """
+        embed = bot.formatter.create_stats_embed(bot.get_stats())
+        await interaction.response.send_message(embed=embed)
+
+    @bot.tree.command(
+        name="reload",
+        description="Reload the tariffs from disk (admins only)"
+    )
+    @app_commands.describe(
+        force="(Optional) Accept integrity warnings the running tariffs did not have"
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def reload(interaction: discord.Interaction, force: bool = False):
+        """
+        /reload command handler
+
+        Validates and swaps in the tariffs on disk; refused (running tariffs
+        kept) if the new data has integrity errors or new warnings
+        """
+        await interaction.response.defer(ephemeral=True)
+
+        try:
+            report = await bot.reload_tariffs(force=force)
+        except TariffValidationError as e:
+            logger.warning(f"🚫 Tariff reload refused: {len(e.issues)} issue(s)")
+            await interaction.followup.send(embed=bot.formatter.create_reload_embed(None, error=e))
+            return
+        except Exception as e:
+            await interaction.followup.send(
+                embed=bot.formatter.create_error_embed(f"❌ Error: {str(e)}")
+            )
+            raise
+
+        await interaction.followup.send(embed=bot.formatter.create_reload_embed(report))
+
     @bot.tree.command(
         name="help",
         description="Show bot usage guide"
@@ -242,6 +622,70 @@ def setup_commands(bot: 'PricingBot'):
         await interaction.response.send_message(embed=embed)
 
 
+def matches_carrier(carrier_code: str, carrier_name: str, carrier_filter: List[str]) -> bool:
+    """
+    /price carriers filter: exact carrier code or part of the carrier name
+
+    Args:
+        carrier_code: Offer or suspended service carrier code
+        carrier_name: Carrier display name
+        carrier_filter: Upper-cased filter terms (e.g. ["UPS", "FEDEX"])
+    """
+    return (
+        carrier_code.upper() in carrier_filter
+        or any(term in carrier_name.upper() for term in carrier_filter)
+    )
+
+
+def parse_parcels(parcels_str: str) -> Optional[List[float]]:
+    """
+    Parse a comma-separated list of parcel weights
+
+    Supports:
+        - "3,1.5" → [3.0, 1.5]
+        - "3kg, 1.5kg" → [3.0, 1.5]
+
+    Returns:
+        List of weights in kg, or None if any item is invalid
+    """
+    weights = []
+
+    for item in parcels_str.split(','):
+        weight_kg = parse_weight(item)
+        if weight_kg is None:
+            return None
+        weights.append(weight_kg)
+
+    return weights
+
+
+def parse_dimensions(dimensions_str: str) -> Optional[Tuple[float, float, float]]:
+    """
+    Parse box dimensions in cm
+
+    Supports:
+        - "40x30x20" → (40.0, 30.0, 20.0)
+        - "40 x 30 x 20cm" → (40.0, 30.0, 20.0)
+        - "40*30*20" → (40.0, 30.0, 20.0)
+
+    Returns:
+        (length, width, height) in cm, or None if invalid
+    """
+    match = re.match(
+        r'^(\d+\.?\d*)\s*[x×*]\s*(\d+\.?\d*)\s*[x×*]\s*(\d+\.?\d*)\s*(cm)?$',
+        dimensions_str.strip().lower()
+    )
+
+    if not match:
+        return None
+
+    dims = tuple(float(match.group(i)) for i in range(1, 4))
+    if any(d <= 0 for d in dims):
+        return None
+
+    return dims
+
+
 def parse_weight(weight_str: str) -> Optional[float]:
     """
     Parse weight string to float in kg
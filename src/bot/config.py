@@ -4,6 +4,7 @@ Loads bot token and settings from environment variables
 """
 
 import os
+from pathlib import Path
 from typing import Optional
 
 
@@ -27,9 +28,53 @@ class BotConfig:
         # Maximum offers to display per query
         self.max_offers: int = 10
 
+        # Paginated /price results: how long the offer list is kept for the page buttons (seconds)
+        # Discord interaction tokens expire after 15 minutes: keep it below 900
+        self.price_pages_ttl: float = self._parse_float(os.getenv("PRICE_PAGES_TTL"), 600.0)
+
+        # Rendered /price and /freight embeds kept for identical quotes (0 disables)
+        embed_cache_size = self._parse_int(os.getenv("EMBED_CACHE_SIZE"))
+        self.embed_cache_size: int = 256 if embed_cache_size is None else embed_cache_size
+
         # Enable debug logging
         self.debug: bool = os.getenv("DEBUG", "false").lower() == "true"
 
+        # Pricing worker pool ("thread" or "process"), size and wait queue bound
+        self.pricing_pool_mode: str = os.getenv("PRICING_POOL_MODE", "thread").lower()
+        self.pricing_pool_workers: int = self._parse_int(os.getenv("PRICING_POOL_WORKERS")) or 4
+        self.pricing_pool_queue: int = self._parse_int(os.getenv("PRICING_POOL_QUEUE")) or 32
+
+        # Event-loop monitoring: lag probe interval and blocking threshold (ms)
+        self.loop_probe_interval_ms: float = self._parse_float(os.getenv("LOOP_PROBE_INTERVAL_MS"), 50.0)
+        self.loop_block_threshold_ms: float = self._parse_float(os.getenv("LOOP_BLOCK_THRESHOLD_MS"), 100.0)
+        # asyncio debug mode (native slow-callback warnings, adds overhead)
+        self.loop_debug: bool = os.getenv("LOOP_DEBUG", "false").lower() == "true"
+
+        # UPS API host override (e.g. local mock server for load testing)
+        self.ups_base_url: Optional[str] = os.getenv("UPS_API_BASE_URL") or None
+
+        # UPS live rate cache lifetime (seconds)
+        self.ups_rate_cache_ttl: float = self._parse_float(os.getenv("UPS_RATE_CACHE_TTL"), 1800.0)
+
+        # UPS pre-warming of top lanes (CSV: country_iso2,weight_kg)
+        # Disabled when the file does not exist
+        default_lanes = Path(__file__).parent.parent.parent / "data" / "prewarm_lanes.csv"
+        self.ups_prewarm_lanes_file: Path = Path(os.getenv("UPS_PREWARM_LANES_FILE", str(default_lanes)))
+        self.ups_prewarm_interval: float = self._parse_float(os.getenv("UPS_PREWARM_INTERVAL"), 900.0)
+        # Max UPS requests/sec (each request, not each lane: a lane costs up to 4)
+        self.ups_prewarm_rate: float = self._parse_float(os.getenv("UPS_PREWARM_RATE"), 2.0)
+
+        # Precomputed cheapest-service breakpoints (python -m src.cli.breakpoints)
+        # Countries missing from the file are computed on first /breakpoints use
+        default_breakpoints = Path(__file__).parent.parent.parent / "data" / "compiled" / "breakpoints.csv"
+        self.breakpoints_file: Path = Path(os.getenv("BREAKPOINTS_FILE", str(default_breakpoints)))
+
+        # Optional SQLite tariff store (python -m src.cli.tariff_store build)
+        # When set, scopes and bands are read on demand instead of loading every CSV
+        self.tariff_store_file: Optional[Path] = (
+            Path(os.getenv("TARIFF_STORE_FILE")) if os.getenv("TARIFF_STORE_FILE") else None
+        )
+
     @staticmethod
     def _parse_int(value: Optional[str]) -> Optional[int]:
         """Parse string to int, return None if invalid"""
@@ -40,6 +85,16 @@ class BotConfig:
         except ValueError:
             return None
 
+    @staticmethod
+    def _parse_float(value: Optional[str], default: float) -> float:
+        """Parse string to float, return default if missing or invalid"""
+        if not value:
+            return default
+        try:
+            return float(value)
+        except ValueError:
+            return default
+
     def validate(self) -> bool:
         """Validate that required config values are set"""
         if not self.token:
@@ -3,113 +3,267 @@ Discord Message Formatter
 Formats pricing engine results as Discord embeds
 """
 
-from typing import List
+from typing import List, Dict, Any, Optional, Set
 import discord
-from src.engine.engine import PriceOffer
+from src.engine.engine import PriceOffer, SuspendedService
+from src.engine.breakpoints import BreakpointTable
+from src.engine.trace import (
+    SKIP_NO_BAND, SKIP_NO_SCOPE, SKIP_OVERWEIGHT, SKIP_SUSPENDED, QuoteTrace, ServiceTrace, describe_scope
+)
+from src.engine.validator import TariffValidationError, ValidationReport
 from .config import config
+from .render_cache import RenderCache, offer_fingerprint, suspended_fingerprint
 
 
 class PricingFormatter:
     """Formats pricing results for Discord"""
 
-    @staticmethod
+    def __init__(self, cache_size: int = 256):
+        """
+        Args:
+            cache_size: Rendered /price and /freight embeds kept in memory
+                        (per-offer fragments: 8x as many; 0 disables caching)
+        """
+        # Fingerprint of offers + display options -> rendered embed
+        self.render_cache = RenderCache(max_entries=cache_size)
+        # (offer fingerprint, weight, freight mode) -> offer field value
+        self.fragment_cache = RenderCache(max_entries=cache_size * 8)
+
     def create_offers_embed(
+        self,
         offers: List[PriceOffer],
         weight_kg: float,
         destination: str,
-        country_name: str
+        country_name: str,
+        parcel_weights: Optional[List[float]] = None,
+        is_freight: bool = False,
+        suspended: Optional[List[SuspendedService]] = None,
+        page: int = 0
     ) -> discord.Embed:
         """
         Create Discord embed for pricing offers
 
+        Offers are shown config.max_offers per page (see pagination.py for
+        the /price buttons); only the requested page is rendered.
+
+        Rendered embeds are cached by offer fingerprint and display options:
+        a cached or coalesced quote is served as a copy of the earlier embed.
+        The fingerprint holds every displayed value, so new tariffs never hit
+        a stale entry.
+
         Args:
             offers: List of price offers from engine
-            weight_kg: Weight in kg
+            weight_kg: Weight in kg (total shipment weight for multi-parcel)
             destination: Destination query string
             country_name: Resolved country name
+            parcel_weights: Individual parcel weights for multi-parcel shipments
+            is_freight: Freight quotes (/freight): pieces and billed weight labels
+            suspended: Services suspended for the destination, shown with
+                       their cheapest alternative (from engine.quote)
+            page: Page to render (0-based, clamped to the last page)
 
         Returns:
             Discord embed with formatted offers
         """
+        page = min(max(page, 0), self.page_count(offers) - 1)
+        start = page * config.max_offers
+        zoned = _zoned_services(offers)
+        offer_keys = [
+            offer_fingerprint(offer, show_zone=offer.service_code in zoned)
+            for offer in offers[start:start + config.max_offers]
+        ]
+        key = (
+            tuple(offer_keys), len(offers), page, weight_kg, destination, country_name,
+            tuple(parcel_weights) if parcel_weights else None, is_freight,
+            tuple(suspended_fingerprint(service) for service in suspended) if suspended else None,
+        )
+
+        embed = self.render_cache.get(key)
+        if embed is None:
+            embed = self._render_offers_embed(
+                offers, offer_keys, page, weight_kg, destination, country_name, parcel_weights, is_freight,
+                suspended
+            )
+            self.render_cache.put(key, embed)
+
+        # Callers may edit the embed: never hand out the cached instance
+        return embed.copy()
+
+    @staticmethod
+    def collapse_zones(offers: List[PriceOffer]) -> List[PriceOffer]:
+        """
+        Drop zone offers priced exactly like an earlier zone of the same service
+
+        Without a postal code, a multi-zone country gets one offer per zone:
+        identical ones would show as duplicate lines. Zones with different
+        prices are kept (and labelled with their zone).
+        """
+        seen = set()
+        collapsed = []
+        for offer in offers:
+            key = (offer.service_code, offer.freight, offer.surcharges, offer.total, offer.currency,
+                   offer.chargeable_weight_kg)
+            if key not in seen:
+                seen.add(key)
+                collapsed.append(offer)
+        return collapsed
+
+    @staticmethod
+    def page_count(offers: List[PriceOffer]) -> int:
+        """Number of /price pages for an offer list (at least 1)"""
+        return max(1, -(-len(offers) // config.max_offers))
+
+    def _render_offers_embed(
+        self,
+        offers: List[PriceOffer],
+        offer_keys: List[tuple],
+        page: int,
+        weight_kg: float,
+        destination: str,
+        country_name: str,
+        parcel_weights: Optional[List[float]],
+        is_freight: bool,
+        suspended: Optional[List[SuspendedService]]
+    ) -> discord.Embed:
+        """Build the /price or /freight embed (cache miss)"""
+
+        unit = "pieces" if is_freight else "parcels"
+
+        if parcel_weights:
+            weight_label = f"{len(parcel_weights)} {unit} ({weight_kg:g}kg)"
+        else:
+            weight_label = f"{weight_kg}kg"
 
         if not offers:
             embed = discord.Embed(
                 title="❌ No Offers Found",
-                description=f"No carriers available for **{weight_kg}kg** to **{country_name}** ({destination})",
+                description=f"No carriers available for **{weight_label}** to **{country_name}** ({destination})",
                 color=discord.Color.red()
             )
             return embed
 
-        # Check if destination is USA for Trump tariff warning
-        is_usa = "US" in country_name.upper() or "ÉTATS-UNIS" in country_name.upper() or "USA" in country_name.upper()
-
         # Create embed with results
         embed = discord.Embed(
-            title=f"📦 Shipping Quotes: {weight_kg}kg → {country_name}",
+            title=f"{'🚛 Freight' if is_freight else '📦 Shipping'} Quotes: {weight_label} → {country_name}",
             description=f"Found **{len(offers)}** available offer(s) - Sorted by price (cheapest first)",
             color=config.embed_color
         )
 
-        # Add Trump tariff warning if USA destination
-        # Note: Suspended services are filtered out, so we only show available options
-        if is_usa:
+        # Suspended services (e.g. UPS to the USA): cheapest alternative inline, first page only
+        if suspended and page == 0:
             embed.add_field(
-                name="ℹ️ USA Shipping Notice",
-                value=(
-                    "**Note:** Some UPS services are currently unavailable for USA destinations due to trade policy "
-                    "restrictions under the Trump administration's tariff regulations.\n\n"
-                    "✅ **Showing only available services below** (FedEx, Delivengo, Spring, and select UPS options)."
-                ),
+                name="⛔ Suspended Services",
+                value="\n".join(_suspended_line(service) for service in suspended)[:1024],
                 inline=False
             )
 
         # Add each offer as a field (use inline=True for 2-column layout)
-        for i, offer in enumerate(offers[:config.max_offers], 1):
+        start = page * config.max_offers
+        zoned = _zoned_services(offers)
+        for i, (offer, offer_key) in enumerate(zip(offers[start:], offer_keys), start + 1):
             # Medal emojis for top 3
-            medal = {1: "🥇", 2: "🥈", 3: "🥉"}.get(i, f"{i}.")
-
-            # Add suspension emoji if service is suspended
-            if offer.is_suspended:
-                medal = "⛔"
-
-            # Format price components with better alignment
-            freight_str = f"{float(offer.freight):.2f}"
-            surcharges_str = f"{float(offer.surcharges):+.2f}" if offer.surcharges != 0 else ""
-            total_str = f"**{float(offer.total):.2f} {offer.currency}**"
-
-            # Build field value with cleaner formatting
-            value_parts = [
-                f"💰 **Total:** {total_str}",
-                f"📄 Freight: `{freight_str} {offer.currency}`",
-            ]
+            medal = _MEDALS.get(i, f"{i}.")
 
-            if surcharges_str:
-                emoji = "💸" if offer.surcharges < 0 else "➕"
-                value_parts.append(f"{emoji} Surcharges: `{surcharges_str} {offer.currency}`")
-
-            value_parts.append(f"🏷️ Service: `{offer.service_code}`")
-
-            # Add warning if suspended
-            if offer.is_suspended and offer.warning:
-                value_parts.append(f"⚠️ *{offer.warning}*")
-
-            field_name = f"{medal} {offer.carrier_name}"
-            field_value = "\n".join(value_parts)
+            # Field value depends on the offer only: shared by every quote listing it
+            fragment_key = (offer_key, weight_kg, is_freight)
+            field_value = self.fragment_cache.get(fragment_key)
+            if field_value is None:
+                field_value = _offer_field_value(offer, weight_kg, is_freight, offer.service_code in zoned)
+                self.fragment_cache.put(fragment_key, field_value)
 
             # Use inline=True for compact 2-column layout (max 2 per row on desktop)
             embed.add_field(
-                name=field_name,
+                name=f"{medal} {offer.carrier_name}",
                 value=field_value,
                 inline=True  # Changed from False to enable column layout
             )
 
         # Add footer with metadata
+        if parcel_weights:
+            weights_text = " + ".join(f"{w:g}" for w in parcel_weights)
+            footer_weight = f"{unit.capitalize()}: {weights_text}kg (whole-shipment totals)"
+        else:
+            footer_weight = f"Weight: {weight_kg}kg"
+
+        pages = self.page_count(offers)
+        footer_page = f" | Page {page + 1}/{pages}" if pages > 1 else ""
+
         embed.set_footer(
-            text=f"Query: {destination} | Weight: {weight_kg}kg | Pricing Engine v0.4.0 (with UPS API)"
+            text=f"Query: {destination} | {footer_weight}{footer_page} | Pricing Engine v0.4.0 (with UPS API)"
         )
 
         return embed
 
+    @staticmethod
+    def create_explain_embed(trace: QuoteTrace, country_name: str) -> discord.Embed:
+        """
+        Create embed explaining a quote (/explain)
+
+        One field per priced service (scope and why, band, surcharges, total)
+        and one field listing the services that were skipped and why.
+
+        Args:
+            trace: QuoteTrace returned by PricingEngine.explain()
+            country_name: Resolved country name
+        """
+        weight_kg = sum(trace.parcel_weights)
+        weight_label = f"{weight_kg:g}kg"
+        if len(trace.parcel_weights) > 1:
+            weight_label = f"{len(trace.parcel_weights)} {'pieces' if trace.mode == 'freight' else 'parcels'} ({weight_label})"
+
+        if trace.dest_iso2 is None:
+            return PricingFormatter.create_error_embed(f"❌ Unknown destination: `{trace.dest}`")
+
+        priced = [s for s in trace.services if not s.skip_reason]
+        embed = discord.Embed(
+            title=f"🔍 Quote Explained: {weight_label} → {country_name}",
+            description=(
+                f"**{len(priced)}** service(s) priced, **{len(trace.skipped)}** skipped"
+                + (f" · postal code `{trace.postal_code}`" if trace.postal_code else "")
+            ),
+            color=config.embed_color
+        )
+
+        # Discord caps embeds at 25 fields: keep one for the skipped list
+        for service in priced[:24]:
+            value_parts = []
+            for scope in service.scopes:
+                if not scope.priced:
+                    value_parts.append(f"⏭️ `{scope.scope_code}`: no band for {scope.missing_weight_kg:g}kg")
+                    continue
+
+                bands = ", ".join(f"{b.min_weight_kg:g}-{b.max_weight_kg:g}kg" for b in scope.bands)
+                value_parts.append(f"🗺️ `{scope.scope_code}` ({describe_scope(scope)})")
+                value_parts.append(f"📏 Band: {bands}")
+                value_parts.append(f"📄 Freight: `{float(scope.freight):.2f} {service.currency}`")
+                for surcharge in scope.surcharges:
+                    rate = f" ({float(surcharge.value):g}%)" if surcharge.kind == "PERCENT" else ""
+                    value_parts.append(f"➕ {surcharge.name}{rate}: `{float(surcharge.amount):+.2f}`")
+                value_parts.append(f"💰 **Total: {float(scope.total):.2f} {service.currency}**")
+
+            if service.chargeable_weights:
+                weights = " + ".join(f"{w:g}" for w in service.chargeable_weights)
+                value_parts.append(f"📐 Chargeable: {weights}kg")
+
+            if service.restriction:
+                icon = "⛔" if service.is_suspended else "⚠️"
+                value_parts.append(f"{icon} *{service.restriction}*")
+
+            embed.add_field(
+                name=f"{'⛔' if service.is_suspended else '✅'} {service.service_code}",
+                value="\n".join(value_parts)[:1024],
+                inline=False
+            )
+
+        if trace.skipped:
+            lines = [f"`{s.service_code}`: {_skip_reason(s, trace.dest_iso2)}" for s in trace.skipped]
+            embed.add_field(name="⏭️ Skipped", value="\n".join(lines)[:1024], inline=False)
+
+        footer = f"Tariffs valid on {trace.ship_date:%Y-%m-%d}" if trace.ship_date else ""
+        embed.set_footer(text=f"{footer} · suspended services are hidden from /price".strip(" ·"))
+
+        return embed
+
     @staticmethod
     def create_error_embed(error_message: str) -> discord.Embed:
         """Create error embed"""
@@ -120,6 +274,19 @@ class PricingFormatter:
         )
         return embed
 
+    @staticmethod
+    def create_busy_embed() -> discord.Embed:
+        """Create embed shown when the pricing pool is saturated"""
+        embed = discord.Embed(
+            title="⏳ Bot Busy",
+            description=(
+                "The pricing engine is handling a lot of requests right now.\n"
+                "Please try again in a few seconds."
+            ),
+            color=discord.Color.orange()
+        )
+        return embed
+
     @staticmethod
     def create_carriers_embed(carriers_info: List[dict]) -> discord.Embed:
         """
@@ -150,6 +317,249 @@ class PricingFormatter:
 
         return embed
 
+    @staticmethod
+    def create_breakpoints_embed(
+        table: BreakpointTable,
+        country_name: str,
+        weight_kg: Optional[float] = None,
+        max_lines: int = 25
+    ) -> discord.Embed:
+        """
+        Create embed listing the cheapest service per weight range
+
+        Consecutive ranges won by the same service are shown as one line.
+
+        Args:
+            table: BreakpointTable for the destination
+            country_name: Display name of the destination
+            weight_kg: Optional weight to highlight (cheapest service at this weight)
+            max_lines: Maximum number of ranges listed
+
+        Returns:
+            Discord embed with the breakpoint ranges
+        """
+        embed = discord.Embed(
+            title=f"📈 Cheapest Service by Weight → {country_name}",
+            color=config.embed_color
+        )
+
+        if not table.breakpoints:
+            embed.description = "No service ships to this destination."
+            return embed
+
+        # Group consecutive ranges won by the same service
+        groups = []
+        for bp in table.breakpoints:
+            if groups and groups[-1]['service_code'] == bp.service_code:
+                group = groups[-1]
+                group['max'] = bp.max_weight_kg
+                group['low'] = min(group['low'], bp.total_at_min)
+                group['high'] = max(group['high'], bp.total_at_max)
+            else:
+                groups.append({
+                    'service_code': bp.service_code,
+                    'carrier_code': bp.carrier_code,
+                    'currency': bp.currency,
+                    'min': bp.min_weight_kg,
+                    'max': bp.max_weight_kg,
+                    'low': bp.total_at_min,
+                    'high': bp.total_at_max,
+                })
+
+        lines = []
+        for group in groups[:max_lines]:
+            if group['min'] == group['max']:
+                weights = f"{group['min']:g}kg"
+            else:
+                weights = f"{group['min']:g}–{group['max']:g}kg"
+
+            if abs(group['high'] - group['low']) < 0.005:
+                prices = f"{group['low']:.2f} {group['currency']}"
+            else:
+                prices = f"{group['low']:.2f}–{group['high']:.2f} {group['currency']}"
+
+            lines.append(f"`{weights}` **{group['service_code']}** ({group['carrier_code']}) · {prices}")
+
+        if len(groups) > max_lines:
+            lines.append(f"… {len(groups) - max_lines} more ranges")
+
+        embed.description = "\n".join(lines)
+
+        if weight_kg is not None:
+            best = table.cheapest(weight_kg)
+            if best:
+                value = f"**{best.service_code}** ({best.carrier_code}) · {best.total_at(weight_kg):.2f} {best.currency}"
+            else:
+                value = "No service for this weight"
+            embed.add_field(name=f"🏆 Cheapest at {weight_kg:g}kg", value=value, inline=False)
+
+        embed.set_footer(text="Totals include surcharges · suspended services excluded")
+
+        return embed
+
+    @staticmethod
+    def create_reload_embed(
+        report: Optional[ValidationReport],
+        error: Optional[TariffValidationError] = None
+    ) -> discord.Embed:
+        """
+        Create embed with the outcome of a /reload
+
+        Args:
+            report: Validation report of the new data (None if not validated)
+            error: Set when the reload was refused (running tariffs unchanged)
+        """
+        if error is not None:
+            embed = discord.Embed(
+                title="❌ Reload Refused",
+                description=(
+                    "The new tariffs would degrade results; the running tariffs are unchanged.\n"
+                    f"```\n{error.report.summary(error.issues)[:3800]}\n```"
+                ),
+                color=discord.Color.red()
+            )
+            embed.set_footer(text="Fix the data, or use force:True to accept new warnings")
+            return embed
+
+        embed = discord.Embed(
+            title="🔄 Tariffs Reloaded",
+            color=discord.Color.green()
+        )
+
+        if report is not None:
+            embed.description = (
+                f"{report.rows} rows checked in {report.elapsed_s * 1000:.0f} ms · "
+                f"{len(report.warnings)} integrity warnings"
+            )
+
+        return embed
+
+    @staticmethod
+    def create_stats_embed(stats: Dict[str, Any]) -> discord.Embed:
+        """
+        Create embed with bot runtime stats
+
+        Args:
+            stats: Dict returned by PricingBot.get_stats()
+
+        Returns:
+            Discord embed with one field per stat entry
+        """
+        embed = discord.Embed(
+            title="📊 Bot Stats",
+            color=config.embed_color
+        )
+
+        event_loop = stats.get('event_loop')
+        if event_loop:
+            lag = event_loop['lag']
+            value_parts = [
+                f"⏱️ Lag p50 `{_ms(lag['p50'])}` | p95 `{_ms(lag['p95'])}` | "
+                f"p99 `{_ms(lag['p99'])}` | max `{_ms(lag['max'])}`",
+            ]
+
+            for blocked in event_loop['blocked_stages']:
+                value_parts.append(
+                    f"🐢 `/{blocked['command']} [{blocked['stage']}]` blocked "
+                    f"{blocked['count']}x (max `{_ms(blocked['max'])}`)"
+                )
+
+            embed.add_field(
+                name="🔁 Event Loop",
+                value="\n".join(value_parts),
+                inline=False
+            )
+
+        pool = stats.get('pricing_pool')
+        if pool:
+            embed.add_field(
+                name="🧮 Pricing Pool",
+                value=(
+                    f"⚙️ Mode: `{pool['mode']}` | Workers: `{pool['workers']}`\n"
+                    f"📥 In flight: `{pool['in_flight']}` | Queue: `{pool['queue_depth']}/{pool['max_queue']}` | "
+                    f"Saturation: `{pool['saturation']:.0%}`\n"
+                    f"⏱️ Wait p50 `{_ms(pool['wait']['p50'])}` | p95 `{_ms(pool['wait']['p95'])}` | "
+                    f"Run p95 `{_ms(pool['run']['p95'])}`\n"
+                    f"✅ Completed: `{pool['completed']}` | ⛔ Rejected (busy): `{pool['rejected']}`"
+                ),
+                inline=False
+            )
+
+        breakers = stats.get('ups_breakers')
+        if breakers is None:
+            embed.add_field(
+                name="UPS API",
+                value="Not used yet (no live rate request since startup)",
+                inline=False
+            )
+
+        for breaker in breakers or []:
+            state_emoji = {"CLOSED": "🟢", "HALF_OPEN": "🟡", "OPEN": "🔴"}.get(breaker['state'], "⚪")
+            latency = breaker['latency']
+
+            value_parts = [
+                f"{state_emoji} State: `{breaker['state']}`",
+                f"📞 Calls: `{breaker['total_calls']}` | Failures: `{breaker['total_failures']}`",
+                f"⏭️ Short-circuited: `{breaker['short_circuited']}` | Opened: `{breaker['times_opened']}`",
+                f"⏱️ Timeout: `{breaker['timeout']:.1f}s`",
+            ]
+
+            if latency['count']:
+                value_parts.append(
+                    f"📈 p50 `{_ms(latency['p50'])}` | p95 `{_ms(latency['p95'])}` | "
+                    f"p99 `{_ms(latency['p99'])}`"
+                )
+
+            embed.add_field(
+                name=f"UPS {breaker['name']} API",
+                value="\n".join(value_parts),
+                inline=True
+            )
+
+        cache = stats.get('ups_cache')
+        if cache:
+            hit_ratio = f"{cache['hit_ratio']:.0%}" if cache['hit_ratio'] is not None else "n/a"
+            embed.add_field(
+                name="⚡ UPS Rate Cache",
+                value=(
+                    f"Entries: `{cache['entries']}`\n"
+                    f"Hits: `{cache['hits']}` | Misses: `{cache['misses']}` | Ratio: `{hit_ratio}`"
+                ),
+                inline=False
+            )
+
+        cache = stats.get('embed_cache')
+        if cache and cache['hits'] + cache['misses']:
+            hit_ratio = f"{cache['hit_ratio']:.0%}" if cache['hit_ratio'] is not None else "n/a"
+            embed.add_field(
+                name="🖼️ Embed Render Cache",
+                value=(
+                    f"Entries: `{cache['entries']}`\n"
+                    f"Hits: `{cache['hits']}` | Misses: `{cache['misses']}` | Ratio: `{hit_ratio}`"
+                ),
+                inline=False
+            )
+
+        prewarm = stats.get('ups_prewarm')
+        if prewarm:
+            max_lag = f"{prewarm['max_lag']:.0f}s" if prewarm['max_lag'] is not None else "n/a"
+            value_parts = [
+                f"🔥 Warm lanes: `{prewarm['warm_lanes']}/{prewarm['lanes']}` | Cycles: `{prewarm['cycles']}`",
+                f"🔄 Refreshes: `{prewarm['refreshes']}` | Failures: `{prewarm['failures']}`",
+                f"📡 UPS requests: `{prewarm['ups_requests']}`",
+                f"⏳ Max refresh lag: `{max_lag}`",
+            ]
+            if prewarm['last_error']:
+                value_parts.append(f"⚠️ Last error: *{prewarm['last_error']}*")
+
+            embed.add_field(
+                name="🔥 UPS Pre-warming",
+                value="\n".join(value_parts),
+                inline=False
+            )
+
+        return embed
+
     @staticmethod
     def create_help_embed() -> discord.Embed:
         """Create help embed"""
@@ -160,23 +570,64 @@ class PricingFormatter:
         )
 
         embed.add_field(
-            name="/price <weight> <destination> [carriers]",
+            name="/price <weight> <destination> [carriers] [parcels] [dimensions]",
             value=(
                 "Get shipping quotes for a destination\n"
                 "**Examples:**\n"
                 "• `/price 2kg Japan`\n"
                 "• `/price 5kg Germany carriers:fedex,spring`\n"
-                "• `/price 10 australia` (kg assumed if no unit)"
+                "• `/price 10 australia` (kg assumed if no unit)\n"
+                "• `/price 2kg Japan parcels:3,1.5` (3-box shipment)\n"
+                "• `/price 2kg US dimensions:40x30x20` (volumetric weight)\n"
+                f"More than {config.max_offers} offers? Use the ◀ ▶ buttons to page through them"
+            ),
+            inline=False
+        )
+
+        embed.add_field(
+            name="/freight <weight> <destination> [pieces] [dimensions] [postal_code]",
+            value=(
+                "Freight quotes for heavy pallets (up to 1000kg per piece)\n"
+                "• `/freight 320kg US`\n"
+                "• `/freight 300 Japan pieces:250,180` (3-piece shipment)"
+            ),
+            inline=False
+        )
+
+        embed.add_field(
+            name="/breakpoints <destination> [weight]",
+            value=(
+                "Show which service is cheapest for each weight range\n"
+                "• `/breakpoints Germany`\n"
+                "• `/breakpoints DE 1.2kg`"
             ),
             inline=False
         )
 
+        embed.add_field(
+            name="/explain <weight> <destination> [parcels] [dimensions] [postal_code] [freight]",
+            value="Show why each service was priced or skipped: zone, weight band and every surcharge",
+            inline=False
+        )
+
         embed.add_field(
             name="/carriers",
             value="List all available shipping carriers",
             inline=False
         )
 
+        embed.add_field(
+            name="/stats",
+            value="Show bot runtime stats (event loop, UPS API health)",
+            inline=False
+        )
+
+        embed.add_field(
+            name="/reload [force]",
+            value="Reload the tariffs after an ETL run (admins only, refused if the new data fails validation)",
+            inline=False
+        )
+
         embed.add_field(
             name="/help",
             value="Show this help message",
@@ -196,3 +647,77 @@ class PricingFormatter:
         embed.set_footer(text="Powered by Unified Pricing Engine v0.3.0")
 
         return embed
+
+
+_MEDALS = {1: "🥇", 2: "🥈", 3: "🥉"}
+
+
+def _zoned_services(offers: List[PriceOffer]) -> Set[str]:
+    """Services listed more than once (one offer per zone of a multi-zone country)"""
+    seen, zoned = set(), set()
+    for offer in offers:
+        (zoned if offer.service_code in seen else seen).add(offer.service_code)
+    return zoned
+
+
+def _offer_field_value(offer: PriceOffer, weight_kg: float, is_freight: bool, show_zone: bool = False) -> str:
+    """Field value of one offer in /price and /freight embeds"""
+    # Format price components with better alignment
+    freight_str = f"{float(offer.freight):.2f}"
+    total_str = f"**{float(offer.total):.2f} {offer.currency}**"
+
+    # Build field value with cleaner formatting
+    value_parts = [
+        f"💰 **Total:** {total_str}",
+        f"📄 Freight: `{freight_str} {offer.currency}`",
+    ]
+
+    # Volumetric weight billed instead of actual weight
+    if offer.chargeable_weight_kg and offer.chargeable_weight_kg > weight_kg:
+        reason = "billed weight" if is_freight else "volumetric"
+        value_parts.append(f"📐 Chargeable: `{offer.chargeable_weight_kg:.2f}kg` ({reason})")
+
+    if offer.surcharges != 0:
+        emoji = "💸" if offer.surcharges < 0 else "➕"
+        value_parts.append(f"{emoji} Surcharges: `{float(offer.surcharges):+.2f} {offer.currency}`")
+
+    value_parts.append(f"🏷️ Service: `{offer.service_code}`")
+
+    # Same service priced for several zones: tell the offers apart
+    if show_zone:
+        value_parts.append(f"🗺️ Zone: `{offer.scope_code}`")
+
+    return "\n".join(value_parts)
+
+
+def _suspended_line(service: SuspendedService) -> str:
+    """'Suspended → cheapest alternative' line for /price"""
+    line = f"~~{service.service_label}~~ → "
+    offer = service.alternative
+    if offer is None:
+        line += "no alternative available"
+    else:
+        line += f"**{offer.carrier_name}** `{offer.service_code}`: **{float(offer.total):.2f} {offer.currency}**"
+
+    reason = service.message_en or service.message
+    return f"{line}\n*{reason}*" if reason else line
+
+
+def _skip_reason(service: ServiceTrace, country_iso2: str) -> str:
+    """Why a service was skipped, for /explain"""
+    if service.skip_reason == SKIP_OVERWEIGHT:
+        return f"over its {service.max_weight_kg:g}kg limit"
+    if service.skip_reason == SKIP_NO_SCOPE:
+        return f"no lane to {country_iso2}"
+    if service.skip_reason == SKIP_NO_BAND:
+        return "no band for this weight"
+    if service.skip_reason == SKIP_SUSPENDED:
+        return f"⛔ suspended for {country_iso2}"
+    return service.skip_reason
+
+
+def _ms(seconds: Optional[float]) -> str:
+    """Format a duration in seconds as milliseconds"""
+    if seconds is None:
+        return "n/a"
+    return f"{seconds * 1000:.0f}ms"
@@ -0,0 +1,121 @@
+"""
+Event Loop Monitor
+Measures event-loop lag and reports which command stage blocked the loop
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from src.integrations.latency import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """
+    Event-loop responsiveness monitor
+
+    - Lag probe: a task sleeps `interval` seconds and records how late it
+      wakes up. Lag means something ran on the loop without yielding
+      (and delays Discord heartbeats).
+    - Stage timing: synchronous sections of command handlers are wrapped in
+      `stage(command, name)`; a section longer than `block_threshold` is
+      logged with its command and stage, since it held the loop that long.
+    - Optional asyncio debug mode (`asyncio_debug=True`) additionally makes
+      asyncio log every callback slower than `block_threshold`. It has a
+      noticeable overhead, so it is off by default.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        block_threshold: float = 0.1,
+        asyncio_debug: bool = False
+    ):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.asyncio_debug = asyncio_debug
+
+        self.lag = LatencyWindow(size=2000)
+        self._task: Optional[asyncio.Task] = None
+
+        # (command, stage) -> [count, total seconds, max seconds] of blocking sections
+        self.blocked: Dict[Tuple[str, str], list] = {}
+        self._last_stage: Optional[Tuple[str, str]] = None
+
+    def start(self):
+        """Start the lag probe on the running loop"""
+        if self._task is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+        if self.asyncio_debug:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.block_threshold
+            logger.info(f"🐢 asyncio slow-callback detection enabled ({self.block_threshold * 1000:.0f}ms)")
+
+        self._task = loop.create_task(self._probe(), name="loop-lag-probe")
+
+    async def stop(self):
+        """Cancel the lag probe"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _probe(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self.lag.record(lag)
+
+            if lag > self.block_threshold:
+                culprit = "/{} [{}]".format(*self._last_stage) if self._last_stage else "unknown"
+                logger.warning(f"🐢 Event loop lag {lag * 1000:.0f}ms (last stage: {culprit})")
+
+    @contextmanager
+    def stage(self, command: str, name: str):
+        """
+        Time a synchronous section of a command handler
+
+        Example:
+            with bot.loop_monitor.stage("price", "engine"):
+                offers = bot.pricing_engine.price(destination, weight_kg)
+        """
+        key = (command, name)
+        self._last_stage = key
+        started = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+
+            if elapsed > self.block_threshold:
+                entry = self.blocked.setdefault(key, [0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] = max(entry[2], elapsed)
+                logger.warning(f"🐢 /{command} [{name}] blocked the event loop for {elapsed * 1000:.0f}ms")
+
+    def stats(self) -> Dict[str, Any]:
+        """Lag percentiles and the worst blocking stages"""
+        worst = sorted(self.blocked.items(), key=lambda item: item[1][1], reverse=True)
+
+        return {
+            'lag': self.lag.summary(),
+            'block_threshold': self.block_threshold,
+            'blocked_stages': [
+                {'command': command, 'stage': name, 'count': count, 'total': total, 'max': max_seconds}
+                for (command, name), (count, total, max_seconds) in worst[:5]
+            ],
+        }
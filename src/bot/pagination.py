@@ -0,0 +1,155 @@
+"""
+Paginated /price results
+The sorted offer list is kept server-side with a TTL: paging re-renders a page
+from it, with no engine recomputation and no UPS API call
+"""
+
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import discord
+
+from src.engine.engine import PriceOffer, SuspendedService
+from .formatter import PricingFormatter
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredQuote:
+    """Everything needed to render any page of a /price result"""
+    offers: List[PriceOffer]  # Final list: sorted, UPS API rates merged, carrier filter applied
+    weight_kg: float
+    destination: str
+    country_name: str
+    parcel_weights: Optional[List[float]] = None
+    suspended: List[SuspendedService] = field(default_factory=list)
+
+    def render(self, formatter: PricingFormatter, page: int) -> discord.Embed:
+        return formatter.create_offers_embed(
+            self.offers,
+            self.weight_kg,
+            self.destination,
+            self.country_name,
+            parcel_weights=self.parcel_weights,
+            suspended=self.suspended,
+            page=page
+        )
+
+
+class QuotePageStore:
+    """TTL store of /price results being paged through"""
+
+    def __init__(self, ttl: float = 600.0, max_entries: int = 512, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: Dict[int, tuple] = {}  # quote_id -> (stored_at, StoredQuote)
+        self._ids = itertools.count(1)
+
+    def put(self, quote: StoredQuote) -> int:
+        """Store a quote, return its id"""
+        self._evict()
+
+        quote_id = next(self._ids)
+        self._entries[quote_id] = (self._clock(), quote)
+        return quote_id
+
+    def get(self, quote_id: int) -> Optional[StoredQuote]:
+        """Return the stored quote, or None if missing/expired"""
+        entry = self._entries.get(quote_id)
+
+        if entry is None or self._clock() - entry[0] > self.ttl:
+            self._entries.pop(quote_id, None)
+            return None
+
+        return entry[1]
+
+    def _evict(self):
+        """Drop expired entries, then the oldest ones beyond max_entries"""
+        now = self._clock()
+        for quote_id in [qid for qid, (stored_at, _) in self._entries.items() if now - stored_at > self.ttl]:
+            del self._entries[quote_id]
+
+        # Dicts keep insertion order: the first ids are the oldest
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class OfferPagesView(discord.ui.View):
+    """Previous/next buttons under a /price result (requester only)"""
+
+    def __init__(
+        self,
+        store: QuotePageStore,
+        formatter: PricingFormatter,
+        quote_id: int,
+        page_count: int,
+        owner_id: int
+    ):
+        super().__init__(timeout=store.ttl)
+        self.store = store
+        self.formatter = formatter
+        self.quote_id = quote_id
+        self.page_count = page_count
+        self.owner_id = owner_id
+        self.page = 0
+        self.message: Optional[discord.Message] = None  # Set by the command after sending
+
+        self._update_buttons()
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.owner_id:
+            await interaction.response.send_message(
+                "Only the person who ran this /price can change pages.", ephemeral=True
+            )
+            return False
+        return True
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page - 1)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.primary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.page + 1)
+
+    async def _show(self, interaction: discord.Interaction, page: int):
+        """Render one page from the stored offers"""
+        quote = self.store.get(self.quote_id)
+
+        if quote is None:
+            self._disable()
+            await interaction.response.edit_message(view=self)
+            await interaction.followup.send(
+                "⌛ These quotes have expired, run /price again for fresh rates.", ephemeral=True
+            )
+            self.stop()
+            return
+
+        self.page = min(max(page, 0), self.page_count - 1)
+        self._update_buttons()
+        await interaction.response.edit_message(embed=quote.render(self.formatter, self.page), view=self)
+
+    async def on_timeout(self):
+        self._disable()
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException as e:
+                logger.debug(f"Could not disable /price buttons: {e}")
+
+    def _update_buttons(self):
+        self.previous_page.disabled = self.page <= 0
+        self.next_page.disabled = self.page >= self.page_count - 1
+
+    def _disable(self):
+        for item in self.children:
+            item.disabled = True
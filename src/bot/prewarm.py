@@ -0,0 +1,181 @@
+"""
+UPS Rate Pre-warmer
+Background task refreshing live UPS rates for the top (country, weight) lanes
+"""
+
+import asyncio
+import csv
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.integrations.throttle import RequestThrottle
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Lane:
+    """A (destination, weight) lane to keep warm"""
+    country_iso2: str
+    weight_kg: float
+
+
+def load_lanes(path: Path) -> List[Lane]:
+    """
+    Load the lane list from CSV
+
+    Expected columns: country_iso2, weight_kg
+    Example:
+        country_iso2,weight_kg
+        US,2.0
+        JP,1.0
+
+    Returns:
+        Deduplicated lanes in file order (empty list if file missing)
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    lanes: List[Lane] = []
+    seen = set()
+
+    with path.open("r", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+
+        for row in reader:
+            try:
+                lane = Lane(
+                    country_iso2=row["country_iso2"].strip().upper(),
+                    weight_kg=float(row["weight_kg"])
+                )
+            except (KeyError, ValueError, AttributeError):
+                logger.warning(f"⚠️ Skipping invalid pre-warm lane: {row}")
+                continue
+
+            if lane not in seen:
+                seen.add(lane)
+                lanes.append(lane)
+
+    return lanes
+
+
+class RatePrewarmer:
+    """
+    Periodically refreshes UPS rates for a fixed lane list
+
+    Each cycle refreshes every lane once. A lane refresh can cost up to 4 UPS
+    requests (Shop + 3 Rate fallbacks), so the spacing is applied to each
+    individual UPS request: at most `max_requests_per_sec` requests per
+    second, whatever the number of fallbacks. UPS calls are blocking
+    (`requests`), so they run in a worker thread to keep the event loop
+    free. Rates land in the UPS client's live rate cache.
+    """
+
+    def __init__(
+        self,
+        client_getter: Callable[[], Any],
+        lanes: List[Lane],
+        refresh_interval: float = 900.0,
+        max_requests_per_sec: float = 2.0,
+        throttle: Optional[RequestThrottle] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.client_getter = client_getter
+        self.lanes = lanes
+        self.refresh_interval = refresh_interval
+        self.throttle = throttle or RequestThrottle(max_requests_per_sec)
+        self._clock = clock
+
+        self._task: Optional[asyncio.Task] = None
+
+        # Stats
+        self.cycles = 0
+        self.refreshes = 0
+        self.failures = 0
+        self.last_cycle_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_refreshed: Dict[Lane, float] = {}
+
+    def start(self):
+        """Start the background refresh loop (no-op without lanes)"""
+        if not self.lanes or self._task is not None:
+            return
+
+        logger.info(
+            f"🔥 UPS pre-warmer started: {len(self.lanes)} lanes every {self.refresh_interval:.0f}s"
+        )
+        self._task = asyncio.create_task(self._run(), name="ups-prewarm")
+
+    async def stop(self):
+        """Cancel the background loop"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            cycle_started = self._clock()
+
+            try:
+                client = self.client_getter()
+            except Exception as e:
+                logger.error(f"❌ UPS pre-warmer disabled: {e}")
+                self.last_error = str(e)
+                return
+
+            await self.refresh_all(client)
+
+            self.cycles += 1
+            self.last_cycle_seconds = self._clock() - cycle_started
+            logger.info(
+                f"🔥 UPS pre-warm cycle {self.cycles} done in {self.last_cycle_seconds:.1f}s "
+                f"({self.failures} failures total)"
+            )
+
+            await asyncio.sleep(max(0.0, self.refresh_interval - self.last_cycle_seconds))
+
+    async def refresh_all(self, client):
+        """Refresh every lane once, spacing every UPS request through the throttle"""
+        for lane in self.lanes:
+            try:
+                rates = await asyncio.to_thread(
+                    client.refresh_rates, lane.weight_kg, lane.country_iso2,
+                    before_request=self.throttle.wait
+                )
+            except Exception as e:
+                rates = []
+                self.last_error = f"{lane.country_iso2} {lane.weight_kg}kg: {e}"
+
+            if rates:
+                self.refreshes += 1
+                self.last_refreshed[lane] = self._clock()
+            else:
+                self.failures += 1
+                logger.warning(f"⚠️ UPS pre-warm failed for {lane.weight_kg}kg → {lane.country_iso2}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Refresh lag and failure counts"""
+        now = self._clock()
+        lags = [now - ts for ts in self.last_refreshed.values()]
+
+        return {
+            'lanes': len(self.lanes),
+            'warm_lanes': len(self.last_refreshed),
+            'cycles': self.cycles,
+            'refreshes': self.refreshes,
+            'failures': self.failures,
+            'ups_requests': self.throttle.requests,
+            'max_lag': max(lags) if lags else None,
+            'last_cycle_seconds': self.last_cycle_seconds,
+            'last_error': self.last_error,
+        }
@@ -0,0 +1,71 @@
+"""
+Render Cache - LRU cache of rendered Discord embeds and offer fragments
+Identical quotes (cached or coalesced engine results) render to the same embed
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from src.engine.engine import PriceOffer, SuspendedService
+
+
+class RenderCache:
+    """Bounded LRU cache keyed by a hashable fingerprint"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value (marked most recently used), or None"""
+        value = self._entries.get(key)
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full"""
+        if self.max_entries <= 0:
+            return
+
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit ratio"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else None,
+        }
+
+
+def offer_fingerprint(offer: PriceOffer, show_zone: bool = False) -> Tuple:
+    """Every offer attribute shown in an embed (a new tariff gives a new fingerprint)"""
+    return (
+        offer.carrier_code, offer.carrier_name, offer.service_code,
+        offer.freight, offer.surcharges, offer.total, offer.currency,
+        offer.chargeable_weight_kg,
+        offer.scope_code if show_zone else None,
+    )
+
+
+def suspended_fingerprint(service: SuspendedService) -> Tuple:
+    alternative = offer_fingerprint(service.alternative) if service.alternative else None
+    return (service.service_label, service.message, service.message_en, alternative)
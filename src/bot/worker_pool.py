@@ -0,0 +1,162 @@
+"""
+Pricing Worker Pool
+Runs PricingEngine calls off the event loop with bounded concurrency
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from src.engine.engine import OriginAddress, PricingEngine
+from src.engine.loader import DataLoader
+from src.integrations.latency import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+
+class PoolBusyError(Exception):
+    """Raised when the pool already has max_workers + max_queue calls in flight"""
+
+
+# Engine of a process-pool worker (built once per process by _init_worker)
+_worker_engine: Optional[PricingEngine] = None
+
+
+def _init_worker(snapshot: bytes, origin: Optional[OriginAddress]):
+    """Process-pool initializer: rebuild the engine from the shared snapshot"""
+    global _worker_engine
+    _worker_engine = PricingEngine(loader=DataLoader.from_snapshot(snapshot), origin=origin)
+
+
+def _call_engine(engine: PricingEngine, method: str, args: tuple, kwargs: dict) -> Tuple[float, Any]:
+    """Run an engine method, returning (wall-clock start time, result)"""
+    started = time.time()
+    return started, getattr(engine, method)(*args, **kwargs)
+
+
+def _call_worker_engine(method: str, args: tuple, kwargs: dict) -> Tuple[float, Any]:
+    """Process-pool entry point (uses the per-process engine)"""
+    return _call_engine(_worker_engine, method, args, kwargs)
+
+
+class PricingWorkerPool:
+    """
+    Bounded pool for engine work
+
+    - mode="thread": workers share the bot's engine (unblocks the event loop)
+    - mode="process": each worker loads the engine from a DataLoader snapshot
+      (true CPU parallelism for batch / multi-parcel pricing)
+
+    At most `max_workers` calls run at once and `max_queue` more may wait;
+    beyond that `call()` raises PoolBusyError immediately (backpressure)
+    instead of piling up requests.
+    """
+
+    def __init__(
+        self,
+        engine: PricingEngine,
+        mode: str = "thread",
+        max_workers: int = 4,
+        max_queue: int = 32
+    ):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Invalid pool mode: {mode}")
+
+        self.engine = engine
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+        self._executor: Executor = self._create_executor()
+
+        # Stats (only touched from the event loop thread)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_times = LatencyWindow()
+        self.run_times = LatencyWindow()
+
+    def _create_executor(self) -> Executor:
+        if self.mode == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.engine.loader.snapshot(), self.engine.origin)
+            )
+
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pricing")
+
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        """
+        Run `engine.<method>(*args, **kwargs)` in the pool
+
+        Example:
+            offers = await bot.pricing_pool.call("price", "JP", 2.0)
+
+        Raises:
+            PoolBusyError: If the pool and its queue are full
+        """
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            logger.warning(f"⏳ Pricing pool saturated ({self.in_flight} in flight) - rejecting {method}")
+            raise PoolBusyError(f"Pricing pool busy ({self.in_flight} requests in flight)")
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        loop = asyncio.get_running_loop()
+        submitted = time.time()
+
+        try:
+            if self.mode == "process":
+                task = functools.partial(_call_worker_engine, method, args, kwargs)
+            else:
+                task = functools.partial(_call_engine, self.engine, method, args, kwargs)
+
+            started, result = await loop.run_in_executor(self._executor, task)
+            finished = time.time()
+
+            self.wait_times.record(max(0.0, started - submitted))
+            self.run_times.record(max(0.0, finished - started))
+            self.completed += 1
+            return result
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, wait time and saturation"""
+        return {
+            'mode': self.mode,
+            'workers': self.max_workers,
+            'in_flight': self.in_flight,
+            'queue_depth': max(0, self.in_flight - self.max_workers),
+            'max_queue': self.max_queue,
+            'saturation': min(1.0, self.in_flight / self.max_workers),
+            'peak_in_flight': self.peak_in_flight,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'wait': self.wait_times.summary(),
+            'run': self.run_times.summary(),
+        }
+
+    def refresh(self):
+        """
+        Pick up a reloaded engine (after PricingEngine.reload)
+
+        Thread workers share the engine and need nothing. Process workers
+        hold their own copy, so the executor is replaced by one built from a
+        fresh snapshot; calls already submitted finish on the old workers.
+        """
+        if self.mode != "process":
+            return
+
+        old_executor = self._executor
+        self._executor = self._create_executor()
+        old_executor.shutdown(wait=False)
+
+    def shutdown(self):
+        """Stop the workers (pending calls are cancelled)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
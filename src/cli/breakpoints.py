@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tables de breakpoints: service le moins cher par tranche de poids
+
+Calcule hors ligne, pour chaque pays desservi, l'enveloppe inférieure des
+prix totaux (surcharges comprises) de tous les services et l'écrit dans
+data/compiled/breakpoints.csv (chargé au démarrage du bot pour /breakpoints).
+
+Usage:
+    python -m src.cli.breakpoints                    # tous les pays → CSV
+    python -m src.cli.breakpoints DE                 # affiche la table DE
+    python -m src.cli.breakpoints Allemagne --weight 1.2
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent dir to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.engine.engine import PricingEngine
+from src.engine.breakpoints import (
+    DEFAULT_BREAKPOINTS_FILE,
+    compute_breakpoints,
+    served_countries,
+    write_csv,
+)
+
+
+def format_breakpoint(bp) -> str:
+    """Formate une tranche pour affichage CLI"""
+    low = "[" if bp.min_inclusive else "]"
+    high = "]" if bp.max_inclusive else "["
+
+    if bp.min_weight_kg == bp.max_weight_kg:
+        weights = f"{bp.min_weight_kg:g} kg"
+        prices = f"{bp.total_at_min:.2f}"
+    else:
+        weights = f"{low}{bp.min_weight_kg:g}, {bp.max_weight_kg:g}{high} kg"
+        prices = f"{bp.total_at_min:.2f} → {bp.total_at_max:.2f}"
+
+    return f"   {weights:<22} {bp.service_code:<32} {prices} {bp.currency}"
+
+
+def print_table(engine: PricingEngine, country: str, weight_kg=None):
+    """Affiche la table d'un pays (et le service le moins cher à un poids)"""
+    table = engine.breakpoints(country)
+
+    if table is None:
+        print(f"❌ Unknown country: {country}")
+        sys.exit(1)
+
+    print("=" * 70)
+    print(f"📈 Breakpoints → {table.country_iso2} ({len(table)} ranges)")
+    print("=" * 70)
+
+    for bp in table.breakpoints:
+        print(format_breakpoint(bp))
+
+    if weight_kg is not None:
+        best = table.cheapest(weight_kg)
+        print()
+        if best:
+            print(f"🏆 Cheapest at {weight_kg:g} kg: {best.service_code} "
+                  f"({best.total_at(weight_kg):.2f} {best.currency})")
+        else:
+            print(f"❌ No service for {weight_kg:g} kg")
+
+
+def export_all(engine: PricingEngine, output: Path):
+    """Calcule les tables de tous les pays desservis et les écrit en CSV"""
+    started = time.time()
+    countries = served_countries(engine)
+
+    tables = [compute_breakpoints(engine, iso2) for iso2 in countries]
+    write_csv(tables, output)
+
+    ranges = sum(len(table) for table in tables)
+    print(f"✅ {len(countries)} countries, {ranges} ranges → {output} ({time.time() - started:.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cheapest-service breakpoint tables")
+    parser.add_argument("country", nargs="?", help="Print the table for one country (name or ISO2)")
+    parser.add_argument("--weight", type=float, help="Show the cheapest service at this weight (kg)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_BREAKPOINTS_FILE,
+                        help="CSV output when exporting all countries")
+    args = parser.parse_args()
+
+    print("📦 Loading pricing engine...")
+    engine = PricingEngine()
+    print()
+
+    if args.country:
+        print_table(engine, args.country, args.weight)
+    else:
+        export_all(engine, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Export de la matrice complète des prix (pays × poids × service)
+
+Pour chaque ISO2 de country_aliases.csv et chaque pas de 0.1 kg jusqu'au
+poids max des services, exporte le prix de chaque service disponible.
+Les prix viennent de PricingEngine.price() (mêmes résultats que /price,
+services suspendus exclus).
+
+Génération parallèle: un process par cœur, chaque worker reconstruit le
+moteur depuis un snapshot du DataLoader et tarifie un pays à la fois. Les
+pays sont écrits dans l'ordre, par chunks, avec un nombre borné de pays en
+attente: la matrice n'est jamais entièrement en mémoire.
+
+Usage:
+    python -m src.cli.export_matrix                              # CSV, tous les cœurs
+    python -m src.cli.export_matrix --output matrix.parquet      # Parquet (pyarrow)
+    python -m src.cli.export_matrix --countries DE,JP --workers 1
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Add parent dir to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.engine.engine import PricingEngine
+from src.engine.loader import DataLoader
+
+
+DEFAULT_OUTPUT = Path(__file__).parent.parent.parent / "data" / "compiled" / "price_matrix.csv"
+
+MATRIX_FIELDS = [
+    "country_iso2", "weight_kg", "carrier_code", "service_code",
+    "freight", "surcharges", "total", "currency",
+]
+
+# Prix arrondis à 4 décimales dans l'export (Decimal exact côté moteur)
+_QUANTUM = Decimal("0.0001")
+
+Row = Tuple[str, float, str, str, Decimal, Decimal, Decimal, str]
+
+
+# Moteur d'un worker (construit une fois par process par _init_worker)
+_worker_engine: Optional[PricingEngine] = None
+
+
+def _init_worker(snapshot: bytes):
+    """Initializer du process pool: reconstruit le moteur depuis le snapshot"""
+    global _worker_engine
+    _worker_engine = PricingEngine(loader=DataLoader.from_snapshot(snapshot))
+
+
+def _price_country_in_worker(iso2: str, weights: List[float]) -> List[Row]:
+    return price_country(_worker_engine, iso2, weights)
+
+
+def priceable_max_weight(engine: PricingEngine, iso2: str) -> float:
+    """
+    Poids au-delà duquel aucun service ne tarife ce pays
+
+    Plus petit de max_weight_kg et de la dernière bande du scope, sur tous
+    les services: évite d'appeler price() jusqu'à 1000 kg pour un pays
+    dont les bandes s'arrêtent à 70 kg.
+    """
+    limit = 0.0
+
+    for service_id, service in engine.loader.services_on().items():
+        for scope in engine._find_scopes(service_id, iso2):
+            if scope.bands:
+                last_band = max(band.max_weight_kg for band in scope.bands)
+                limit = max(limit, min(service.max_weight_kg, last_band))
+
+    return limit
+
+
+def price_country(engine: PricingEngine, iso2: str, weights: List[float]) -> List[Row]:
+    """Toutes les lignes de la matrice pour un pays"""
+    rows = []
+    limit = priceable_max_weight(engine, iso2)
+
+    for weight_kg in weights:
+        if weight_kg > limit:
+            break
+
+        services = set()
+
+        for offer in engine.price(iso2, weight_kg):
+            # Pays à plusieurs zones: une ligne par service, la zone la moins chère
+            if offer.is_suspended or offer.service_code in services:
+                continue
+            services.add(offer.service_code)
+
+            rows.append((
+                iso2,
+                weight_kg,
+                offer.carrier_code,
+                offer.service_code,
+                offer.freight.quantize(_QUANTUM),
+                offer.surcharges.quantize(_QUANTUM),
+                offer.total.quantize(_QUANTUM),
+                offer.currency,
+            ))
+
+    return rows
+
+
+def weight_steps(max_weight_kg: float, step: float = 0.1) -> List[float]:
+    """Poids step, 2*step, ... jusqu'à max_weight_kg (sans dérive flottante)"""
+    count = int(round(max_weight_kg / step))
+    return [round(i * step, 6) for i in range(1, count + 1)]
+
+
+def matrix_countries(engine: PricingEngine) -> List[str]:
+    """ISO2 distincts de country_aliases.csv"""
+    return sorted(set(engine.resolver.alias_map.values()))
+
+
+class CsvMatrixWriter:
+    """Écrit la matrice en CSV, chunk par chunk"""
+
+    def __init__(self, path: Path):
+        self._file = Path(path).open("w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(MATRIX_FIELDS)
+
+    def write(self, rows: List[Row]):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetMatrixWriter:
+    """Écrit la matrice en Parquet (un row group par chunk), nécessite pyarrow"""
+
+    def __init__(self, path: Path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema([
+            ("country_iso2", pa.string()),
+            ("weight_kg", pa.float64()),
+            ("carrier_code", pa.string()),
+            ("service_code", pa.string()),
+            ("freight", pa.decimal128(12, 4)),
+            ("surcharges", pa.decimal128(12, 4)),
+            ("total", pa.decimal128(12, 4)),
+            ("currency", pa.string()),
+        ])
+        self._writer = pq.ParquetWriter(str(path), self._schema)
+
+    def write(self, rows: List[Row]):
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        table = self._pa.Table.from_arrays(
+            [self._pa.array(column, type=field.type) for column, field in zip(columns, self._schema)],
+            schema=self._schema
+        )
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+
+
+def open_writer(path: Path, fmt: str):
+    """Writer CSV ou Parquet selon le format demandé"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    if fmt == "parquet":
+        return ParquetMatrixWriter(path)
+    return CsvMatrixWriter(path)
+
+
+def export_matrix(
+    engine: PricingEngine,
+    writer,
+    countries: List[str],
+    weights: List[float],
+    workers: int
+) -> int:
+    """
+    Génère la matrice et l'écrit pays par pays
+
+    Args:
+        engine: Moteur (utilisé directement si workers == 1, sinon snapshot)
+        writer: CsvMatrixWriter / ParquetMatrixWriter
+        countries: ISO2 à exporter
+        weights: Pas de poids
+        workers: Nombre de process (1 = dans le process courant)
+
+    Returns:
+        Nombre de lignes écrites
+    """
+    total_rows = 0
+
+    if workers <= 1:
+        for iso2 in countries:
+            rows = price_country(engine, iso2, weights)
+            writer.write(rows)
+            total_rows += len(rows)
+        return total_rows
+
+    # Fenêtre bornée de pays en cours: l'ordre de sortie est conservé et
+    # les résultats en attente d'écriture restent limités
+    window = workers * 2
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(engine.loader.snapshot(),)
+    ) as executor:
+        pending = deque()
+
+        for iso2 in countries:
+            pending.append(executor.submit(_price_country_in_worker, iso2, weights))
+
+            if len(pending) >= window:
+                rows = pending.popleft().result()
+                writer.write(rows)
+                total_rows += len(rows)
+
+        while pending:
+            rows = pending.popleft().result()
+            writer.write(rows)
+            total_rows += len(rows)
+
+    return total_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the full price matrix (country × weight × service)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Output file (.csv or .parquet)")
+    parser.add_argument("--format", choices=["csv", "parquet"], help="Output format (default: from extension)")
+    parser.add_argument("--step", type=float, default=0.1, help="Weight step in kg")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--countries", help="Comma-separated ISO2 subset (default: all of country_aliases.csv)")
+    args = parser.parse_args()
+
+    fmt = args.format or ("parquet" if args.output.suffix == ".parquet" else "csv")
+
+    print("📦 Loading pricing engine...")
+    engine = PricingEngine()
+
+    if args.countries:
+        countries = [c.strip().upper() for c in args.countries.split(",")]
+    else:
+        countries = matrix_countries(engine)
+
+    max_weight = max(service.max_weight_kg for service in engine.loader.services.values())
+    weights = weight_steps(max_weight, args.step)
+
+    print(f"🧮 {len(countries)} countries × {len(weights)} weights × "
+          f"{len(engine.loader.services)} services ({args.workers} workers)")
+
+    try:
+        writer = open_writer(args.output, fmt)
+    except ImportError:
+        print("❌ Parquet export requires pyarrow (pip install pyarrow)")
+        sys.exit(1)
+
+    started = time.time()
+    try:
+        rows = export_matrix(engine, writer, countries, weights, args.workers)
+    finally:
+        writer.close()
+    elapsed = time.time() - started
+
+    print(f"✅ {rows} rows → {args.output}")
+    print(f"⏱️  Generated in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Load test for the /price command handler
+
+Drives the real `setup_commands` handlers of a PricingBot with fake
+discord.Interaction objects (no Discord connection) and reports
+throughput, latency percentiles and event-loop lag.
+
+Usage:
+    python -m src.cli.load_test --requests 500 --concurrency 20
+    python -m src.cli.load_test --replay queries.csv --concurrency 50
+    python -m src.cli.load_test --ups mock --ups-latency-ms 300 --ups-error-rate 0.1
+
+Replay files are CSV with columns: weight,destination[,carriers]
+"""
+
+import argparse
+import asyncio
+import csv
+import logging
+import os
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional
+
+# Add parent dir to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.integrations.latency import LatencyWindow
+
+
+# Synthetic traffic mix (roughly our order history)
+SYNTHETIC_DESTINATIONS = [
+    "US", "DE", "GB", "JP", "AU", "Allemagne", "Japon", "Canada", "ES", "IT",
+    "NL", "BE", "CH", "SE", "KR", "SG", "États-Unis", "Royaume-Uni", "BR", "CN",
+]
+SYNTHETIC_WEIGHTS = ["0.25", "0.5", "1", "1kg", "2kg", "2.5", "3kg", "5", "10kg", "20"]
+SYNTHETIC_CARRIERS = [None, None, None, None, "fedex", "spring", "ups", "fedex,spring"]
+
+# Loggers silenced during a run (handlers log every request). Set on the named
+# loggers: the bot's logging.basicConfig() resets the root level on import.
+QUIET_LOGGERS = ["src", "discord"]
+
+
+@dataclass
+class Query:
+    """One /price invocation"""
+    weight: str
+    destination: str
+    carriers: Optional[str] = None
+
+
+class FakeResponse:
+    """Stand-in for discord.InteractionResponse"""
+
+    def __init__(self, interaction: 'FakeInteraction'):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def defer(self, **kwargs):
+        self._done = True
+
+    async def send_message(self, content: Any = None, **kwargs):
+        self._done = True
+        self._interaction.sent.append(kwargs.get('embed'))
+
+
+class FakeMessage:
+    """Stand-in for the discord.WebhookMessage returned by followup.send(wait=True)"""
+
+    def __init__(self, embed: Any = None, view: Any = None):
+        self.embed = embed
+        self.view = view
+
+    async def edit(self, **kwargs):
+        self.embed = kwargs.get('embed', self.embed)
+        self.view = kwargs.get('view', self.view)
+
+
+class FakeFollowup:
+    """Stand-in for discord.Webhook (interaction.followup)"""
+
+    def __init__(self, interaction: 'FakeInteraction'):
+        self._interaction = interaction
+
+    async def send(self, content: Any = None, wait: bool = False, **kwargs) -> Optional[FakeMessage]:
+        self._interaction.sent.append(kwargs.get('embed'))
+        # Paginated /price keeps the message to disable its buttons on timeout
+        return FakeMessage(kwargs.get('embed'), kwargs.get('view')) if wait else None
+
+
+class FakeUser:
+    """Stand-in for discord.User (the /price page buttons check the requester id)"""
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+
+
+class FakeInteraction:
+    """Minimal discord.Interaction used by the command handlers"""
+
+    def __init__(self, user_id: int = 0):
+        self.sent: List[Any] = []
+        self.user = FakeUser(user_id)
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+
+def synthetic_queries(count: int, seed: int = 42) -> List[Query]:
+    """Random mix of weights/destinations/carrier filters"""
+    rng = random.Random(seed)
+    return [
+        Query(
+            weight=rng.choice(SYNTHETIC_WEIGHTS),
+            destination=rng.choice(SYNTHETIC_DESTINATIONS),
+            carriers=rng.choice(SYNTHETIC_CARRIERS)
+        )
+        for _ in range(count)
+    ]
+
+
+def load_replay(path: Path, count: Optional[int] = None) -> List[Query]:
+    """Load recorded queries (cycled if fewer than `count`)"""
+    with Path(path).open("r", encoding="utf-8") as f:
+        queries = [
+            Query(
+                weight=row["weight"],
+                destination=row["destination"],
+                carriers=row.get("carriers") or None
+            )
+            for row in csv.DictReader(f)
+        ]
+
+    if not queries:
+        raise ValueError(f"No queries in {path}")
+
+    if count:
+        queries = [queries[i % len(queries)] for i in range(count)]
+
+    return queries
+
+
+async def run_load(bot, queries: List[Query], concurrency: int) -> dict:
+    """
+    Replay queries against the /price handler
+
+    Event-loop lag and blocking stages come from the bot's own LoopMonitor.
+
+    Returns:
+        Dict with throughput, latency and loop lag summaries
+    """
+    price_callback = bot.tree.get_command("price").callback
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for query in queries:
+        queue.put_nowait(query)
+
+    latencies = LatencyWindow(size=len(queries))
+    errors: Counter = Counter()  # Exception type name -> count
+
+    async def worker():
+        while True:
+            try:
+                query = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            interaction = FakeInteraction()
+            started = time.perf_counter()
+            try:
+                await price_callback(
+                    interaction,
+                    weight=query.weight,
+                    destination=query.destination,
+                    carriers=query.carriers
+                )
+            except Exception as e:
+                errors[type(e).__name__] += 1
+            latencies.record(time.perf_counter() - started)
+
+    bot.loop_monitor.start()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    await bot.loop_monitor.stop()
+    loop_stats = bot.loop_monitor.stats()
+
+    return {
+        'requests': len(queries),
+        'errors': sum(errors.values()),
+        'error_types': dict(errors.most_common()),
+        'elapsed': elapsed,
+        'throughput': len(queries) / elapsed if elapsed else 0.0,
+        'latency': latencies.summary(),
+        'loop_lag': loop_stats['lag'],
+        'blocked_stages': loop_stats['blocked_stages'],
+    }
+
+
+def build_bot(ups_mode: str):
+    """Create a PricingBot with commands registered (never connects to Discord)"""
+    from src.bot.bot import PricingBot
+    from src.bot import commands as cmd_module
+
+    bot = PricingBot()
+    bot.loop_monitor.interval = 0.01  # Finer lag resolution for benchmarks
+    cmd_module.setup_commands(bot)
+
+    if ups_mode == "off":
+        def ups_disabled():
+            raise RuntimeError("UPS API disabled for load test")
+        bot.get_ups_client = ups_disabled
+
+    return bot
+
+
+def quiet_logs(level: int = logging.ERROR):
+    """Raise the level of the bot's loggers so the report stays readable"""
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(level)
+
+
+def print_report(result: dict, concurrency: int):
+    """Print load test summary"""
+
+    def ms(value: Optional[float]) -> str:
+        return f"{value * 1000:8.2f} ms" if value is not None else "     n/a"
+
+    latency = result['latency']
+    lag = result['loop_lag']
+
+    print("=" * 70)
+    print(f"📈 LOAD TEST RESULTS ({result['requests']} requests, concurrency {concurrency})")
+    print("=" * 70)
+    print(f"   Elapsed:     {result['elapsed']:.2f} s")
+    print(f"   Throughput:  {result['throughput']:.1f} req/s")
+    print(f"   Errors:      {result['errors']}")
+    for error_type, count in result['error_types'].items():
+        print(f"      {error_type}: {count}")
+    print()
+    print("   Latency      p50 {}   p95 {}   p99 {}   max {}".format(
+        ms(latency['p50']), ms(latency['p95']), ms(latency['p99']), ms(latency['max'])))
+    print("   Loop lag     p50 {}   p95 {}   p99 {}   max {}".format(
+        ms(lag['p50']), ms(lag['p95']), ms(lag['p99']), ms(lag['max'])))
+
+    if result['blocked_stages']:
+        print()
+        print("   Stages blocking the loop:")
+        for blocked in result['blocked_stages']:
+            print(f"      /{blocked['command']} [{blocked['stage']}]: {blocked['count']}x, "
+                  f"total {blocked['total'] * 1000:.0f} ms, max {blocked['max'] * 1000:.0f} ms")
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the /price command handler")
+    parser.add_argument("--requests", type=int, default=200, help="Number of /price calls")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent in-flight calls")
+    parser.add_argument("--replay", type=Path, help="CSV of recorded queries (weight,destination,carriers)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for synthetic traffic")
+    parser.add_argument("--ups", choices=["off", "mock", "live"], default="off",
+                        help="UPS live rates: off, local mock server, or configured API")
+    parser.add_argument("--ups-latency-ms", type=float, default=100.0, help="Mock UPS latency")
+    parser.add_argument("--ups-error-rate", type=float, default=0.0, help="Mock UPS error rate (0-1)")
+    args = parser.parse_args()
+
+    quiet_logs()
+
+    mock_server = None
+    if args.ups == "mock":
+        from src.integrations.ups_mock_server import MOCK_CREDENTIALS_ENV, MockBehavior, start_in_thread
+        from src.bot.config import config
+
+        mock_server, base_url = start_in_thread(
+            MockBehavior(latency_ms=args.ups_latency_ms, error_rate=args.ups_error_rate, seed=args.seed)
+        )
+        os.environ.update(MOCK_CREDENTIALS_ENV)
+        config.ups_base_url = base_url
+        print(f"🧪 UPS mock server on {base_url}")
+
+    if args.replay:
+        queries = load_replay(args.replay, args.requests)
+    else:
+        queries = synthetic_queries(args.requests, args.seed)
+
+    print("📦 Loading bot (no Discord connection)...")
+    bot = build_bot(args.ups)
+
+    print(f"🚀 Replaying {len(queries)} /price calls at concurrency {args.concurrency}...")
+    result = asyncio.run(run_load(bot, queries, args.concurrency))
+    print()
+    print_report(result, args.concurrency)
+
+    if mock_server is not None:
+        mock_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
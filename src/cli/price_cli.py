@@ -6,10 +6,16 @@ Usage:
     python price_cli.py 2kg AU
     python price_cli.py 0.5 Allemagne
     python price_cli.py 1 "États-Unis"
+    python price_cli.py 2kg US 40x30x20
+    python price_cli.py 2kg CA --postal K1A0B1
+    python price_cli.py 2kg JP --date 2025-06-01
+    python price_cli.py 320kg US --freight --pieces 180,250 120x80x100
+    python price_cli.py 2kg DE --explain
 """
 
 import sys
 import re
+from datetime import date
 from pathlib import Path
 
 # Add parent dir to path
@@ -18,6 +24,23 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from src.engine.engine import PricingEngine
 
 
+def pop_option(args, name):
+    """Retire `name <valeur>` de la liste d'arguments et renvoie la valeur (ou None)"""
+    if name not in args:
+        return None
+
+    index = args.index(name)
+    value = args[index + 1] if index + 1 < len(args) else None
+    del args[index:index + 2]
+
+    return value
+
+
+def parse_pieces(value):
+    """Poids des pièces supplémentaires: "180,250kg" → [180.0, 250.0]"""
+    return [float(item.strip().lower().removesuffix("kg").replace(',', '.')) for item in value.split(',')]
+
+
 def parse_query(args):
     """
     Parse la requête depuis les arguments CLI
@@ -27,15 +50,39 @@ def parse_query(args):
         2 kg Australie
         0.5 Allemagne
         1.5kg "États-Unis"
+        2kg US 40x30x20    (dimensions en cm → poids volumétrique)
+        2kg CA --postal K1A0B1
+        2kg JP --date 2025-06-01   (grille en vigueur à cette date)
+
+    Returns:
+        (weight_kg, country, dimensions_cm ou None, postal_code ou None, ship_date ou None)
     """
 
+    args = list(args)
+
+    # Extraire les options (--postal <code>, --date <YYYY-MM-DD>)
+    postal_code = pop_option(args, "--postal")
+    ship_date = pop_option(args, "--date")
+    if ship_date:
+        ship_date = date.fromisoformat(ship_date)
+
     query_str = " ".join(args)
 
+    # Extraire les dimensions LxlxH (avant le poids, sinon "40" serait pris pour le poids)
+    dimensions_cm = None
+    dims_match = re.search(
+        r'(\d+(?:[.,]\d+)?)\s*[x×*]\s*(\d+(?:[.,]\d+)?)\s*[x×*]\s*(\d+(?:[.,]\d+)?)\s*(cm)?',
+        query_str, re.IGNORECASE
+    )
+    if dims_match:
+        dimensions_cm = tuple(float(dims_match.group(i).replace(',', '.')) for i in range(1, 4))
+        query_str = query_str.replace(dims_match.group(0), ' ')
+
     # Extraire le poids (nombre + optionnel kg/g)
     weight_match = re.search(r'(\d+(?:[.,]\d+)?)\s*(kg|g)?', query_str, re.IGNORECASE)
 
     if not weight_match:
-        return None, None
+        return None, None, None, None, None
 
     weight_str = weight_match.group(1).replace(',', '.')
     weight_kg = float(weight_str)
@@ -45,9 +92,9 @@ def parse_query(args):
         weight_kg /= 1000.0
 
     # Le reste = pays
-    country = query_str.replace(weight_match.group(0), '').strip()
+    country = " ".join(query_str.replace(weight_match.group(0), '', 1).split())
 
-    return weight_kg, country
+    return weight_kg, country, dimensions_cm, postal_code, ship_date
 
 
 def format_offer(offer, index=None):
@@ -61,6 +108,9 @@ def format_offer(offer, index=None):
         f"      └─ Fret: {float(offer.freight):.2f} {offer.currency}",
     ]
 
+    if offer.chargeable_weight_kg is not None:
+        lines.append(f"      └─ Poids taxable: {offer.chargeable_weight_kg:.2f} kg")
+
     if offer.surcharges > 0:
         lines.append(f"      └─ Surcharges: {float(offer.surcharges):.2f} {offer.currency}")
 
@@ -71,15 +121,37 @@ def format_offer(offer, index=None):
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: price_cli.py <weight>kg <country>")
+        print("Usage: price_cli.py <weight>kg <country> [LxWxH] [--postal <code>] [--date YYYY-MM-DD]"
+              " [--pieces <w1,w2>] [--freight] [--explain]")
         print("\nExamples:")
         print("  price_cli.py 2kg AU")
         print("  price_cli.py 0.5 Allemagne")
         print("  price_cli.py 1.5kg 'États-Unis'")
+        print("  price_cli.py 2kg US 40x30x20")
+        print("  price_cli.py 2kg CA --postal K1A0B1")
+        print("  price_cli.py 2kg JP --date 2025-06-01")
+        print("  price_cli.py 2kg JP --pieces 3,1.5          (envoi multi-colis)")
+        print("  price_cli.py 320kg US --freight --pieces 180  (fret, services jusqu'à 1000 kg)")
+        print("  price_cli.py 2kg DE --explain               (scope, bande et surcharges de chaque service)")
         sys.exit(1)
 
+    # Options fret / multi-pièces (avant le parsing du poids)
+    args = sys.argv[1:]
+    freight = "--freight" in args
+    if freight:
+        args.remove("--freight")
+    explain = "--explain" in args
+    if explain:
+        args.remove("--explain")
+    pieces = pop_option(args, "--pieces")
+
     # Parser la requête
-    weight_kg, country = parse_query(sys.argv[1:])
+    try:
+        weight_kg, country, dimensions_cm, postal_code, ship_date = parse_query(args)
+        piece_weights = [weight_kg] + (parse_pieces(pieces) if pieces else [])
+    except ValueError as e:
+        print(f"❌ Invalid query: {e}")
+        sys.exit(1)
 
     if not weight_kg or not country:
         print("❌ Invalid query. Format: <weight>kg <country>")
@@ -92,17 +164,43 @@ def main():
 
     # Calculer les prix
     print("=" * 70)
-    print(f"🔍 Query: {weight_kg}kg → {country}")
+    dims_label = " ({}x{}x{} cm)".format(*(f"{d:g}" for d in dimensions_cm)) if dimensions_cm else ""
+    postal_label = f" {postal_code}" if postal_code else ""
+    date_label = f" (ship date {ship_date})" if ship_date else ""
+    weight_label = f"{weight_kg}kg" if len(piece_weights) == 1 else " + ".join(f"{w:g}" for w in piece_weights) + " kg"
+    mode_label = "🚛 Freight" if freight else "🔍 Query"
+    print(f"{mode_label}: {weight_label}{dims_label} → {country}{postal_label}{date_label}")
     print("=" * 70)
     print()
 
-    offers = engine.price(country, weight_kg, debug=False)
+    dimensions = [dimensions_cm] * len(piece_weights) if dimensions_cm else None
+
+    if explain:
+        trace = engine.explain(
+            country, piece_weights, freight=freight, parcel_dimensions=dimensions,
+            postal_code=postal_code, ship_date=ship_date
+        )
+        print(trace.format())
+        print()
+        offers = trace.offers
+    elif freight:
+        offers = engine.price_freight(
+            country, piece_weights, piece_dimensions=dimensions,
+            postal_code=postal_code, ship_date=ship_date
+        )
+    else:
+        offers = engine.price_shipment(
+            country, piece_weights, parcel_dimensions=dimensions,
+            postal_code=postal_code, ship_date=ship_date
+        )
 
     if not offers:
         print("❌ No offers found for this destination/weight")
         print("\nPossible reasons:")
         print("  - Country not supported")
         print("  - Weight exceeds maximum for all services")
+        if freight:
+            print("  - No freight rate grid loaded for this destination")
         sys.exit(1)
 
     # Afficher les résultats
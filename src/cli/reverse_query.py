@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Requêtes inverses: destinations et poids sous un budget
+
+Usage:
+    python -m src.cli.reverse_query --weight 1 --max 15      # pays/services à 1 kg sous 15 €
+    python -m src.cli.reverse_query --country Japon --max 30 # poids max sous 30 € vers le Japon
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent dir to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.engine.engine import PricingEngine
+
+
+def print_lanes(engine: PricingEngine, weight_kg: float, max_total: float):
+    """Affiche les couples (pays, service) sous le plafond"""
+    lanes = engine.lanes_under(weight_kg, max_total)
+
+    print("=" * 70)
+    print(f"🔍 {weight_kg:g}kg for ≤ {max_total:.2f}: {len(lanes)} lanes, "
+          f"{len({lane.country_iso2 for lane in lanes})} countries")
+    print("=" * 70)
+
+    for lane in lanes:
+        name = engine.resolver.get_name(lane.country_iso2) or ""
+        print(f"   {lane.country_iso2}  {name:<24} {lane.service_code:<32} "
+              f"{float(lane.total):7.2f} {lane.currency}")
+
+
+def print_budgets(engine: PricingEngine, country: str, max_total: float):
+    """Affiche le poids maximal par service sous le plafond"""
+    budgets = engine.max_weight_under(country, max_total)
+
+    print("=" * 70)
+    print(f"🔍 Max weight → {country} for ≤ {max_total:.2f}")
+    print("=" * 70)
+
+    if not budgets:
+        print("❌ No service under this budget (or unknown country)")
+        return
+
+    for budget in budgets:
+        print(f"   {budget.service_code:<32} {budget.weight_kg:7.3f} kg   "
+              f"{float(budget.total):7.2f} {budget.currency}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reverse pricing queries under a price cap")
+    parser.add_argument("--max", type=float, required=True, help="Price cap (total incl. surcharges)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--weight", type=float, help="List all lanes under the cap at this weight (kg)")
+    target.add_argument("--country", help="Max weight under the cap for this country")
+    args = parser.parse_args()
+
+    print("📦 Loading pricing engine...")
+    engine = PricingEngine()
+    print()
+
+    if args.weight is not None:
+        print_lanes(engine, args.weight, args.max)
+    else:
+        print_budgets(engine, args.country, args.max)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Diff des tarifs entre deux versions de data/normalized
+
+Usage:
+    python -m src.cli.tariff_diff OLD_DIR NEW_DIR
+    python -m src.cli.tariff_diff --old-ref HEAD~1          # ancienne version depuis git
+    python -m src.cli.tariff_diff --old-ref v0.4.0 --top 20
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent dir to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.engine.engine import PricingEngine
+from src.engine.loader import DataLoader
+from src.engine.diff import diff_tariffs
+
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+NORMALIZED_DIR = REPO_ROOT / "data" / "normalized"
+
+
+def load_engine_from(data_dir: Path) -> PricingEngine:
+    """Moteur sur un répertoire de CSV normalisés (sans contrôle d'intégrité: on compare l'existant)"""
+    loader = DataLoader(data_dir=Path(data_dir), validate=False)
+    loader.load_all()
+    return PricingEngine(loader=loader)
+
+
+def export_git_version(ref: str, target: Path) -> Path:
+    """Extrait data/normalized tel qu'à la révision git `ref` dans target"""
+    files = subprocess.run(
+        ["git", "ls-tree", "--name-only", ref, "data/normalized/"],
+        cwd=REPO_ROOT, check=True, capture_output=True, text=True
+    ).stdout.split()
+
+    for name in files:
+        content = subprocess.run(
+            ["git", "show", f"{ref}:{name}"],
+            cwd=REPO_ROOT, check=True, capture_output=True
+        ).stdout
+        (target / Path(name).name).write_bytes(content)
+
+    return target
+
+
+def format_weights(ranges) -> str:
+    return ", ".join(f"{low:g}kg" if low == high else f"{low:g}-{high:g}kg" for low, high in ranges)
+
+
+def format_countries(countries, limit: int = 8) -> str:
+    shown = ",".join(countries[:limit])
+    return shown + (f" +{len(countries) - limit}" if len(countries) > limit else "")
+
+
+def print_report(diff, top: int):
+    """Affiche le résumé du diff"""
+    print("=" * 70)
+    print("📊 TARIFF DIFF")
+    print("=" * 70)
+    print(f"   Changed lane groups: {len(diff.changed)} "
+          f"({sum(len(d.countries) for d in diff.changed)} lanes)")
+    print(f"   Unchanged lanes:     {diff.unchanged_lanes}")
+    print(f"   Lanes added / lost:  {len(diff.lanes_added)} / {len(diff.lanes_lost)}")
+    if diff.zones_added or diff.zones_lost:
+        print(f"   Zones added / lost:  {len(diff.zones_added)} / {len(diff.zones_lost)}")
+
+    if diff.services_added:
+        print(f"   ➕ Services added:   {', '.join(diff.services_added)}")
+    if diff.services_removed:
+        print(f"   ➖ Services removed: {', '.join(diff.services_removed)}")
+
+    print()
+    print(f"📈 Largest increases (top {top}):")
+    for d in diff.top_increases(top):
+        print(f"   {d.service_code:<30} +{d.max_increase:7.2f} ({d.max_increase_pct:+.1f}%) "
+              f"@ {d.max_increase_weight:g}kg  [{format_countries(d.countries)}]")
+
+    print()
+    print(f"📉 Largest decreases (top {top}):")
+    for d in diff.top_decreases(top):
+        print(f"   {d.service_code:<30} {d.max_decrease:8.2f} ({d.max_decrease_pct:+.1f}%) "
+              f"@ {d.max_decrease_weight:g}kg  [{format_countries(d.countries)}]")
+
+    coverage = [d for d in diff.changed if d.weights_added or d.weights_lost]
+    if coverage:
+        print()
+        print("⚖️  Weight coverage changes:")
+        for d in coverage[:top]:
+            parts = []
+            if d.weights_added:
+                parts.append(f"added {format_weights(d.weights_added)}")
+            if d.weights_lost:
+                parts.append(f"lost {format_weights(d.weights_lost)}")
+            print(f"   {d.service_code:<30} {'; '.join(parts)}  [{format_countries(d.countries)}]")
+
+    for label, lanes in (("➕ Lanes added", diff.lanes_added), ("➖ Lanes lost", diff.lanes_lost)):
+        if lanes:
+            print()
+            print(f"{label}:")
+            by_service = {}
+            for service_code, iso2 in lanes:
+                by_service.setdefault(service_code, []).append(iso2)
+            for service_code, countries in by_service.items():
+                print(f"   {service_code:<30} {format_countries(countries, 20)}")
+
+    for label, zones in (("➕ Zones added", diff.zones_added), ("➖ Zones lost", diff.zones_lost)):
+        if zones:
+            print()
+            print(f"{label}:")
+            for service_code, iso2, scope_code in zones:
+                print(f"   {service_code:<30} {iso2} {scope_code}")
+
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff tariffs between two normalized data versions")
+    parser.add_argument("old_dir", nargs="?", type=Path, help="Old data/normalized directory")
+    parser.add_argument("new_dir", nargs="?", type=Path, default=NORMALIZED_DIR,
+                        help="New data/normalized directory (default: current)")
+    parser.add_argument("--old-ref", help="Take the old version from a git revision instead of old_dir")
+    parser.add_argument("--top", type=int, default=10, help="Number of increases/decreases to show")
+    args = parser.parse_args()
+
+    if not args.old_dir and not args.old_ref:
+        parser.error("old_dir or --old-ref is required")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_dir = export_git_version(args.old_ref, Path(tmp)) if args.old_ref else args.old_dir
+
+        print(f"📦 Old: {args.old_ref or old_dir}")
+        old_engine = load_engine_from(old_dir)
+        print(f"📦 New: {args.new_dir}")
+        new_engine = load_engine_from(args.new_dir)
+        print()
+
+        diff = diff_tariffs(old_engine, new_engine)
+
+    print_report(diff, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+CLI de la base SQLite des tarifs (voir src/engine/tariff_store.py)
+
+Usage:
+    python -m src.cli.tariff_store build
+    python -m src.cli.tariff_store bands 204
+    python -m src.cli.tariff_store services JP
+    python -m src.cli.tariff_store bench --repeat 20
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+# Add parent dir to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.engine.engine import PricingEngine
+from src.engine.loader import DataLoader
+from src.engine.tariff_store import (
+    DEFAULT_NORMALIZED_DIR, DEFAULT_STORE_PATH, SQLiteDataLoader, TariffStore, build_store, store_is_current
+)
+
+
+# Requêtes du benchmark: lanes fréquentes
+BENCH_QUERIES = [("US", 1.0), ("DE", 2.0), ("JP", 0.5), ("GB", 5.0), ("AU", 10.0), ("FR", 1.0)]
+
+
+def timed(func: Callable, repeat: int) -> List[float]:
+    """Durées (s) de `repeat` appels, sorties console masquées"""
+    durations = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - started)
+    return durations
+
+
+def ms(durations: List[float]) -> str:
+    return f"{statistics.median(durations) * 1000:9.3f} ms"
+
+
+def load_csv_loader() -> DataLoader:
+    loader = DataLoader()
+    loader.load_all()
+    return loader
+
+
+def load_sqlite_loader(db_path: Path) -> SQLiteDataLoader:
+    loader = SQLiteDataLoader(db_path)
+    loader.load_all()
+    return loader
+
+
+def csv_services_for_country(loader: DataLoader, iso2: str) -> List[int]:
+    """Équivalent CSV de TariffStore.services_for_country (parcours de tous les scopes)"""
+    return sorted({scope.service_id for scope in loader.scopes.values() if iso2 in scope.countries})
+
+
+def bench(db_path: Path, repeat: int):
+    """Compare démarrage à froid et latence par requête: CSV vs SQLite"""
+    print(f"⏱️  Benchmark ({repeat} runs, median)\n")
+
+    def cold_price(make_loader):
+        def run():
+            engine = PricingEngine(loader=make_loader())
+            engine.price(*BENCH_QUERIES[0])
+        return run
+
+    csv_loader = load_csv_loader()
+    sqlite_loader = load_sqlite_loader(db_path)
+    csv_engine = PricingEngine(loader=csv_loader)
+    sqlite_engine = PricingEngine(loader=sqlite_loader)
+    store = TariffStore(db_path)
+
+    scope_id = next(iter(csv_loader.scopes))
+
+    def price_all(engine):
+        return lambda: [engine.price(dest, weight) for dest, weight in BENCH_QUERIES]
+
+    rows = [
+        ("Cold start: load", timed(load_csv_loader, repeat), timed(lambda: load_sqlite_loader(db_path), repeat)),
+        ("Cold start: load + 1st quote",
+         timed(cold_price(load_csv_loader), repeat),
+         timed(cold_price(lambda: load_sqlite_loader(db_path)), repeat)),
+        (f"Bands of scope {scope_id}",
+         timed(lambda: csv_loader.scopes[scope_id].bands, repeat),
+         timed(lambda: store.bands(scope_id), repeat)),
+        ("Services for country JP",
+         timed(lambda: csv_services_for_country(csv_loader, "JP"), repeat),
+         timed(lambda: store.services_for_country("JP"), repeat)),
+        (f"Warm price() x{len(BENCH_QUERIES)}",
+         timed(price_all(csv_engine), repeat),
+         timed(price_all(sqlite_engine), repeat)),
+    ]
+
+    print(f"   {'':32} {'CSV':>12} {'SQLite':>12}")
+    for label, csv_durations, sqlite_durations in rows:
+        print(f"   {label:32} {ms(csv_durations)} {ms(sqlite_durations)}")
+
+    print(f"\n   SQLite scopes loaded on demand: {sqlite_loader.scopes.cached}/{len(csv_loader.scopes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite tariff store: build, query, benchmark")
+    parser.add_argument("--db", type=Path, default=DEFAULT_STORE_PATH, help="SQLite file")
+    parser.add_argument("--normalized", type=Path, default=DEFAULT_NORMALIZED_DIR, help="Normalized CSV directory")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="Generate the store from the normalized CSVs")
+
+    bands_parser = subparsers.add_parser("bands", help="Bands of a scope")
+    bands_parser.add_argument("scope_id", type=int)
+
+    services_parser = subparsers.add_parser("services", help="Services serving a country")
+    services_parser.add_argument("country_iso2")
+
+    bench_parser = subparsers.add_parser("bench", help="Compare CSV and SQLite loaders")
+    bench_parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement")
+
+    args = parser.parse_args()
+
+    if args.command == "build" or not store_is_current(args.db, args.normalized):
+        started = time.perf_counter()
+        build_store(args.normalized, args.db)
+        print(f"✅ Built {args.db} in {time.perf_counter() - started:.2f}s")
+
+    if args.command == "bands":
+        store = TariffStore(args.db)
+        for band in store.bands(args.scope_id):
+            print(f"{band['min_weight_kg']:>8}-{band['max_weight_kg']:<8} "
+                  f"base {band['base_amount']:>8}  per kg {band['amount_per_kg']:>6}"
+                  f"{'  (min charge)' if band['is_min_charge'] else ''}")
+
+    elif args.command == "services":
+        store = TariffStore(args.db)
+        for service in store.services_for_country(args.country_iso2.upper()):
+            print(f"{service['service_id']:>4}  {service['code']:<28} {service['label']}")
+
+    elif args.command == "bench":
+        bench(args.db, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
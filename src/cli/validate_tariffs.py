@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Contrôle d'intégrité des tarifs normalisés (voir src/engine/validator.py)
+
+Code retour 1 si erreurs (ou avertissements avec --strict): utilisable en CI
+ou avant un /reload.
+
+Usage:
+    python -m src.cli.validate_tariffs
+    python -m src.cli.validate_tariffs data/normalized --strict
+    python -m src.cli.validate_tariffs NEW_DIR --baseline data/normalized
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent dir to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.engine.validator import ERROR, WARNING, validate_dir
+
+
+NORMALIZED_DIR = Path(__file__).parent.parent.parent / "data" / "normalized"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check referential integrity and band continuity of the tariffs")
+    parser.add_argument("data_dir", nargs="?", type=Path, default=NORMALIZED_DIR, help="Normalized CSV directory")
+    parser.add_argument("--strict", action="store_true", help="Fail on warnings too")
+    parser.add_argument("--baseline", type=Path, help="Only report issues absent from this directory (reload check)")
+    args = parser.parse_args()
+
+    report = validate_dir(args.data_dir)
+    issues = report.issues
+
+    if args.baseline:
+        issues = report.new_since(validate_dir(args.baseline))
+        print(f"🔍 {len(issues)} new issue(s) vs {args.baseline}")
+
+    errors = [issue for issue in issues if issue.severity == ERROR]
+    warnings = [issue for issue in issues if issue.severity == WARNING]
+
+    if issues:
+        print(report.summary(issues))
+        print()
+
+    print(f"{'✅' if not errors else '❌'} {report.rows} rows checked in {report.elapsed_s * 1000:.0f} ms: "
+          f"{len(errors)} errors, {len(warnings)} warnings")
+
+    # Avec --baseline, toute nouvelle anomalie ferait échouer un /reload
+    if errors or (warnings and (args.strict or args.baseline)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
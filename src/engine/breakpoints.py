@@ -0,0 +1,445 @@
+"""
+Breakpoints - Service le moins cher en fonction du poids
+
+Pour une destination, le prix total (fret + surcharges) de chaque service est
+affine par morceaux en fonction du poids: affine sur chaque bande, avec des
+trous entre les bandes et des bandes ponctuelles (min == max, ex: grilles UPS
+tarifées au demi-kilo). L'enveloppe inférieure de ces fonctions donne, pour
+chaque tranche de poids, le service le moins cher.
+
+Les tranches sont stockées triées: la recherche du service le moins cher à un
+poids donné est un bisect en O(log n).
+
+Usage:
+    table = compute_breakpoints(engine, "DE")
+    best = table.cheapest(1.2)   # Breakpoint ou None
+"""
+
+import bisect
+import csv
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .loader import DataLoader, TariffBand, TariffScope
+
+
+# Fichier produit par `python -m src.cli.breakpoints`
+DEFAULT_BREAKPOINTS_FILE = Path(__file__).parent.parent.parent / "data" / "compiled" / "breakpoints.csv"
+
+CSV_FIELDS = [
+    "country_iso2", "min_weight_kg", "max_weight_kg", "min_inclusive", "max_inclusive",
+    "service_code", "carrier_code", "total_at_min", "total_at_max", "currency",
+]
+
+# Tolérance sur les poids (kg) pour fusionner des points d'intersection quasi égaux
+_EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class Breakpoint:
+    """Tranche de poids sur laquelle un même service est le moins cher"""
+    min_weight_kg: float
+    max_weight_kg: float
+    min_inclusive: bool
+    max_inclusive: bool
+    service_code: str
+    carrier_code: str
+    total_at_min: float
+    total_at_max: float
+    currency: str
+
+    def covers(self, weight_kg: float) -> bool:
+        """True si le poids est dans la tranche (bornes incluses/exclues)"""
+        if weight_kg < self.min_weight_kg or (weight_kg == self.min_weight_kg and not self.min_inclusive):
+            return False
+        if weight_kg > self.max_weight_kg or (weight_kg == self.max_weight_kg and not self.max_inclusive):
+            return False
+        return True
+
+    def total_at(self, weight_kg: float) -> float:
+        """Prix total interpolé (le prix est affine sur la tranche)"""
+        span = self.max_weight_kg - self.min_weight_kg
+        if span <= 0:
+            return self.total_at_min
+        ratio = (weight_kg - self.min_weight_kg) / span
+        return self.total_at_min + (self.total_at_max - self.total_at_min) * ratio
+
+
+@dataclass
+class BreakpointTable:
+    """Enveloppe inférieure d'une destination (tranches triées, sans chevauchement)"""
+    country_iso2: str
+    breakpoints: List[Breakpoint] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._keys = [_start_key(bp) for bp in self.breakpoints]
+
+    def cheapest(self, weight_kg: float) -> Optional[Breakpoint]:
+        """
+        Service le moins cher au poids donné, en O(log n)
+
+        Returns:
+            La tranche couvrant le poids, ou None si aucun service ne le tarife
+        """
+        index = bisect.bisect_right(self._keys, (weight_kg, 0)) - 1
+
+        if index < 0:
+            return None
+
+        breakpoint = self.breakpoints[index]
+        return breakpoint if breakpoint.covers(weight_kg) else None
+
+    def __len__(self) -> int:
+        return len(self.breakpoints)
+
+
+def _start_key(breakpoint: Breakpoint) -> Tuple[float, int]:
+    """Clé de tri: à poids égal, une borne incluse passe avant une borne exclue"""
+    return (breakpoint.min_weight_kg, 0 if breakpoint.min_inclusive else 1)
+
+
+@dataclass
+class ServiceCurve:
+    """Prix d'un service sur un scope donné, avec ses bandes indexées par poids"""
+    service_id: int
+    service_code: str
+    carrier_code: str
+    currency: str
+    max_weight_kg: float
+    scope: TariffScope
+    band_mins: List[float]
+    loader: Optional[DataLoader] = field(default=None, repr=False, compare=False)  # Tarifs du scope
+
+    @classmethod
+    def for_scope(
+        cls,
+        engine,
+        service_id: int,
+        scope: TariffScope,
+        loader: Optional[DataLoader] = None
+    ) -> 'ServiceCurve':
+        loader = loader or engine.loader
+        service = loader.services[service_id]
+        carrier = loader.carriers[service.carrier_id]
+        return cls(
+            service_id=service_id,
+            service_code=service.code,
+            carrier_code=carrier.code,
+            currency=carrier.currency,
+            max_weight_kg=service.max_weight_kg,
+            scope=scope,
+            band_mins=[band.min_weight_kg for band in scope.bands],
+            loader=loader
+        )
+
+    def band_at(self, weight_kg: float) -> Optional[TariffBand]:
+        """
+        Bande appliquée par le moteur (première bande couvrant le poids)
+
+        Les bandes sont triées par min_weight_kg: les bandes candidates sont
+        celles qui commencent avant le poids, et seules les dernières peuvent
+        encore le couvrir.
+        """
+        if weight_kg > self.max_weight_kg:
+            return None
+
+        index = bisect.bisect_right(self.band_mins, weight_kg) - 1
+        found = None
+
+        while index >= 0 and self.scope.bands[index].max_weight_kg >= weight_kg:
+            found = self.scope.bands[index]
+            index -= 1
+
+        return found
+
+    def total(self, engine, band: TariffBand, country_iso2: str, weight_kg: float) -> Decimal:
+        """Prix total (fret + surcharges) d'un colis sur une bande donnée (surcharges des tarifs du scope)"""
+        freight = engine._calculate_freight(band, weight_kg)
+        return freight + engine._calculate_surcharges(
+            self.service_id, country_iso2, weight_kg, freight, loader=self.loader
+        )
+
+
+def compute_breakpoints(engine, country_iso2: str, loader: Optional[DataLoader] = None) -> BreakpointTable:
+    """
+    Calcule l'enveloppe inférieure des prix de tous les services vers un pays
+
+    Les services suspendus pour la destination sont ignorés (non proposés
+    par /price). Le prix est évalué avec les fonctions du moteur
+    (_calculate_freight, _calculate_surcharges), surcharges comprises.
+
+    Args:
+        engine: PricingEngine
+        country_iso2: Code ISO2 de destination
+        loader: Tarifs à utiliser (défaut: engine.loader, lu une seule fois)
+
+    Returns:
+        BreakpointTable (vide si aucun service ne dessert le pays)
+    """
+    curves = _service_curves(engine, country_iso2, loader or engine.loader)
+
+    if not curves:
+        return BreakpointTable(country_iso2=country_iso2)
+
+    # Poids critiques: bornes de toutes les bandes (le jeu de services
+    # disponibles ne change qu'à ces poids)
+    critical = sorted({
+        weight
+        for curve in curves
+        for band in curve.scope.bands
+        for weight in (band.min_weight_kg, min(band.max_weight_kg, curve.max_weight_kg))
+        if weight >= 0
+    })
+
+    pieces: List[Breakpoint] = []
+
+    for index, weight in enumerate(critical):
+        # Le poids critique lui-même (bande ponctuelle, borne partagée, ...)
+        point = _cheapest_at(engine, curves, country_iso2, weight)
+        if point and weight > 0:
+            pieces.append(_point_piece(weight, point))
+
+        if index + 1 == len(critical):
+            break
+
+        # Intervalle ouvert jusqu'au poids critique suivant
+        pieces.extend(_open_interval_pieces(engine, curves, country_iso2, weight, critical[index + 1]))
+
+    return BreakpointTable(country_iso2=country_iso2, breakpoints=_merge(pieces))
+
+
+def _service_curves(engine, country_iso2: str, loader: DataLoader) -> List[ServiceCurve]:
+    """Services desservant la destination, une courbe par scope résolu (zones comprises)"""
+    curves = []
+
+    for service_id, service in loader.services_on().items():
+        _, is_suspended = engine._check_restriction(service, country_iso2, loader=loader)
+        if is_suspended:
+            continue
+
+        for scope in engine._find_scopes(service_id, country_iso2, loader=loader):
+            if scope.bands:
+                curves.append(ServiceCurve.for_scope(engine, service_id, scope, loader))
+
+    return curves
+
+
+def _cheapest_at(engine, curves: List[ServiceCurve], country_iso2: str, weight_kg: float):
+    """(curve, total) du service le moins cher à un poids exact, ou None"""
+    best = None
+
+    for curve in curves:
+        band = curve.band_at(weight_kg)
+        if band is None:
+            continue
+
+        total = float(curve.total(engine, band, country_iso2, weight_kg))
+        if best is None or total < best[1]:
+            best = (curve, total)
+
+    return best
+
+
+def _point_piece(weight_kg: float, cheapest) -> Breakpoint:
+    curve, total = cheapest
+    return Breakpoint(
+        min_weight_kg=weight_kg,
+        max_weight_kg=weight_kg,
+        min_inclusive=True,
+        max_inclusive=True,
+        service_code=curve.service_code,
+        carrier_code=curve.carrier_code,
+        total_at_min=total,
+        total_at_max=total,
+        currency=curve.currency
+    )
+
+
+def _open_interval_pieces(
+    engine,
+    curves: List[ServiceCurve],
+    country_iso2: str,
+    low: float,
+    high: float
+) -> List[Breakpoint]:
+    """
+    Enveloppe inférieure sur l'intervalle ouvert ]low, high[
+
+    Aucune borne de bande n'est à l'intérieur: chaque service disponible y a
+    une seule bande, donc un prix affine. Les intersections de ces droites
+    découpent l'intervalle en sous-intervalles à gagnant unique.
+    """
+    middle = (low + high) / 2
+
+    # Droites (curve, band, prix en low, prix en high) des services disponibles
+    lines = []
+    for curve in curves:
+        band = curve.band_at(middle)
+        if band is not None:
+            lines.append((
+                curve,
+                band,
+                float(curve.total(engine, band, country_iso2, low)),
+                float(curve.total(engine, band, country_iso2, high))
+            ))
+
+    if not lines:
+        return []
+
+    # Intersections des droites strictement à l'intérieur de l'intervalle
+    cuts = {low, high}
+    for i, (_, _, a_low, a_high) in enumerate(lines):
+        for _, _, b_low, b_high in lines[i + 1:]:
+            gap_low, gap_high = a_low - b_low, a_high - b_high
+            if gap_low * gap_high < 0:
+                ratio = gap_low / (gap_low - gap_high)
+                cut = low + (high - low) * ratio
+                if low + _EPSILON < cut < high - _EPSILON:
+                    cuts.add(cut)
+
+    cuts = sorted(cuts)
+    pieces = []
+
+    for start, end in zip(cuts, cuts[1:]):
+        probe = (start + end) / 2
+        best = None
+
+        for curve, band, total_low, total_high in lines:
+            total = total_low + (total_high - total_low) * (probe - low) / (high - low)
+            if best is None or total < best[1]:
+                best = ((curve, band, total_low, total_high), total)
+
+        (curve, band, total_low, total_high), _ = best
+
+        def interpolate(weight_kg: float) -> float:
+            return total_low + (total_high - total_low) * (weight_kg - low) / (high - low)
+
+        pieces.append(Breakpoint(
+            min_weight_kg=start,
+            max_weight_kg=end,
+            min_inclusive=start != low,
+            max_inclusive=False,
+            service_code=curve.service_code,
+            carrier_code=curve.carrier_code,
+            total_at_min=interpolate(start),
+            total_at_max=interpolate(end),
+            currency=curve.currency
+        ))
+
+    return pieces
+
+
+def _merge(pieces: List[Breakpoint]) -> List[Breakpoint]:
+    """
+    Fusionne les tranches contiguës d'un même service au prix continu
+
+    Ex: ]0.5, 1.0[ + [1.0] + ]1.0, 2.0[ sur la même bande → ]0.5, 2.0[
+    Les sauts de prix (changement de bande) restent des tranches distinctes,
+    sinon l'interpolation de total_at() serait fausse.
+    """
+    merged: List[Breakpoint] = []
+
+    for piece in pieces:
+        if merged:
+            last = merged[-1]
+            contiguous = (
+                last.max_weight_kg == piece.min_weight_kg
+                and last.max_inclusive != piece.min_inclusive
+            )
+
+            if contiguous and last.service_code == piece.service_code and _collinear(last, piece):
+                merged[-1] = Breakpoint(
+                    min_weight_kg=last.min_weight_kg,
+                    max_weight_kg=piece.max_weight_kg,
+                    min_inclusive=last.min_inclusive,
+                    max_inclusive=piece.max_inclusive,
+                    service_code=last.service_code,
+                    carrier_code=last.carrier_code,
+                    total_at_min=last.total_at_min,
+                    total_at_max=piece.total_at_max,
+                    currency=last.currency
+                )
+                continue
+
+        merged.append(piece)
+
+    return merged
+
+
+def _collinear(first: Breakpoint, second: Breakpoint) -> bool:
+    """True si `second` prolonge la droite de prix de `first` sans saut"""
+    if abs(first.total_at_max - second.total_at_min) > 1e-6:
+        return False
+
+    first_span = first.max_weight_kg - first.min_weight_kg
+    second_span = second.max_weight_kg - second.min_weight_kg
+
+    # Un point (span nul) est toujours compatible s'il n'y a pas de saut
+    if first_span <= 0 or second_span <= 0:
+        return True
+
+    first_slope = (first.total_at_max - first.total_at_min) / first_span
+    second_slope = (second.total_at_max - second.total_at_min) / second_span
+    return abs(first_slope - second_slope) <= 1e-6 * max(1.0, abs(first_slope))
+
+
+def write_csv(tables: Iterable[BreakpointTable], path: Path):
+    """Écrit les tables dans un CSV (une ligne par tranche)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+
+        for table in tables:
+            for bp in table.breakpoints:
+                writer.writerow({
+                    "country_iso2": table.country_iso2,
+                    "min_weight_kg": repr(bp.min_weight_kg),
+                    "max_weight_kg": repr(bp.max_weight_kg),
+                    "min_inclusive": bp.min_inclusive,
+                    "max_inclusive": bp.max_inclusive,
+                    "service_code": bp.service_code,
+                    "carrier_code": bp.carrier_code,
+                    "total_at_min": f"{bp.total_at_min:.4f}",
+                    "total_at_max": f"{bp.total_at_max:.4f}",
+                    "currency": bp.currency,
+                })
+
+
+def load_csv(path: Path) -> Dict[str, BreakpointTable]:
+    """Charge les tables produites par write_csv(), indexées par ISO2"""
+    rows_by_country: Dict[str, List[Breakpoint]] = {}
+
+    with Path(path).open("r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            rows_by_country.setdefault(row["country_iso2"], []).append(Breakpoint(
+                min_weight_kg=float(row["min_weight_kg"]),
+                max_weight_kg=float(row["max_weight_kg"]),
+                min_inclusive=row["min_inclusive"] == "True",
+                max_inclusive=row["max_inclusive"] == "True",
+                service_code=row["service_code"],
+                carrier_code=row["carrier_code"],
+                total_at_min=float(row["total_at_min"]),
+                total_at_max=float(row["total_at_max"]),
+                currency=row["currency"]
+            ))
+
+    return {
+        iso2: BreakpointTable(country_iso2=iso2, breakpoints=breakpoints)
+        for iso2, breakpoints in rows_by_country.items()
+    }
+
+
+def served_countries(engine) -> List[str]:
+    """Pays ISO2 desservis par au moins un scope (catch-all exclus)"""
+    services = engine.loader.services_on()
+    return sorted({
+        iso2
+        for scope in engine.loader.scopes.values()
+        for iso2 in scope.countries
+        if scope.service_id in services
+    })
@@ -0,0 +1,269 @@
+"""
+Tariff diff - Écarts de prix entre deux versions des données normalisées
+
+Compare deux DataLoader (ex: avant / après un refresh ETL) service par
+service (par code, les IDs pouvant changer) et pays par pays:
+
+- Alignement sur les bandes: les prix étant affines sur chaque bande,
+  l'écart est affine entre deux bornes consécutives (union des bornes des
+  deux versions). Les extrêmes sont donc atteints aux bornes: pas
+  d'échantillonnage du poids.
+- Les pays partageant le même couple (scope ancien, scope nouveau) ont les
+  mêmes écarts: chaque couple est calculé une seule fois.
+- Pays à plusieurs zones (un scope par zone): chaque zone est comparée à
+  la zone de même code de l'autre version.
+- Lanes (service, pays) ajoutées ou perdues, zones ajoutées ou retirées
+  d'un pays toujours desservi, et services ajoutés/retirés.
+
+Usage:
+    diff = diff_tariffs(old_engine, new_engine)
+    diff.top_increases(10)
+"""
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+
+from .breakpoints import ServiceCurve
+from .loader import TariffScope
+
+
+# Écart (devise) en dessous duquel un prix est considéré inchangé
+PRICE_TOLERANCE = 0.005
+
+
+@dataclass
+class LaneDelta:
+    """Écarts de prix d'un service sur un groupe de pays (même couple de scopes)"""
+    service_code: str
+    countries: List[str]
+    old_scope_code: str
+    new_scope_code: str
+    max_increase: float = 0.0
+    max_increase_pct: float = 0.0
+    max_increase_weight: Optional[float] = None
+    max_decrease: float = 0.0  # Négatif (baisse la plus forte)
+    max_decrease_pct: float = 0.0
+    max_decrease_weight: Optional[float] = None
+    weights_lost: List[Tuple[float, float]] = field(default_factory=list)  # Tranches tarifées avant seulement
+    weights_added: List[Tuple[float, float]] = field(default_factory=list)  # Tranches tarifées après seulement
+
+    @property
+    def is_changed(self) -> bool:
+        return (
+            self.max_increase > PRICE_TOLERANCE
+            or self.max_decrease < -PRICE_TOLERANCE
+            or bool(self.weights_lost)
+            or bool(self.weights_added)
+        )
+
+    def _record(self, weight_kg: float, old_total: Decimal, new_total: Decimal):
+        delta = float(new_total - old_total)
+        pct = delta / float(old_total) * 100 if old_total else 0.0
+
+        if delta > self.max_increase:
+            self.max_increase, self.max_increase_pct, self.max_increase_weight = delta, pct, weight_kg
+        if delta < self.max_decrease:
+            self.max_decrease, self.max_decrease_pct, self.max_decrease_weight = delta, pct, weight_kg
+
+
+@dataclass
+class TariffDiff:
+    """Résultat complet d'une comparaison"""
+    changed: List[LaneDelta] = field(default_factory=list)
+    unchanged_lanes: int = 0
+    lanes_added: List[Tuple[str, str]] = field(default_factory=list)  # (service_code, iso2)
+    lanes_lost: List[Tuple[str, str]] = field(default_factory=list)
+    zones_added: List[Tuple[str, str, str]] = field(default_factory=list)  # (service_code, iso2, scope_code)
+    zones_lost: List[Tuple[str, str, str]] = field(default_factory=list)  # Pays toujours desservi, zone retirée
+    services_added: List[str] = field(default_factory=list)
+    services_removed: List[str] = field(default_factory=list)
+
+    def top_increases(self, limit: int = 10) -> List[LaneDelta]:
+        """Plus fortes hausses (en montant)"""
+        increased = [d for d in self.changed if d.max_increase > PRICE_TOLERANCE]
+        return sorted(increased, key=lambda d: d.max_increase, reverse=True)[:limit]
+
+    def top_decreases(self, limit: int = 10) -> List[LaneDelta]:
+        """Plus fortes baisses (en montant)"""
+        decreased = [d for d in self.changed if d.max_decrease < -PRICE_TOLERANCE]
+        return sorted(decreased, key=lambda d: d.max_decrease)[:limit]
+
+
+def diff_tariffs(old_engine, new_engine) -> TariffDiff:
+    """
+    Compare les tarifs de deux moteurs (ancienne et nouvelle version des données)
+
+    Args:
+        old_engine: PricingEngine sur les anciennes données
+        new_engine: PricingEngine sur les nouvelles données
+
+    Returns:
+        TariffDiff
+    """
+    result = TariffDiff()
+
+    old_services = {s.code: sid for sid, s in old_engine.loader.services_on().items()}
+    new_services = {s.code: sid for sid, s in new_engine.loader.services_on().items()}
+
+    result.services_added = sorted(set(new_services) - set(old_services))
+    result.services_removed = sorted(set(old_services) - set(new_services))
+
+    countries = sorted(_known_countries(old_engine) | _known_countries(new_engine))
+
+    for service_code in sorted(set(old_services) | set(new_services)):
+        old_id = old_services.get(service_code)
+        new_id = new_services.get(service_code)
+
+        # Pays regroupés par couple (scope ancien, scope nouveau)
+        countries_by_pair: Dict[Tuple[Optional[int], Optional[int]], List[str]] = {}
+
+        for iso2 in countries:
+            old_scopes = _priced_scopes(old_engine, old_id, iso2)
+            new_scopes = _priced_scopes(new_engine, new_id, iso2)
+
+            if not old_scopes and not new_scopes:
+                continue
+            if not old_scopes:
+                result.lanes_added.append((service_code, iso2))
+                continue
+            if not new_scopes:
+                result.lanes_lost.append((service_code, iso2))
+                continue
+
+            for old_scope, new_scope in _zone_pairs(old_scopes, new_scopes):
+                if old_scope is None:
+                    result.zones_added.append((service_code, iso2, new_scope.code))
+                elif new_scope is None:
+                    result.zones_lost.append((service_code, iso2, old_scope.code))
+                else:
+                    countries_by_pair.setdefault((old_scope.scope_id, new_scope.scope_id), []).append(iso2)
+
+        for (old_scope_id, new_scope_id), pair_countries in countries_by_pair.items():
+            delta = _compare_scopes(
+                service_code,
+                ServiceCurve.for_scope(old_engine, old_id, old_engine.loader.scopes[old_scope_id]),
+                ServiceCurve.for_scope(new_engine, new_id, new_engine.loader.scopes[new_scope_id]),
+                old_engine,
+                new_engine,
+                pair_countries
+            )
+
+            if delta.is_changed:
+                result.changed.append(delta)
+            else:
+                result.unchanged_lanes += len(pair_countries)
+
+    return result
+
+
+def _known_countries(engine) -> Set[str]:
+    """Alias du résolveur + pays listés dans les scopes"""
+    countries = set(engine.resolver.alias_map.values())
+    for scope in engine.loader.scopes.values():
+        countries.update(scope.countries)
+    return countries
+
+
+def _priced_scopes(engine, service_id: Optional[int], iso2: str) -> List[TariffScope]:
+    """Scopes (zones) tarifés par le moteur pour ce pays, sans ceux qui n'ont aucune bande"""
+    if service_id is None:
+        return []
+    return [scope for scope in engine._find_scopes(service_id, iso2) if scope.bands]
+
+
+def _zone_pairs(
+    old_scopes: List[TariffScope],
+    new_scopes: List[TariffScope]
+) -> List[Tuple[Optional[TariffScope], Optional[TariffScope]]]:
+    """
+    Couples (scope ancien, scope nouveau) d'un pays, zone par zone
+
+    Un seul scope de chaque côté: comparés directement (le code du scope
+    peut changer d'une version à l'autre). Pays à plusieurs zones: zones
+    appariées par code de scope, None pour une zone absente d'un côté.
+    """
+    if len(old_scopes) == 1 and len(new_scopes) == 1:
+        return [(old_scopes[0], new_scopes[0])]
+
+    old_by_code = {scope.code: scope for scope in old_scopes}
+    new_by_code = {scope.code: scope for scope in new_scopes}
+
+    return [
+        (old_by_code.get(code), new_by_code.get(code))
+        for code in sorted(old_by_code.keys() | new_by_code.keys())
+    ]
+
+
+def _compare_scopes(
+    service_code: str,
+    old_curve: ServiceCurve,
+    new_curve: ServiceCurve,
+    old_engine,
+    new_engine,
+    countries: List[str]
+) -> LaneDelta:
+    """
+    Écarts entre deux courbes de prix, aux bornes des bandes
+
+    Chaque poids critique (borne de bande) est comparé exactement, puis
+    chaque intervalle ouvert entre deux bornes est comparé à ses deux
+    extrémités avec les bandes appliquées à l'intérieur de l'intervalle.
+    """
+    delta = LaneDelta(
+        service_code=service_code,
+        countries=countries,
+        old_scope_code=old_curve.scope.code,
+        new_scope_code=new_curve.scope.code
+    )
+    iso2 = countries[0]
+
+    critical = sorted({
+        weight
+        for curve in (old_curve, new_curve)
+        for band in curve.scope.bands
+        for weight in (band.min_weight_kg, min(band.max_weight_kg, curve.max_weight_kg))
+        if weight >= 0
+    })
+
+    for index, weight in enumerate(critical):
+        if weight > 0:
+            old_band = old_curve.band_at(weight)
+            new_band = new_curve.band_at(weight)
+
+            if old_band and new_band:
+                delta._record(
+                    weight,
+                    old_curve.total(old_engine, old_band, iso2, weight),
+                    new_curve.total(new_engine, new_band, iso2, weight)
+                )
+            elif old_band or new_band:
+                _add_range(delta.weights_lost if old_band else delta.weights_added, weight, weight)
+
+        if index + 1 == len(critical):
+            break
+
+        low, high = weight, critical[index + 1]
+        middle = (low + high) / 2
+        old_band = old_curve.band_at(middle)
+        new_band = new_curve.band_at(middle)
+
+        if old_band and new_band:
+            for bound in (low, high):
+                delta._record(
+                    bound,
+                    old_curve.total(old_engine, old_band, iso2, bound),
+                    new_curve.total(new_engine, new_band, iso2, bound)
+                )
+        elif old_band or new_band:
+            _add_range(delta.weights_lost if old_band else delta.weights_added, low, high)
+
+    return delta
+
+
+def _add_range(ranges: List[Tuple[float, float]], low: float, high: float):
+    """Ajoute une tranche de poids, fusionnée avec la précédente si contiguë"""
+    if ranges and ranges[-1][1] >= low:
+        ranges[-1] = (ranges[-1][0], max(ranges[-1][1], high))
+    else:
+        ranges.append((low, high))
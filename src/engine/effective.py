@@ -0,0 +1,86 @@
+"""
+Effective dates - Versions datées des grilles tarifaires
+
+Quand un transporteur publie une nouvelle grille, services.csv contient une
+nouvelle ligne de service (même code, nouveau service_id, ses propres scopes
+et bandes) avec sa période de validité active_from/active_to (active_to
+inclus, vide = sans fin). Les surcharges peuvent aussi être datées
+(colonnes active_from/active_to optionnelles de surcharge_rules.csv).
+
+L'index découpe le calendrier en segments entre deux dates de changement
+et précalcule pour chacun les services en vigueur: tarifer à une date passée
+coûte une recherche dichotomique, comme tarifer aujourd'hui. Les surcharges
+(quelques règles par service) sont filtrées à la volée avec is_active().
+
+Si deux versions d'un même code se chevauchent, la plus récente
+(active_from le plus grand) l'emporte.
+"""
+
+import bisect
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Union
+
+if TYPE_CHECKING:
+    from .loader import Service
+
+
+def parse_date(value: Optional[str]) -> Optional[date]:
+    """Date ISO (YYYY-MM-DD) depuis un CSV, None si vide"""
+    value = (value or "").strip()
+    return date.fromisoformat(value) if value else None
+
+
+def as_date(value: Union[date, datetime, str, None]) -> date:
+    """Date d'expédition: date, datetime, chaîne ISO ou None (= aujourd'hui)"""
+    if value is None:
+        return date.today()
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def is_active(item, day: date) -> bool:
+    """True si active_from <= day <= active_to (bornes absentes = ouvertes)"""
+    return (
+        (item.active_from is None or item.active_from <= day)
+        and (item.active_to is None or day <= item.active_to)
+    )
+
+
+class EffectiveIndex:
+    """Index d'intervalles: date → services en vigueur (une version par code)"""
+
+    def __init__(self, services: Iterable['Service']):
+        services = sorted(services, key=lambda s: s.service_id)
+
+        # Dates où l'ensemble en vigueur peut changer
+        boundaries = {date.min}
+        for service in services:
+            if service.active_from is not None:
+                boundaries.add(service.active_from)
+            if service.active_to is not None and service.active_to < date.max:
+                boundaries.add(service.active_to + timedelta(days=1))
+
+        self.boundaries: List[date] = sorted(boundaries)
+        self.segments: List[Dict[int, 'Service']] = [
+            self._services_at(day, services) for day in self.boundaries
+        ]
+
+    @staticmethod
+    def _services_at(day: date, services: List['Service']) -> Dict[int, 'Service']:
+        # Une seule version par code: la plus récente en vigueur
+        latest = {}
+        for service in services:
+            if not is_active(service, day):
+                continue
+            current = latest.get(service.code)
+            if current is None or (service.active_from or date.min) >= (current.active_from or date.min):
+                latest[service.code] = service
+
+        return {service.service_id: service for service in sorted(latest.values(), key=lambda s: s.service_id)}
+
+    def at(self, day: date) -> Dict[int, 'Service']:
+        """Services en vigueur à une date, par service_id (O(log n) segments)"""
+        return self.segments[bisect.bisect_right(self.boundaries, day) - 1]
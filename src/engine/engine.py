@@ -2,14 +2,27 @@
 Pricing Engine - Moteur de tarification unifié
 """
 
-import json
-from pathlib import Path
+import bisect
+from datetime import date
 from decimal import Decimal
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
 from .loader import DataLoader, TariffScope, TariffBand, SurchargeRule
 from .country_resolver import CountryResolver
+from .effective import as_date
+from .freight import chargeable_freight_weight, freight_amount, is_freight_service
+from .breakpoints import BreakpointTable, compute_breakpoints
+from .reverse import LaneQuote, ReverseIndex, WeightBudget
+from .trace import (
+    SCOPE_CATCH_ALL, SCOPE_COUNTRY, SCOPE_POSTAL, SCOPE_UNZONED, SCOPE_ZONES,
+    SKIP_NO_BAND, SKIP_NO_SCOPE, SKIP_OVERWEIGHT, SKIP_SUSPENDED, QuoteTrace, ScopeTrace, ServiceTrace, SurchargeTrace
+)
+from .validator import TariffValidationError, ValidationReport
+
+
+# Dimensions d'un colis en cm: (longueur, largeur, hauteur)
+Dimensions = Tuple[float, float, float]
 
 
 @dataclass
@@ -48,6 +61,28 @@ class PriceOffer:
     band_details: str
     warning: Optional[str] = None  # Warning message if service restricted
     is_suspended: bool = False  # True if service suspended for this destination
+    parcel_count: int = 1  # Number of parcels priced in this offer (multi-parcel shipments)
+    chargeable_weight_kg: Optional[float] = None  # Billed weight when dimensions were given (max of actual/volumetric)
+
+
+@dataclass
+class SuspendedService:
+    """Service suspendu vers la destination et son remplaçant le moins cher"""
+    service_code: str
+    service_label: str
+    carrier_code: str
+    carrier_name: str
+    message: str  # message_fr de la restriction
+    message_en: str
+    alternative_services: List[str]  # Codes listés dans service_restrictions.json
+    alternative: Optional[PriceOffer] = None  # Offre la moins chère parmi les alternatives (None = aucune tarifée)
+
+
+@dataclass
+class Quote:
+    """Offres d'un envoi et services suspendus vers la destination"""
+    offers: List[PriceOffer]
+    suspended: List[SuspendedService]
 
 
 class PricingEngine:
@@ -77,103 +112,635 @@ class PricingEngine:
         self.resolver = CountryResolver()
         self.origin = origin
 
-        # Load service restrictions (Trump tariffs, etc.)
-        self.restrictions = self._load_restrictions()
+        # Index des requêtes inverses (construit au premier usage)
+        self._reverse_index: Optional[ReverseIndex] = None
+
+    def reload(self, force: bool = False) -> Optional[ValidationReport]:
+        """
+        Recharge les tarifs à chaud depuis la même source que le loader actuel
+
+        Le nouveau loader est entièrement chargé et validé avant d'être mis
+        en service: en cas de refus, le moteur garde les tarifs actuels.
+
+        Args:
+            force: Accepter des avertissements absents des données actuelles
+
+        Returns:
+            Rapport de validation des nouvelles données (None si non validées)
+
+        Raises:
+            TariffValidationError: Erreurs d'intégrité, ou nouveaux
+                avertissements (régression) sans force
+        """
+        loader = self.loader.reloaded()
+        report = loader.validation
+
+        if report is not None and self.loader.validation is not None and not force:
+            regressions = report.new_since(self.loader.validation)
+            if regressions:
+                raise TariffValidationError(report, regressions)
+
+        self.loader = loader
+        self._reverse_index = None
+
+        return report
 
-    def price(self, dest: str, weight_kg: float, debug: bool = False) -> List[PriceOffer]:
+    def price(
+        self,
+        dest: str,
+        weight_kg: float,
+        debug: bool = False,
+        dimensions_cm: Optional[Dimensions] = None,
+        postal_code: Optional[str] = None,
+        ship_date: Optional[date] = None,
+        trace: Optional[QuoteTrace] = None
+    ) -> List[PriceOffer]:
         """
         Calcule les prix pour tous les services disponibles
 
         Args:
             dest: Nom du pays de destination (ex: "Australie", "AU", "australia")
             weight_kg: Poids en kilogrammes
-            debug: Si True, affiche les détails du calcul
+            debug: Si True, affiche la trace du calcul
+            dimensions_cm: (L, l, H) en cm - active le poids volumétrique
+            postal_code: Code postal de destination (choisit la zone des pays
+                         découpés en plusieurs scopes)
+            ship_date: Date d'expédition (défaut: aujourd'hui) - tarife avec
+                       la grille en vigueur à cette date
+            trace: QuoteTrace à remplir (voir trace.py), None = pas de trace
 
         Returns:
             Liste d'offres triées par prix croissant
         """
+        return self.price_shipment(
+            dest, [weight_kg], debug=debug,
+            parcel_dimensions=[dimensions_cm] if dimensions_cm else None,
+            postal_code=postal_code,
+            ship_date=ship_date,
+            trace=trace
+        )
+
+    def price_shipment(
+        self,
+        dest: str,
+        parcel_weights: List[float],
+        debug: bool = False,
+        parcel_dimensions: Optional[List[Optional[Dimensions]]] = None,
+        postal_code: Optional[str] = None,
+        ship_date: Optional[date] = None,
+        trace: Optional[QuoteTrace] = None,
+        suspended: Optional[List[SuspendedService]] = None,
+        loader: Optional[DataLoader] = None
+    ) -> List[PriceOffer]:
+        """
+        Calcule les prix d'un envoi multi-colis pour tous les services
+
+        Chaque service est évalué en une passe: le scope est résolu une fois,
+        puis chaque colis est tarifé sur sa propre bande. Un service n'est
+        proposé que s'il accepte tous les colis.
+
+        Surcharges appliquées au niveau de l'envoi:
+        - PERCENT: sur le fret cumulé (= somme des % par colis)
+        - PER_KG: sur le poids total
+        - FLAT: une seule fois par envoi (pas une fois par colis)
+
+        Poids volumétrique: si les dimensions d'un colis sont fournies, il est
+        tarifé sur son poids taxable max(poids réel, L×l×H / volumetric_divisor)
+        avec le diviseur propre à chaque service. La limite max_weight_kg reste
+        vérifiée sur le poids réel.
+
+        Pays à plusieurs zones (UPS CA 1-5, Delivengo boxable/non boxable):
+        avec un code postal, seule la zone qui le couvre est tarifée; sans
+        code postal, une offre est renvoyée par zone.
+
+        Versions datées: seuls les services et surcharges en vigueur à la
+        date d'expédition sont utilisés (voir effective.py), ce qui permet de
+        re-tarifer une commande passée avec la grille de l'époque.
+
+        Args:
+            dest: Nom du pays de destination
+            parcel_weights: Poids de chaque colis en kg (ex: [2.0, 3.5, 1.0])
+            debug: Si True, affiche la trace du calcul
+            parcel_dimensions: Dimensions (cm) de chaque colis, alignées sur
+                               parcel_weights (None = pas de poids volumétrique)
+            postal_code: Code postal de destination (optionnel)
+            ship_date: Date d'expédition (défaut: aujourd'hui)
+            trace: QuoteTrace à remplir: exclusions, scopes, bandes et
+                   surcharges de chaque service (None = pas de trace)
+            suspended: Liste à remplir avec les services suspendus vers la
+                       destination et leur meilleure alternative (voir quote())
+            loader: Tarifs à utiliser (défaut: self.loader, lu une seule fois
+                    au début de l'appel pour ne pas mélanger deux versions
+                    si reload() le remplace pendant le calcul)
+
+        Returns:
+            Liste d'offres triées par prix total croissant (la première est la moins chère)
+        """
+
+        if not parcel_weights:
+            return []
+
+        loader = loader or self.loader
+
+        if debug and trace is None:
+            trace = QuoteTrace(dest, list(parcel_weights), postal_code=postal_code)
+
+        heaviest = max(parcel_weights)
+
+        # Volume de chaque colis (cm³), calculé une fois pour tous les services
+        volumes = self._parcel_volumes(parcel_weights, parcel_dimensions)
+        chargeable_by_divisor = {}  # divisor -> poids taxables des colis
 
         # Résoudre le pays
         dest_iso2 = self.resolver.resolve(dest)
 
         if not dest_iso2:
             if debug:
-                print(f"❌ Unknown country: {dest}")
+                print(trace.format())
             return []
 
-        if debug:
-            print(f"🌍 Resolved: {dest} → {dest_iso2} ({self.resolver.get_name(dest_iso2)})")
-            print(f"⚖️  Weight: {weight_kg} kg\n")
+        if trace is not None:
+            trace.dest_iso2 = dest_iso2
+            trace.country_name = self.resolver.get_name(dest_iso2)
+
+        # Zones couvrant le code postal (une recherche dans le trie pour tous les services)
+        postal_matches = loader.postal_index.lookup(dest_iso2, postal_code) if postal_code else None
+
+        # Grille en vigueur à la date d'expédition (une recherche pour tous les services)
+        ship_date = as_date(ship_date)
+        services = loader.services_on(ship_date)
+
+        if trace is not None:
+            trace.ship_date = ship_date
 
         offers = []
 
         # Pour chaque service
-        for service_id, service in self.loader.services.items():
-            # Vérifier poids max
-            if weight_kg > service.max_weight_kg:
-                if debug:
-                    print(f"⏭️  {service.code}: weight exceeds max {service.max_weight_kg}kg")
+        for service_id, service in services.items():
+            service_trace = None
+            if trace is not None:
+                service_trace = ServiceTrace(service.code, service.carrier_code, service.max_weight_kg)
+                trace.services.append(service_trace)
+
+            # Restriction en vigueur (avant toute recherche de scope ou de bande)
+            warning, is_suspended = self._check_restriction(service, dest_iso2, ship_date, loader=loader)
+
+            if service_trace is not None:
+                service_trace.restriction = warning
+                service_trace.is_suspended = is_suspended
+
+            if is_suspended:
+                if service_trace is not None:
+                    service_trace.skip_reason = SKIP_SUSPENDED
+                if suspended is not None and heaviest <= service.max_weight_kg:
+                    suspended.append(self._suspended_service(service, dest_iso2, ship_date, loader=loader))
                 continue
 
-            # Trouver le scope pour ce pays
-            scope = self._find_scope(service_id, dest_iso2)
-
-            if not scope:
-                if debug:
-                    print(f"⏭️  {service.code}: no scope for {dest_iso2}")
+            # Vérifier poids max (par colis)
+            if heaviest > service.max_weight_kg:
+                if service_trace is not None:
+                    service_trace.skip_reason = SKIP_OVERWEIGHT
                 continue
 
-            # Trouver la bande de poids
-            band = self._find_band(scope, weight_kg)
+            # Trouver les scopes pour ce pays (une fois pour tous les colis)
+            scopes = self._find_scopes(service_id, dest_iso2, postal_matches, loader=loader)
 
-            if not band:
-                if debug:
-                    print(f"⏭️  {service.code}: no band for {weight_kg}kg")
+            if not scopes:
+                if service_trace is not None:
+                    service_trace.skip_reason = SKIP_NO_SCOPE
                 continue
 
-            # Calculer le fret de base
-            freight = self._calculate_freight(band, weight_kg)
+            # Poids taxable de chaque colis (partagé entre services de même diviseur)
+            if volumes is None:
+                chargeable_weights = parcel_weights
+            else:
+                divisor = service.volumetric_divisor
+                chargeable_weights = chargeable_by_divisor.get(divisor)
 
-            # Calculer les surcharges
-            surcharge_total = self._calculate_surcharges(service_id, dest_iso2, weight_kg, freight)
+                if chargeable_weights is None:
+                    chargeable_weights = [
+                        max(weight, volume / divisor) if volume else weight
+                        for weight, volume in zip(parcel_weights, volumes)
+                    ]
+                    chargeable_by_divisor[divisor] = chargeable_weights
 
-            # Total
-            total = freight + surcharge_total
+            chargeable_total = sum(chargeable_weights)
 
             # Carrier info
-            carrier = self.loader.carriers[service.carrier_id]
-
-            # Check for service restrictions
-            warning, is_suspended = self._check_restriction(service.code, dest_iso2)
-
-            offer = PriceOffer(
-                carrier_code=carrier.code,
-                carrier_name=carrier.name,
-                service_code=service.code,
-                service_label=service.label,
-                freight=freight,
-                surcharges=surcharge_total,
-                total=total,
-                currency=carrier.currency,
-                scope_code=scope.code,
-                band_details=f"{band.min_weight_kg}-{band.max_weight_kg}kg",
-                warning=warning,
-                is_suspended=is_suspended
-            )
+            carrier = loader.carriers[service.carrier_id]
+
+            if service_trace is not None:
+                service_trace.currency = carrier.currency
+                if volumes is not None:
+                    service_trace.chargeable_weights = chargeable_weights
+
+            for scope in scopes:
+                scope_trace = None
+                if service_trace is not None:
+                    scope_trace = self._trace_scope(scope, dest_iso2, postal_matches, len(scopes), loader=loader)
+                    service_trace.scopes.append(scope_trace)
+
+                # Trouver la bande de poids de chaque colis et cumuler le fret
+                freight = Decimal(0)
+                bands = []
+                freight_by_weight = {}  # Colis de même poids: une seule recherche de bande
+
+                for weight_kg in chargeable_weights:
+                    if weight_kg not in freight_by_weight:
+                        band = self._find_band(scope, weight_kg)
+                        freight_by_weight[weight_kg] = (
+                            (band, self._calculate_freight(band, weight_kg)) if band else (None, None)
+                        )
+
+                    band, parcel_freight = freight_by_weight[weight_kg]
+                    if not band:
+                        break
+
+                    bands.append(band)
+                    freight += parcel_freight
+
+                if len(bands) != len(parcel_weights):
+                    if scope_trace is not None:
+                        scope_trace.missing_weight_kg = weight_kg
+                    continue
+
+                # Calculer les surcharges (niveau envoi: FLAT appliquée une seule fois)
+                surcharge_total = self._calculate_surcharges(
+                    service_id, dest_iso2, chargeable_total, freight, ship_date=ship_date,
+                    applied=scope_trace.surcharges if scope_trace is not None else None,
+                    loader=loader
+                )
+
+                # Total
+                total = freight + surcharge_total
+
+                if scope_trace is not None:
+                    scope_trace.bands = bands
+                    scope_trace.freight = freight
+                    scope_trace.total = total
+
+                offer = PriceOffer(
+                    carrier_code=carrier.code,
+                    carrier_name=carrier.name,
+                    service_code=service.code,
+                    service_label=service.label,
+                    freight=freight,
+                    surcharges=surcharge_total,
+                    total=total,
+                    currency=carrier.currency,
+                    scope_code=scope.code,
+                    band_details=", ".join(f"{b.min_weight_kg}-{b.max_weight_kg}kg" for b in bands),
+                    warning=warning,
+                    is_suspended=is_suspended,
+                    parcel_count=len(parcel_weights),
+                    chargeable_weight_kg=chargeable_total if volumes is not None else None
+                )
+
+                offers.append(offer)
+
+            if service_trace is not None and not any(s.priced for s in service_trace.scopes):
+                service_trace.skip_reason = SKIP_NO_BAND
+
+        # Trier par prix croissant
+        offers.sort(key=lambda o: o.total)
+
+        if suspended:
+            self._pick_alternatives(suspended, offers)
+
+        if debug:
+            print(trace.format())
+
+        return offers
+
+    def price_freight(
+        self,
+        dest: str,
+        piece_weights: List[float],
+        debug: bool = False,
+        piece_dimensions: Optional[List[Optional[Dimensions]]] = None,
+        postal_code: Optional[str] = None,
+        ship_date: Optional[date] = None,
+        trace: Optional[QuoteTrace] = None,
+        suspended: Optional[List[SuspendedService]] = None,
+        loader: Optional[DataLoader] = None
+    ) -> List[PriceOffer]:
+        """
+        Calcule les prix d'un envoi fret (palettes) pour les services fret
+
+        Voir freight.py: l'envoi est tarifé sur son poids taxable total
+        (volumétrique compris, arrondi au kg supérieur) avec une seule bande,
+        les bandes au kg appliquant leur minimum de perception.
 
-            offers.append(offer)
+        Args:
+            dest: Nom du pays de destination
+            piece_weights: Poids de chaque pièce en kg (ex: [320.0, 180.0])
+            debug: Si True, affiche la trace du calcul
+            piece_dimensions: Dimensions (cm) de chaque pièce, alignées sur
+                              piece_weights (None = pas de poids volumétrique)
+            postal_code: Code postal de destination (optionnel)
+            ship_date: Date d'expédition (défaut: aujourd'hui)
+            trace: QuoteTrace à remplir (voir price_shipment)
+            suspended: Services suspendus à remplir (voir price_shipment)
+            loader: Tarifs à utiliser (voir price_shipment)
+
+        Returns:
+            Liste d'offres triées par prix total croissant
+        """
+        if not piece_weights:
+            return []
+
+        loader = loader or self.loader
+
+        if debug and trace is None:
+            trace = QuoteTrace(dest, list(piece_weights), mode="freight", postal_code=postal_code)
 
+        heaviest = max(piece_weights)
+        volumes = self._parcel_volumes(piece_weights, piece_dimensions)
+
+        dest_iso2 = self.resolver.resolve(dest)
+
+        if not dest_iso2:
             if debug:
-                print(f"✅ {service.code} ({scope.code}): "
-                      f"{float(freight):.2f} + {float(surcharge_total):.2f} = "
-                      f"{float(total):.2f} {carrier.currency}")
+                print(trace.format())
+            return []
+
+        postal_matches = loader.postal_index.lookup(dest_iso2, postal_code) if postal_code else None
+        ship_date = as_date(ship_date)
+
+        if trace is not None:
+            trace.dest_iso2 = dest_iso2
+            trace.country_name = self.resolver.get_name(dest_iso2)
+            trace.ship_date = ship_date
+
+        offers = []
+
+        for service_id, service in loader.services_on(ship_date).items():
+            if not is_freight_service(service):
+                continue
+
+            service_trace = None
+            if trace is not None:
+                service_trace = ServiceTrace(service.code, service.carrier_code, service.max_weight_kg)
+                trace.services.append(service_trace)
+
+            warning, is_suspended = self._check_restriction(service, dest_iso2, ship_date, loader=loader)
+
+            if service_trace is not None:
+                service_trace.restriction = warning
+                service_trace.is_suspended = is_suspended
+
+            if is_suspended:
+                if service_trace is not None:
+                    service_trace.skip_reason = SKIP_SUSPENDED
+                if suspended is not None and heaviest <= service.max_weight_kg:
+                    suspended.append(self._suspended_service(service, dest_iso2, ship_date, loader=loader))
+                continue
+
+            if heaviest > service.max_weight_kg:
+                if service_trace is not None:
+                    service_trace.skip_reason = SKIP_OVERWEIGHT
+                continue
+
+            scopes = self._find_scopes(service_id, dest_iso2, postal_matches, loader=loader)
+
+            if not scopes:
+                if service_trace is not None:
+                    service_trace.skip_reason = SKIP_NO_SCOPE
+                continue
+
+            weight_kg = chargeable_freight_weight(piece_weights, volumes, service.volumetric_divisor)
+            carrier = loader.carriers[service.carrier_id]
+
+            if service_trace is not None:
+                service_trace.currency = carrier.currency
+                service_trace.chargeable_weights = [weight_kg]
+
+            for scope in scopes:
+                scope_trace = None
+                if service_trace is not None:
+                    scope_trace = self._trace_scope(scope, dest_iso2, postal_matches, len(scopes), loader=loader)
+                    service_trace.scopes.append(scope_trace)
+
+                band = self._find_band(scope, weight_kg)
+
+                if not band:
+                    if scope_trace is not None:
+                        scope_trace.missing_weight_kg = weight_kg
+                    continue
+
+                freight = freight_amount(band, weight_kg)
+                surcharge_total = self._calculate_surcharges(
+                    service_id, dest_iso2, weight_kg, freight, ship_date=ship_date,
+                    applied=scope_trace.surcharges if scope_trace is not None else None,
+                    loader=loader
+                )
+                total = freight + surcharge_total
+
+                if scope_trace is not None:
+                    scope_trace.bands = [band]
+                    scope_trace.freight = freight
+                    scope_trace.total = total
+
+                band_details = f"{band.min_weight_kg}-{band.max_weight_kg}kg"
+                if band.amount_per_kg:
+                    band_details += f" @ {float(band.amount_per_kg):.2f}/kg"
+                    if band.is_min_charge:
+                        band_details += f" (min {float(band.base_amount):.2f})"
+
+                offers.append(PriceOffer(
+                    carrier_code=carrier.code,
+                    carrier_name=carrier.name,
+                    service_code=service.code,
+                    service_label=service.label,
+                    freight=freight,
+                    surcharges=surcharge_total,
+                    total=total,
+                    currency=carrier.currency,
+                    scope_code=scope.code,
+                    band_details=band_details,
+                    warning=warning,
+                    is_suspended=is_suspended,
+                    parcel_count=len(piece_weights),
+                    chargeable_weight_kg=weight_kg
+                ))
+
+            if service_trace is not None and not any(s.priced for s in service_trace.scopes):
+                service_trace.skip_reason = SKIP_NO_BAND
 
-        # Trier par prix croissant
         offers.sort(key=lambda o: o.total)
 
+        if suspended:
+            self._pick_alternatives(suspended, offers)
+
+        if debug:
+            print(trace.format())
+
         return offers
 
-    def _find_scope(self, service_id: int, dest_iso2: str) -> Optional[TariffScope]:
+    def quote(
+        self,
+        dest: str,
+        parcel_weights: List[float],
+        freight: bool = False,
+        parcel_dimensions: Optional[List[Optional[Dimensions]]] = None,
+        postal_code: Optional[str] = None,
+        ship_date: Optional[date] = None
+    ) -> Quote:
+        """
+        Offres et services suspendus avec leur alternative (commande /price)
+
+        Les alternatives listées dans service_restrictions.json sont choisies
+        parmi les offres de la même passe: pas de second appel au moteur.
+
+        Args:
+            freight: Tarifer en mode fret (price_freight) au lieu de colis
+
+        Returns:
+            Quote: offres triées et services suspendus vers la destination
+        """
+        loader = self.loader
+        suspended: List[SuspendedService] = []
+
+        if freight:
+            offers = self.price_freight(
+                dest, parcel_weights, piece_dimensions=parcel_dimensions,
+                postal_code=postal_code, ship_date=ship_date, suspended=suspended, loader=loader
+            )
+        else:
+            offers = self.price_shipment(
+                dest, parcel_weights, parcel_dimensions=parcel_dimensions,
+                postal_code=postal_code, ship_date=ship_date, suspended=suspended, loader=loader
+            )
+
+        return Quote(offers=offers, suspended=suspended)
+
+    def explain(
+        self,
+        dest: str,
+        parcel_weights: List[float],
+        freight: bool = False,
+        parcel_dimensions: Optional[List[Optional[Dimensions]]] = None,
+        postal_code: Optional[str] = None,
+        ship_date: Optional[date] = None
+    ) -> QuoteTrace:
+        """
+        Devis accompagné de sa trace (commande /explain)
+
+        Args:
+            freight: Tarifer en mode fret (price_freight) au lieu de colis
+
+        Returns:
+            QuoteTrace: décision de chaque service, offres dans trace.offers
+        """
+        loader = self.loader
+        trace = QuoteTrace(
+            dest, list(parcel_weights), mode="freight" if freight else "parcel", postal_code=postal_code
+        )
+
+        if freight:
+            trace.offers = self.price_freight(
+                dest, parcel_weights, piece_dimensions=parcel_dimensions,
+                postal_code=postal_code, ship_date=ship_date, trace=trace, loader=loader
+            )
+        else:
+            trace.offers = self.price_shipment(
+                dest, parcel_weights, parcel_dimensions=parcel_dimensions,
+                postal_code=postal_code, ship_date=ship_date, trace=trace, loader=loader
+            )
+
+        return trace
+
+    def breakpoints(self, dest: str) -> Optional[BreakpointTable]:
+        """
+        Tranches de poids du service le moins cher vers un pays
+
+        Voir breakpoints.compute_breakpoints (enveloppe inférieure des prix
+        totaux de tous les services, surcharges comprises).
+
+        Args:
+            dest: Nom du pays de destination
+
+        Returns:
+            BreakpointTable, ou None si le pays est inconnu
+        """
+        dest_iso2 = self.resolver.resolve(dest)
+
+        if not dest_iso2:
+            return None
+
+        return compute_breakpoints(self, dest_iso2, loader=self.loader)
+
+    def lanes_under(self, weight_kg: float, max_total: float) -> List[LaneQuote]:
+        """
+        Tous les couples (pays, service) dont le prix total est <= max_total
+
+        Ex: "vers quels pays peut-on envoyer 1 kg pour moins de 15 €?"
+
+        Args:
+            weight_kg: Poids du colis
+            max_total: Plafond du prix total (surcharges comprises)
+
+        Returns:
+            Liste de LaneQuote triée par prix croissant
+        """
+        return self._get_reverse_index().lanes_under(weight_kg, max_total)
+
+    def max_weight_under(self, dest: str, max_total: float) -> List[WeightBudget]:
+        """
+        Poids maximal expédiable vers un pays sous un plafond, par service
+
+        Args:
+            dest: Nom du pays de destination
+            max_total: Plafond du prix total (surcharges comprises)
+
+        Returns:
+            Liste de WeightBudget triée par poids décroissant (vide si pays inconnu)
+        """
+        dest_iso2 = self.resolver.resolve(dest)
+
+        if not dest_iso2:
+            return []
+
+        return self._get_reverse_index().max_weight_under(dest_iso2, max_total)
+
+    def _get_reverse_index(self) -> ReverseIndex:
+        # Reconstruit si reload() a remplacé les tarifs depuis la construction
+        index = self._reverse_index
+        if index is None or index.loader is not self.loader:
+            index = self._reverse_index = ReverseIndex(self)
+        return index
+
+    @staticmethod
+    def _parcel_volumes(
+        parcel_weights: List[float],
+        parcel_dimensions: Optional[List[Optional[Dimensions]]]
+    ) -> Optional[List[Optional[float]]]:
+        """
+        Calcule le volume (cm³) de chaque colis
+
+        Returns:
+            None si aucune dimension fournie, sinon une liste alignée sur
+            parcel_weights (None pour les colis sans dimensions)
+        """
+        if not parcel_dimensions or not any(parcel_dimensions):
+            return None
+
+        if len(parcel_dimensions) != len(parcel_weights):
+            raise ValueError(
+                f"parcel_dimensions has {len(parcel_dimensions)} entries for {len(parcel_weights)} parcels"
+            )
+
+        return [
+            dims[0] * dims[1] * dims[2] if dims else None
+            for dims in parcel_dimensions
+        ]
+
+    def _find_scope(
+        self,
+        service_id: int,
+        dest_iso2: str,
+        loader: Optional[DataLoader] = None
+    ) -> Optional[TariffScope]:
         """
         Trouve le scope tarifaire pour un service et un pays
 
@@ -181,14 +748,15 @@ class PricingEngine:
         1. Scope spécifique au pays (non catch-all)
         2. Scope catch-all (Reste du monde)
         """
+        loader = loader or self.loader
 
         # Index direct
         key = (service_id, dest_iso2)
-        if key in self.loader.scope_by_service_country:
-            return self.loader.scope_by_service_country[key]
+        if key in loader.scope_by_service_country:
+            return loader.scope_by_service_country[key]
 
         # Fallback: chercher un scope catch-all pour ce service
-        scopes = self.loader.scopes_by_service.get(service_id, [])
+        scopes = loader.scopes_by_service.get(service_id, [])
 
         for scope in scopes:
             if scope.is_catch_all:
@@ -196,19 +764,94 @@ class PricingEngine:
 
         return None
 
+    def _find_scopes(
+        self,
+        service_id: int,
+        dest_iso2: str,
+        postal_matches: Optional[Dict[int, int]] = None,
+        loader: Optional[DataLoader] = None
+    ) -> List[TariffScope]:
+        """
+        Trouve tous les scopes tarifaires applicables pour un service et un pays
+
+        Un pays peut être découpé en plusieurs zones (un scope par zone).
+
+        Args:
+            service_id: Service
+            dest_iso2: Pays de destination
+            postal_matches: Résultat de PostalIndex.lookup() pour le code
+                            postal de destination (None = code inconnu)
+            loader: Tarifs à utiliser (défaut: self.loader)
+
+        Returns:
+            - Sans code postal: tous les scopes du pays (ou le catch-all)
+            - Avec code postal: les zones dont la règle la plus précise le
+              couvre, sinon les scopes du pays sans règle postale
+        """
+        loader = loader or self.loader
+        candidates = loader.scopes_by_service_country.get((service_id, dest_iso2))
+
+        if not candidates:
+            scope = self._find_scope(service_id, dest_iso2, loader=loader)
+            return [scope] if scope else []
+
+        if postal_matches is None:
+            return list(candidates)
+
+        zoned = [scope for scope in candidates if scope.scope_id in postal_matches]
+
+        if zoned:
+            depth = max(postal_matches[scope.scope_id] for scope in zoned)
+            return [scope for scope in zoned if postal_matches[scope.scope_id] == depth]
+
+        # Aucune zone ne couvre ce code: scopes valables pour tout le pays
+        zoned_scopes = loader.postal_index.zoned_scopes
+        return [scope for scope in candidates if scope.scope_id not in zoned_scopes]
+
+    def _trace_scope(
+        self,
+        scope: TariffScope,
+        dest_iso2: str,
+        postal_matches: Optional[Dict[int, int]],
+        scope_count: int,
+        loader: Optional[DataLoader] = None
+    ) -> ScopeTrace:
+        """Raison du choix d'un scope par _find_scopes (mode trace uniquement)"""
+        if postal_matches and scope.scope_id in postal_matches:
+            return ScopeTrace(scope.code, SCOPE_POSTAL, postal_depth=postal_matches[scope.scope_id])
+
+        if scope.is_catch_all or dest_iso2 not in scope.countries:
+            return ScopeTrace(scope.code, SCOPE_CATCH_ALL)
+
+        loader = loader or self.loader
+        if postal_matches is not None and loader.postal_index.has_zones(dest_iso2):
+            return ScopeTrace(scope.code, SCOPE_UNZONED)
+
+        return ScopeTrace(scope.code, SCOPE_ZONES if scope_count > 1 else SCOPE_COUNTRY)
+
     def _find_band(self, scope: TariffScope, weight_kg: float) -> Optional[TariffBand]:
         """
         Trouve la bande de poids appropriée
 
         Les bandes sont triées par min_weight_kg croissant
         On cherche la première bande où min_weight <= weight <= max_weight
+
+        Recherche dichotomique sur scope.band_mins (grilles fret avec de
+        longues suites de bandes au kg): seules les bandes qui commencent
+        avant le poids et le couvrent encore sont parcourues.
         """
+        band_mins = scope.band_mins
+        if len(band_mins) != len(scope.bands):
+            band_mins = [band.min_weight_kg for band in scope.bands]
 
-        for band in scope.bands:
-            if band.min_weight_kg <= weight_kg <= band.max_weight_kg:
-                return band
+        index = bisect.bisect_right(band_mins, weight_kg) - 1
+        found = None
 
-        return None
+        while index >= 0 and scope.bands[index].max_weight_kg >= weight_kg:
+            found = scope.bands[index]
+            index -= 1
+
+        return found
 
     def _calculate_freight(self, band: TariffBand, weight_kg: float) -> Decimal:
         """
@@ -232,7 +875,10 @@ class PricingEngine:
         dest_iso2: str,
         weight_kg: float,
         freight: Decimal,
-        conditions: Optional[Dict] = None
+        conditions: Optional[Dict] = None,
+        ship_date: Optional[date] = None,
+        applied: Optional[List[SurchargeTrace]] = None,
+        loader: Optional[DataLoader] = None
     ) -> Decimal:
         """
         Calcule le total des surcharges applicables
@@ -251,12 +897,17 @@ class PricingEngine:
         1. Surcharges négatives (remises) en premier
         2. Surcharges positives (frais) ensuite
         3. Total final >= 0
+
+        Seules les règles en vigueur à ship_date (défaut: aujourd'hui) s'appliquent.
+
+        applied: liste complétée avec le détail de chaque règle appliquée
+        (mode trace uniquement). loader: tarifs à utiliser (défaut: self.loader).
         """
 
         if conditions is None:
             conditions = {}
 
-        rules = self.loader.surcharges.get(service_id, [])
+        rules = (loader or self.loader).surcharges_on(service_id, ship_date)
 
         # Filtrer les règles applicables (vérifier conditions)
         applicable_rules = []
@@ -290,6 +941,9 @@ class PricingEngine:
 
             total += surcharge
 
+            if applied is not None:
+                applied.append(SurchargeTrace(rule.name, rule.kind, rule.basis, rule.value, surcharge))
+
         return total
 
     def _matches_conditions(self, rule_conditions: Dict, query_conditions: Dict) -> bool:
@@ -324,51 +978,48 @@ class PricingEngine:
 
         return True
 
-    def _load_restrictions(self) -> Dict:
-        """
-        Load service restrictions from JSON config
-
-        Returns:
-            Dict with restrictions indexed by (service_code, country_iso2)
-        """
-        restrictions_file = Path(__file__).parent.parent.parent / "data" / "service_restrictions.json"
-
-        if not restrictions_file.exists():
-            return {}
-
-        try:
-            with open(restrictions_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Index by (service_code, country_iso2)
-            indexed = {}
-            for restriction in data.get('restrictions', []):
-                key = (restriction['service_code'], restriction['country_iso2'])
-                indexed[key] = restriction
+    @property
+    def restrictions(self) -> Dict[Tuple[str, str], dict]:
+        """Restrictions par (service_code, ISO2), entrées JSON brutes (toutes dates)"""
+        return self.loader.restriction_index.by_code
 
-            return indexed
-        except Exception as e:
-            print(f"⚠️  Warning: Could not load restrictions: {e}")
-            return {}
-
-    def _check_restriction(self, service_code: str, dest_iso2: str) -> tuple:
+    def _check_restriction(self, service, dest_iso2: str, ship_date=None, loader=None) -> tuple:
         """
-        Check if a service has restrictions for a destination
+        Check if a service has restrictions for a destination on the ship date
 
         Returns:
             (warning_message, is_suspended)
         """
-        key = (service_code, dest_iso2)
-        restriction = self.restrictions.get(key)
+        restriction = (loader or self.loader).restriction_on(service.service_id, dest_iso2, ship_date)
 
         if not restriction:
             return (None, False)
 
-        status = restriction.get('status', 'UNKNOWN')
-        is_suspended = status == 'SUSPENDED'
-        warning = restriction.get('message_fr', '⚠️ Service restreint')
-
-        return (warning, is_suspended)
+        return (restriction.message, restriction.is_suspended)
+
+    def _suspended_service(self, service, dest_iso2: str, ship_date=None, loader=None) -> SuspendedService:
+        """Service suspendu, alternative choisie une fois les offres tarifées"""
+        loader = loader or self.loader
+        restriction = loader.restriction_on(service.service_id, dest_iso2, ship_date)
+        carrier = loader.carriers[service.carrier_id]
+
+        return SuspendedService(
+            service_code=service.code,
+            service_label=service.label,
+            carrier_code=carrier.code,
+            carrier_name=carrier.name,
+            message=restriction.message,
+            message_en=restriction.message_en,
+            alternative_services=restriction.alternative_services
+        )
+
+    @staticmethod
+    def _pick_alternatives(suspended: List[SuspendedService], offers: List[PriceOffer]):
+        """Offre la moins chère parmi les alternatives de chaque service suspendu (offres triées)"""
+        for entry in suspended:
+            entry.alternative = next(
+                (offer for offer in offers if offer.service_code in entry.alternative_services), None
+            )
 
 
 def main():
@@ -0,0 +1,78 @@
+"""
+Freight - Tarification fret (palettes, services jusqu'à 1000 kg)
+
+Différences avec la tarification colis (price_shipment):
+- Seuls les services fret sont évalués (max_weight_kg > 70 kg: FedEx IPF,
+  IEF, REF).
+- Un envoi multi-pièces est tarifé sur son poids taxable total, avec une
+  seule bande pour l'envoi (et non une bande par colis).
+- Poids taxable = somme des max(poids réel, poids volumétrique) des pièces,
+  arrondie au kg supérieur.
+- Bandes au kg avec minimum de perception: pour une bande is_min_charge
+  avec amount_per_kg, base_amount est le minimum facturé et
+  fret = max(amount_per_kg × poids, base_amount).
+"""
+
+import math
+from decimal import Decimal
+from typing import List, Optional
+
+from .loader import Service, TariffBand
+
+
+# Au-delà, un envoi n'est plus un colis (limite des services colis, /price)
+PARCEL_MAX_WEIGHT_KG = 70.0
+
+# Limite par pièce des services fret
+FREIGHT_MAX_WEIGHT_KG = 1000.0
+
+# Pas d'arrondi du poids taxable fret
+FREIGHT_WEIGHT_STEP_KG = 1.0
+
+
+def is_freight_service(service: Service) -> bool:
+    """True pour les services fret (pièces de plus de 70 kg acceptées)"""
+    return service.max_weight_kg > PARCEL_MAX_WEIGHT_KG
+
+
+def chargeable_freight_weight(
+    piece_weights: List[float],
+    piece_volumes: Optional[List[Optional[float]]],
+    volumetric_divisor: float
+) -> float:
+    """
+    Poids taxable d'un envoi fret
+
+    Args:
+        piece_weights: Poids réel de chaque pièce (kg)
+        piece_volumes: Volume de chaque pièce en cm³ (None = pas de volumétrique)
+        volumetric_divisor: Diviseur du service (cm³/kg)
+
+    Returns:
+        Somme des poids taxables des pièces, arrondie au pas supérieur
+    """
+    if piece_volumes is None:
+        total = sum(piece_weights)
+    else:
+        total = sum(
+            max(weight, volume / volumetric_divisor) if volume else weight
+            for weight, volume in zip(piece_weights, piece_volumes)
+        )
+
+    # round() absorbe le bruit flottant avant l'arrondi (ex: 120.00000001 → 120)
+    return math.ceil(round(total / FREIGHT_WEIGHT_STEP_KG, 6)) * FREIGHT_WEIGHT_STEP_KG
+
+
+def freight_amount(band: TariffBand, weight_kg: float) -> Decimal:
+    """
+    Fret d'un envoi sur une bande fret
+
+    - Bande au kg avec minimum: max(amount_per_kg × poids, base_amount)
+    - Sinon: base_amount + amount_per_kg × poids (comme les colis)
+    """
+    weight = Decimal(str(weight_kg))
+
+    if band.is_min_charge and band.amount_per_kg:
+        return max(band.amount_per_kg * weight, band.base_amount)
+
+    return band.base_amount + band.amount_per_kg * weight
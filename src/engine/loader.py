@@ -5,10 +5,20 @@ Construit les index pour un accès rapide
 
 import csv
 import json
+import logging
+import pickle
 from pathlib import Path
+from datetime import date
 from decimal import Decimal
-from typing import Dict, List, Set
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+from dataclasses import dataclass, field
+
+from .effective import EffectiveIndex, as_date, is_active, parse_date
+from .postal_index import PostalIndex
+from .restrictions import RestrictionIndex, ServiceRestriction, read_restrictions, restrictions_path
+from .validator import TariffValidationError, ValidationReport, validate_dir
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -31,6 +41,9 @@ class Service:
     incoterm: str
     service_type: str
     max_weight_kg: float
+    volumetric_divisor: float = 5000.0  # cm³/kg (poids volumétrique = L×l×H / divisor)
+    active_from: Optional[date] = None  # Premier jour de validité (None = depuis toujours)
+    active_to: Optional[date] = None  # Dernier jour de validité, inclus (None = sans fin)
 
 
 @dataclass
@@ -42,6 +55,7 @@ class TariffScope:
     is_catch_all: bool
     countries: Set[str]  # Set de ISO2
     bands: List['TariffBand']
+    band_mins: List[float] = field(default_factory=list)  # min_weight_kg des bandes triées (bisect)
 
 
 @dataclass
@@ -64,42 +78,75 @@ class SurchargeRule:
     basis: str
     value: Decimal
     conditions: dict
+    active_from: Optional[date] = None
+    active_to: Optional[date] = None
 
 
 class DataLoader:
     """Charge les données normalisées depuis CSV"""
 
-    def __init__(self, data_dir: Path = None):
+    def __init__(self, data_dir: Path = None, validate: bool = True):
         if data_dir is None:
             data_dir = Path(__file__).parent.parent.parent / "data" / "normalized"
 
         self.data_dir = data_dir
+        self.restrictions_path = restrictions_path(data_dir)  # data/service_restrictions.json
+        self.validate = validate  # Contrôle d'intégrité avant chargement (validator.py)
+        self.validation: Optional[ValidationReport] = None
 
         # Données chargées
         self.carriers: Dict[int, Carrier] = {}
         self.services: Dict[int, Service] = {}
         self.scopes: Dict[int, TariffScope] = {}
-        self.surcharges: Dict[int, List[SurchargeRule]] = {}  # service_id -> rules
+        self.surcharges: Dict[int, List[SurchargeRule]] = {}  # service_id -> rules (toutes versions)
+        self.restrictions: List[ServiceRestriction] = []
 
         # Index rapides
         self.scopes_by_service: Dict[int, List[TariffScope]] = {}
         self.scope_by_service_country: Dict[tuple, TariffScope] = {}  # (service_id, iso2) -> scope
+        self.scopes_by_service_country: Dict[tuple, List[TariffScope]] = {}  # (service_id, iso2) -> scopes non catch-all
+        self.postal_index = PostalIndex()  # Zones infra-pays (tariff_scope_postal_codes.csv, optionnel)
+        self.effective_index: Optional[EffectiveIndex] = None  # Date -> services en vigueur
+        self.restriction_index = RestrictionIndex()  # (service_id, iso2) -> suspensions datées
 
     def load_all(self):
-        """Charge toutes les données"""
+        """
+        Charge toutes les données
+
+        Raises:
+            TariffValidationError: Si le contrôle d'intégrité trouve des erreurs
+        """
         print("📦 Loading pricing data...")
 
+        if self.validate:
+            self.validation = validate_dir(self.data_dir)
+            if not self.validation.ok:
+                raise TariffValidationError(self.validation)
+            self._log_warnings()
+
         self._load_carriers()
         self._load_services()
         self._load_scopes()
         self._load_bands()
         self._load_surcharges()
+        self._load_postal_codes()
+        self._load_restrictions()
 
         self._build_indexes()
 
         print(f"✅ Loaded {len(self.carriers)} carriers, {len(self.services)} services, "
               f"{len(self.scopes)} scopes")
 
+    def _log_warnings(self):
+        """
+        Avertissements connus: journalisés (INFO) plutôt qu'affichés à chaque
+        chargement. Les nouveaux avertissements sont bloqués par
+        PricingEngine.reload().
+        """
+        if self.validation and self.validation.warnings:
+            logger.info(f"⚠️  {len(self.validation.warnings)} integrity warnings "
+                        f"(python -m src.cli.validate_tariffs)")
+
     def _load_carriers(self):
         """Charge carriers.csv"""
         path = self.data_dir / "carriers.csv"
@@ -136,7 +183,10 @@ class DataLoader:
                     origin_iso2=row["origin_iso2"],
                     incoterm=row["incoterm"],
                     service_type=row["service_type"],
-                    max_weight_kg=float(row["max_weight_kg"])
+                    max_weight_kg=float(row["max_weight_kg"]),
+                    volumetric_divisor=float(row.get("volumetric_divisor") or 5000.0),
+                    active_from=parse_date(row.get("active_from")),
+                    active_to=parse_date(row.get("active_to"))
                 )
                 self.services[service.service_id] = service
 
@@ -197,6 +247,7 @@ class DataLoader:
         # Trier les bands par min_weight pour chaque scope
         for scope in self.scopes.values():
             scope.bands.sort(key=lambda b: b.min_weight_kg)
+            scope.band_mins = [band.min_weight_kg for band in scope.bands]
 
     def _load_surcharges(self):
         """Charge surcharge_rules.csv"""
@@ -222,7 +273,9 @@ class DataLoader:
                     kind=row["kind"],
                     basis=row["basis"],
                     value=Decimal(row["value"]),
-                    conditions=conditions
+                    conditions=conditions,
+                    active_from=parse_date(row.get("active_from")),
+                    active_to=parse_date(row.get("active_to"))
                 )
 
                 if service_id not in self.surcharges:
@@ -230,6 +283,40 @@ class DataLoader:
 
                 self.surcharges[service_id].append(rule)
 
+    def _load_postal_codes(self):
+        """
+        Charge tariff_scope_postal_codes.csv (optionnel)
+
+        Une ligne par règle: préfixe si postal_to est vide, sinon plage
+        inclusive postal_from..postal_to.
+        """
+        path = self.data_dir / "tariff_scope_postal_codes.csv"
+
+        if not path.exists():
+            return
+
+        with path.open("r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+
+            for row in reader:
+                scope_id = int(row["scope_id"])
+                if scope_id not in self.scopes:
+                    continue
+
+                iso2 = row["country_iso2"]
+                postal_to = (row.get("postal_to") or "").strip()
+
+                if postal_to:
+                    self.postal_index.add_range(iso2, row["postal_from"], postal_to, scope_id)
+                else:
+                    self.postal_index.add_prefix(iso2, row["postal_from"], scope_id)
+
+    def _load_restrictions(self):
+        """Charge service_restrictions.json (optionnel, à côté de data/normalized)"""
+        self.restrictions = [
+            ServiceRestriction.from_json(entry) for entry in read_restrictions(self.restrictions_path)
+        ]
+
     def _build_indexes(self):
         """Construit les index pour accès rapide"""
 
@@ -250,6 +337,53 @@ class DataLoader:
                 if key not in self.scope_by_service_country or not scope.is_catch_all:
                     self.scope_by_service_country[key] = scope
 
+        # Index: (service_id, country_iso2) -> tous les scopes non catch-all
+        # (plusieurs zones pour un même pays: UPS CA 1-5, Delivengo boxable/non boxable)
+        for scope_id in sorted(self.scopes):
+            scope = self.scopes[scope_id]
+            if scope.is_catch_all:
+                continue
+            for iso2 in scope.countries:
+                self.scopes_by_service_country.setdefault((scope.service_id, iso2), []).append(scope)
+
+        # Index: date -> versions de services en vigueur
+        self.effective_index = EffectiveIndex(self.services.values())
+
+        # Index: (service_id, country_iso2) -> restrictions datées
+        self.restriction_index = RestrictionIndex(self.restrictions, self.services.values())
+
+    def services_on(self, ship_date=None) -> Dict[int, Service]:
+        """Services en vigueur à une date, une version par code (défaut: aujourd'hui)"""
+        return self.effective_index.at(as_date(ship_date))
+
+    def surcharges_on(self, service_id: int, ship_date=None) -> List[SurchargeRule]:
+        """Surcharges d'un service en vigueur à une date (défaut: aujourd'hui)"""
+        day = as_date(ship_date)
+        return [rule for rule in self.surcharges.get(service_id, []) if is_active(rule, day)]
+
+    def restriction_on(self, service_id: int, country_iso2: str, ship_date=None) -> Optional[ServiceRestriction]:
+        """Restriction d'un service vers un pays en vigueur à une date (défaut: aujourd'hui)"""
+        return self.restriction_index.lookup(service_id, country_iso2, as_date(ship_date))
+
+    def reloaded(self) -> 'DataLoader':
+        """Nouvelle instance chargée depuis la même source (rechargement à chaud)"""
+        loader = DataLoader(data_dir=self.data_dir, validate=self.validate)
+        loader.load_all()
+        return loader
+
+    def snapshot(self) -> bytes:
+        """
+        Sérialise les données chargées (pour les workers d'un process pool)
+
+        Les workers reconstruisent le loader via from_snapshot() sans relire les CSV
+        """
+        return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def from_snapshot(data: bytes) -> 'DataLoader':
+        """Reconstruit un DataLoader depuis snapshot()"""
+        return pickle.loads(data)
+
 
 def load_engine():
     """Helper: charge et retourne un DataLoader prêt"""
@@ -0,0 +1,127 @@
+"""
+Postal index - Zones infra-pays par code postal
+
+Certains transporteurs découpent un pays en plusieurs zones (UPS: CA 1-5,
+AU 1-3...). Les règles (préfixes ou plages de codes postaux) de chaque scope
+sont rangées dans un trie par pays:
+
+- Préfixe "75" → toutes les adresses dont le code commence par 75.
+- Plage "20000"-"20999" → décomposée en préfixes à l'insertion ("20"), les
+  plages non alignées donnant quelques préfixes de plus
+  (ex: "75001"-"75020" → 75001..75009, 7501, 75020).
+
+Recherche en O(longueur du code): un parcours du trie renvoie, pour chaque
+scope ayant une règle qui couvre le code, la longueur du préfixe le plus
+long (la règle la plus précise l'emporte, service par service).
+
+Fichier optionnel data/normalized/tariff_scope_postal_codes.csv:
+    scope_id,country_iso2,postal_from,postal_to
+    42,CA,K,           # Préfixe
+    43,FR,20000,20999  # Plage (codes numériques de même longueur)
+"""
+
+import re
+from typing import Dict, List, Set
+
+
+def normalize_postal_code(postal_code: str) -> str:
+    """Code postal normalisé pour le trie (majuscules, sans espaces ni tirets)"""
+    return re.sub(r"[\s\-]", "", postal_code or "").upper()
+
+
+def range_to_prefixes(low: str, high: str) -> List[str]:
+    """
+    Décompose une plage numérique inclusive en préfixes
+
+    Args:
+        low: Début de plage ("20000")
+        high: Fin de plage ("20999"), même longueur que low
+
+    Returns:
+        Liste minimale de préfixes couvrant exactement la plage
+    """
+    if len(low) != len(high) or not (low.isdigit() and high.isdigit()):
+        raise ValueError(f"Postal range must be numeric codes of the same length: {low}-{high}")
+    if low > high:
+        raise ValueError(f"Empty postal range: {low}-{high}")
+
+    length = len(low)
+    prefixes = []
+    start, end = int(low), int(high)
+
+    while start <= end:
+        # Plus grand bloc aligné 10^k commençant à start et contenu dans la plage
+        size = 1
+        while size * 10 <= 10 ** length and start % (size * 10) == 0 and start + size * 10 - 1 <= end:
+            size *= 10
+
+        digits = length - (len(str(size)) - 1)
+        prefixes.append(str(start).zfill(length)[:digits])
+        start += size
+
+    return prefixes
+
+
+class _Node:
+    __slots__ = ("children", "scope_ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.scope_ids: Set[int] = set()
+
+
+class PostalIndex:
+    """Tries de préfixes de codes postaux, un par pays"""
+
+    def __init__(self):
+        self._roots: Dict[str, _Node] = {}
+        self.zoned_scopes: Set[int] = set()  # Scopes ayant au moins une règle postale
+        self.rule_count = 0
+
+    def __len__(self) -> int:
+        return self.rule_count
+
+    def add_prefix(self, country_iso2: str, prefix: str, scope_id: int):
+        """Ajoute une règle préfixe (préfixe vide = tout le pays)"""
+        node = self._roots.setdefault(country_iso2, _Node())
+
+        for char in normalize_postal_code(prefix):
+            node = node.children.setdefault(char, _Node())
+
+        node.scope_ids.add(scope_id)
+        self.zoned_scopes.add(scope_id)
+        self.rule_count += 1
+
+    def add_range(self, country_iso2: str, low: str, high: str, scope_id: int):
+        """Ajoute une plage inclusive de codes numériques"""
+        for prefix in range_to_prefixes(normalize_postal_code(low), normalize_postal_code(high)):
+            self.add_prefix(country_iso2, prefix, scope_id)
+
+    def has_zones(self, country_iso2: str) -> bool:
+        return country_iso2 in self._roots
+
+    def lookup(self, country_iso2: str, postal_code: str) -> Dict[int, int]:
+        """
+        Scopes dont une règle couvre le code postal
+
+        Returns:
+            scope_id → longueur du préfixe le plus long qui correspond
+            (vide si aucune règle du pays ne couvre ce code)
+        """
+        node = self._roots.get(country_iso2)
+        matches: Dict[int, int] = {}
+
+        if node is None:
+            return matches
+
+        for scope_id in node.scope_ids:
+            matches[scope_id] = 0
+
+        for depth, char in enumerate(normalize_postal_code(postal_code), 1):
+            node = node.children.get(char)
+            if node is None:
+                break
+            for scope_id in node.scope_ids:
+                matches[scope_id] = depth
+
+        return matches
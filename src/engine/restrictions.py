@@ -0,0 +1,114 @@
+"""
+Restrictions - Suspensions et restrictions de services par pays
+
+Source: data/service_restrictions.json (à côté de data/normalized). Le
+fichier est chargé par le DataLoader avec les tarifs: même snapshot
+(loader.pkl, base SQLite), même validation, même rechargement à chaud.
+
+Index par (service_id, pays ISO2): une restriction écrite pour un code de
+service s'applique à toutes ses versions datées. Chaque restriction a un
+intervalle de validité effective_date → end_date (inclus, optionnels): une
+expédition antérieure à la suspension est tarifée normalement.
+
+Le moteur consulte l'index avant toute recherche de scope ou de bande: un
+service suspendu ne coûte qu'une lecture de dict.
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .effective import is_active, parse_date
+
+
+RESTRICTIONS_FILE = "service_restrictions.json"
+
+STATUS_SUSPENDED = "SUSPENDED"
+
+
+def restrictions_path(normalized_dir: Path) -> Path:
+    """Fichier des restrictions associé à un répertoire data/normalized"""
+    return Path(normalized_dir).parent / RESTRICTIONS_FILE
+
+
+@dataclass
+class ServiceRestriction:
+    service_code: str
+    country_iso2: str
+    status: str  # SUSPENDED | autre statut = avertissement seul
+    reason: str = ""
+    message: str = "⚠️ Service restreint"  # message_fr
+    message_en: str = ""
+    alternative_services: List[str] = field(default_factory=list)  # Codes de services de remplacement
+    active_from: Optional[date] = None  # effective_date
+    active_to: Optional[date] = None  # end_date (inclus)
+    raw: dict = field(default_factory=dict, repr=False)  # Entrée JSON d'origine
+
+    @property
+    def is_suspended(self) -> bool:
+        return self.status == STATUS_SUSPENDED
+
+    @classmethod
+    def from_json(cls, entry: dict) -> 'ServiceRestriction':
+        return cls(
+            service_code=entry["service_code"],
+            country_iso2=entry["country_iso2"],
+            status=entry.get("status", "UNKNOWN"),
+            reason=entry.get("reason", ""),
+            message=entry.get("message_fr", "⚠️ Service restreint"),
+            message_en=entry.get("message_en", ""),
+            alternative_services=list(entry.get("alternative_services", [])),
+            active_from=parse_date(entry.get("effective_date")),
+            active_to=parse_date(entry.get("end_date")),
+            raw=entry
+        )
+
+
+def read_restrictions(path: Path) -> List[dict]:
+    """Entrées JSON brutes du fichier (liste vide s'il n'existe pas)"""
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f).get("restrictions", [])
+
+
+class RestrictionIndex:
+    """Restrictions indexées par (service_id, ISO2), filtrées par date"""
+
+    def __init__(self, restrictions: Iterable[ServiceRestriction] = (), services: Iterable = ()):
+        self.restrictions = list(restrictions)
+
+        # Toutes les versions d'un code de service
+        service_ids: Dict[str, List[int]] = {}
+        for service in services:
+            service_ids.setdefault(service.code, []).append(service.service_id)
+
+        self._by_service_country: Dict[Tuple[int, str], List[ServiceRestriction]] = {}
+        for restriction in self.restrictions:
+            for service_id in service_ids.get(restriction.service_code, []):
+                key = (service_id, restriction.country_iso2)
+                self._by_service_country.setdefault(key, []).append(restriction)
+
+    def lookup(self, service_id: int, country_iso2: str, day: date) -> Optional[ServiceRestriction]:
+        """Restriction en vigueur le jour donné (None = aucune)"""
+        candidates = self._by_service_country.get((service_id, country_iso2))
+        if not candidates:
+            return None
+
+        for restriction in candidates:
+            if is_active(restriction, day):
+                return restriction
+
+        return None
+
+    @property
+    def by_code(self) -> Dict[Tuple[str, str], dict]:
+        """Entrées JSON par (service_code, ISO2), toutes dates confondues"""
+        return {(r.service_code, r.country_iso2): r.raw for r in self.restrictions}
+
+    def __len__(self) -> int:
+        return len(self.restrictions)
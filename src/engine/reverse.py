@@ -0,0 +1,264 @@
+"""
+Reverse queries - Recherches par budget plutôt que par destination
+
+- lanes_under(poids, plafond): tous les couples (pays, service) dont le prix
+  total au poids donné est <= plafond
+- max_weight_under(pays, plafond): poids maximal expédiable sous le plafond,
+  par service
+
+Le prix d'un colis ne dépend que du scope (bandes) et du service
+(surcharges), pas du pays: l'index regroupe les pays par (service, scope) et
+chaque scope est évalué une seule fois, au lieu d'appeler price() pour chaque
+pays.
+
+Usage:
+    index = ReverseIndex(engine)
+    lanes = index.lanes_under(1.0, 15)
+    budgets = index.max_weight_under("JP", 30)
+"""
+
+import bisect
+import math
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from .breakpoints import ServiceCurve
+
+
+@dataclass(frozen=True)
+class LaneQuote:
+    """Couple (pays, service) sous le plafond de prix"""
+    country_iso2: str
+    service_code: str
+    carrier_code: str
+    total: Decimal
+    currency: str
+
+
+@dataclass(frozen=True)
+class WeightBudget:
+    """Poids maximal expédiable sous un plafond de prix avec un service"""
+    country_iso2: str
+    service_code: str
+    carrier_code: str
+    weight_kg: float
+    total: Decimal
+    currency: str
+
+
+@dataclass
+class _BandTotals:
+    """Prix aux bornes de chaque bande d'un scope (pour max_weight_under)"""
+    lows: List[float]  # Poids bas de chaque bande
+    highs: List[float]  # Poids haut (plafonné au max du service)
+    totals: List[Tuple[Decimal, Decimal]]  # Prix aux deux bornes
+    suffix_min: List[float]  # suffix_min[i] = prix minimal des bandes i..n (non décroissant)
+
+
+class ReverseIndex:
+    """
+    Index pays ↔ (service, scope) pour les requêtes inverses
+
+    Construit une fois par moteur (voir PricingEngine.reverse_index). Les
+    services suspendus pour un pays n'y figurent pas.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+
+        # Tarifs lus une fois: l'index reste cohérent si le moteur est rechargé
+        self.loader = engine.loader
+
+        # Une courbe par (service, scope) effectivement utilisé, avec ses pays
+        self.curves: List[ServiceCurve] = []
+        self.countries: List[List[str]] = []
+        self.curves_by_country: Dict[str, List[int]] = {}
+
+        self._band_totals: Dict[int, _BandTotals] = {}
+
+        self._build()
+
+    def _build(self):
+        """Résout les scopes de chaque (service, pays), regroupés par scope"""
+        loader = self.loader
+
+        # Pays connus: alias du résolveur + pays listés dans les scopes
+        universe = set(self.engine.resolver.alias_map.values())
+        for scope in loader.scopes.values():
+            universe.update(scope.countries)
+
+        for service_id, service in loader.services_on().items():
+            countries_by_scope: Dict[int, List[str]] = {}
+
+            for iso2 in sorted(universe):
+                scopes = [scope for scope in self.engine._find_scopes(service_id, iso2, loader=loader) if scope.bands]
+                if not scopes:
+                    continue
+
+                _, is_suspended = self.engine._check_restriction(service, iso2, loader=loader)
+                if is_suspended:
+                    continue
+
+                for scope in scopes:
+                    countries_by_scope.setdefault(scope.scope_id, []).append(iso2)
+
+            for scope_id, countries in countries_by_scope.items():
+                index = len(self.curves)
+                self.curves.append(ServiceCurve.for_scope(self.engine, service_id, loader.scopes[scope_id], loader))
+                self.countries.append(countries)
+
+                for iso2 in countries:
+                    self.curves_by_country.setdefault(iso2, []).append(index)
+
+    def lanes_under(self, weight_kg: float, max_total: float) -> List[LaneQuote]:
+        """
+        Tous les couples (pays, service) à <= max_total pour un colis
+
+        Args:
+            weight_kg: Poids du colis
+            max_total: Plafond du prix total (surcharges comprises)
+
+        Returns:
+            Liste triée par prix croissant puis pays
+        """
+        cap = Decimal(str(max_total))
+        lanes = []
+
+        for curve, countries in zip(self.curves, self.countries):
+            band = curve.band_at(weight_kg)
+            if band is None:
+                continue
+
+            total = curve.total(self.engine, band, countries[0], weight_kg)
+            if total > cap:
+                continue
+
+            lanes.extend(
+                LaneQuote(
+                    country_iso2=iso2,
+                    service_code=curve.service_code,
+                    carrier_code=curve.carrier_code,
+                    total=total,
+                    currency=curve.currency
+                )
+                for iso2 in countries
+            )
+
+        lanes.sort(key=lambda lane: (lane.total, lane.country_iso2, lane.service_code))
+        return lanes
+
+    def max_weight_under(self, country_iso2: str, max_total: float) -> List[WeightBudget]:
+        """
+        Poids maximal expédiable vers un pays sous un plafond, par service
+
+        Args:
+            country_iso2: Code ISO2 de destination
+            max_total: Plafond du prix total (surcharges comprises)
+
+        Returns:
+            Liste triée par poids décroissant (le premier est le meilleur budget)
+        """
+        cap = Decimal(str(max_total))
+        budgets = []
+
+        for index in self.curves_by_country.get(country_iso2, []):
+            curve = self.curves[index]
+            found = self._max_weight(index, country_iso2, cap)
+
+            if found:
+                weight_kg, total = found
+                budgets.append(WeightBudget(
+                    country_iso2=country_iso2,
+                    service_code=curve.service_code,
+                    carrier_code=curve.carrier_code,
+                    weight_kg=weight_kg,
+                    total=total,
+                    currency=curve.currency
+                ))
+
+        budgets.sort(key=lambda b: (-b.weight_kg, b.total))
+        return budgets
+
+    def _max_weight(self, index: int, country_iso2: str, cap: Decimal) -> Optional[Tuple[float, Decimal]]:
+        """
+        Plus grand poids d'un scope dont le prix est <= cap
+
+        La dernière bande dont le prix minimal passe sous le plafond est
+        trouvée par bisect sur suffix_min, puis le poids est résolu sur la
+        droite de prix de cette bande (arrondi au gramme inférieur).
+        """
+        curve = self.curves[index]
+        totals = self._totals(index, country_iso2)
+
+        last = bisect.bisect_right(totals.suffix_min, float(cap)) - 1
+
+        # Normalement la bande `last` convient; on redescend si une borne
+        # partagée appartient en fait à la bande précédente
+        for i in range(last, -1, -1):
+            found = self._solve_band(curve, totals, i, country_iso2, cap)
+            if found:
+                return found
+
+        return None
+
+    def _solve_band(
+        self,
+        curve: ServiceCurve,
+        totals: _BandTotals,
+        i: int,
+        country_iso2: str,
+        cap: Decimal
+    ) -> Optional[Tuple[float, Decimal]]:
+        low, high = totals.lows[i], totals.highs[i]
+        total_low, total_high = totals.totals[i]
+
+        if total_high <= cap:
+            weight_kg = high
+        elif total_low <= cap:
+            ratio = (cap - total_low) / (total_high - total_low)
+            weight_kg = max(low, math.floor((low + (high - low) * float(ratio)) * 1000) / 1000)
+        else:
+            return None
+
+        if weight_kg <= 0:
+            return None
+
+        # Vérification avec la bande réellement appliquée par le moteur
+        band = curve.band_at(weight_kg)
+        if band is None:
+            return None
+
+        total = curve.total(self.engine, band, country_iso2, weight_kg)
+        return (weight_kg, total) if total <= cap else None
+
+    def _totals(self, index: int, country_iso2: str) -> _BandTotals:
+        """Prix aux bornes des bandes d'un scope (calculés au premier usage)"""
+        totals = self._band_totals.get(index)
+        if totals is not None:
+            return totals
+
+        curve = self.curves[index]
+        lows, highs, prices = [], [], []
+
+        for band in curve.scope.bands:
+            if band.min_weight_kg > curve.max_weight_kg:
+                break
+
+            high = min(band.max_weight_kg, curve.max_weight_kg)
+            lows.append(band.min_weight_kg)
+            highs.append(high)
+            prices.append((
+                curve.total(self.engine, band, country_iso2, band.min_weight_kg),
+                curve.total(self.engine, band, country_iso2, high)
+            ))
+
+        suffix_min = [0.0] * len(prices)
+        running = math.inf
+        for i in range(len(prices) - 1, -1, -1):
+            running = min(running, float(min(prices[i])))
+            suffix_min[i] = running
+
+        totals = _BandTotals(lows=lows, highs=highs, totals=prices, suffix_min=suffix_min)
+        self._band_totals[index] = totals
+        return totals
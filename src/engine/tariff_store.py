@@ -0,0 +1,559 @@
+"""
+Tariff store - Base SQLite générée depuis data/normalized
+
+- Requêtes ad hoc indexées sans tout charger (bandes d'un scope, services
+  desservant un pays...), voir TariffStore.
+- Backend DataLoader paresseux (SQLiteDataLoader): transporteurs, services,
+  surcharges et zones postales sont chargés au démarrage; scopes et bandes
+  sont lus à la demande puis gardés en mémoire.
+
+Index:
+- tariff_scope_countries (service_id, country_iso2): service_id est
+  dénormalisé depuis tariff_scopes à la génération
+- tariff_bands (scope_id, min_weight_kg)
+
+Les restrictions (data/service_restrictions.json) sont compilées dans la
+même base. Comme le DataLoader CSV, les pays et bandes dont le scope
+n'existe pas sont ignorés, et des CSV en erreur d'intégrité (validator.py)
+ne sont pas compilés. La base garde l'empreinte des CSV sources (table
+meta): store_is_current() indique si elle doit être régénérée.
+Le rapport de validation des CSV est aussi gardé dans meta: SQLiteDataLoader
+le relit, et PricingEngine.reload() refuse les nouveaux avertissements comme
+avec le DataLoader CSV.
+
+Usage:
+    python -m src.cli.tariff_store build
+    python -m src.cli.tariff_store bench
+"""
+
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Mapping
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from .effective import EffectiveIndex, parse_date
+from .loader import Carrier, DataLoader, Service, SurchargeRule, TariffBand, TariffScope
+from .restrictions import RestrictionIndex, ServiceRestriction, read_restrictions, restrictions_path
+from .validator import Issue, TariffValidationError, ValidationReport, validate_dir
+
+
+DEFAULT_NORMALIZED_DIR = Path(__file__).parent.parent.parent / "data" / "normalized"
+DEFAULT_STORE_PATH = Path(__file__).parent.parent.parent / "data" / "compiled" / "tariffs.sqlite"
+
+# Incrémenter si le schéma change (une base d'une autre version est régénérée)
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+
+CREATE TABLE carriers (
+    carrier_id INTEGER PRIMARY KEY, code TEXT NOT NULL, name TEXT NOT NULL, currency TEXT NOT NULL
+);
+
+CREATE TABLE services (
+    service_id INTEGER PRIMARY KEY, carrier_id INTEGER NOT NULL, code TEXT NOT NULL, label TEXT,
+    direction TEXT, origin_iso2 TEXT, incoterm TEXT, service_type TEXT,
+    max_weight_kg REAL NOT NULL, volumetric_divisor REAL, active_from TEXT, active_to TEXT
+);
+
+CREATE TABLE tariff_scopes (
+    scope_id INTEGER PRIMARY KEY, service_id INTEGER NOT NULL, code TEXT NOT NULL,
+    description TEXT, is_catch_all INTEGER NOT NULL
+);
+
+CREATE TABLE tariff_scope_countries (
+    scope_id INTEGER NOT NULL, service_id INTEGER NOT NULL, country_iso2 TEXT NOT NULL
+);
+
+-- Montants en TEXT: valeurs Decimal exactes
+CREATE TABLE tariff_bands (
+    band_id INTEGER PRIMARY KEY, scope_id INTEGER NOT NULL,
+    min_weight_kg REAL NOT NULL, max_weight_kg REAL NOT NULL,
+    base_amount TEXT NOT NULL, amount_per_kg TEXT NOT NULL, is_min_charge INTEGER NOT NULL,
+    file_order INTEGER NOT NULL
+);
+
+CREATE TABLE surcharge_rules (
+    surcharge_id INTEGER PRIMARY KEY, service_id INTEGER NOT NULL, name TEXT, kind TEXT,
+    basis TEXT, value TEXT NOT NULL, conditions TEXT, active_from TEXT, active_to TEXT
+);
+
+CREATE TABLE tariff_scope_postal_codes (
+    scope_id INTEGER NOT NULL, country_iso2 TEXT NOT NULL, postal_from TEXT NOT NULL, postal_to TEXT
+);
+
+-- Entrées de service_restrictions.json (JSON d'origine)
+CREATE TABLE service_restrictions (
+    service_code TEXT NOT NULL, country_iso2 TEXT NOT NULL, entry TEXT NOT NULL
+);
+
+CREATE INDEX idx_scopes_service ON tariff_scopes (service_id);
+CREATE INDEX idx_scope_countries_service_country ON tariff_scope_countries (service_id, country_iso2);
+CREATE INDEX idx_scope_countries_country ON tariff_scope_countries (country_iso2);
+CREATE INDEX idx_scope_countries_scope ON tariff_scope_countries (scope_id);
+CREATE INDEX idx_bands_scope_weight ON tariff_bands (scope_id, min_weight_kg);
+"""
+
+SOURCE_FILES = [
+    "carriers.csv",
+    "services.csv",
+    "tariff_scopes.csv",
+    "tariff_scope_countries.csv",
+    "tariff_bands.csv",
+    "surcharge_rules.csv",
+    "tariff_scope_postal_codes.csv",
+]
+
+
+def source_hash(normalized_dir: Path) -> str:
+    """Empreinte des CSV normalisés (fichiers optionnels compris) et des restrictions"""
+    digest = hashlib.sha256(f"v{SCHEMA_VERSION}".encode())
+
+    for name in SOURCE_FILES:
+        path = Path(normalized_dir) / name
+        if path.exists():
+            digest.update(name.encode())
+            digest.update(path.read_bytes())
+
+    path = restrictions_path(normalized_dir)
+    if path.exists():
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+
+    return digest.hexdigest()
+
+
+def _read_csv(path: Path) -> List[dict]:
+    if not path.exists():
+        return []
+    with path.open("r", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _flag(value: str) -> int:
+    return 1 if (value or "").lower() == "true" else 0
+
+
+def build_store(normalized_dir: Optional[Path] = None, db_path: Optional[Path] = None) -> Path:
+    """
+    Génère la base SQLite depuis les CSV normalisés
+
+    La base est écrite dans un fichier temporaire puis renommée: un lecteur
+    ne voit jamais une base à moitié construite.
+
+    Returns:
+        Chemin de la base
+
+    Raises:
+        TariffValidationError: Si les CSV ont des erreurs d'intégrité (base inchangée)
+    """
+    normalized_dir = Path(normalized_dir or DEFAULT_NORMALIZED_DIR)
+    db_path = Path(db_path or DEFAULT_STORE_PATH)
+
+    report = validate_dir(normalized_dir)
+    if not report.ok:
+        raise TariffValidationError(report)
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = db_path.with_suffix(db_path.suffix + ".tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+
+        conn.executemany(
+            "INSERT INTO carriers VALUES (?, ?, ?, ?)",
+            [(int(r["carrier_id"]), r["code"], r["name"], r["currency"])
+             for r in _read_csv(normalized_dir / "carriers.csv")]
+        )
+
+        conn.executemany(
+            "INSERT INTO services VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(int(r["service_id"]), int(r["carrier_id"]), r["code"], r["label"], r["direction"],
+              r["origin_iso2"], r["incoterm"], r["service_type"], float(r["max_weight_kg"]),
+              float(r.get("volumetric_divisor") or 5000.0),
+              r.get("active_from") or None, r.get("active_to") or None)
+             for r in _read_csv(normalized_dir / "services.csv")]
+        )
+
+        scope_rows = _read_csv(normalized_dir / "tariff_scopes.csv")
+        service_by_scope = {int(r["scope_id"]): int(r["service_id"]) for r in scope_rows}
+
+        conn.executemany(
+            "INSERT INTO tariff_scopes VALUES (?, ?, ?, ?, ?)",
+            [(int(r["scope_id"]), int(r["service_id"]), r["code"], r["description"], _flag(r["is_catch_all"]))
+             for r in scope_rows]
+        )
+
+        conn.executemany(
+            "INSERT INTO tariff_scope_countries VALUES (?, ?, ?)",
+            [(int(r["scope_id"]), service_by_scope[int(r["scope_id"])], r["country_iso2"])
+             for r in _read_csv(normalized_dir / "tariff_scope_countries.csv")
+             if int(r["scope_id"]) in service_by_scope]
+        )
+
+        conn.executemany(
+            "INSERT INTO tariff_bands VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(int(r["band_id"]), int(r["scope_id"]), float(r["min_weight_kg"]), float(r["max_weight_kg"]),
+              str(Decimal(r["base_amount"])), str(Decimal(r["amount_per_kg"])), _flag(r["is_min_charge"]), order)
+             for order, r in enumerate(_read_csv(normalized_dir / "tariff_bands.csv"))
+             if int(r["scope_id"]) in service_by_scope]
+        )
+
+        conn.executemany(
+            "INSERT INTO surcharge_rules VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(int(r["surcharge_id"]), int(r["service_id"]), r["name"], r["kind"], r["basis"],
+              str(Decimal(r["value"])), r.get("conditions") or "{}",
+              r.get("active_from") or None, r.get("active_to") or None)
+             for r in _read_csv(normalized_dir / "surcharge_rules.csv")]
+        )
+
+        conn.executemany(
+            "INSERT INTO tariff_scope_postal_codes VALUES (?, ?, ?, ?)",
+            [(int(r["scope_id"]), r["country_iso2"], r["postal_from"], r.get("postal_to") or None)
+             for r in _read_csv(normalized_dir / "tariff_scope_postal_codes.csv")]
+        )
+
+        conn.executemany(
+            "INSERT INTO service_restrictions VALUES (?, ?, ?)",
+            [(entry["service_code"], entry["country_iso2"], json.dumps(entry, ensure_ascii=False))
+             for entry in read_restrictions(restrictions_path(normalized_dir))]
+        )
+
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("schema_version", str(SCHEMA_VERSION)),
+            ("source_hash", source_hash(normalized_dir)),
+            ("validation", _dump_report(report)),
+        ])
+
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+    return db_path
+
+
+def _dump_report(report: ValidationReport) -> str:
+    return json.dumps({
+        "issues": [[i.severity, i.check, i.subject, i.message] for i in report.issues],
+        "rows": report.rows,
+        "elapsed_s": report.elapsed_s,
+    }, ensure_ascii=False)
+
+
+def _load_report(text: str) -> ValidationReport:
+    data = json.loads(text)
+    return ValidationReport(
+        issues=[Issue(*issue) for issue in data["issues"]],
+        rows=data["rows"],
+        elapsed_s=data["elapsed_s"]
+    )
+
+
+def store_is_current(db_path: Optional[Path] = None, normalized_dir: Optional[Path] = None) -> bool:
+    """True si la base existe et correspond aux CSV normalisés actuels"""
+    db_path = Path(db_path or DEFAULT_STORE_PATH)
+    if not db_path.exists():
+        return False
+
+    try:
+        stored = TariffStore(db_path).meta("source_hash")
+    except sqlite3.Error:
+        return False
+
+    return stored == source_hash(Path(normalized_dir or DEFAULT_NORMALIZED_DIR))
+
+
+class TariffStore:
+    """
+    Accès en lecture seule à la base SQLite
+
+    Une connexion partagée entre threads (pool de threads du bot), les
+    requêtes étant sérialisées par un verrou.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or DEFAULT_STORE_PATH)
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Tariff store not found: {self.db_path} (run: python -m src.cli.tariff_store build)")
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Connexion et verrou non sérialisables (snapshot pour process pool)
+        return {"db_path": self.db_path}
+
+    def __setstate__(self, state):
+        self.db_path = state["db_path"]
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def query(self, sql: str, params: Iterable = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(
+                    f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+                )
+                self._conn.row_factory = sqlite3.Row
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def meta(self, key: str) -> Optional[str]:
+        rows = self.query("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0]["value"] if rows else None
+
+    def validation(self) -> Optional[ValidationReport]:
+        """Rapport de validation des CSV compilés (None pour une base sans rapport)"""
+        text = self.meta("validation")
+        return _load_report(text) if text else None
+
+    # --- Requêtes ad hoc ---
+
+    def bands(self, scope_id: int) -> List[sqlite3.Row]:
+        """Bandes d'un scope, par poids croissant (index scope_id, min_weight_kg)"""
+        return self.query(
+            "SELECT * FROM tariff_bands WHERE scope_id = ? ORDER BY min_weight_kg, file_order",
+            (scope_id,)
+        )
+
+    def services_for_country(self, country_iso2: str) -> List[sqlite3.Row]:
+        """Services ayant au moins un scope listant ce pays"""
+        return self.query(
+            "SELECT * FROM services WHERE service_id IN "
+            "(SELECT DISTINCT service_id FROM tariff_scope_countries WHERE country_iso2 = ?) "
+            "ORDER BY service_id",
+            (country_iso2,)
+        )
+
+    def scopes_for(self, service_id: int, country_iso2: str) -> List[sqlite3.Row]:
+        """Scopes d'un service listant ce pays (index service_id, country_iso2)"""
+        return self.query(
+            "SELECT s.* FROM tariff_scope_countries c JOIN tariff_scopes s ON s.scope_id = c.scope_id "
+            "WHERE c.service_id = ? AND c.country_iso2 = ? ORDER BY s.scope_id",
+            (service_id, country_iso2)
+        )
+
+
+class LazyIndex(Mapping):
+    """
+    Index lu à la demande (une requête par clé) puis gardé en mémoire
+
+    fetch(key) renvoie la valeur ou None si la clé n'existe pas; keys()
+    liste toutes les clés (itération, rare).
+    """
+
+    def __init__(self, fetch: Callable, keys: Callable[[], Iterable]):
+        self._fetch = fetch
+        self._keys = keys
+        self._cache: Dict = {}
+
+    def __getitem__(self, key):
+        if key not in self._cache:
+            self._cache[key] = self._fetch(key)
+
+        value = self._cache[key]
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._keys()))
+
+    def __len__(self) -> int:
+        return len(list(self._keys()))
+
+    @property
+    def cached(self) -> int:
+        """Nombre de clés déjà lues"""
+        return sum(1 for value in self._cache.values() if value is not None)
+
+
+class SQLiteDataLoader(DataLoader):
+    """
+    DataLoader lisant la base SQLite (scopes et bandes chargés à la demande)
+
+    Même interface que DataLoader pour le moteur: scopes, scopes_by_service,
+    scope_by_service_country et scopes_by_service_country sont des LazyIndex.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        super().__init__()
+        self.store = TariffStore(db_path)
+
+    def reloaded(self) -> 'SQLiteDataLoader':
+        """Rouvre la base (reconstruite et validée par build_store)"""
+        loader = SQLiteDataLoader(self.store.db_path)
+        loader.load_all()
+        return loader
+
+    def load_all(self):
+        """Charge les petites tables, scopes et bandes restent paresseux"""
+        print("📦 Loading pricing data (SQLite)...")
+
+        # Validé par build_store: le rapport sert de référence au rechargement
+        if self.validate:
+            self.validation = self.store.validation()
+            self._log_warnings()
+
+        self._load_carriers()
+        self._load_services()
+        self._load_surcharges()
+        self._load_postal_codes()
+        self._load_restrictions()
+
+        self._build_indexes()
+
+        print(f"✅ Loaded {len(self.carriers)} carriers, {len(self.services)} services "
+              f"(scopes on demand from {self.store.db_path.name})")
+
+    def _load_carriers(self):
+        for row in self.store.query("SELECT * FROM carriers ORDER BY rowid"):
+            self.carriers[row["carrier_id"]] = Carrier(
+                carrier_id=row["carrier_id"], code=row["code"], name=row["name"], currency=row["currency"]
+            )
+
+    def _load_services(self):
+        for row in self.store.query("SELECT * FROM services ORDER BY rowid"):
+            self.services[row["service_id"]] = Service(
+                service_id=row["service_id"],
+                carrier_id=row["carrier_id"],
+                carrier_code=self.carriers[row["carrier_id"]].code,
+                code=row["code"],
+                label=row["label"],
+                direction=row["direction"],
+                origin_iso2=row["origin_iso2"],
+                incoterm=row["incoterm"],
+                service_type=row["service_type"],
+                max_weight_kg=row["max_weight_kg"],
+                volumetric_divisor=row["volumetric_divisor"] or 5000.0,
+                active_from=parse_date(row["active_from"]),
+                active_to=parse_date(row["active_to"])
+            )
+
+    def _load_surcharges(self):
+        for row in self.store.query("SELECT * FROM surcharge_rules ORDER BY rowid"):
+            try:
+                conditions = json.loads(row["conditions"]) if row["conditions"] else {}
+            except json.JSONDecodeError:
+                conditions = {}
+
+            rule = SurchargeRule(
+                surcharge_id=row["surcharge_id"],
+                service_id=row["service_id"],
+                name=row["name"],
+                kind=row["kind"],
+                basis=row["basis"],
+                value=Decimal(row["value"]),
+                conditions=conditions,
+                active_from=parse_date(row["active_from"]),
+                active_to=parse_date(row["active_to"])
+            )
+            self.surcharges.setdefault(rule.service_id, []).append(rule)
+
+    def _load_postal_codes(self):
+        for row in self.store.query("SELECT * FROM tariff_scope_postal_codes ORDER BY rowid"):
+            if row["postal_to"]:
+                self.postal_index.add_range(row["country_iso2"], row["postal_from"], row["postal_to"], row["scope_id"])
+            else:
+                self.postal_index.add_prefix(row["country_iso2"], row["postal_from"], row["scope_id"])
+
+    def _load_restrictions(self):
+        self.restrictions = [
+            ServiceRestriction.from_json(json.loads(row["entry"]))
+            for row in self.store.query("SELECT entry FROM service_restrictions ORDER BY rowid")
+        ]
+
+    def _build_indexes(self):
+        self.scopes = LazyIndex(self._fetch_scope, self._scope_ids)
+        self.scopes_by_service = LazyIndex(self._fetch_service_scopes, self._service_ids)
+        self.scope_by_service_country = LazyIndex(self._fetch_country_scope, self._service_countries)
+        self.scopes_by_service_country = LazyIndex(self._fetch_country_scopes, self._service_countries)
+
+        self.effective_index = EffectiveIndex(self.services.values())
+        self.restriction_index = RestrictionIndex(self.restrictions, self.services.values())
+
+    # --- Lectures à la demande ---
+
+    def _service_ids(self) -> List[int]:
+        return list(self.services)
+
+    def _scope_ids(self) -> List[int]:
+        return [row["scope_id"] for row in self.store.query("SELECT scope_id FROM tariff_scopes ORDER BY rowid")]
+
+    def _service_countries(self) -> List[tuple]:
+        return [
+            (row["service_id"], row["country_iso2"])
+            for row in self.store.query(
+                "SELECT DISTINCT service_id, country_iso2 FROM tariff_scope_countries ORDER BY service_id, country_iso2"
+            )
+        ]
+
+    def _fetch_scope(self, scope_id: int) -> Optional[TariffScope]:
+        rows = self.store.query("SELECT * FROM tariff_scopes WHERE scope_id = ?", (scope_id,))
+        if not rows:
+            return None
+
+        row = rows[0]
+        bands = [
+            TariffBand(
+                band_id=band["band_id"],
+                scope_id=band["scope_id"],
+                min_weight_kg=band["min_weight_kg"],
+                max_weight_kg=band["max_weight_kg"],
+                base_amount=Decimal(band["base_amount"]),
+                amount_per_kg=Decimal(band["amount_per_kg"]),
+                is_min_charge=bool(band["is_min_charge"])
+            )
+            for band in self.store.bands(scope_id)
+        ]
+        countries = self.store.query(
+            "SELECT country_iso2 FROM tariff_scope_countries WHERE scope_id = ?", (scope_id,)
+        )
+
+        return TariffScope(
+            scope_id=row["scope_id"],
+            service_id=row["service_id"],
+            code=row["code"],
+            description=row["description"],
+            is_catch_all=bool(row["is_catch_all"]),
+            countries={country["country_iso2"] for country in countries},
+            bands=bands,
+            band_mins=[band.min_weight_kg for band in bands]
+        )
+
+    def _fetch_service_scopes(self, service_id: int) -> Optional[List[TariffScope]]:
+        rows = self.store.query(
+            "SELECT scope_id FROM tariff_scopes WHERE service_id = ? ORDER BY rowid", (service_id,)
+        )
+        return [self.scopes[row["scope_id"]] for row in rows] or None
+
+    def _fetch_country_scope(self, key: tuple) -> Optional[TariffScope]:
+        """Même priorité que DataLoader: dernier scope non catch-all, sinon premier catch-all"""
+        rows = self.store.query(
+            "SELECT s.scope_id, s.is_catch_all FROM tariff_scope_countries c "
+            "JOIN tariff_scopes s ON s.scope_id = c.scope_id "
+            "WHERE c.service_id = ? AND c.country_iso2 = ? ORDER BY s.rowid",
+            key
+        )
+        specific = [row for row in rows if not row["is_catch_all"]]
+
+        if specific:
+            return self.scopes[specific[-1]["scope_id"]]
+        if rows:
+            return self.scopes[rows[0]["scope_id"]]
+        return None
+
+    def _fetch_country_scopes(self, key: tuple) -> Optional[List[TariffScope]]:
+        rows = self.store.scopes_for(*key)
+        return [self.scopes[row["scope_id"]] for row in rows if not row["is_catch_all"]] or None
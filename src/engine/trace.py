@@ -0,0 +1,145 @@
+"""
+Trace - Explication structurée d'un devis
+
+Pour chaque service: raison d'exclusion, ou scope retenu (et pourquoi),
+bande de chaque colis et détail des surcharges appliquées.
+
+Le moteur ne remplit une trace que si l'appelant en fournit une
+(price_shipment(trace=QuoteTrace(...)) ou engine.explain()): sans trace,
+la boucle de tarification ne fait qu'un test `is not None` par étape, sans
+formatage de chaînes ni print. La trace garde les valeurs brutes (Decimal,
+bandes); le texte n'est produit que par format() ou par le formatter du bot.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+from .loader import TariffBand
+
+
+# Raisons d'exclusion d'un service
+SKIP_OVERWEIGHT = "overweight"  # Un colis dépasse max_weight_kg
+SKIP_NO_SCOPE = "no_scope"  # Le service ne dessert pas le pays (ou pas ce code postal)
+SKIP_NO_BAND = "no_band"  # Aucun scope n'a de bande pour le poids d'un colis
+SKIP_SUSPENDED = "suspended"  # Service suspendu vers ce pays à la date d'expédition
+
+# Raisons du choix d'un scope
+SCOPE_COUNTRY = "country"  # Scope dédié listant le pays
+SCOPE_ZONES = "zones"  # Pays à plusieurs zones sans code postal: une offre par zone
+SCOPE_POSTAL = "postal"  # Zone couvrant le code postal (préfixe le plus long)
+SCOPE_UNZONED = "unzoned"  # Code postal hors des zones: scope valable pour tout le pays
+SCOPE_CATCH_ALL = "catch_all"  # Pas de scope dédié: grille « reste du monde »
+
+
+@dataclass
+class SurchargeTrace:
+    name: str
+    kind: str  # PERCENT | FLAT | PER_KG
+    basis: str
+    value: Decimal
+    amount: Decimal  # Montant appliqué à l'envoi
+
+
+@dataclass
+class ScopeTrace:
+    scope_code: str
+    reason: str  # SCOPE_*
+    postal_depth: Optional[int] = None  # Longueur du préfixe postal retenu (SCOPE_POSTAL)
+    bands: List[TariffBand] = field(default_factory=list)  # Bande de chaque colis
+    missing_weight_kg: Optional[float] = None  # Poids sans bande (scope écarté)
+    freight: Optional[Decimal] = None
+    surcharges: List[SurchargeTrace] = field(default_factory=list)
+    total: Optional[Decimal] = None
+
+    @property
+    def priced(self) -> bool:
+        return self.total is not None
+
+
+@dataclass
+class ServiceTrace:
+    service_code: str
+    carrier_code: str
+    max_weight_kg: float
+    skip_reason: Optional[str] = None  # SKIP_* (None = au moins une offre)
+    currency: Optional[str] = None
+    chargeable_weights: Optional[List[float]] = None  # Poids taxables si différents des poids réels
+    restriction: Optional[str] = None  # Avertissement de restriction (service_restrictions.json)
+    is_suspended: bool = False
+    scopes: List[ScopeTrace] = field(default_factory=list)
+
+
+@dataclass
+class QuoteTrace:
+    dest: str
+    parcel_weights: List[float]
+    mode: str = "parcel"  # parcel | freight
+    postal_code: Optional[str] = None
+    ship_date: Optional[date] = None
+    dest_iso2: Optional[str] = None  # None = pays inconnu
+    country_name: Optional[str] = None
+    services: List[ServiceTrace] = field(default_factory=list)
+    offers: list = field(default_factory=list)  # PriceOffer triées (rempli par engine.explain)
+
+    def service(self, service_code: str) -> Optional[ServiceTrace]:
+        return next((s for s in self.services if s.service_code == service_code), None)
+
+    @property
+    def skipped(self) -> List[ServiceTrace]:
+        return [s for s in self.services if s.skip_reason]
+
+    def format(self) -> str:
+        """Rendu texte (mode debug du moteur et price_cli)"""
+        if self.dest_iso2 is None:
+            return f"❌ Unknown country: {self.dest}"
+
+        lines = [f"🌍 Resolved: {self.dest} → {self.dest_iso2} ({self.country_name})"]
+        total_weight = sum(self.parcel_weights)
+        if self.mode == "freight":
+            lines.append(f"🚛 Pieces: {self.parcel_weights} (total {total_weight} kg)\n")
+        elif len(self.parcel_weights) == 1:
+            lines.append(f"⚖️  Weight: {total_weight} kg\n")
+        else:
+            lines.append(f"⚖️  Parcels: {self.parcel_weights} (total {total_weight} kg)\n")
+
+        for service in self.services:
+            if service.skip_reason == SKIP_OVERWEIGHT:
+                lines.append(f"⏭️  {service.service_code}: weight exceeds max {service.max_weight_kg}kg")
+                continue
+            if service.skip_reason == SKIP_NO_SCOPE:
+                lines.append(f"⏭️  {service.service_code}: no scope for {self.dest_iso2}")
+                continue
+            if service.skip_reason == SKIP_SUSPENDED:
+                lines.append(f"⛔ {service.service_code}: suspended for {self.dest_iso2}")
+                continue
+
+            for scope in service.scopes:
+                label = f"{service.service_code} ({scope.scope_code})"
+                if not scope.priced:
+                    lines.append(f"⏭️  {label}: no band for {scope.missing_weight_kg}kg")
+                    continue
+
+                surcharges = "".join(
+                    f"\n      {s.name}: {float(s.amount):+.2f}" for s in scope.surcharges
+                )
+                lines.append(
+                    f"✅ {label} [{describe_scope(scope)}]: {float(scope.freight):.2f} + "
+                    f"{float(scope.total - scope.freight):.2f} = {float(scope.total):.2f} "
+                    f"{service.currency}{surcharges}"
+                )
+
+        return "\n".join(lines)
+
+
+def describe_scope(scope: ScopeTrace) -> str:
+    """Pourquoi ce scope a été retenu, en clair"""
+    if scope.reason == SCOPE_POSTAL:
+        return f"postal zone, {scope.postal_depth}-char prefix"
+    return {
+        SCOPE_COUNTRY: "country scope",
+        SCOPE_ZONES: "one of several zones, no postal code",
+        SCOPE_UNZONED: "postal code outside zones",
+        SCOPE_CATCH_ALL: "catch-all",
+    }.get(scope.reason, scope.reason)
@@ -0,0 +1,359 @@
+"""
+Validator - Contrôle d'intégrité des tarifs normalisés
+
+Le DataLoader ignore ce qu'il ne sait pas rattacher (bandes d'un scope
+inconnu, conditions JSON illisibles lues comme {}): le moteur renvoie alors
+moins d'offres, ou des offres fausses, sans explication. Ce module relit les
+CSV bruts et signale:
+
+- Références: carrier, service ou scope inconnus
+- Bandes: min > max, chevauchements, trous dans une grille par tranches,
+  grille qui s'arrête avant le max_weight_kg du service
+- Pays couvert par plusieurs scopes d'un même service (hors zones postales)
+- Surcharges: kind/basis inconnus, valeur illisible, conditions JSON invalides
+- Restrictions (service_restrictions.json): fichier illisible, dates
+  invalides, services ou alternatives inconnus
+
+Gravité:
+- error: le moteur tarifierait faux (ou planterait) → chargement refusé
+- warning: lignes ignorées ou lanes incomplètes, tolérées au chargement
+
+Un rechargement à chaud refuse aussi les warnings absents des données en
+service (report.new_since(baseline)): une mise à jour ne peut pas dégrader
+les résultats sans le dire.
+
+Chaque table est lue une seule fois puis regroupée par clé (dict/set): la
+validation complète des ~10k lignes prend quelques dizaines de ms.
+"""
+
+import csv
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .effective import parse_date
+from .restrictions import read_restrictions, restrictions_path
+
+
+ERROR = "error"
+WARNING = "warning"
+
+SURCHARGE_KINDS = {"PERCENT", "FLAT", "PER_KG"}
+PERCENT_BASES = {"FREIGHT", "TOTAL"}
+
+# Écart toléré entre deux tranches consécutives (bruit des PDF, au gramme)
+GAP_TOLERANCE_KG = 0.001
+
+# Nombre d'exemples listés par summary() pour chaque contrôle
+SUMMARY_EXAMPLES = 3
+
+
+@dataclass(frozen=True)
+class Issue:
+    severity: str  # ERROR | WARNING
+    check: str  # ex: "band_overlap"
+    subject: str  # Objet concerné (ex: "scope 42"), stable d'un chargement à l'autre
+    message: str
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.check, self.subject)
+
+
+@dataclass
+class ValidationReport:
+    issues: List[Issue] = field(default_factory=list)
+    rows: int = 0  # Lignes contrôlées
+    elapsed_s: float = 0.0
+
+    @property
+    def errors(self) -> List[Issue]:
+        return [issue for issue in self.issues if issue.severity == ERROR]
+
+    @property
+    def warnings(self) -> List[Issue]:
+        return [issue for issue in self.issues if issue.severity == WARNING]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def new_since(self, baseline: Optional['ValidationReport']) -> List[Issue]:
+        """Problèmes absents d'un rapport précédent (tous si pas de référence)"""
+        if baseline is None:
+            return list(self.issues)
+        known = {issue.key for issue in baseline.issues}
+        return [issue for issue in self.issues if issue.key not in known]
+
+    def summary(self, issues: Optional[Iterable[Issue]] = None) -> str:
+        """Résumé par contrôle: nombre de cas et premiers exemples"""
+        by_check: Dict[Tuple[str, str], List[Issue]] = defaultdict(list)
+        for issue in (self.issues if issues is None else issues):
+            by_check[(issue.severity, issue.check)].append(issue)
+
+        lines = []
+        for (severity, check), items in sorted(by_check.items()):
+            icon = "❌" if severity == ERROR else "⚠️ "
+            lines.append(f"{icon} {check}: {len(items)}")
+            for issue in items[:SUMMARY_EXAMPLES]:
+                lines.append(f"      {issue.message}")
+            if len(items) > SUMMARY_EXAMPLES:
+                lines.append(f"      ... {len(items) - SUMMARY_EXAMPLES} more")
+
+        return "\n".join(lines)
+
+
+class TariffValidationError(Exception):
+    """Données tarifaires refusées (erreurs, ou régression lors d'un rechargement)"""
+
+    def __init__(self, report: ValidationReport, issues: Optional[List[Issue]] = None):
+        self.report = report
+        self.issues = report.errors if issues is None else issues
+        super().__init__(
+            f"{len(self.issues)} tariff integrity issue(s):\n{report.summary(self.issues)}"
+        )
+
+
+def _read(path: Path) -> List[dict]:
+    if not path.exists():
+        return []
+    with path.open("r", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _number(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def validate_dir(data_dir: Path) -> ValidationReport:
+    """Valide les CSV normalisés d'un répertoire"""
+    started = time.perf_counter()
+    data_dir = Path(data_dir)
+    tables = {
+        name: _read(data_dir / f"{name}.csv")
+        for name in ("carriers", "services", "tariff_scopes", "tariff_scope_countries",
+                     "tariff_bands", "surcharge_rules", "tariff_scope_postal_codes")
+    }
+
+    try:
+        tables["service_restrictions"] = read_restrictions(restrictions_path(data_dir))
+    except (OSError, ValueError) as e:
+        report = validate_tables(tables)
+        report.issues.append(Issue(ERROR, "restrictions_file", "service_restrictions.json",
+                                   f"{restrictions_path(data_dir).name}: {e}"))
+    else:
+        report = validate_tables(tables)
+
+    report.elapsed_s = time.perf_counter() - started
+    return report
+
+
+def validate_tables(tables: Dict[str, List[dict]]) -> ValidationReport:
+    """
+    Valide des tables normalisées (lignes csv.DictReader, valeurs str)
+
+    Args:
+        tables: nom de table (sans .csv) -> lignes; tables absentes = vides.
+                "service_restrictions": entrées JSON de service_restrictions.json
+    """
+    report = ValidationReport(rows=sum(len(rows) for rows in tables.values()))
+    add = report.issues.append
+
+    def rows(name):
+        return tables.get(name) or []
+
+    carrier_ids = {row["carrier_id"] for row in rows("carriers")}
+
+    # --- Services ---
+    service_max: Dict[str, float] = {}
+    for row in rows("services"):
+        subject = f"service {row['service_id']}"
+        if row["carrier_id"] not in carrier_ids:
+            add(Issue(ERROR, "unknown_carrier", subject,
+                      f"{row['code']}: carrier_id {row['carrier_id']} not in carriers.csv"))
+
+        max_weight = _number(row.get("max_weight_kg"))
+        if max_weight is None or max_weight <= 0:
+            add(Issue(ERROR, "invalid_value", subject, f"{row['code']}: max_weight_kg={row.get('max_weight_kg')!r}"))
+        else:
+            service_max[row["service_id"]] = max_weight
+
+        try:
+            active_from = parse_date(row.get("active_from"))
+            active_to = parse_date(row.get("active_to"))
+        except ValueError:
+            add(Issue(ERROR, "invalid_value", subject, f"{row['code']}: unreadable active_from/active_to"))
+        else:
+            if active_from and active_to and active_from > active_to:
+                add(Issue(ERROR, "invalid_value", subject, f"{row['code']}: active_from after active_to"))
+
+    service_codes = {row["service_id"]: row["code"] for row in rows("services")}
+
+    # --- Scopes ---
+    scopes: Dict[str, dict] = {}
+    for row in rows("tariff_scopes"):
+        if row["service_id"] not in service_codes:
+            add(Issue(ERROR, "unknown_service", f"scope {row['scope_id']}",
+                      f"scope {row['scope_id']} ({row['code']}): service_id {row['service_id']} not in services.csv"))
+        scopes[row["scope_id"]] = row
+
+    # --- Pays des scopes (non catch-all) ---
+    orphan_countries: Dict[str, int] = defaultdict(int)
+    scopes_by_lane: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+    for row in rows("tariff_scope_countries"):
+        scope = scopes.get(row["scope_id"])
+        if scope is None:
+            orphan_countries[row["scope_id"]] += 1
+        elif scope["is_catch_all"].lower() != "true":
+            scopes_by_lane[(scope["service_id"], row["country_iso2"])].append(row["scope_id"])
+
+    for scope_id, count in orphan_countries.items():
+        add(Issue(WARNING, "orphan_scope_countries", f"scope {scope_id}",
+                  f"{count} country row(s) for unknown scope {scope_id} (ignored)"))
+
+    # --- Bandes: regroupement par scope ---
+    bands: Dict[str, List[Tuple[float, float, tuple]]] = defaultdict(list)
+    orphan_bands: Dict[str, int] = defaultdict(int)
+    for row in rows("tariff_bands"):
+        if row["scope_id"] not in scopes:
+            orphan_bands[row["scope_id"]] += 1
+            continue
+
+        low, high = _number(row.get("min_weight_kg")), _number(row.get("max_weight_kg"))
+        prices = (row.get("base_amount"), row.get("amount_per_kg"), row.get("is_min_charge"))
+        if low is None or high is None or any(_number(value) is None for value in prices[:2]):
+            add(Issue(ERROR, "invalid_value", f"band {row['band_id']}",
+                      f"band {row['band_id']} (scope {row['scope_id']}): unreadable weight or amount"))
+            continue
+        if low > high:
+            add(Issue(ERROR, "band_inverted", f"band {row['band_id']}",
+                      f"band {row['band_id']} (scope {row['scope_id']}): min {low} > max {high} kg"))
+            continue
+
+        bands[row["scope_id"]].append((low, high, prices))
+
+    for scope_id, count in orphan_bands.items():
+        add(Issue(WARNING, "orphan_bands", f"scope {scope_id}",
+                  f"{count} band(s) for unknown scope {scope_id} (ignored)"))
+
+    # --- Bandes: continuité par scope ---
+    # Import local: freight importe loader, qui importe ce module
+    from .freight import FREIGHT_WEIGHT_STEP_KG, PARCEL_MAX_WEIGHT_KG
+
+    for scope_id, scope in scopes.items():
+        scope_bands = bands.get(scope_id)
+        label = f"scope {scope_id} ({scope['code']})"
+
+        if not scope_bands:
+            add(Issue(WARNING, "empty_scope", f"scope {scope_id}", f"{label}: no bands"))
+            continue
+
+        scope_bands.sort(key=lambda band: (band[0], band[1]))
+
+        # Fret: poids taxable arrondi au kg, 68-99 kg puis 100-299 kg est continu
+        max_weight = service_max.get(scope["service_id"])
+        is_freight = max_weight is not None and max_weight > PARCEL_MAX_WEIGHT_KG
+        max_gap = (FREIGHT_WEIGHT_STEP_KG if is_freight else 0.0) + GAP_TOLERANCE_KG
+
+        for (low, high, _), (next_low, next_high, _) in zip(scope_bands, scope_bands[1:]):
+            # Bornes communes (max = min suivant) normales: la bande inférieure l'emporte
+            if next_low < high:
+                add(Issue(ERROR, "band_overlap", f"scope {scope_id}",
+                          f"{label}: {low}-{high} kg overlaps {next_low}-{next_high} kg"))
+                break
+            # Grilles par paliers (min = max: 0.5, 1.0, ...) discontinues par construction
+            if low < high and next_low < next_high and next_low - high > max_gap:
+                add(Issue(ERROR, "band_gap", f"scope {scope_id}",
+                          f"{label}: no band between {high} and {next_low} kg"))
+                break
+
+        top = max(band[1] for band in scope_bands)
+        if max_weight is not None and top < max_weight - GAP_TOLERANCE_KG:
+            add(Issue(WARNING, "band_coverage", f"scope {scope_id}",
+                      f"{label}: bands stop at {top} kg, service accepts {max_weight} kg"))
+
+    # --- Pays couverts deux fois par un service ---
+    zoned: Set[str] = {row["scope_id"] for row in rows("tariff_scope_postal_codes")}
+    for (service_id, iso2), scope_ids in scopes_by_lane.items():
+        unzoned = [scope_id for scope_id in scope_ids if scope_id not in zoned]
+        if len(unzoned) < 2:
+            continue
+
+        grids = {tuple(bands.get(scope_id, ())) for scope_id in unzoned}
+        subject = f"lane {service_codes.get(service_id, service_id)} {iso2}"
+        if len(grids) > 1:
+            add(Issue(ERROR, "duplicate_scope", subject,
+                      f"{subject}: scopes {', '.join(unzoned)} with different prices and no postal zones"))
+        else:
+            add(Issue(WARNING, "duplicate_scope", subject,
+                      f"{subject}: scopes {', '.join(unzoned)} with identical prices (duplicate offers)"))
+
+    # --- Surcharges ---
+    for row in rows("surcharge_rules"):
+        subject = f"surcharge {row['surcharge_id']}"
+        label = f"surcharge {row['surcharge_id']} ({row['name']})"
+
+        if row["service_id"] not in service_codes:
+            add(Issue(WARNING, "orphan_surcharge", subject,
+                      f"{label}: service_id {row['service_id']} not in services.csv"))
+
+        value = _number(row.get("value"))
+        if row["kind"] not in SURCHARGE_KINDS:
+            add(Issue(ERROR, "surcharge_kind", subject, f"{label}: unknown kind {row['kind']!r} (priced as 0)"))
+        elif row["kind"] == "PERCENT" and row["basis"] not in PERCENT_BASES:
+            add(Issue(ERROR, "surcharge_kind", subject, f"{label}: unknown PERCENT basis {row['basis']!r} (priced as 0)"))
+
+        if value is None:
+            add(Issue(ERROR, "invalid_value", subject, f"{label}: value={row.get('value')!r}"))
+        elif row["kind"] == "PERCENT" and value <= -100:
+            add(Issue(ERROR, "invalid_value", subject, f"{label}: {value}% wipes out the freight"))
+
+        conditions = row.get("conditions")
+        if conditions:
+            try:
+                parsed = json.loads(conditions)
+            except json.JSONDecodeError:
+                parsed = None
+            if not isinstance(parsed, dict):
+                add(Issue(ERROR, "surcharge_conditions", subject,
+                          f"{label}: conditions {conditions!r} is not a JSON object (rule would apply to every quote)"))
+
+    # --- Restrictions ---
+    known_codes = set(service_codes.values())
+    for entry in rows("service_restrictions"):
+        code, iso2 = entry.get("service_code"), entry.get("country_iso2")
+        subject = f"restriction {code} {iso2}"
+
+        if not code or not iso2:
+            add(Issue(ERROR, "invalid_value", subject, f"restriction without service_code/country_iso2: {entry}"))
+            continue
+
+        try:
+            start, end = parse_date(entry.get("effective_date")), parse_date(entry.get("end_date"))
+        except (TypeError, ValueError):
+            add(Issue(ERROR, "invalid_value", subject, f"{subject}: unreadable effective_date/end_date"))
+        else:
+            if start and end and start > end:
+                add(Issue(ERROR, "invalid_value", subject, f"{subject}: effective_date after end_date"))
+
+        if code not in known_codes:
+            add(Issue(WARNING, "orphan_restriction", subject, f"{subject}: unknown service (ignored)"))
+
+        unknown = [alt for alt in entry.get("alternative_services", []) if alt not in known_codes]
+        if unknown:
+            add(Issue(WARNING, "unknown_alternative", subject,
+                      f"{subject}: unknown alternative service(s) {', '.join(unknown)}"))
+
+    # --- Zones postales ---
+    for row in rows("tariff_scope_postal_codes"):
+        if row["scope_id"] not in scopes:
+            add(Issue(WARNING, "orphan_postal_codes", f"scope {row['scope_id']}",
+                      f"postal rule {row['country_iso2']} {row['postal_from']} for unknown scope {row['scope_id']}"))
+
+    return report
@@ -5,9 +5,15 @@ Extrait les tarifs FedEx IP Export depuis le PDF 91 pages
 
 import csv
 import re
+import sys
 from pathlib import Path
 from decimal import Decimal
-import pdfplumber
+
+# Project root
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.etl.pdf_tables import extract_tables
 
 
 # Mapping country → ISO2 (réutilise le mapping de Spring + additions)
@@ -249,40 +255,38 @@ def extract_zone_chart():
 
     zone_mappings = []
 
-    with pdfplumber.open(pdf_path) as pdf:
-        # Pages 22-26 (indices 21-25)
-        for page_idx in range(21, 26):
-            page = pdf.pages[page_idx]
-            table = page.extract_table()
+    # Pages 22-26 (indices 21-25), extraites en parallèle et mises en cache
+    tables = extract_tables(pdf_path, range(21, 26))
 
-            if not table or len(table) < 2:
-                continue
+    for table in tables.values():
+        if not table or len(table) < 2:
+            continue
 
-            # Header: ['Country/Territory', 'IPE', 'IP', 'IE', 'RE', 'IPF', 'IEF', 'REF']
-            # On veut la colonne 'IP' (index 2)
+        # Header: ['Country/Territory', 'IPE', 'IP', 'IE', 'RE', 'IPF', 'IEF', 'REF']
+        # On veut la colonne 'IP' (index 2)
 
-            for row in table[1:]:  # Skip header
-                if not row or not row[0]:
-                    continue
+        for row in table[1:]:  # Skip header
+            if not row or not row[0]:
+                continue
 
-                country = row[0].strip()
-                zone_ip = row[2].strip() if len(row) > 2 else ""
+            country = row[0].strip()
+            zone_ip = row[2].strip() if len(row) > 2 else ""
 
-                if not zone_ip or len(zone_ip) > 2:
-                    continue
+            if not zone_ip or len(zone_ip) > 2:
+                continue
 
-                # Normaliser le pays
-                iso2 = COUNTRY_MAPPING.get(country)
+            # Normaliser le pays
+            iso2 = COUNTRY_MAPPING.get(country)
 
-                if not iso2:
-                    print(f"  ⚠️  Unknown country: {country}")
-                    continue
+            if not iso2:
+                print(f"  ⚠️  Unknown country: {country}")
+                continue
 
-                zone_mappings.append({
-                    "country_label": country,
-                    "country_iso2": iso2,
-                    "zone": zone_ip
-                })
+            zone_mappings.append({
+                "country_label": country,
+                "country_iso2": iso2,
+                "zone": zone_ip
+            })
 
     # Écrire CSV
     csv_path.parent.mkdir(parents=True, exist_ok=True)
@@ -305,65 +309,67 @@ def extract_rate_tables():
     print("\n📄 Extracting FedEx IP Export rate tables...")
 
     rates = []
+    seen = set()  # (weight_kg, zone) déjà extraits
 
-    with pdfplumber.open(pdf_path) as pdf:
-        # Configuration des pages à extraire
-        pages_config = [
-            # (page_idx, zone_row_idx, data_start_idx)
-            (13, 1, 2),   # Page 14: 0.5-24.0 kg, zones A-T
-            (9, 1, 2),    # Page 10: 24.0-57.0 kg, zones A-S
-            (10, 1, 2),   # Page 11: 57.5-70.5 kg, zones A-S
-            (11, 1, 2),   # Page 12: 14.0-47.0 kg, zones T-X
-            (12, 1, 2),   # Page 13: 47.5-70.5 kg, zones T-X
-        ]
-
-        for page_idx, zone_row, data_start in pages_config:
-            page = pdf.pages[page_idx]
-            table = page.extract_table()
-
-            if not table or len(table) < data_start + 1:
-                continue
+    # Configuration des pages à extraire
+    pages_config = [
+        # (page_idx, zone_row_idx, data_start_idx)
+        (13, 1, 2),   # Page 14: 0.5-24.0 kg, zones A-T
+        (9, 1, 2),    # Page 10: 24.0-57.0 kg, zones A-S
+        (10, 1, 2),   # Page 11: 57.5-70.5 kg, zones A-S
+        (11, 1, 2),   # Page 12: 14.0-47.0 kg, zones T-X
+        (12, 1, 2),   # Page 13: 47.5-70.5 kg, zones T-X
+    ]
 
-            # Extraire les zones (row 1)
-            zones = [z for z in table[zone_row][1:] if z and len(z) <= 2]
+    tables = extract_tables(pdf_path, [page_idx for page_idx, _, _ in pages_config])
 
-            print(f"  Page {page_idx+1}: {len(zones)} zones ({', '.join(zones)})")
+    for page_idx, zone_row, data_start in pages_config:
+        table = tables[page_idx]
 
-            # Extraire les données
-            for row in table[data_start:]:
-                if not row or not row[0]:
-                    continue
+        if not table or len(table) < data_start + 1:
+            continue
 
-                try:
-                    weight_kg = float(row[0])
-                except ValueError:
-                    continue
+        # Extraire les zones (row 1)
+        zones = [z for z in table[zone_row][1:] if z and len(z) <= 2]
 
-                # Prix par zone
-                for i, zone in enumerate(zones):
-                    col_idx = i + 1
+        print(f"  Page {page_idx+1}: {len(zones)} zones ({', '.join(zones)})")
 
-                    if col_idx >= len(row):
-                        continue
+        # Extraire les données
+        for row in table[data_start:]:
+            if not row or not row[0]:
+                continue
 
-                    price_str = row[col_idx]
+            try:
+                weight_kg = float(row[0])
+            except ValueError:
+                continue
 
-                    if not price_str or price_str.strip() == "":
-                        continue
+            # Prix par zone
+            for i, zone in enumerate(zones):
+                col_idx = i + 1
 
-                    try:
-                        price = float(price_str.replace(",", "."))
+                if col_idx >= len(row):
+                    continue
 
-                        # Éviter les doublons (certains poids apparaissent sur plusieurs pages)
-                        key = (weight_kg, zone)
-                        if not any(r["weight_kg"] == weight_kg and r["zone"] == zone for r in rates):
-                            rates.append({
-                                "weight_kg": weight_kg,
-                                "zone": zone,
-                                "price": price
-                            })
-                    except ValueError:
-                        pass
+                price_str = row[col_idx]
+
+                if not price_str or price_str.strip() == "":
+                    continue
+
+                try:
+                    price = float(price_str.replace(",", "."))
+
+                    # Éviter les doublons (certains poids apparaissent sur plusieurs pages)
+                    key = (weight_kg, zone)
+                    if key not in seen:
+                        seen.add(key)
+                        rates.append({
+                            "weight_kg": weight_kg,
+                            "zone": zone,
+                            "price": price
+                        })
+                except ValueError:
+                    pass
 
     # Trier par zone puis poids
     rates.sort(key=lambda r: (r["zone"], r["weight_kg"]))
@@ -6,7 +6,7 @@ Input files:
 - fedex_export_zone_chart.csv (193 countries × 7 services)
 - fedex_ipe_export_rates.csv (861 IPE pricing rows)
 
-Output:
+Output (upserted, reruns are idempotent):
 - services.csv (FedEx services)
 - tariff_scopes.csv (zones per service)
 - tariff_scope_countries.csv (country mappings)
@@ -14,11 +14,18 @@ Output:
 """
 
 import csv
+import sys
 from pathlib import Path
 from decimal import Decimal
 from collections import defaultdict
 import logging
 
+# Project root
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.etl.writer import BandSpec, NormalizedWriter, ScopeSpec
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -69,14 +76,14 @@ FEDEX_SERVICES = {
     }
 }
 
+# Input CSV extracts (user-provided) and output directory
+DEFAULT_ZONE_CHART_PATH = "/Users/yoyaku/YOYAKU Dropbox/Benjamin Belaga/Downloads/fedex_export_zone_chart.csv"
+DEFAULT_IPE_RATES_PATH = "/Users/yoyaku/YOYAKU Dropbox/Benjamin Belaga/Downloads/fedex_ipe_export_rates.csv"
+DEFAULT_OUTPUT_DIR = PROJECT_ROOT / "data" / "normalized"
+
 # FedEx is carrier_id=3
 FEDEX_CARRIER_ID = 3
 
-# Base service_id for FedEx services (will auto-increment)
-# Check existing services.csv for next available ID
-SERVICE_ID_BASE = 4  # Adjust based on existing data
-
-
 class FedExV2ETL:
     def __init__(self, zone_chart_path: str, ipe_rates_path: str, output_dir: str):
         """
@@ -89,57 +96,14 @@ class FedExV2ETL:
         self.ipe_rates_path = Path(ipe_rates_path)
         self.output_dir = Path(output_dir)
 
-        # Data structures
-        self.services = {}  # service_code -> service_id
-        self.scopes = {}    # (service_code, zone) -> scope_id
-        self.scope_countries = defaultdict(list)  # scope_id -> [country_iso2]
-        self.bands = []
-
-        # Counters for IDs
-        self.next_service_id = SERVICE_ID_BASE
-        self.next_scope_id = 1
-        self.next_band_id = 1
-
-        # Load existing data to avoid conflicts
-        self._load_existing_data()
-
-    def _load_existing_data(self):
-        """Load existing services and scopes to get next IDs"""
-        services_file = self.output_dir / 'services.csv'
-        scopes_file = self.output_dir / 'tariff_scopes.csv'
-        bands_file = self.output_dir / 'tariff_bands.csv'
-
-        if services_file.exists():
-            with open(services_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    service_id = int(row['service_id'])
-                    if service_id >= self.next_service_id:
-                        self.next_service_id = service_id + 1
-                    # Store existing FedEx services
-                    if row['code'].startswith('FDX_'):
-                        self.services[row['code']] = service_id
-
-        if scopes_file.exists():
-            with open(scopes_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    scope_id = int(row['scope_id'])
-                    if scope_id >= self.next_scope_id:
-                        self.next_scope_id = scope_id + 1
-
-        if bands_file.exists():
-            with open(bands_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    band_id = int(row['band_id'])
-                    if band_id >= self.next_band_id:
-                        self.next_band_id = band_id + 1
-
-        logger.info(f"📊 Next IDs: service={self.next_service_id}, scope={self.next_scope_id}, band={self.next_band_id}")
+        # Data structures (IDs are allocated by the writer on upsert)
+        self.scopes = {}  # (service_code, zone) -> ScopeSpec
+        self.bands_count = 0
+
+        self.writer = NormalizedWriter(self.output_dir)
 
     def process_zone_chart(self):
-        """Process zone chart to create services, scopes, and country mappings"""
+        """Process zone chart to create scopes and country mappings"""
         logger.info(f"📖 Reading zone chart: {self.zone_chart_path}")
 
         with open(self.zone_chart_path, 'r', encoding='utf-8') as f:
@@ -165,29 +129,21 @@ class FedExV2ETL:
             if not scope_data[key]['page']:
                 scope_data[key]['page'] = row['page_number']
 
-        # Create services if not existing
-        for product_code, service_info in FEDEX_SERVICES.items():
-            service_code = service_info['code']
-            if service_code not in self.services:
-                self.services[service_code] = self.next_service_id
-                self.next_service_id += 1
-                logger.info(f"✅ Created service: {service_code} (ID={self.services[service_code]})")
-
         # Create scopes
         for (product, zone), data in scope_data.items():
             service_code = FEDEX_SERVICES[product]['code']
-            service_id = self.services[service_code]
-
             scope_code = f"FDX_{product}_ZONE_{zone}"
-            scope_id = self.next_scope_id
-            self.next_scope_id += 1
 
-            self.scopes[(service_code, zone)] = scope_id
-            self.scope_countries[scope_id] = list(data['countries'])
+            self.scopes[(service_code, zone)] = ScopeSpec(
+                code=scope_code,
+                description=f"FedEx {product} Export - Zone {zone}",
+                countries=sorted(data['countries']),
+                bands=[]
+            )
 
-            logger.debug(f"✅ Scope {scope_id}: {scope_code} ({len(data['countries'])} countries)")
+            logger.debug(f"✅ Scope {scope_code} ({len(data['countries'])} countries)")
 
-        logger.info(f"✅ Created {len(self.scopes)} scopes for {len(self.services)} services")
+        logger.info(f"✅ Created {len(self.scopes)} scopes for {len(FEDEX_SERVICES)} services")
 
     def process_ipe_rates(self, package_type='Package'):
         """
@@ -214,8 +170,6 @@ class FedExV2ETL:
                 logger.warning(f"⚠️ Scope not found for {service_code} Zone {zone}")
                 continue
 
-            scope_id = self.scopes[scope_key]
-
             # Parse weight and price
             min_weight = row['min_weight_kg']
             max_weight = row['max_weight_kg']
@@ -226,45 +180,29 @@ class FedExV2ETL:
             if not min_weight or not max_weight:
                 continue
 
-            min_weight = float(min_weight)
-            max_weight = float(max_weight)
-            price_eur = Decimal(price_eur)
-
-            band_id = self.next_band_id
-            self.next_band_id += 1
-
-            self.bands.append({
-                'band_id': band_id,
-                'scope_id': scope_id,
-                'min_weight_kg': min_weight,
-                'max_weight_kg': max_weight,
-                'base_amount': price_eur,
-                'amount_per_kg': Decimal('0.0'),
-                'is_min_charge': is_min_charge
-            })
-
-        logger.info(f"✅ Created {len(self.bands)} IPE pricing bands")
-
-    def write_services(self):
-        """Write/update services.csv"""
-        services_file = self.output_dir / 'services.csv'
-
-        # Load existing services
-        existing_services = []
-        if services_file.exists():
-            with open(services_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                existing_services = [row for row in reader if not row['code'].startswith('FDX_')]
-
-        # Add new FedEx services
-        new_services = []
+            self.scopes[scope_key].bands.append(BandSpec(
+                min_weight_kg=float(min_weight),
+                max_weight_kg=float(max_weight),
+                base_amount=Decimal(price_eur),
+                amount_per_kg=Decimal('0.0'),
+                is_min_charge=is_min_charge
+            ))
+            self.bands_count += 1
+
+        logger.info(f"✅ Created {self.bands_count} IPE pricing bands")
+
+    def write(self):
+        """
+        Upsert FedEx services, scopes, country mappings and bands
+
+        Rows are matched on service code, scope code and weight range:
+        existing IDs are kept and only changed CSV files are rewritten.
+        """
         for product_code, service_info in FEDEX_SERVICES.items():
             service_code = service_info['code']
-            service_id = self.services.get(service_code)
 
-            if service_id:
-                new_services.append({
-                    'service_id': service_id,
+            self.writer.sync_service(
+                {
                     'carrier_id': FEDEX_CARRIER_ID,
                     'code': service_code,
                     'label': service_info['label'],
@@ -276,162 +214,38 @@ class FedExV2ETL:
                     'volumetric_divisor': 5000,
                     'active_from': '2025-11-21',
                     'active_to': ''
-                })
-
-        # Write combined services
-        all_services = existing_services + new_services
-        all_services.sort(key=lambda x: int(x['service_id']))
-
-        with open(services_file, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = [
-                'service_id', 'carrier_id', 'code', 'label', 'direction',
-                'origin_iso2', 'incoterm', 'service_type', 'max_weight_kg',
-                'volumetric_divisor', 'active_from', 'active_to'
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(all_services)
-
-        logger.info(f"✅ Wrote {len(new_services)} FedEx services to {services_file}")
-
-    def write_scopes(self):
-        """Write tariff_scopes.csv"""
-        scopes_file = self.output_dir / 'tariff_scopes.csv'
-
-        # Load existing non-FedEx scopes
-        existing_scopes = []
-        if scopes_file.exists():
-            with open(scopes_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                existing_scopes = [row for row in reader if not row['code'].startswith('FDX_')]
-
-        # Create new FedEx scopes
-        new_scopes = []
-        for (service_code, zone), scope_id in self.scopes.items():
-            service_id = self.services[service_code]
-            product = service_code.replace('FDX_', '').replace('_EXPORT', '')
-
-            new_scopes.append({
-                'scope_id': scope_id,
-                'service_id': service_id,
-                'code': f"FDX_{product}_ZONE_{zone}",
-                'description': f"FedEx {product} Export - Zone {zone}",
-                'is_catch_all': False
-            })
-
-        # Write combined scopes
-        all_scopes = existing_scopes + new_scopes
-        all_scopes.sort(key=lambda x: int(x['scope_id']))
-
-        with open(scopes_file, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ['scope_id', 'service_id', 'code', 'description', 'is_catch_all']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(all_scopes)
-
-        logger.info(f"✅ Wrote {len(new_scopes)} FedEx scopes to {scopes_file}")
-
-    def write_scope_countries(self):
-        """Write tariff_scope_countries.csv"""
-        countries_file = self.output_dir / 'tariff_scope_countries.csv'
-
-        # Load existing non-FedEx country mappings
-        existing_mappings = []
-        fedex_scope_ids = set(self.scopes.values())
-
-        if countries_file.exists():
-            with open(countries_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                existing_mappings = [
-                    row for row in reader
-                    if int(row['scope_id']) not in fedex_scope_ids
-                ]
-
-        # Create new FedEx mappings
-        new_mappings = []
-        for scope_id, countries in self.scope_countries.items():
-            for country_iso2 in sorted(countries):
-                new_mappings.append({
-                    'scope_id': scope_id,
-                    'country_iso2': country_iso2
-                })
-
-        # Write combined mappings
-        all_mappings = existing_mappings + new_mappings
-        all_mappings.sort(key=lambda x: (int(x['scope_id']), x['country_iso2']))
-
-        with open(countries_file, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ['scope_id', 'country_iso2']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(all_mappings)
-
-        logger.info(f"✅ Wrote {len(new_mappings)} FedEx country mappings to {countries_file}")
-
-    def write_bands(self):
-        """Write tariff_bands.csv"""
-        bands_file = self.output_dir / 'tariff_bands.csv'
-
-        # Load existing non-FedEx bands
-        existing_bands = []
-        fedex_scope_ids = set(self.scopes.values())
-
-        if bands_file.exists():
-            with open(bands_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                existing_bands = [
-                    row for row in reader
-                    if int(row['scope_id']) not in fedex_scope_ids
-                ]
-
-        # Write combined bands
-        all_bands = existing_bands + self.bands
-        all_bands.sort(key=lambda x: int(x['band_id']))
-
-        with open(bands_file, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = [
-                'band_id', 'scope_id', 'min_weight_kg', 'max_weight_kg',
-                'base_amount', 'amount_per_kg', 'is_min_charge'
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(all_bands)
-
-        logger.info(f"✅ Wrote {len(self.bands)} FedEx pricing bands to {bands_file}")
+                },
+                [spec for (code, _), spec in self.scopes.items() if code == service_code]
+            )
+
+        written = self.writer.commit()
+        logger.info(f"✅ Updated {len(written)} normalized file(s) in {self.output_dir}")
 
     def run(self):
         """Execute full ETL pipeline"""
         logger.info("🚀 Starting FedEx V2 ETL")
 
-        # Phase 1: Process zone chart (services, scopes, countries)
+        # Phase 1: Process zone chart (scopes, countries)
         self.process_zone_chart()
 
         # Phase 2: Process IPE rates (pricing bands)
         self.process_ipe_rates(package_type='Package')
 
-        # Phase 3: Write all output files
-        self.write_services()
-        self.write_scopes()
-        self.write_scope_countries()
-        self.write_bands()
+        # Phase 3: Upsert into normalized CSVs
+        self.write()
 
         logger.info("✅ FedEx V2 ETL complete!")
         logger.info(f"📊 Summary:")
-        logger.info(f"   - Services: {len(self.services)}")
+        logger.info(f"   - Services: {len(FEDEX_SERVICES)}")
         logger.info(f"   - Scopes: {len(self.scopes)}")
-        logger.info(f"   - Country mappings: {sum(len(c) for c in self.scope_countries.values())}")
-        logger.info(f"   - Pricing bands: {len(self.bands)}")
+        logger.info(f"   - Country mappings: {sum(len(s.countries) for s in self.scopes.values())}")
+        logger.info(f"   - Pricing bands: {self.bands_count}")
 
 
 def main():
     """Main entry point"""
-    # Paths
-    zone_chart = "/Users/yoyaku/YOYAKU Dropbox/Benjamin Belaga/Downloads/fedex_export_zone_chart.csv"
-    ipe_rates = "/Users/yoyaku/YOYAKU Dropbox/Benjamin Belaga/Downloads/fedex_ipe_export_rates.csv"
-    output_dir = "/Users/yoyaku/repos/pricing-engine/data/normalized"
-
     # Run ETL
-    etl = FedExV2ETL(zone_chart, ipe_rates, output_dir)
+    etl = FedExV2ETL(DEFAULT_ZONE_CHART_PATH, DEFAULT_IPE_RATES_PATH, DEFAULT_OUTPUT_DIR)
     etl.run()
 
 
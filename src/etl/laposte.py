@@ -5,9 +5,15 @@ Extrait les tarifs du PDF Odyssée et génère les tables normalisées
 
 import csv
 import json
+import sys
 from pathlib import Path
 from decimal import Decimal
-import pdfplumber
+
+# Project root
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.etl.pdf_tables import extract_tables
 
 
 # Mapping pays → ISO2
@@ -33,43 +39,41 @@ def extract_delivengo_raw():
 
     print(f"📄 Extracting from {pdf_path.name}...")
 
-    with pdfplumber.open(pdf_path) as pdf:
-        page = pdf.pages[2]  # Page 3
-        table = page.extract_table()
+    table = extract_tables(pdf_path, [2])[2]  # Page 3 (en cache si inchangée)
 
-        if not table or len(table) < 2:
-            raise ValueError("No table found on page 3")
+    if not table or len(table) < 2:
+        raise ValueError("No table found on page 3")
 
-        csv_path.parent.mkdir(parents=True, exist_ok=True)
+    csv_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with csv_path.open("w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "country_label", "country_iso2", "solution_type",
-                "format", "price_per_kg", "fixed_amount"
-            ])
+    with csv_path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "country_label", "country_iso2", "solution_type",
+            "format", "price_per_kg", "fixed_amount"
+        ])
 
-            for row in table[1:]:  # Skip header
-                if not row or not row[0]:
-                    continue
+        for row in table[1:]:  # Skip header
+            if not row or not row[0]:
+                continue
 
-                country_label = row[0].strip()
-                solution = row[1].strip() if len(row) > 1 else ""
-                fmt = row[2].strip() if len(row) > 2 else ""
-                price_kg_str = row[3].strip() if len(row) > 3 else "0"
-                fixed_str = row[4].strip() if len(row) > 4 else "0"
+            country_label = row[0].strip()
+            solution = row[1].strip() if len(row) > 1 else ""
+            fmt = row[2].strip() if len(row) > 2 else ""
+            price_kg_str = row[3].strip() if len(row) > 3 else "0"
+            fixed_str = row[4].strip() if len(row) > 4 else "0"
 
-                # Normaliser le pays
-                country_iso2 = COUNTRY_MAPPING.get(country_label, country_label)
+            # Normaliser le pays
+            country_iso2 = COUNTRY_MAPPING.get(country_label, country_label)
 
-                # Convertir prix
-                price_kg = float(price_kg_str.replace(",", "."))
-                fixed = float(fixed_str.replace(",", "."))
+            # Convertir prix
+            price_kg = float(price_kg_str.replace(",", "."))
+            fixed = float(fixed_str.replace(",", "."))
 
-                writer.writerow([
-                    country_label, country_iso2, solution,
-                    fmt, price_kg, fixed
-                ])
+            writer.writerow([
+                country_label, country_iso2, solution,
+                fmt, price_kg, fixed
+            ])
 
     print(f"✅ Raw data extracted to {csv_path}")
     return csv_path
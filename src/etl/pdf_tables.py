@@ -0,0 +1,205 @@
+"""
+Extraction des tableaux PDF partagée par les ETL (FedEx, Spring, La Poste)
+
+- Les pages sont extraites (pdfplumber `extract_table()`) en parallèle dans
+  un pool de processus, chaque worker ouvrant le PDF une seule fois.
+- Cache par page sur disque (data/cache/pdf_tables):
+    * index par fichier: (SHA-256 du PDF, index de page) → table. Un PDF
+      inchangé n'est pas rouvert du tout.
+    * par contenu de page: SHA-256 des flux de contenu de la page. Quand
+      un transporteur republie le PDF, seules les pages modifiées sont
+      ré-extraites.
+
+Usage:
+    tables = extract_tables(pdf_path, [21, 22, 23])
+    table = tables[21]  # Liste de lignes, ou None si aucun tableau
+"""
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pdfplumber
+from pdfminer.pdftypes import resolve1
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "cache" / "pdf_tables"
+
+# Incrémenter si le format des tables en cache change (invalide tout le cache)
+CACHE_VERSION = 1
+
+Table = Optional[List[List[Optional[str]]]]
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 du fichier (lecture par blocs)"""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def page_fingerprint(page) -> str:
+    """
+    Empreinte du contenu d'une page pdfplumber
+
+    Hash de la taille de page et des flux de contenu décodés: deux pages
+    identiques dans deux versions du PDF ont la même empreinte.
+    """
+    digest = hashlib.sha256(repr(page.bbox).encode())
+
+    contents = resolve1(page.page_obj.attrs.get("Contents"))
+    streams = contents if isinstance(contents, list) else [contents]
+
+    for stream in streams:
+        stream = resolve1(stream)
+        if stream is not None:
+            digest.update(stream.get_data())
+
+    return digest.hexdigest()
+
+
+class PageTableCache:
+    """Cache disque des tables extraites (index par fichier + tables par page)"""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.pages_dir = self.cache_dir / "pages"
+
+    def _file_index_path(self, pdf_hash: str) -> Path:
+        return self.cache_dir / f"{pdf_hash}.json"
+
+    def _page_path(self, fingerprint: str) -> Path:
+        return self.pages_dir / f"{fingerprint}.json"
+
+    @staticmethod
+    def _read(path: Path):
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if data.get("version") == CACHE_VERSION else None
+
+    @staticmethod
+    def _write(path: Path, data: dict):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def file_tables(self, pdf_hash: str) -> Dict[int, Table]:
+        """Tables connues pour un PDF (index de page → table)"""
+        data = self._read(self._file_index_path(pdf_hash))
+        if not data:
+            return {}
+        return {int(index): table for index, table in data["tables"].items()}
+
+    def store_file_tables(self, pdf_hash: str, tables: Dict[int, Table]):
+        """Fusionne des tables dans l'index du PDF"""
+        merged = self.file_tables(pdf_hash)
+        merged.update(tables)
+        self._write(self._file_index_path(pdf_hash), {
+            "version": CACHE_VERSION,
+            "tables": {str(index): table for index, table in sorted(merged.items())},
+        })
+
+    def page_table(self, fingerprint: str):
+        """(True, table) si la page est en cache, sinon (False, None)"""
+        data = self._read(self._page_path(fingerprint))
+        if data is None:
+            return False, None
+        return True, data["table"]
+
+    def store_page_table(self, fingerprint: str, table: Table):
+        self._write(self._page_path(fingerprint), {"version": CACHE_VERSION, "table": table})
+
+
+def _extract_pages(pdf_path: str, page_indices: List[int]) -> Dict[int, Table]:
+    """Worker: extrait les tables des pages demandées (PDF ouvert une fois)"""
+    with pdfplumber.open(pdf_path) as pdf:
+        return {index: pdf.pages[index].extract_table() for index in page_indices}
+
+
+def _fingerprint_pages(pdf_path: str, page_indices: List[int]) -> Dict[int, str]:
+    with pdfplumber.open(pdf_path) as pdf:
+        return {index: page_fingerprint(pdf.pages[index]) for index in page_indices}
+
+
+def _chunks(items: List[int], count: int) -> List[List[int]]:
+    """Répartit les pages en `count` lots (round-robin)"""
+    return [chunk for chunk in (items[i::count] for i in range(count)) if chunk]
+
+
+def extract_tables(
+    pdf_path,
+    page_indices: Iterable[int],
+    workers: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+    use_cache: bool = True
+) -> Dict[int, Table]:
+    """
+    Tables des pages demandées, depuis le cache ou extraites en parallèle
+
+    Args:
+        pdf_path: Chemin du PDF
+        page_indices: Index (base 0) des pages à extraire
+        workers: Processus d'extraction (défaut: nombre de CPU, 1 = sans pool)
+        cache_dir: Répertoire du cache (défaut: data/cache/pdf_tables)
+        use_cache: False pour forcer la ré-extraction
+
+    Returns:
+        Dict index de page → table (`page.extract_table()`, None si absente)
+    """
+    pdf_path = Path(pdf_path)
+    indices = sorted(set(page_indices))
+    cache = PageTableCache(cache_dir)
+
+    pdf_hash = file_sha256(pdf_path)
+    tables = cache.file_tables(pdf_hash) if use_cache else {}
+    missing = [index for index in indices if index not in tables]
+
+    if not missing:
+        logger.info(f"📦 {pdf_path.name}: {len(indices)} page(s) from cache")
+        return {index: tables[index] for index in indices}
+
+    # PDF modifié ou pages nouvelles: réutiliser les pages au contenu identique
+    fingerprints = _fingerprint_pages(str(pdf_path), missing)
+    to_extract = []
+
+    for index in missing:
+        hit, table = cache.page_table(fingerprints[index]) if use_cache else (False, None)
+        if hit:
+            tables[index] = table
+        else:
+            to_extract.append(index)
+
+    if to_extract:
+        workers = min(workers or os.cpu_count() or 1, len(to_extract))
+        logger.info(f"📄 {pdf_path.name}: extracting {len(to_extract)} page(s) with {workers} worker(s)")
+
+        if workers == 1:
+            extracted = _extract_pages(str(pdf_path), to_extract)
+        else:
+            extracted = {}
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for result in pool.map(_extract_pages, [str(pdf_path)] * workers, _chunks(to_extract, workers)):
+                    extracted.update(result)
+
+        for index, table in extracted.items():
+            cache.store_page_table(fingerprints[index], table)
+        tables.update(extracted)
+
+    cache.store_file_tables(pdf_hash, {index: tables[index] for index in missing})
+    logger.info(
+        f"📦 {pdf_path.name}: {len(indices) - len(to_extract)} cached, {len(to_extract)} extracted"
+    )
+
+    return {index: tables[index] for index in indices}
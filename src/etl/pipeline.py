@@ -0,0 +1,769 @@
+#!/usr/bin/env python3
+"""
+ETL Pipeline
+Runs every carrier ETL in dependency order: raw → intermediate → normalized → compiled
+
+Stages declare their inputs, outputs and dependencies:
+- Extract stages (raw PDF/Excel → data/intermediate) are independent and run
+  in parallel in a process pool.
+- Normalize stages write the shared data/normalized tables. Several carrier
+  ETLs append instead of upserting, so the normalized tables are rebuilt
+  as a whole: when any normalize input changed, the ETL-owned tables are
+  reset and every normalize stage runs again, serially, in dependency order.
+  The rebuilt rows then get back the IDs they had before, matched on the
+  writer's natural keys (new rows take IDs from id_sequences.json), and the
+  result must pass the integrity validator (on failure the previous tables
+  are restored).
+- Compile: DataLoader snapshot (data/compiled/loader.pkl), cheapest-service
+  breakpoints (data/compiled/breakpoints.csv) and the SQLite tariff store
+  (data/compiled/tariffs.sqlite) built from the normalized tables.
+
+A stage is skipped when the content hashes of its inputs (including its own
+source code) match the last successful run, stored in
+data/cache/etl_pipeline_state.json.
+
+Usage:
+    python3 src/etl/pipeline.py
+    python3 src/etl/pipeline.py --force --workers 4
+    python3 src/etl/pipeline.py --with ups_economy_ddu --no-compile
+"""
+
+import argparse
+import csv
+import hashlib
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from graphlib import TopologicalSorter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Project root
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.etl.base_schema import (
+    CSV_CARRIERS,
+    CSV_SERVICES,
+    CSV_SURCHARGE_RULES,
+    CSV_TARIFF_BANDS,
+    CSV_TARIFF_SCOPE_COUNTRIES,
+    CSV_TARIFF_SCOPES,
+)
+from src.etl.writer import NormalizedWriter
+
+logger = logging.getLogger(__name__)
+
+NORMALIZED_DIR = Path("data") / "normalized"
+COMPILED_DIR = Path("data") / "compiled"
+RESTRICTIONS_FILE = Path("data") / "service_restrictions.json"  # Compiled with the tariffs
+STATE_FILE = Path("data") / "cache" / "etl_pipeline_state.json"
+
+# Tables produced by the ETLs (country_aliases.csv is maintained by hand)
+ETL_TABLES = {
+    "carriers.csv": CSV_CARRIERS,
+    "services.csv": CSV_SERVICES,
+    "tariff_scopes.csv": CSV_TARIFF_SCOPES,
+    "tariff_scope_countries.csv": CSV_TARIFF_SCOPE_COUNTRIES,
+    "tariff_bands.csv": CSV_TARIFF_BANDS,
+    "surcharge_rules.csv": CSV_SURCHARGE_RULES,
+}
+
+# ID column of each ETL table (None: no ID) and the ID columns it references
+ID_COLUMNS = {
+    "carriers.csv": ("carrier_id", []),
+    "services.csv": ("service_id", ["carrier_id"]),
+    "tariff_scopes.csv": ("scope_id", ["service_id"]),
+    "tariff_scope_countries.csv": (None, ["scope_id"]),
+    "tariff_bands.csv": ("band_id", ["scope_id"]),
+    "surcharge_rules.csv": ("surcharge_id", ["service_id"]),
+}
+
+
+@dataclass
+class Stage:
+    """One step of the pipeline"""
+    name: str                   # "<carrier>.<step>"
+    run: str                    # "module:function" called without arguments
+    inputs: List[str]           # Paths relative to the root, or "module:CONSTANT" references
+    outputs: List[str] = field(default_factory=list)
+    deps: List[str] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)  # Extra code files (the run module is implicit)
+    writes_normalized: bool = False
+    default: bool = True        # False: only with --with <carrier>
+
+    @property
+    def carrier(self) -> str:
+        return self.name.split(".")[0]
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str                 # ran, skipped, kept, failed
+    seconds: float = 0.0
+    detail: str = ""
+
+
+@dataclass
+class PipelineReport:
+    results: List[StageResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(result.status != "failed" for result in self.results)
+
+    def result(self, name: str) -> Optional[StageResult]:
+        return next((result for result in self.results if result.name == name), None)
+
+
+STAGES = [
+    Stage("laposte.extract", "src.etl.laposte:extract_delivengo_raw",
+          inputs=["data/raw/LaPoste_odysseeD-1102072-1_0.pdf"],
+          outputs=["data/intermediate/laposte_delivengo_raw.csv"],
+          sources=["src/etl/pdf_tables.py"]),
+    Stage("laposte.normalize", "src.etl.laposte:normalize_delivengo",
+          inputs=["data/intermediate/laposte_delivengo_raw.csv"],
+          deps=["laposte.extract"],
+          writes_normalized=True),
+
+    Stage("spring.extract", "src.etl.spring:extract_spring_raw",
+          inputs=["data/raw/T2023 eCommerce - Spring Expéditions YOYAKU (1).pdf"],
+          outputs=["data/intermediate/spring_raw.csv"],
+          sources=["src/etl/pdf_tables.py"]),
+    Stage("spring.normalize", "src.etl.spring:normalize_spring",
+          inputs=["data/intermediate/spring_raw.csv"],
+          deps=["spring.extract", "laposte.normalize"],
+          writes_normalized=True),
+
+    Stage("fedex.zone_chart", "src.etl.fedex:extract_zone_chart",
+          inputs=["data/raw/FEDEX Courtesy-Net-Rates-15358183-English (2).pdf"],
+          outputs=["data/intermediate/fedex_zone_chart.csv"],
+          sources=["src/etl/pdf_tables.py"]),
+    Stage("fedex.rates", "src.etl.fedex:extract_rate_tables",
+          inputs=["data/raw/FEDEX Courtesy-Net-Rates-15358183-English (2).pdf"],
+          outputs=["data/intermediate/fedex_ip_rates.csv"],
+          sources=["src/etl/pdf_tables.py"]),
+    Stage("fedex.normalize", "src.etl.fedex:normalize_fedex",
+          inputs=["data/intermediate/fedex_zone_chart.csv", "data/intermediate/fedex_ip_rates.csv"],
+          deps=["fedex.zone_chart", "fedex.rates", "spring.normalize"],
+          writes_normalized=True),
+
+    # Extraction and normalization are a single function in ups.py
+    Stage("ups.normalize", "src.etl.ups:normalize_to_canonical",
+          inputs=["data/raw/PROPOSITION TARIFAIRE YOYAKU 2023.xlsx"],
+          outputs=["data/intermediate/ups_rates.csv"],
+          deps=["fedex.normalize"],
+          writes_normalized=True),
+
+    Stage("ups_all_services.extract", "src.etl.ups_all_services:extract_all_services",
+          inputs=["src.etl.ups_all_services:DEFAULT_XLSX_PATH"],
+          outputs=["data/intermediate/ups_all_services_raw.csv"]),
+    Stage("ups_all_services.normalize", "src.etl.pipeline:normalize_ups_all_services",
+          inputs=["data/intermediate/ups_all_services_raw.csv"],
+          deps=["ups_all_services.extract", "ups.normalize"],
+          sources=["src/etl/ups_all_services.py", "src/etl/writer.py"],
+          writes_normalized=True),
+
+    Stage("fedex_v2.normalize", "src.etl.fedex_v2_from_csv:main",
+          inputs=[
+              "src.etl.fedex_v2_from_csv:DEFAULT_ZONE_CHART_PATH",
+              "src.etl.fedex_v2_from_csv:DEFAULT_IPE_RATES_PATH",
+          ],
+          deps=["ups_all_services.normalize"],
+          sources=["src/etl/writer.py"],
+          writes_normalized=True),
+
+    # Superseded by ups_all_services (same UPS_ECONOMY_DDU_EXPORT_FR service)
+    Stage("ups_economy_ddu.extract", "src.etl.ups_economy_ddu:extract_raw",
+          inputs=["src.etl.ups_economy_ddu:DEFAULT_XLSX_PATH"],
+          outputs=["data/intermediate/ups_economy_ddu_raw.csv"],
+          default=False),
+    Stage("ups_economy_ddu.normalize", "src.etl.ups_economy_ddu:normalize_to_canonical",
+          inputs=["data/intermediate/ups_economy_ddu_raw.csv"],
+          deps=["ups_economy_ddu.extract", "fedex_v2.normalize"],
+          sources=["src/etl/writer.py"],
+          writes_normalized=True,
+          default=False),
+
+    # Not part of the production grid
+    Stage("ups_wwe_grid.normalize", "src.etl.pipeline:normalize_ups_wwe_grid",
+          inputs=["src.etl.ups_wwe_grid:DEFAULT_CSV_PATH"],
+          deps=["fedex_v2.normalize", "ups_economy_ddu.normalize"],
+          sources=["src/etl/ups_wwe_grid.py"],
+          writes_normalized=True,
+          default=False),
+]
+
+
+# ----------------------------------------------------------------------
+# Stage adapters (ETL entry points that need arguments)
+# ----------------------------------------------------------------------
+
+def normalize_ups_all_services():
+    """Normalize UPS all-services from the intermediate CSV (no Excel re-read)"""
+    import pandas as pd
+    from src.etl.ups_all_services import normalize_to_canonical
+
+    raw_df = pd.read_csv(PROJECT_ROOT / "data" / "intermediate" / "ups_all_services_raw.csv")
+    normalize_to_canonical(raw_df)
+
+
+def normalize_ups_wwe_grid():
+    """UPS WWE grid ETL with errors raised (run_etl() only prints them)"""
+    from src.etl.ups_wwe_grid import append_to_csvs, extract_raw, normalize_to_canonical
+
+    services, scope_countries, bands = normalize_to_canonical(extract_raw())
+    append_to_csvs(services, scope_countries, bands)
+
+
+# ----------------------------------------------------------------------
+# Hashing / state
+# ----------------------------------------------------------------------
+
+def resolve_ref(ref: str):
+    """Resolve "module:attribute" (function or path constant)"""
+    module_name, attribute = ref.split(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _is_ref(value: str) -> bool:
+    return re.fullmatch(r"[\w.]+:\w+", value) is not None
+
+
+def _module_file(ref: str) -> Path:
+    return Path(importlib.util.find_spec(ref.split(":")[0]).origin)
+
+
+def stage_input_paths(stage: Stage, root: Path) -> List[Path]:
+    """Data inputs then code inputs of a stage, as absolute paths"""
+    paths = []
+    for value in stage.inputs:
+        path = Path(resolve_ref(value)) if _is_ref(value) else Path(value)
+        paths.append(path if path.is_absolute() else root / path)
+
+    paths.append(_module_file(stage.run))
+    paths.extend(root / source for source in stage.sources)
+
+    return paths
+
+
+def file_hash(path: Path) -> Optional[str]:
+    """SHA-256 of a file, None if it does not exist"""
+    if not path.is_file():
+        return None
+
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_files(paths: Iterable[Path]) -> Dict[str, Optional[str]]:
+    return {str(path): file_hash(path) for path in paths}
+
+
+def normalized_hash(root: Path) -> str:
+    """Combined hash of every table in data/normalized and of the service restrictions"""
+    digest = hashlib.sha256()
+    paths = sorted((root / NORMALIZED_DIR).glob("*.csv")) + [root / RESTRICTIONS_FILE]
+    for path in paths:
+        digest.update(path.name.encode())
+        digest.update((file_hash(path) or "").encode())
+    return digest.hexdigest()
+
+
+def load_state(path: Path) -> Dict:
+    if not path.exists():
+        return {"stages": {}}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(path: Path, state: Dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+# ----------------------------------------------------------------------
+# Execution
+# ----------------------------------------------------------------------
+
+def _run_stage(name: str, run: str, root: str) -> float:
+    """Run one stage function from `root` (process-pool worker), returns seconds"""
+    os.chdir(root)
+    started = time.perf_counter()
+    resolve_ref(run)()
+    return time.perf_counter() - started
+
+
+def select_stages(stages: List[Stage], carriers: Iterable[str] = ()) -> List[Stage]:
+    """Default stages plus the stages of the optional carriers requested"""
+    carriers = set(carriers)
+    return [stage for stage in stages if stage.default or stage.carrier in carriers]
+
+
+def _graph(stages: List[Stage]) -> TopologicalSorter:
+    """Dependency graph (dependencies on unselected stages are ignored)"""
+    names = {stage.name for stage in stages}
+    return TopologicalSorter({stage.name: [d for d in stage.deps if d in names] for stage in stages})
+
+
+def _plan(stage: Stage, root: Path, state: Dict, force: bool):
+    """
+    Decide whether a stage must run
+
+    Returns:
+        (action, input hashes, detail) with action "run", "skip", "keep" or "fail"
+    """
+    try:
+        hashes = hash_files(stage_input_paths(stage, root))
+    except ImportError as e:
+        return "fail", {}, f"cannot load stage: {e}"
+
+    missing = [path for path, digest in hashes.items() if digest is None]
+    outputs_exist = all((root / output).is_file() for output in stage.outputs)
+
+    if missing:
+        if stage.outputs and outputs_exist:
+            return "keep", hashes, f"missing input, keeping existing output ({Path(missing[0]).name})"
+        return "fail", hashes, f"missing input: {missing[0]}"
+
+    if not force and outputs_exist and state["stages"].get(stage.name) == hashes:
+        return "skip", hashes, "inputs unchanged"
+
+    return "run", hashes, ""
+
+
+def _run_extract_phase(stages, root, state, force, workers, report):
+    """Extract stages: scheduled on the dependency graph, run in a process pool"""
+    by_name = {stage.name: stage for stage in stages}
+    graph = _graph(stages)
+    graph.prepare()
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    running = {}
+
+    try:
+        while graph.is_active():
+            for name in graph.get_ready():
+                stage = by_name[name]
+                action, hashes, detail = _plan(stage, root, state, force)
+
+                if action != "run":
+                    status = {"skip": "skipped", "keep": "kept", "fail": "failed"}[action]
+                    report.results.append(StageResult(name, status, detail=detail))
+                    graph.done(name)
+                elif pool is None:
+                    result = _run_inline(stage, root)
+                    if result.status == "ran":
+                        state["stages"][name] = hashes
+                    report.results.append(result)
+                    graph.done(name)
+                else:
+                    logger.info(f"▶️  {name}")
+                    running[pool.submit(_run_stage, name, stage.run, str(root))] = (stage, hashes)
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, hashes = running.pop(future)
+                try:
+                    seconds = future.result()
+                except Exception as e:
+                    logger.error(f"❌ {stage.name}: {e}")
+                    report.results.append(StageResult(stage.name, "failed", detail=str(e)))
+                else:
+                    state["stages"][stage.name] = hashes
+                    report.results.append(StageResult(stage.name, "ran", seconds))
+                graph.done(stage.name)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def _run_inline(stage: Stage, root: Path) -> StageResult:
+    logger.info(f"▶️  {stage.name}")
+    try:
+        seconds = _run_stage(stage.name, stage.run, str(root))
+    except Exception as e:
+        logger.error(f"❌ {stage.name}: {e}")
+        return StageResult(stage.name, "failed", detail=str(e))
+
+    return StageResult(stage.name, "ran", seconds)
+
+
+def reset_normalized(root: Path):
+    """
+    Empty the ETL-owned normalized tables (headers only)
+
+    The ID sequences (id_sequences.json) are kept: IDs are never reused,
+    see stabilize_ids().
+    """
+    normalized_dir = root / NORMALIZED_DIR
+    normalized_dir.mkdir(parents=True, exist_ok=True)
+
+    for file_name, columns in ETL_TABLES.items():
+        (normalized_dir / file_name).write_text(",".join(columns) + "\n", encoding="utf-8")
+
+
+def _read_table(path: Path) -> Tuple[List[Dict[str, str]], List[str]]:
+    if not path.exists():
+        return [], []
+    with path.open("r", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+        return rows, list(reader.fieldnames or [])
+
+
+def _write_table(path: Path, fieldnames: List[str], rows: List[Dict[str, str]]):
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tmp_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, path)
+
+
+def natural_keys(tables: Dict[str, List[Dict[str, str]]]) -> Dict[str, Dict[str, tuple]]:
+    """
+    Natural key of every row ID of the ETL tables (same keys as writer.py)
+
+    Rows whose parent row is unknown get no key.
+
+    Returns:
+        ID column -> {ID: natural key}
+    """
+    carriers = {row["carrier_id"]: (row["code"],) for row in tables["carriers.csv"]}
+    services = {row["service_id"]: (row["code"],) for row in tables["services.csv"]}
+    scopes = {
+        row["scope_id"]: services[row["service_id"]] + (row["code"],)
+        for row in tables["tariff_scopes.csv"] if row["service_id"] in services
+    }
+    surcharges = {
+        row["surcharge_id"]: services[row["service_id"]] + (row["name"],)
+        for row in tables["surcharge_rules.csv"] if row["service_id"] in services
+    }
+
+    # Legacy grids repeat a weight band with several prices: numbered in file order
+    bands = {}
+    seen = Counter()
+    for row in tables["tariff_bands.csv"]:
+        if row["scope_id"] in scopes:
+            key = scopes[row["scope_id"]] + (
+                round(float(row["min_weight_kg"]), 6), round(float(row["max_weight_kg"]), 6)
+            )
+            seen[key] += 1
+            bands[row["band_id"]] = key + (seen[key],)
+
+    return {
+        "carrier_id": carriers,
+        "service_id": services,
+        "scope_id": scopes,
+        "band_id": bands,
+        "surcharge_id": surcharges,
+    }
+
+
+def stabilize_ids(normalized_dir: Path, previous_dir: Path) -> int:
+    """
+    Give the rebuilt ETL tables the IDs their rows had before the rebuild
+
+    The legacy ETLs number their rows from scratch. Rows are matched on
+    natural keys: an unchanged carrier, service, scope, band or surcharge
+    keeps its ID, new rows get IDs from the persisted sequence, so IDs are
+    never reused and hand-maintained tables referencing scopes
+    (tariff_scope_postal_codes.csv) stay valid.
+
+    Args:
+        normalized_dir: Rebuilt tables (rewritten in place)
+        previous_dir: Copy of data/normalized before the rebuild
+
+    Returns:
+        Number of new IDs allocated
+    """
+    sequences = NormalizedWriter(previous_dir)  # Previous rows + id_sequences.json
+    previous = {file_name: _read_table(previous_dir / file_name)[0] for file_name in ETL_TABLES}
+    rebuilt = {file_name: _read_table(normalized_dir / file_name) for file_name in ETL_TABLES}
+
+    previous_ids = {
+        column: {key: row_id for row_id, key in ids.items()}
+        for column, ids in natural_keys(previous).items()
+    }
+    rebuilt_keys = natural_keys({file_name: rows for file_name, (rows, _) in rebuilt.items()})
+
+    id_maps: Dict[str, Dict[str, str]] = {column: {} for column in rebuilt_keys}
+    used = {column: set() for column in rebuilt_keys}
+    allocated = 0
+
+    # Parents first (ETL_TABLES order): references are mapped before they are rewritten
+    for file_name, (rows, fieldnames) in rebuilt.items():
+        id_column, references = ID_COLUMNS[file_name]
+
+        for row in rows:
+            if id_column:
+                key = rebuilt_keys[id_column].get(row[id_column])
+                stable = previous_ids[id_column].get(key) if key is not None else None
+                if stable is None or stable in used[id_column]:
+                    stable = str(sequences.next_id(id_column))
+                    allocated += 1
+                used[id_column].add(stable)
+                id_maps[id_column][row[id_column]] = stable
+                row[id_column] = stable
+
+            for column in references:
+                row[column] = id_maps[column].get(row[column], row[column])
+
+        if fieldnames:
+            _write_table(normalized_dir / file_name, fieldnames, rows)
+
+    sequences.save_sequences(normalized_dir)
+    return allocated
+
+
+def _restore_normalized(backup, normalized_dir: Path):
+    shutil.rmtree(normalized_dir)
+    shutil.copytree(backup, normalized_dir)
+    logger.error("↩️  Restored previous normalized tables")
+
+
+def _finish_rebuild(normalized_dir: Path, previous_dir: Path):
+    """Stable IDs, then the integrity check (raises TariffValidationError on errors)"""
+    from src.engine.validator import TariffValidationError, validate_dir
+
+    allocated = stabilize_ids(normalized_dir, previous_dir)
+    logger.info(f"🔢 Rebuilt tables keep their IDs ({allocated} new)")
+
+    validation = validate_dir(normalized_dir)
+    if not validation.ok:
+        raise TariffValidationError(validation)
+
+
+def _run_normalize_phase(stages, root, state, force, report):
+    """Normalize stages: full serial rebuild of data/normalized when anything changed"""
+    order = list(_graph(stages).static_order())
+    by_name = {stage.name: stage for stage in stages}
+    plans = {name: _plan(by_name[name], root, state, force) for name in order}
+
+    # A rebuild needs every normalize input: never reset the tables otherwise
+    failed_extract = {result.name for result in report.results if result.status == "failed"}
+    blocked = {}
+    for name in order:
+        failed_deps = sorted(set(by_name[name].deps) & failed_extract)
+        if failed_deps:
+            blocked[name] = f"{failed_deps[0]} failed"
+        elif plans[name][0] == "fail":
+            blocked[name] = plans[name][2]
+        elif plans[name][0] == "keep":
+            missing = next(path for path, digest in plans[name][1].items() if digest is None)
+            blocked[name] = f"missing input: {missing}"
+
+    if blocked:
+        for name in order:
+            if name in blocked:
+                report.results.append(StageResult(name, "failed", detail=blocked[name]))
+            else:
+                report.results.append(StageResult(name, "skipped", detail="normalized data left unchanged"))
+        return
+
+    unchanged = (
+        not force
+        and all(plans[name][0] == "skip" for name in order)
+        and state.get("normalized") == normalized_hash(root)
+    )
+    if unchanged:
+        for name in order:
+            report.results.append(StageResult(name, "skipped", detail="inputs unchanged"))
+        return
+
+    normalized_dir = root / NORMALIZED_DIR
+    with tempfile.TemporaryDirectory() as backup:
+        shutil.copytree(normalized_dir, backup, dirs_exist_ok=True)
+        reset_normalized(root)
+
+        for name in order:
+            result = _run_inline(by_name[name], root)
+            report.results.append(result)
+
+            if result.status == "failed":
+                # Hashes are only recorded for a complete rebuild
+                _restore_normalized(backup, normalized_dir)
+                for remaining in order[order.index(name) + 1:]:
+                    report.results.append(StageResult(remaining, "skipped", detail=f"{name} failed"))
+                return
+
+        try:
+            _finish_rebuild(normalized_dir, Path(backup))
+        except Exception as e:
+            logger.error(f"❌ normalize: {e}")
+            report.results.append(StageResult("normalize", "failed", detail=str(e)))
+            _restore_normalized(backup, normalized_dir)
+            return
+
+    for name in order:
+        state["stages"][name] = plans[name][1]
+    state["normalized"] = normalized_hash(root)
+
+
+def compile_snapshot(root: Path) -> List[Path]:
+    """Write the DataLoader snapshot, the breakpoint tables and the tariff store to data/compiled"""
+    from src.engine.breakpoints import compute_breakpoints, served_countries, write_csv
+    from src.engine.engine import PricingEngine
+    from src.engine.loader import DataLoader
+    from src.engine.tariff_store import build_store
+
+    loader = DataLoader(data_dir=root / NORMALIZED_DIR)
+    loader.load_all()
+    engine = PricingEngine(loader=loader)
+
+    compiled_dir = root / COMPILED_DIR
+    compiled_dir.mkdir(parents=True, exist_ok=True)
+
+    snapshot_path = compiled_dir / "loader.pkl"
+    tmp_path = snapshot_path.with_suffix(".pkl.tmp")
+    tmp_path.write_bytes(loader.snapshot())
+    os.replace(tmp_path, snapshot_path)
+
+    breakpoints_path = compiled_dir / "breakpoints.csv"
+    write_csv([compute_breakpoints(engine, iso2) for iso2 in served_countries(engine)], breakpoints_path)
+
+    store_path = build_store(root / NORMALIZED_DIR, compiled_dir / "tariffs.sqlite")
+
+    return [snapshot_path, breakpoints_path, store_path]
+
+
+def _run_compile_phase(root, state, force, report):
+    outputs = [
+        root / COMPILED_DIR / "loader.pkl",
+        root / COMPILED_DIR / "breakpoints.csv",
+        root / COMPILED_DIR / "tariffs.sqlite",
+    ]
+    source_hash = normalized_hash(root)
+
+    if not force and state.get("compiled_from") == source_hash and all(p.exists() for p in outputs):
+        report.results.append(StageResult("compile", "skipped", detail="normalized data unchanged"))
+        return
+
+    logger.info("▶️  compile")
+    started = time.perf_counter()
+    try:
+        compile_snapshot(root)
+    except Exception as e:
+        logger.error(f"❌ compile: {e}")
+        report.results.append(StageResult("compile", "failed", detail=str(e)))
+        return
+
+    state["compiled_from"] = source_hash
+    report.results.append(StageResult("compile", "ran", time.perf_counter() - started))
+
+
+def run_pipeline(
+    stages: Optional[List[Stage]] = None,
+    root: Path = PROJECT_ROOT,
+    workers: Optional[int] = None,
+    force: bool = False,
+    compile: bool = True,
+    state_file: Optional[Path] = None
+) -> PipelineReport:
+    """
+    Run the pipeline (extract → normalize → compile)
+
+    Args:
+        stages: Stages to run (default: the default carrier stages)
+        root: Project root (stage paths are relative to it)
+        workers: Processes for extract stages (default: CPU count, 1 = in-process)
+        force: Run every stage regardless of input hashes
+        compile: Build data/compiled after normalization
+        state_file: Hash state file (default: data/cache/etl_pipeline_state.json)
+
+    Returns:
+        PipelineReport with status and timing per stage
+    """
+    root = Path(root).resolve()
+    stages = select_stages(STAGES) if stages is None else stages
+    state_path = Path(state_file) if state_file else root / STATE_FILE
+    state = load_state(state_path)
+    report = PipelineReport()
+
+    started = time.perf_counter()
+    previous_cwd = os.getcwd()
+    os.chdir(root)  # Some ETLs use paths relative to the project root
+
+    try:
+        extract = [stage for stage in stages if not stage.writes_normalized]
+        normalize = [stage for stage in stages if stage.writes_normalized]
+
+        _run_extract_phase(extract, root, state, force, workers or os.cpu_count() or 1, report)
+        save_state(state_path, state)
+
+        _run_normalize_phase(normalize, root, state, force, report)
+        save_state(state_path, state)
+
+        if compile and report.ok:
+            _run_compile_phase(root, state, force, report)
+            save_state(state_path, state)
+    finally:
+        os.chdir(previous_cwd)
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def print_report(report: PipelineReport):
+    icons = {"ran": "✅", "skipped": "⏭️ ", "kept": "📦", "failed": "❌"}
+
+    print("\n" + "=" * 70)
+    print("ETL PIPELINE")
+    print("=" * 70)
+    for result in report.results:
+        timing = f"{result.seconds:7.2f}s" if result.status == "ran" else " " * 8
+        print(f"{icons[result.status]} {result.name:<30} {result.status:<8} {timing}  {result.detail}")
+    print("-" * 70)
+    print(f"⏱️  Total: {report.seconds:.2f}s")
+    print("=" * 70)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    optional = sorted({stage.carrier for stage in STAGES if not stage.default})
+
+    parser = argparse.ArgumentParser(description="Run all carrier ETLs (raw → normalized → compiled)")
+    parser.add_argument("--force", action="store_true", help="Ignore input hashes and rerun every stage")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for extract stages (default: CPU count)")
+    parser.add_argument("--with", dest="carriers", action="append", default=[], choices=optional,
+                        help="Also run an optional carrier ETL")
+    parser.add_argument("--no-compile", action="store_true", help="Skip data/compiled snapshot")
+    args = parser.parse_args()
+
+    report = run_pipeline(
+        stages=select_stages(STAGES, args.carriers),
+        workers=args.workers,
+        force=args.force,
+        compile=not args.no_compile
+    )
+
+    print_report(report)
+    sys.exit(0 if report.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
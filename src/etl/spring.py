@@ -5,8 +5,14 @@ Extrait les grilles Europe + Reste du monde et génère les tables normalisées
 
 import csv
 import re
+import sys
 from pathlib import Path
-import pdfplumber
+
+# Project root
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.etl.pdf_tables import extract_tables
 
 
 # Mapping pays → ISO2
@@ -97,69 +103,68 @@ def extract_spring_table(pdf_path, page_index, region_code, region_label):
 
     rows = []
 
-    with pdfplumber.open(pdf_path) as pdf:
-        page = pdf.pages[page_index]
-        table = page.extract_table()
+    # Table en cache si la page n'a pas changé
+    table = extract_tables(pdf_path, [page_index])[page_index]
 
-        if not table or len(table) < 3:
-            raise ValueError(f"No table found on page {page_index + 1}")
+    if not table or len(table) < 3:
+        raise ValueError(f"No table found on page {page_index + 1}")
 
-        # Trouver la ligne d'en-tête (celle avec 100g, 250g, ...)
-        header_row = None
-        header_idx = None
+    # Trouver la ligne d'en-tête (celle avec 100g, 250g, ...)
+    header_row = None
+    header_idx = None
 
-        for i, row in enumerate(table):
-            if any("100g" in str(cell) for cell in row if cell):
-                header_row = row
-                header_idx = i
-                break
+    for i, row in enumerate(table):
+        if any("100g" in str(cell) for cell in row if cell):
+            header_row = row
+            header_idx = i
+            break
 
-        if not header_row:
-            raise ValueError("Could not find weight header row")
+    if not header_row:
+        raise ValueError("Could not find weight header row")
 
-        # Parser les colonnes de poids
-        weight_cols = parse_weight_header(header_row)
+    # Parser les colonnes de poids
+    weight_cols = parse_weight_header(header_row)
 
-        print(f"  Found {len(weight_cols)} weight columns: {[w for _, w in weight_cols]}")
+    print(f"  Found {len(weight_cols)} weight columns: {[w for _, w in weight_cols]}")
 
-        # Parser les lignes pays (après l'en-tête)
-        for row in table[header_idx + 1:]:
-            if not row or not row[0]:
-                continue
+    # Parser les lignes pays (après l'en-tête)
+    for row in table[header_idx + 1:]:
+        if not row or not row[0]:
+            continue
 
-            country_label = row[0].strip()
+        country_label = row[0].strip()
 
-            # Ignorer lignes vides ou notes
-            if not country_label or country_label.startswith("*") or country_label.startswith("Surcharge"):
-                continue
+        # Ignorer lignes vides ou notes
+        if not country_label or country_label.startswith("*") or country_label.startswith("Surcharge"):
+            continue
 
-            # Normaliser le pays
-            country_iso2 = COUNTRY_MAPPING.get(country_label)
+        # Normaliser le pays
+        country_iso2 = COUNTRY_MAPPING.get(country_label)
 
-            if not country_iso2:
-                print(f"  ⚠️  Unknown country: {country_label}")
-                continue
+        if not country_iso2:
+            print(f"  ⚠️  Unknown country: {country_label}")
+            continue
 
-            # Extraire les prix pour chaque tranche de poids
-            for col_idx, weight_kg in weight_cols:
-                price_str = row[col_idx] if col_idx < len(row) else None
+        # Extraire les prix pour chaque tranche de poids
+        for col_idx, weight_kg in weight_cols:
+            price_str = row[col_idx] if col_idx < len(row) else None
 
-                if not price_str or price_str.strip() == "":
-                    continue
+            if not price_str or price_str.strip() == "":
+                continue
 
-                try:
-                    price = float(price_str.replace(",", "."))
+            try:
+                price = float(price_str.replace(",", "."))
 
-                    rows.append({
-                        "region": region_code,
-                        "region_label": region_label,
-                        "country_label": country_label,
-                        "country_iso2": country_iso2,
-                        "weight_kg": weight_kg,
-                        "price": price
-                    })
-                except ValueError:
-                    print(f"  ⚠️  Invalid price: {price_str} for {country_label} @ {weight_kg}kg")
+                rows.append({
+                    "region": region_code,
+                    "region_label": region_label,
+                    "country_label": country_label,
+                    "country_iso2": country_iso2,
+                    "weight_kg": weight_kg,
+                    "price": price
+                })
+            except ValueError:
+                print(f"  ⚠️  Invalid price: {price_str} for {country_label} @ {weight_kg}kg")
 
     return rows
 
@@ -174,6 +179,9 @@ def extract_spring_raw():
 
     all_rows = []
 
+    # Extraction des deux pages en parallèle (mises en cache pour la suite)
+    extract_tables(pdf_path, [1, 2])
+
     # Page 2: Europe
     print("\n  Processing Europe (page 2)...")
     europe_rows = extract_spring_table(pdf_path, page_index=1, region_code="EU", region_label="Europe")
@@ -10,11 +10,15 @@ Follows canonical data model defined in ARCHITECTURE.md
 """
 
 import pandas as pd
-import csv
-import os
+import sys
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple
-from decimal import Decimal
+
+# Project root
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.etl.writer import BandSpec, NormalizedWriter, ScopeSpec
 
 DEFAULT_XLSX_PATH = "/Users/yoyaku/YOYAKU Dropbox/Benjamin Belaga/Downloads/PROPAL YOYAKU ECONOMY DDU (1).xlsx"
 
@@ -248,54 +252,29 @@ def extract_all_services(xlsx_path: str = DEFAULT_XLSX_PATH) -> pd.DataFrame:
 
 def normalize_to_canonical(
     raw_df: Optional[pd.DataFrame] = None,
-    carrier_id: int = 4  # UPS
+    carrier_id: int = 4,  # UPS
+    normalized_dir: Optional[Path] = None
 ) -> None:
-    """Normalize to canonical CSVs"""
+    """
+    Normalize to canonical CSVs
+
+    Upserts through NormalizedWriter: rerunning on the same Excel keeps
+    all IDs and rewrites nothing.
+    """
 
     if raw_df is None:
         raw_df = extract_all_services()
 
-    normalized_dir = Path(__file__).parent.parent.parent / "data" / "normalized"
-
-    services_file = normalized_dir / "services.csv"
-    scopes_file = normalized_dir / "tariff_scopes.csv"
-    scope_countries_file = normalized_dir / "tariff_scope_countries.csv"
-    bands_file = normalized_dir / "tariff_bands.csv"
-
-    # Get next available IDs
-    def get_max_id(csv_file: Path, id_column: str) -> int:
-        if not csv_file.exists():
-            return 0
-        df = pd.read_csv(csv_file)
-        if df.empty:
-            return 0
-        return int(df[id_column].max())
-
-    next_service_id = get_max_id(services_file, 'service_id') + 1
-    next_scope_id = get_max_id(scopes_file, 'scope_id') + 1
-    next_band_id = get_max_id(bands_file, 'band_id') + 1
+    writer = NormalizedWriter(normalized_dir)
 
     print("\n📋 Normalizing to canonical CSVs...")
 
-    # Track service_code -> service_id mapping
-    service_code_to_id = {}
-    services_data = []
-    scopes_data = []
-    scope_countries_data = []
-    bands_data = []
-
     # Group by service
     for service_code, service_group in raw_df.groupby('service_code'):
         # Find service definition
         service_def = next(s for s in SERVICES if s['code'] == service_code)
 
-        # Create service entry
-        service_id = next_service_id
-        service_code_to_id[service_code] = service_id
-        next_service_id += 1
-
-        services_data.append({
-            'service_id': service_id,
+        service_row = {
             'carrier_id': carrier_id,
             'code': service_def['code'],
             'label': service_def['label'],
@@ -307,9 +286,9 @@ def normalize_to_canonical(
             'volumetric_divisor': 5000,
             'active_from': '2022-04-10',
             'active_to': ''
-        })
+        }
 
-        print(f"\n🔧 Service: {service_def['label']} (ID: {service_id})")
+        print(f"\n🔧 Service: {service_def['label']}")
 
         # For EXPORT services: group by destination country
         # For IMPORT services: group by origin country
@@ -318,79 +297,36 @@ def normalize_to_canonical(
         else:
             country_col = 'origin_iso2'
 
-        # Create scopes per country
+        # One scope per country with its FIXED bands
+        scopes = []
         for country_iso2, country_group in service_group.groupby(country_col):
-            scope_id = next_scope_id
-            next_scope_id += 1
-
-            scopes_data.append({
-                'scope_id': scope_id,
-                'service_id': service_id,
-                'code': f"{service_code}_{country_iso2}",
-                'description': f"{service_def['label']} → {country_iso2}",
-                'is_catch_all': False
-            })
-
-            scope_countries_data.append({
-                'scope_id': scope_id,
-                'country_iso2': country_iso2
-            })
-
-            # FIXED bands
             fixed_rows = country_group[country_group['band_type'] == 'FIXED']
-            for _, row in fixed_rows.iterrows():
-                bands_data.append({
-                    'band_id': next_band_id,
-                    'scope_id': scope_id,
-                    'min_weight_kg': row['min_weight_kg'],
-                    'max_weight_kg': row['max_weight_kg'],
-                    'base_amount': round(row['price'], 2),
-                    'amount_per_kg': 0.00,
-                    'is_min_charge': False
-                })
-                next_band_id += 1
+
+            scopes.append(ScopeSpec(
+                code=f"{service_code}_{country_iso2}",
+                description=f"{service_def['label']} → {country_iso2}",
+                countries=[country_iso2],
+                bands=[
+                    BandSpec(
+                        min_weight_kg=row['min_weight_kg'],
+                        max_weight_kg=row['max_weight_kg'],
+                        base_amount=round(row['price'], 2),
+                        amount_per_kg=0.0
+                    )
+                    for _, row in fixed_rows.iterrows()
+                ]
+            ))
+
+        stats = writer.sync_service(service_row, scopes)
 
         country_count = service_group[country_col].nunique()
         band_count = len(service_group)
-        print(f"   ✅ {country_count} countries, {band_count} bands")
-
-    # Append to CSVs
-    def append_csv(file_path: Path, data: List[Dict], fieldnames: List[str]):
-        file_exists = file_path.exists()
-
-        with open(file_path, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-
-            if not file_exists:
-                writer.writeheader()
-
-            for row in data:
-                writer.writerow(row)
+        print(f"   ✅ {country_count} countries, {band_count} bands ({stats.summary()})")
 
     print("\n💾 Writing to normalized CSVs...")
 
-    append_csv(services_file, services_data, [
-        'service_id', 'carrier_id', 'code', 'label', 'direction', 'origin_iso2',
-        'incoterm', 'service_type', 'max_weight_kg', 'volumetric_divisor',
-        'active_from', 'active_to'
-    ])
-    print(f"   ✅ services.csv: +{len(services_data)} services")
-
-    append_csv(scopes_file, scopes_data, [
-        'scope_id', 'service_id', 'code', 'description', 'is_catch_all'
-    ])
-    print(f"   ✅ tariff_scopes.csv: +{len(scopes_data)} scopes")
-
-    append_csv(scope_countries_file, scope_countries_data, [
-        'scope_id', 'country_iso2'
-    ])
-    print(f"   ✅ tariff_scope_countries.csv: +{len(scope_countries_data)} mappings")
-
-    append_csv(bands_file, bands_data, [
-        'band_id', 'scope_id', 'min_weight_kg', 'max_weight_kg',
-        'base_amount', 'amount_per_kg', 'is_min_charge'
-    ])
-    print(f"   ✅ tariff_bands.csv: +{len(bands_data)} bands")
+    for file_name in writer.commit():
+        print(f"   ✅ {file_name} updated")
 
     print("\n✅ Normalization complete!")
 
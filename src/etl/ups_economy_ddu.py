@@ -12,7 +12,7 @@ Structure:
     Row ~55: "Price per kg." with per-kg rates
     Row ~56: "Minimum" with minimum charges
 
-Output: Appends to normalized CSVs
+Output: Upserts into normalized CSVs (idempotent, see writer.py)
 - services.csv (UPS_ECONOMY_DDU_EXPORT_FR)
 - tariff_scopes.csv (one scope per destination country)
 - tariff_scope_countries.csv (scope→country mappings)
@@ -20,11 +20,16 @@ Output: Appends to normalized CSVs
 """
 
 import pandas as pd
-import csv
 import os
+import sys
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple
-from decimal import Decimal
+
+# Project root
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.etl.writer import BandSpec, NormalizedWriter, ScopeSpec
 
 
 # Configuration
@@ -211,7 +216,8 @@ def extract_raw(
 def normalize_to_canonical(
     raw_df: Optional[pd.DataFrame] = None,
     carrier_id: int = 4,  # UPS
-    service_code: str = "UPS_ECONOMY_DDU_EXPORT_FR"
+    service_code: str = "UPS_ECONOMY_DDU_EXPORT_FR",
+    normalized_dir: Optional[Path] = None
 ) -> None:
     """
     Normalize UPS Economy DDU raw data to canonical CSV files
@@ -220,8 +226,9 @@ def normalize_to_canonical(
         raw_df: DataFrame from extract_raw() (or loads from intermediate CSV)
         carrier_id: UPS carrier ID (default 4)
         service_code: Service code (default UPS_ECONOMY_DDU_EXPORT_FR)
+        normalized_dir: Target directory (default data/normalized)
 
-    Appends to:
+    Upserts (by service code, scope code and weight range) into:
         - data/normalized/services.csv
         - data/normalized/tariff_scopes.csv
         - data/normalized/tariff_scope_countries.csv
@@ -236,35 +243,10 @@ def normalize_to_canonical(
     print("🔄 NORMALIZING TO CANONICAL MODEL")
     print("=" * 60)
 
-    normalized_dir = Path(__file__).parent.parent.parent / "data" / "normalized"
-
-    carriers_file = normalized_dir / "carriers.csv"
-    services_file = normalized_dir / "services.csv"
-    scopes_file = normalized_dir / "tariff_scopes.csv"
-    scope_countries_file = normalized_dir / "tariff_scope_countries.csv"
-    bands_file = normalized_dir / "tariff_bands.csv"
-
-    # 1. Get next available IDs
-    def get_max_id(csv_file: Path, id_column: str) -> int:
-        """Get max ID from CSV file"""
-        if not csv_file.exists():
-            return 0
-        df = pd.read_csv(csv_file)
-        if df.empty:
-            return 0
-        return int(df[id_column].max())
-
-    next_service_id = get_max_id(services_file, 'service_id') + 1
-    next_scope_id = get_max_id(scopes_file, 'scope_id') + 1
-    next_band_id = get_max_id(bands_file, 'band_id') + 1
-
-    print(f"📊 Next IDs: service={next_service_id}, scope={next_scope_id}, band={next_band_id}")
+    writer = NormalizedWriter(normalized_dir)
 
-    # 2. Create service entry (if not exists)
-    service_id = next_service_id
-
-    services_data = [{
-        'service_id': service_id,
+    # 1. Service entry (existing service keeps its ID)
+    service_row = {
         'carrier_id': carrier_id,
         'code': service_code,
         'label': 'UPS Economy DDU Export FR',
@@ -276,121 +258,55 @@ def normalize_to_canonical(
         'volumetric_divisor': 5000,
         'active_from': '2022-04-10',
         'active_to': ''
-    }]
-
-    # Check if service already exists
-    if services_file.exists():
-        existing_services = pd.read_csv(services_file)
-        if service_code in existing_services['code'].values:
-            service_id = int(existing_services[existing_services['code'] == service_code]['service_id'].iloc[0])
-            print(f"✅ Service already exists: {service_code} (ID={service_id})")
-            services_data = []  # Don't append
-        else:
-            print(f"✅ Creating new service: {service_code} (ID={service_id})")
-    else:
-        print(f"✅ Creating new service: {service_code} (ID={service_id})")
+    }
 
-    # 3. Create scopes, mappings, and bands per country
-    scopes_data = []
-    scope_countries_data = []
-    bands_data = []
+    # 2. Scopes, mappings, and bands per country
+    scopes = []
 
     for dest_iso2, group in raw_df.groupby('dest_iso2'):
-        scope_id = next_scope_id
-        next_scope_id += 1
-
-        scope_code = f"UPS_ECO_DDU_FR_{dest_iso2}"
-        scope_desc = f"UPS Economy DDU Export FR→{dest_iso2}"
-
-        scopes_data.append({
-            'scope_id': scope_id,
-            'service_id': service_id,
-            'code': scope_code,
-            'description': scope_desc,
-            'is_catch_all': False
-        })
-
-        scope_countries_data.append({
-            'scope_id': scope_id,
-            'country_iso2': dest_iso2
-        })
-
         # FIXED bands (one per weight)
         fixed_rows = group[group['band_type'] == 'FIXED']
-        for _, row in fixed_rows.iterrows():
-            bands_data.append({
-                'band_id': next_band_id,
-                'scope_id': scope_id,
-                'min_weight_kg': row['min_weight_kg'],
-                'max_weight_kg': row['max_weight_kg'],
-                'base_amount': round(row['price'], 2),
-                'amount_per_kg': 0.00,
-                'is_min_charge': False
-            })
-            next_band_id += 1
+        bands = [
+            BandSpec(
+                min_weight_kg=row['min_weight_kg'],
+                max_weight_kg=row['max_weight_kg'],
+                base_amount=round(row['price'], 2),
+                amount_per_kg=0.0
+            )
+            for _, row in fixed_rows.iterrows()
+        ]
 
         # PERKG band (one per country)
         perkg_rows = group[group['band_type'] == 'PERKG']
         if not perkg_rows.empty:
             row = perkg_rows.iloc[0]
-            bands_data.append({
-                'band_id': next_band_id,
-                'scope_id': scope_id,
-                'min_weight_kg': row['min_weight_kg'],
-                'max_weight_kg': row['max_weight_kg'],
-                'base_amount': round(row['min_charge'], 2),
-                'amount_per_kg': round(row['price_per_kg'], 2),
-                'is_min_charge': True
-            })
-            next_band_id += 1
-
-    print(f"✅ Generated {len(scopes_data)} scopes")
-    print(f"✅ Generated {len(scope_countries_data)} country mappings")
-    print(f"✅ Generated {len(bands_data)} tariff bands")
-
-    # 4. Append to CSV files
-    def append_csv(file_path: Path, data: List[Dict], fieldnames: List[str]):
-        """Append data to CSV file"""
-        if not data:
-            return
-
-        file_exists = file_path.exists()
-
-        with open(file_path, 'a', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-
-            if not file_exists:
-                writer.writeheader()
-
-            for row in data:
-                writer.writerow(row)
-
-    # Append services
-    if services_data:
-        append_csv(services_file, services_data, [
-            'service_id', 'carrier_id', 'code', 'label', 'direction', 'origin_iso2',
-            'incoterm', 'service_type', 'max_weight_kg', 'volumetric_divisor',
-            'active_from', 'active_to'
-        ])
-        print(f"💾 Appended {len(services_data)} service(s) to services.csv")
-
-    # Append scopes
-    append_csv(scopes_file, scopes_data, [
-        'scope_id', 'service_id', 'code', 'description', 'is_catch_all'
-    ])
-    print(f"💾 Appended {len(scopes_data)} scopes to tariff_scopes.csv")
-
-    # Append scope countries
-    append_csv(scope_countries_file, scope_countries_data, [
-        'scope_id', 'country_iso2'
-    ])
-    print(f"💾 Appended {len(scope_countries_data)} mappings to tariff_scope_countries.csv")
-
-    # Append bands
-    append_csv(bands_file, bands_data, [
-        'band_id', 'scope_id', 'min_weight_kg', 'max_weight_kg', 'base_amount', 'amount_per_kg', 'is_min_charge'
-    ])
-    print(f"💾 Appended {len(bands_data)} bands to tariff_bands.csv")
+            bands.append(BandSpec(
+                min_weight_kg=row['min_weight_kg'],
+                max_weight_kg=row['max_weight_kg'],
+                base_amount=round(row['min_charge'], 2),
+                amount_per_kg=round(row['price_per_kg'], 2),
+                is_min_charge=True
+            ))
+
+        scopes.append(ScopeSpec(
+            code=f"UPS_ECO_DDU_FR_{dest_iso2}",
+            description=f"UPS Economy DDU Export FR→{dest_iso2}",
+            countries=[dest_iso2],
+            bands=bands
+        ))
+
+    print(f"✅ Generated {len(scopes)} scopes")
+    print(f"✅ Generated {sum(len(scope.bands) for scope in scopes)} tariff bands")
+
+    # 3. Upsert and rewrite changed CSV files only
+    stats = writer.sync_service(service_row, scopes)
+    print(f"🔄 {service_code}: {stats.summary()}")
+
+    written = writer.commit()
+    for file_name in written:
+        print(f"💾 Updated {file_name}")
+    if not written:
+        print("✅ Normalized CSVs already up to date")
 
 
 def run_etl(xlsx_path: Optional[str] = None) -> None:
@@ -403,7 +319,7 @@ def run_etl(xlsx_path: Optional[str] = None) -> None:
     Pipeline:
         1. Extract raw prices from Excel
         2. Normalize to canonical model
-        3. Append to CSV files
+        3. Upsert into CSV files
     """
     print("=" * 60)
     print("UPS ECONOMY DDU ETL - Canonical Data Model")
@@ -29,6 +29,9 @@ from typing import Dict, List, Tuple, Optional
 from decimal import Decimal
 
 
+DEFAULT_CSV_PATH = '/Users/yoyaku/Desktop/UPS documentation et grille/Grille Tarifaire UPS WWE - Sheet1.csv'
+
+
 def extract_raw(csv_path: Optional[str] = None) -> Dict[str, Dict[float, float]]:
     """
     Extract raw pricing data from UPS WWE grid CSV
@@ -45,7 +48,7 @@ def extract_raw(csv_path: Optional[str] = None) -> Dict[str, Dict[float, float]]
         ValueError: If CSV format is invalid
     """
     if csv_path is None:
-        csv_path = '/Users/yoyaku/Desktop/UPS documentation et grille/Grille Tarifaire UPS WWE - Sheet1.csv'
+        csv_path = DEFAULT_CSV_PATH
 
     if not os.path.exists(csv_path):
         raise FileNotFoundError(
@@ -0,0 +1,457 @@
+"""
+Normalized CSV Writer
+Shared, idempotent writer for data/normalized used by the ETL scripts
+
+Rows are keyed on natural keys instead of IDs:
+- carriers:               code
+- services:               code
+- tariff_scopes:          (service_id, code)
+- tariff_scope_countries: (scope_id, country_iso2)
+- tariff_bands:           (scope_id, min_weight_kg, max_weight_kg)
+- surcharge_rules:        (service_id, name)
+
+An ETL publishes the complete set of scopes/bands of a service with
+`sync_service()`: existing rows keep their IDs, new rows get IDs from the
+persisted sequence (id_sequences.json), and rows of that service that are
+no longer produced are removed (no orphaned scopes or bands).
+`commit()` only rewrites the CSV files whose content actually changed, so
+rerunning an ETL on unchanged input writes nothing.
+
+Existing rows are indexed by natural key once, when the writer loads: a
+sync costs O(rows of the service), not a scan of every table per scope.
+Deleted rows are dropped from the row lists once, at commit.
+
+Usage:
+    writer = NormalizedWriter()
+    writer.sync_service(service_row, [ScopeSpec(...), ...])
+    writer.commit()
+"""
+
+import csv
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base_schema import (
+    CSV_CARRIERS,
+    CSV_SERVICES,
+    CSV_SURCHARGE_RULES,
+    CSV_TARIFF_BANDS,
+    CSV_TARIFF_SCOPE_COUNTRIES,
+    CSV_TARIFF_SCOPES,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NORMALIZED_DIR = Path(__file__).parent.parent.parent / "data" / "normalized"
+
+SEQUENCES_FILE = "id_sequences.json"
+
+# table -> (file name, columns, id column)
+TABLES = {
+    "carriers": ("carriers.csv", CSV_CARRIERS, "carrier_id"),
+    "services": ("services.csv", CSV_SERVICES, "service_id"),
+    "tariff_scopes": ("tariff_scopes.csv", CSV_TARIFF_SCOPES, "scope_id"),
+    "tariff_scope_countries": ("tariff_scope_countries.csv", CSV_TARIFF_SCOPE_COUNTRIES, None),
+    "tariff_bands": ("tariff_bands.csv", CSV_TARIFF_BANDS, "band_id"),
+    "surcharge_rules": ("surcharge_rules.csv", CSV_SURCHARGE_RULES, "surcharge_id"),
+}
+
+
+@dataclass
+class BandSpec:
+    """One weight band of a scope (natural key: min/max weight)"""
+    min_weight_kg: float
+    max_weight_kg: float
+    base_amount: Any
+    amount_per_kg: Any = 0
+    is_min_charge: bool = False
+
+
+@dataclass
+class ScopeSpec:
+    """One scope of a service with its countries and bands"""
+    code: str
+    description: str
+    countries: List[str]
+    bands: List[BandSpec]
+    is_catch_all: bool = False
+
+
+@dataclass
+class SyncStats:
+    """Row counts touched by a sync (for ETL logging)"""
+    inserted: Dict[str, int] = field(default_factory=dict)
+    updated: Dict[str, int] = field(default_factory=dict)
+    deleted: Dict[str, int] = field(default_factory=dict)
+
+    def _add(self, bucket: Dict[str, int], table: str, count: int = 1):
+        if count:
+            bucket[table] = bucket.get(table, 0) + count
+
+    def summary(self) -> str:
+        parts = []
+        for label, bucket in (("+", self.inserted), ("~", self.updated), ("-", self.deleted)):
+            parts.extend(f"{label}{count} {table}" for table, count in sorted(bucket.items()))
+        return ", ".join(parts) if parts else "no changes"
+
+
+def _cell(value: Any) -> str:
+    """CSV cell as written by csv.DictWriter"""
+    if value is None:
+        return ""
+    return str(value)
+
+
+def _same_cell(current: str, value: str) -> bool:
+    """Cells are equal as text or as numbers ("70.0" == "70")"""
+    if current == value:
+        return True
+    try:
+        return float(current) == float(value)
+    except ValueError:
+        return False
+
+
+def _weight_key(value: Any) -> float:
+    return round(float(value), 6)
+
+
+class NormalizedWriter:
+    """In-memory view of the normalized CSVs with natural-key upserts"""
+
+    def __init__(self, normalized_dir: Optional[Path] = None):
+        self.normalized_dir = Path(normalized_dir or DEFAULT_NORMALIZED_DIR)
+
+        self.rows: Dict[str, List[Dict[str, str]]] = {}
+        self.fieldnames: Dict[str, List[str]] = {}
+        self._dirty: Dict[str, bool] = {}
+
+        for table, (file_name, columns, _) in TABLES.items():
+            self.rows[table], self.fieldnames[table] = self._read(file_name, columns)
+            self._dirty[table] = False
+
+        # Natural-key indexes over self.rows (kept in sync by _upsert/_remove)
+        self._services_by_code: Dict[str, Dict[str, str]] = {}
+        self._scopes_by_service: Dict[int, Dict[str, Dict[str, str]]] = {}
+        self._countries_by_scope: Dict[int, Dict[str, Dict[str, str]]] = {}
+        self._bands_by_scope: Dict[int, Dict[Tuple[float, float], Dict[str, str]]] = {}
+        self._surcharges_by_key: Dict[Tuple[int, str], Dict[str, str]] = {}
+        # table -> id() of removed rows, dropped from self.rows at commit
+        self._removed: Dict[str, set] = {table: set() for table in TABLES}
+
+        for table, rows in self.rows.items():
+            for row in rows:
+                self._index(table, row)
+
+        self.sequences = self._load_sequences()
+
+    # ------------------------------------------------------------------
+    # Loading / saving
+    # ------------------------------------------------------------------
+
+    def _read(self, file_name: str, columns: List[str]) -> Tuple[List[Dict[str, str]], List[str]]:
+        path = self.normalized_dir / file_name
+        if not path.exists():
+            return [], list(columns)
+
+        with path.open("r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+            fieldnames = list(reader.fieldnames or columns)
+
+        # Keep extra columns already in the file, add missing schema columns
+        for column in columns:
+            if column not in fieldnames:
+                fieldnames.append(column)
+
+        return rows, fieldnames
+
+    def _load_sequences(self) -> Dict[str, int]:
+        """
+        Next free ID per ID column
+
+        The persisted sequence never goes backwards: deleted IDs are not
+        reused. It is also bumped past the max ID in the CSVs in case
+        rows were added by hand.
+        """
+        path = self.normalized_dir / SEQUENCES_FILE
+        sequences: Dict[str, int] = {}
+
+        if path.exists():
+            with path.open("r", encoding="utf-8") as f:
+                sequences = {key: int(value) for key, value in json.load(f).items()}
+
+        for table, (_, _, id_column) in TABLES.items():
+            if id_column is None:
+                continue
+            max_id = max((int(row[id_column]) for row in self.rows[table] if row.get(id_column)), default=0)
+            sequences[id_column] = max(sequences.get(id_column, 1), max_id + 1)
+
+        return sequences
+
+    def next_id(self, id_column: str) -> int:
+        """Allocate the next ID of a sequence"""
+        value = self.sequences[id_column]
+        self.sequences[id_column] = value + 1
+        return value
+
+    def commit(self) -> List[str]:
+        """
+        Write changed tables (and the sequence file)
+
+        Returns:
+            Names of the rewritten CSV files
+        """
+        written = []
+
+        for table, (file_name, _, _) in TABLES.items():
+            if not self._dirty[table]:
+                continue
+
+            self._compact(table)
+
+            # Rows keep their file order (new rows appended) for readable git diffs
+            self._write_atomic(self.normalized_dir / file_name, self.fieldnames[table], self.rows[table])
+            self._dirty[table] = False
+            written.append(file_name)
+
+        if written:
+            self.save_sequences()
+
+        for file_name in written:
+            logger.info(f"💾 Rewrote {file_name}")
+        if not written:
+            logger.info("✅ Normalized CSVs already up to date")
+
+        return written
+
+    def save_sequences(self, normalized_dir: Optional[Path] = None):
+        """Persist the next free IDs (id_sequences.json)"""
+        sequences_path = Path(normalized_dir or self.normalized_dir) / SEQUENCES_FILE
+        tmp_path = sequences_path.with_suffix(".json.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(self.sequences, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, sequences_path)
+
+    @staticmethod
+    def _write_atomic(path: Path, fieldnames: List[str], rows: List[Dict[str, str]]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+
+        with tmp_path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # Natural-key indexes
+    # ------------------------------------------------------------------
+
+    def _index_slot(self, table: str, row: Dict[str, str]) -> Tuple[Optional[dict], Any]:
+        """(index dict, key) holding a row of a table"""
+        if table == "services":
+            return self._services_by_code, row["code"]
+        if table == "tariff_scopes":
+            return self._scopes_by_service.setdefault(int(row["service_id"]), {}), row["code"]
+        if table == "tariff_scope_countries":
+            return self._countries_by_scope.setdefault(int(row["scope_id"]), {}), row["country_iso2"]
+        if table == "tariff_bands":
+            key = (_weight_key(row["min_weight_kg"]), _weight_key(row["max_weight_kg"]))
+            return self._bands_by_scope.setdefault(int(row["scope_id"]), {}), key
+        if table == "surcharge_rules":
+            return self._surcharges_by_key, (int(row["service_id"]), row["name"])
+        return None, None
+
+    def _index(self, table: str, row: Dict[str, str]):
+        index, key = self._index_slot(table, row)
+        if index is not None:
+            index[key] = row
+
+    def _unindex(self, table: str, row: Dict[str, str]):
+        index, key = self._index_slot(table, row)
+        if index is not None and index.get(key) is row:
+            del index[key]
+
+    def _compact(self, table: str):
+        """Drop removed rows from the row list (once per commit)"""
+        removed = self._removed[table]
+        if removed:
+            self.rows[table] = [row for row in self.rows[table] if id(row) not in removed]
+            removed.clear()
+
+    # ------------------------------------------------------------------
+    # Upserts
+    # ------------------------------------------------------------------
+
+    def _upsert(self, table: str, existing: Optional[Dict[str, str]], values: Dict[str, Any], stats: SyncStats):
+        """Insert `values` or update `existing` in place (marks the table dirty on change)"""
+        cells = {key: _cell(value) for key, value in values.items()}
+
+        if existing is None:
+            row = {column: "" for column in self.fieldnames[table]}
+            row.update(cells)
+            self.rows[table].append(row)
+            self._index(table, row)
+            self._dirty[table] = True
+            stats._add(stats.inserted, table)
+            return row
+
+        changed = {key: value for key, value in cells.items() if not _same_cell(existing.get(key, ""), value)}
+        if changed:
+            existing.update(changed)
+            self._dirty[table] = True
+            stats._add(stats.updated, table)
+
+        return existing
+
+    def _remove(self, table: str, rows: List[Dict[str, str]], stats: SyncStats) -> int:
+        """Remove rows (found through the indexes) from a table"""
+        for row in rows:
+            self._unindex(table, row)
+            self._removed[table].add(id(row))
+
+        if rows:
+            self._dirty[table] = True
+            stats._add(stats.deleted, table, len(rows))
+
+        return len(rows)
+
+    def upsert_service(self, service: Dict[str, Any], stats: Optional[SyncStats] = None) -> int:
+        """
+        Insert or update a service keyed on its code
+
+        Args:
+            service: services.csv row without service_id (extra keys ignored)
+
+        Returns:
+            service_id (existing one when the code is already known)
+        """
+        stats = stats or SyncStats()
+        existing = self._services_by_code.get(service["code"])
+
+        values = {key: value for key, value in service.items() if key != "service_id"}
+        values["service_id"] = int(existing["service_id"]) if existing else self.next_id("service_id")
+
+        row = self._upsert("services", existing, values, stats)
+        return int(row["service_id"])
+
+    def sync_service(
+        self,
+        service: Dict[str, Any],
+        scopes: List[ScopeSpec],
+        prune: bool = True
+    ) -> SyncStats:
+        """
+        Publish the complete scopes/countries/bands of one service
+
+        Args:
+            service: services.csv row (keyed on code)
+            scopes: All scopes produced by the ETL for this service
+            prune: Remove scopes/bands of the service that are not in `scopes`
+
+        Returns:
+            SyncStats with inserted/updated/deleted row counts
+        """
+        stats = SyncStats()
+        service_id = self.upsert_service(service, stats)
+
+        existing_scopes = dict(self._scopes_by_service.get(service_id, {}))
+        kept_scope_ids = set()
+
+        for spec in scopes:
+            existing = existing_scopes.get(spec.code)
+            scope_id = int(existing["scope_id"]) if existing else self.next_id("scope_id")
+
+            self._upsert("tariff_scopes", existing, {
+                "scope_id": scope_id,
+                "service_id": service_id,
+                "code": spec.code,
+                "description": spec.description,
+                "is_catch_all": spec.is_catch_all,
+            }, stats)
+            kept_scope_ids.add(scope_id)
+
+            self._sync_scope_countries(scope_id, spec.countries, stats)
+            self._sync_scope_bands(scope_id, spec.bands, stats)
+
+        if prune:
+            stale = [row for row in existing_scopes.values() if int(row["scope_id"]) not in kept_scope_ids]
+            if stale:
+                self._delete_scopes(stale, stats)
+
+        logger.info(f"🔄 {service['code']}: {stats.summary()}")
+        return stats
+
+    def _sync_scope_countries(self, scope_id: int, countries: List[str], stats: SyncStats):
+        wanted = set(countries)
+        current = self._countries_by_scope.get(scope_id, {})
+
+        stale = [row for iso2, row in current.items() if iso2 not in wanted]
+        if stale:
+            self._remove("tariff_scope_countries", stale, stats)
+
+        for iso2 in sorted(wanted - current.keys()):
+            self._upsert("tariff_scope_countries", None, {"scope_id": scope_id, "country_iso2": iso2}, stats)
+
+    def _sync_scope_bands(self, scope_id: int, bands: List[BandSpec], stats: SyncStats):
+        existing = dict(self._bands_by_scope.get(scope_id, {}))
+        wanted_keys = set()
+
+        for band in bands:
+            key = (_weight_key(band.min_weight_kg), _weight_key(band.max_weight_kg))
+            wanted_keys.add(key)
+            row = existing.get(key)
+
+            self._upsert("tariff_bands", row, {
+                "band_id": int(row["band_id"]) if row else self.next_id("band_id"),
+                "scope_id": scope_id,
+                "min_weight_kg": band.min_weight_kg,
+                "max_weight_kg": band.max_weight_kg,
+                "base_amount": band.base_amount,
+                "amount_per_kg": band.amount_per_kg,
+                "is_min_charge": band.is_min_charge,
+            }, stats)
+
+        stale = [row for key, row in existing.items() if key not in wanted_keys]
+        if stale:
+            self._remove("tariff_bands", stale, stats)
+
+    def _delete_scopes(self, scope_rows: List[Dict[str, str]], stats: SyncStats):
+        """Delete scopes with their country mappings and bands"""
+        self._remove("tariff_scopes", scope_rows, stats)
+
+        for scope in scope_rows:
+            scope_id = int(scope["scope_id"])
+            self._remove("tariff_scope_countries", list(self._countries_by_scope.get(scope_id, {}).values()), stats)
+            self._remove("tariff_bands", list(self._bands_by_scope.get(scope_id, {}).values()), stats)
+            self._countries_by_scope.pop(scope_id, None)
+            self._bands_by_scope.pop(scope_id, None)
+
+    def upsert_surcharge(self, service_code: str, rule: Dict[str, Any], stats: Optional[SyncStats] = None) -> int:
+        """
+        Insert or update a surcharge rule keyed on (service, name)
+
+        Args:
+            service_code: Code of an existing service
+            rule: surcharge_rules.csv row without surcharge_id/service_id
+
+        Returns:
+            surcharge_id
+        """
+        stats = stats or SyncStats()
+        service_id = int(self._services_by_code[service_code]["service_id"])
+        existing = self._surcharges_by_key.get((service_id, rule["name"]))
+
+        values = {key: value for key, value in rule.items() if key not in ("surcharge_id", "service_id")}
+        values["service_id"] = service_id
+        values["surcharge_id"] = int(existing["surcharge_id"]) if existing else self.next_id("surcharge_id")
+
+        row = self._upsert("surcharge_rules", existing, values, stats)
+        return int(row["surcharge_id"])
@@ -0,0 +1,170 @@
+"""
+Circuit Breaker - Protects the bot from a degraded upstream API
+One breaker per UPS api_type (STANDARD / WWE), with adaptive request timeouts
+"""
+
+import threading
+import time
+import logging
+from typing import Callable, Dict, Any
+
+from .latency import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with latency-aware failure detection
+
+    States:
+    - CLOSED: calls go through, consecutive failures are counted
+    - OPEN: calls are short-circuited until `open_duration` has elapsed
+    - HALF_OPEN: a single probe call is allowed; success closes, failure re-opens
+
+    A call slower than `slow_call_threshold` counts as a failure, so a
+    latency spike opens the breaker even if UPS eventually answers.
+
+    The request timeout adapts to observed latency:
+        timeout = clamp(p95 * timeout_multiplier, min_timeout, max_timeout)
+    Until `min_samples` successful calls are observed, `max_timeout` is used.
+    """
+
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        open_duration: float = 30.0,
+        slow_call_threshold: float = 10.0,
+        min_timeout: float = 3.0,
+        max_timeout: float = 30.0,
+        timeout_multiplier: float = 3.0,
+        min_samples: int = 10,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.open_duration = open_duration
+        self.slow_call_threshold = slow_call_threshold
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.min_samples = min_samples
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        self.latencies = LatencyWindow()
+
+        # Counters (exported in bot stats)
+        self.total_calls = 0
+        self.total_failures = 0
+        self.short_circuited = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current state (OPEN turns into HALF_OPEN once open_duration elapsed)"""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.open_duration:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may be attempted
+
+        Returns:
+            False if the breaker is open (caller must short-circuit)
+        """
+        with self._lock:
+            state = self._current_state()
+
+            if state == self.CLOSED:
+                return True
+
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                logger.info(f"🔎 UPS {self.name} breaker half-open: sending probe request")
+                return True
+
+            self.short_circuited += 1
+            return False
+
+    def record_success(self, latency: float):
+        """Record a completed call (a slow call counts as a failure)"""
+        if latency > self.slow_call_threshold:
+            logger.warning(
+                f"🐢 UPS {self.name} slow call: {latency:.2f}s "
+                f"(threshold {self.slow_call_threshold:.1f}s)"
+            )
+            self.record_failure(latency)
+            return
+
+        with self._lock:
+            self.total_calls += 1
+            self.latencies.record(latency)
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+            if self._state != self.CLOSED:
+                logger.info(f"✅ UPS {self.name} breaker closed (probe succeeded)")
+            self._state = self.CLOSED
+
+    def record_failure(self, latency: float = None):
+        """Record a failed call (exception, timeout, HTTP 5xx or slow call)"""
+        with self._lock:
+            self.total_calls += 1
+            self.total_failures += 1
+            self._consecutive_failures += 1
+            self._probe_in_flight = False
+
+            if latency is not None:
+                self.latencies.record(latency)
+
+            state = self._current_state()
+            if state == self.HALF_OPEN or (
+                state == self.CLOSED and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self.times_opened += 1
+                logger.error(
+                    f"⛔ UPS {self.name} breaker OPEN after {self._consecutive_failures} "
+                    f"failure(s) - short-circuiting for {self.open_duration:.0f}s"
+                )
+
+    def current_timeout(self) -> float:
+        """Request timeout derived from the observed p95 latency"""
+        if len(self.latencies) < self.min_samples:
+            return self.max_timeout
+
+        p95 = self.latencies.percentile(95)
+        timeout = p95 * self.timeout_multiplier
+        return max(self.min_timeout, min(timeout, self.max_timeout))
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of breaker state and counters"""
+        return {
+            'name': self.name,
+            'state': self.state,
+            'consecutive_failures': self._consecutive_failures,
+            'total_calls': self.total_calls,
+            'total_failures': self.total_failures,
+            'short_circuited': self.short_circuited,
+            'times_opened': self.times_opened,
+            'timeout': self.current_timeout(),
+            'latency': self.latencies.summary(),
+        }
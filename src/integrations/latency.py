@@ -0,0 +1,63 @@
+"""
+Latency tracking helpers
+Rolling window of observed durations with percentile queries
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class LatencyWindow:
+    """Rolling window of the last N latency samples (seconds)"""
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """Add one latency sample"""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Nearest-rank percentile of the window
+
+        Args:
+            pct: Percentile in [0, 100]
+
+        Returns:
+            Latency in seconds, or None if the window is empty
+        """
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+
+        return _nearest_rank(ordered, pct)
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """p50/p95/p99/max of the window (seconds)"""
+        with self._lock:
+            ordered = sorted(self._samples)
+
+        if not ordered:
+            return {'count': 0, 'p50': None, 'p95': None, 'p99': None, 'max': None}
+
+        return {
+            'count': len(ordered),
+            'p50': _nearest_rank(ordered, 50),
+            'p95': _nearest_rank(ordered, 95),
+            'p99': _nearest_rank(ordered, 99),
+            'max': ordered[-1],
+        }
+
+
+def _nearest_rank(ordered, pct: float) -> float:
+    """Pick the nearest-rank percentile from an already sorted list"""
+    rank = int(round(pct / 100.0 * (len(ordered) - 1)))
+    return ordered[max(0, min(rank, len(ordered) - 1))]
@@ -0,0 +1,68 @@
+"""
+Live Rate Cache - TTL cache for UPS API rate responses
+Shared between user-facing /price calls and the background pre-warmer
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class RateCache:
+    """Thread-safe TTL cache of rate lists keyed by lane"""
+
+    def __init__(self, ttl: float = 1800.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[Hashable, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        destination_country: str,
+        weight_kg: float,
+        destination_city: str,
+        destination_postal: str,
+        dimensions_cm: Optional[Tuple[float, float, float]] = None
+    ) -> Tuple:
+        """
+        Build the cache key for a lane
+
+        Weight is rounded to the gram, postal codes ignore case and spaces
+        ("K1A 0B1" == "k1a0b1"), dimensions are part of the lane (they change
+        the billed weight).
+        """
+        postal = "".join(destination_postal.split()).upper() if destination_postal else destination_postal
+        dimensions = tuple(round(d, 1) for d in dimensions_cm) if dimensions_cm else None
+        return (destination_country.upper(), round(weight_kg, 3), destination_city, postal, dimensions)
+
+    def get(self, key: Hashable) -> Optional[List[Dict[str, Any]]]:
+        """Return cached rates, or None if missing/expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or self._clock() - entry[0] > self.ttl:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return [dict(rate) for rate in entry[1]]
+
+    def put(self, key: Hashable, rates: List[Dict[str, Any]]):
+        """Store rates for a lane (timestamped now)"""
+        with self._lock:
+            self._entries[key] = (self._clock(), [dict(rate) for rate in rates])
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit ratio"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else None,
+            }
@@ -0,0 +1,46 @@
+"""
+Request Throttle - Spaces individual UPS API requests
+Used by the background pre-warmer so that its request rate, not its lane rate,
+stays within UPS rate limits
+"""
+
+import threading
+import time
+from typing import Callable
+
+
+class RequestThrottle:
+    """
+    Thread-safe minimum spacing between requests (token bucket of size 1)
+
+    `wait()` blocks the calling thread until the next request slot, so it
+    must be called from a worker thread (the pre-warmer runs UPS calls via
+    asyncio.to_thread), never from the event loop.
+    """
+
+    def __init__(
+        self,
+        max_requests_per_sec: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.min_spacing = 1.0 / max_requests_per_sec if max_requests_per_sec > 0 else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.waited_seconds = 0.0
+
+    def wait(self):
+        """Block until a request may be sent, then reserve the slot"""
+        with self._lock:
+            now = self._clock()
+            delay = max(0.0, self._next_slot - now)
+            self._next_slot = max(now, self._next_slot) + self.min_spacing
+            self.requests += 1
+            self.waited_seconds += delay
+
+        if delay > 0:
+            self._sleep(delay)
@@ -9,10 +9,13 @@ import json
 import time
 import logging
 import os
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from decimal import Decimal
 from dataclasses import dataclass
 
+from .circuit_breaker import CircuitBreaker
+from .rate_cache import RateCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -124,6 +127,9 @@ class UPSAPIClient:
         'RO', 'BG', 'SK', 'SI', 'HR', 'EE', 'LV', 'LT', 'LU', 'CY', 'MT'
     }
 
+    # Package dimensions (cm) sent when the caller gives none
+    DEFAULT_DIMENSIONS_CM = (30, 30, 15)
+
     # UPS service code names
     SERVICE_NAMES = {
         '03': 'UPS Ground',
@@ -140,14 +146,32 @@ class UPSAPIClient:
         '92': 'UPS SurePost',
     }
 
-    def __init__(self, credentials_manager: Optional[UPSCredentialsManager] = None, production: bool = True):
+    def __init__(
+        self,
+        credentials_manager: Optional[UPSCredentialsManager] = None,
+        production: bool = True,
+        cache_ttl: float = 1800.0,
+        base_url: Optional[str] = None
+    ):
+        """
+        Args:
+            credentials_manager: UPS credentials (loaded from env/ups.env if None)
+            production: Use onlinetools.ups.com (True) or wwwcie.ups.com (False)
+            cache_ttl: Live rate cache lifetime in seconds
+            base_url: Override the UPS host (e.g. "http://127.0.0.1:8089" for
+                      the local mock server); takes precedence over `production`
+        """
         if credentials_manager is None:
             credentials_manager = UPSCredentialsManager()
 
         self.credentials = credentials_manager
 
         # Environment selection
-        if production:
+        if base_url:
+            base_url = base_url.rstrip('/')
+            self.base_url = f"{base_url}/api"
+            self.auth_url = f"{base_url}/security/v1/oauth/token"
+        elif production:
             self.base_url = "https://onlinetools.ups.com/api"  # PRODUCTION
             self.auth_url = "https://onlinetools.ups.com/security/v1/oauth/token"
         else:
@@ -156,6 +180,16 @@ class UPSAPIClient:
 
         self.tokens = {}  # Token cache
 
+        # One circuit breaker per API (STANDARD / WWE): a degraded UPS endpoint
+        # is short-circuited instead of costing every /price the full timeout
+        self.breakers = {
+            'STANDARD': CircuitBreaker('STANDARD'),
+            'WWE': CircuitBreaker('WWE'),
+        }
+
+        # Live rate cache (filled by /price calls and the background pre-warmer)
+        self.rate_cache = RateCache(ttl=cache_ttl)
+
         # YOYAKU Paris origin address
         # Note: StateProvinceCode required for NegotiatedRatesIndicator
         self.origin_address = {
@@ -205,7 +239,8 @@ class UPSAPIClient:
         }
 
         try:
-            response = requests.post(auth_url, headers=headers, data=data, timeout=30)
+            timeout = self.breakers[api_type].current_timeout()
+            response = requests.post(auth_url, headers=headers, data=data, timeout=timeout)
             response.raise_for_status()
 
             token_data = response.json()
@@ -231,7 +266,10 @@ class UPSAPIClient:
         destination_country: str,
         destination_city: str = "Main City",
         destination_postal: str = "00000",
-        fallback_to_individual: bool = True
+        fallback_to_individual: bool = True,
+        use_cache: bool = True,
+        dimensions_cm: Optional[Tuple[float, float, float]] = None,
+        before_request: Optional[Callable[[], None]] = None
     ) -> List[Dict[str, Any]]:
         """
         Get real-time shipping rates from UPS API
@@ -242,6 +280,10 @@ class UPSAPIClient:
             destination_city: Destination city name
             destination_postal: Destination postal code
             fallback_to_individual: If Shop fails, try individual service codes
+            use_cache: Serve from the live rate cache when fresh (False forces a UPS call)
+            dimensions_cm: Package (length, width, height) in cm (default 30x30x15)
+            before_request: Called before every UPS request (Shop and each
+                            fallback Rate call), e.g. RequestThrottle.wait
 
         Returns:
             List of rate dictionaries with keys:
@@ -252,17 +294,32 @@ class UPSAPIClient:
             - delivery_days: Estimated delivery time
             - api_type: 'STANDARD' or 'WWE'
         """
+        dimensions_cm = tuple(dimensions_cm) if dimensions_cm else self.DEFAULT_DIMENSIONS_CM
+        cache_key = RateCache.make_key(
+            destination_country, weight_kg, destination_city, destination_postal, dimensions_cm
+        )
+
+        if use_cache:
+            cached = self.rate_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"⚡ UPS rates served from cache for {weight_kg}kg to {destination_country}")
+                return cached
+
         # Determine which API to use
         api_type = 'STANDARD' if destination_country in self.EUROPE_COUNTRIES else 'WWE'
 
         # Try "Shop" first (all services)
+        if before_request:
+            before_request()
         rates = self._get_rates_internal(
             weight_kg, destination_country, destination_city,
-            destination_postal, api_type, request_option='Shop'
+            destination_postal, api_type, request_option='Shop',
+            dimensions_cm=dimensions_cm
         )
 
         # If Shop fails and fallback enabled, try individual service codes
-        if not rates and fallback_to_individual:
+        # (pointless while the breaker is open: every call would be short-circuited)
+        if not rates and fallback_to_individual and self.breakers[api_type].state != CircuitBreaker.OPEN:
             logger.info(f"🔄 Shop failed, trying individual service codes for {api_type}")
 
             # Service codes to try based on API type
@@ -272,10 +329,12 @@ class UPSAPIClient:
             service_codes = ['11', '65'] if api_type == 'STANDARD' else ['07', '08', '65']
 
             for service_code in service_codes:
+                if before_request:
+                    before_request()
                 service_rates = self._get_rates_internal(
                     weight_kg, destination_country, destination_city,
                     destination_postal, api_type, request_option='Rate',
-                    service_code=service_code
+                    service_code=service_code, dimensions_cm=dimensions_cm
                 )
                 if service_rates:
                     rates.extend(service_rates)
@@ -283,8 +342,29 @@ class UPSAPIClient:
             if rates:
                 logger.info(f"✅ Fallback successful: {len(rates)} rates obtained via individual service codes")
 
+        # Only cache successful lookups (failures must be retried)
+        if rates:
+            self.rate_cache.put(cache_key, rates)
+
         return rates
 
+    def refresh_rates(
+        self,
+        weight_kg: float,
+        destination_country: str,
+        before_request: Optional[Callable[[], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Force a UPS call for a lane and update the live rate cache
+
+        Used by the background pre-warmer so user-facing calls hit the cache.
+        A lane costs up to 4 UPS requests (Shop + 3 Rate fallbacks):
+        `before_request` is called before each one.
+        """
+        return self.get_shipping_rates(
+            weight_kg, destination_country, use_cache=False, before_request=before_request
+        )
+
     def _get_rates_internal(
         self,
         weight_kg: float,
@@ -293,7 +373,8 @@ class UPSAPIClient:
         destination_postal: str,
         api_type: str,
         request_option: str = 'Shop',
-        service_code: Optional[str] = None
+        service_code: Optional[str] = None,
+        dimensions_cm: Optional[Tuple[float, float, float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Internal method to get rates with specific request option
@@ -301,7 +382,20 @@ class UPSAPIClient:
         Args:
             request_option: 'Shop' (all services) or 'Rate' (specific service)
             service_code: Required if request_option='Rate'
+            dimensions_cm: Package (length, width, height) in cm (default 30x30x15)
+
+        Calls go through the api_type circuit breaker: while it is open the
+        request is skipped and an empty list is returned immediately.
         """
+        breaker = self.breakers[api_type]
+        length, width, height = dimensions_cm or self.DEFAULT_DIMENSIONS_CM
+
+        if not breaker.allow_request():
+            logger.warning(f"⛔ UPS API {api_type} circuit open - skipping {request_option} request")
+            return []
+
+        # Rating request start: token fetches must not skew the latency window
+        started = None
 
         try:
             # Get access token
@@ -341,9 +435,9 @@ class UPSAPIClient:
                                 "Code": "CM",
                                 "Description": "Centimeters"
                             },
-                            "Length": "30",
-                            "Width": "30",
-                            "Height": "15"
+                            "Length": f"{length:g}",
+                            "Width": f"{width:g}",
+                            "Height": f"{height:g}"
                         },
                         "PackageWeight": {
                             "UnitOfMeasurement": {
@@ -391,10 +485,23 @@ class UPSAPIClient:
             logger.debug(f"📤 UPS API {api_type} request to {rating_url}")
             logger.debug(f"   {req_desc}, Weight: {weight_kg}kg, Destination: {destination_country}")
 
-            response = requests.post(rating_url, json=payload, headers=headers, timeout=30)
+            started = time.monotonic()
+            response = requests.post(
+                rating_url, json=payload, headers=headers, timeout=breaker.current_timeout()
+            )
+            latency = time.monotonic() - started
+
+            # Server-side errors mean UPS is degraded; 4xx are request problems
+            if response.status_code >= 500:
+                breaker.record_failure(latency)
+            else:
+                breaker.record_success(latency)
 
-            # Parse response
-            data = response.json()
+            # Parse response (error pages are not always JSON)
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
 
             # Check for HTTP errors
             if response.status_code != 200:
@@ -469,10 +576,15 @@ class UPSAPIClient:
             logger.info(f"✅ {len(rates)} UPS rates obtained for {weight_kg}kg to {destination_country}")
             return rates
 
-        except Exception as e:
+        except requests.exceptions.RequestException as e:
+            breaker.record_failure(time.monotonic() - started if started is not None else None)
             logger.error(f"❌ UPS API {api_type} call error: {e}")
-            import traceback
-            traceback.print_exc()
+            return []
+
+        except Exception as e:
+            # Unexpected errors still release a half-open probe
+            breaker.record_failure(time.monotonic() - started if started is not None else None)
+            logger.exception(f"❌ UPS API {api_type} call error: {e}")
             return []
 
     def _estimate_delivery_days(self, service_code: str, destination_country: str) -> str:
@@ -500,6 +612,10 @@ class UPSAPIClient:
 
         return estimates.get(service_code, '5-10')
 
+    def breaker_stats(self) -> List[Dict[str, Any]]:
+        """Circuit breaker state for each API (shown by the bot's /stats)"""
+        return [breaker.stats() for breaker in self.breakers.values()]
+
 
 def main():
     """Test UPS API integration"""
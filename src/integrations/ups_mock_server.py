@@ -0,0 +1,307 @@
+"""
+UPS API Mock Server - Local stand-in for offline load testing
+Implements the two endpoints used by UPSAPIClient:
+    POST /security/v1/oauth/token
+    POST /api/rating/v1/Rate
+
+Prices are deterministic (function of service and weight), latency and
+errors are injected from a seeded RNG so benchmarks are reproducible.
+
+Usage:
+    python -m src.integrations.ups_mock_server --port 8089
+    python -m src.integrations.ups_mock_server --latency-ms 300 --jitter-ms 100 --error-rate 0.1
+
+Then point the client at it:
+    UPSAPIClient(base_url="http://127.0.0.1:8089")
+    UPS_API_BASE_URL=http://127.0.0.1:8089 python -m src.bot.bot
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+# Dummy credentials accepted by the mock (any Basic credentials are accepted)
+MOCK_CREDENTIALS_ENV = {
+    'UPS_STANDARD_CLIENT_ID': 'mock-standard-id',
+    'UPS_STANDARD_CLIENT_SECRET': 'mock-standard-secret',
+    'UPS_STANDARD_ACCOUNT': 'MOCK01',
+    'UPS_WWE_CLIENT_ID': 'mock-wwe-id',
+    'UPS_WWE_CLIENT_SECRET': 'mock-wwe-secret',
+    'UPS_WWE_ACCOUNT': 'MOCK02',
+}
+
+# Retail tariff per service: (base EUR, EUR per kg)
+MOCK_TARIFFS = {
+    '11': (Decimal('12.50'), Decimal('1.80')),   # Standard
+    '65': (Decimal('24.00'), Decimal('4.20')),   # Express Saver
+    '07': (Decimal('31.00'), Decimal('5.10')),   # Worldwide Express
+    '08': (Decimal('27.00'), Decimal('4.60')),   # Worldwide Expedited
+}
+
+
+@dataclass
+class MockBehavior:
+    """Latency, error injection and pricing options of the mock server"""
+    latency_ms: float = 50.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_mode: str = "http500"            # http500 | timeout | business
+    timeout_sleep_s: float = 60.0          # Sleep used by error_mode=timeout
+    negotiated: bool = True                # Include NegotiatedRateCharges
+    negotiated_discount: Decimal = Decimal('0.20')
+    shop_services: List[str] = field(default_factory=lambda: ['11', '65', '07', '08'])
+    token_expires_in: int = 3600
+    seed: int = 42
+
+
+class MockState:
+    """Shared RNG and counters (requests are served from several threads)"""
+
+    def __init__(self, behavior: MockBehavior):
+        self.behavior = behavior
+        self._rng = random.Random(behavior.seed)
+        self._lock = threading.Lock()
+        self.counters = {'token': 0, 'rate': 0, 'errors': 0}
+
+    def draw(self) -> Tuple[float, bool]:
+        """Draw (latency seconds, inject error) for one request"""
+        with self._lock:
+            jitter = self._rng.uniform(-1.0, 1.0) * self.behavior.jitter_ms
+            fail = self._rng.random() < self.behavior.error_rate
+
+        latency = max(0.0, self.behavior.latency_ms + jitter) / 1000.0
+        return latency, fail
+
+    def count(self, key: str):
+        with self._lock:
+            self.counters[key] += 1
+
+
+def _rated_shipment(service_code: str, weight_kg: float, behavior: MockBehavior) -> Dict[str, Any]:
+    """Build one RatedShipment entry with retail and (optionally) negotiated charges"""
+    base, per_kg = MOCK_TARIFFS[service_code]
+    retail = (base + per_kg * Decimal(str(weight_kg))).quantize(Decimal('0.01'))
+
+    shipment = {
+        'Service': {'Code': service_code, 'Description': ''},
+        'TotalCharges': {'CurrencyCode': 'EUR', 'MonetaryValue': str(retail)},
+    }
+
+    if behavior.negotiated:
+        negotiated = (retail * (1 - behavior.negotiated_discount)).quantize(Decimal('0.01'))
+        shipment['NegotiatedRateCharges'] = {
+            'TotalCharge': {'CurrencyCode': 'EUR', 'MonetaryValue': str(negotiated)}
+        }
+
+    return shipment
+
+
+def build_rate_response(payload: Dict[str, Any], behavior: MockBehavior) -> Tuple[int, Dict[str, Any]]:
+    """
+    Compute the mock response for a RateRequest
+
+    Returns:
+        (HTTP status, JSON body)
+    """
+    try:
+        request = payload['RateRequest']
+        option = request['Request']['RequestOption']
+        shipment = request['Shipment']
+        weight_kg = float(shipment['Package'][0]['PackageWeight']['Weight'])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return 400, _business_error('250002', 'Invalid request payload')
+
+    if option == 'Shop':
+        codes = [c for c in behavior.shop_services if c in MOCK_TARIFFS]
+    elif option == 'Rate':
+        code = shipment.get('Service', {}).get('Code')
+        if code not in MOCK_TARIFFS:
+            return 400, _business_error('111210', f'The requested service is unavailable ({code})')
+        codes = [code]
+    else:
+        return 400, _business_error('250003', f'Invalid RequestOption: {option}')
+
+    rated = [_rated_shipment(code, weight_kg, behavior) for code in codes]
+
+    return 200, {
+        'RateResponse': {
+            'Response': {'ResponseStatus': {'Code': '1', 'Description': 'Success'}},
+            'RatedShipment': rated if len(rated) > 1 else rated[0],
+        }
+    }
+
+
+def _business_error(code: str, message: str) -> Dict[str, Any]:
+    """UPS REST error body"""
+    return {'response': {'errors': [{'code': code, 'message': message}]}}
+
+
+class MockUPSHandler(BaseHTTPRequestHandler):
+    """HTTP handler for the mock UPS endpoints"""
+
+    state: MockState = None  # Set by make_server()
+
+    def log_message(self, format, *args):
+        pass  # Keep load tests quiet
+
+    def do_GET(self):
+        if self.path == '/__stats':
+            self._send_json(200, self.state.counters)
+        else:
+            self._send_json(404, _business_error('404', 'Not found'))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        if self.path == '/security/v1/oauth/token':
+            self._handle_token()
+        elif self.path == '/api/rating/v1/Rate':
+            self._handle_rate(body)
+        else:
+            self._send_json(404, _business_error('404', 'Not found'))
+
+    def _handle_token(self):
+        self.state.count('token')
+
+        if not self.headers.get('Authorization', '').startswith('Basic '):
+            self._send_json(401, _business_error('250002', 'Invalid Authentication Information'))
+            return
+
+        self._send_json(200, {
+            'token_type': 'Bearer',
+            'access_token': f"mock-token-{self.state.counters['token']}",
+            'expires_in': str(self.state.behavior.token_expires_in),
+            'status': 'approved',
+        })
+
+    def _handle_rate(self, body: bytes):
+        self.state.count('rate')
+        behavior = self.state.behavior
+        latency, fail = self.state.draw()
+
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            self._send_json(401, _business_error('250002', 'Invalid Authentication Information'))
+            return
+
+        if fail:
+            self.state.count('errors')
+
+            if behavior.error_mode == 'timeout':
+                time.sleep(behavior.timeout_sleep_s)
+            else:
+                time.sleep(latency)
+
+            if behavior.error_mode == 'business':
+                self._send_json(400, _business_error('111100', 'The requested service is invalid from the selected origin.'))
+            else:
+                self._send_json(500, _business_error('500', 'Internal Server Error (injected)'))
+            return
+
+        time.sleep(latency)
+
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            self._send_json(400, _business_error('250002', 'Malformed JSON'))
+            return
+
+        status, response = build_rate_response(payload, behavior)
+        self._send_json(status, response)
+
+    def _send_json(self, status: int, data: Dict[str, Any]):
+        payload = json.dumps(data).encode('utf-8')
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client gave up (timeout injection)
+
+
+def make_server(
+    behavior: Optional[MockBehavior] = None,
+    host: str = '127.0.0.1',
+    port: int = 0
+) -> ThreadingHTTPServer:
+    """
+    Create the mock server (port 0 picks a free port)
+
+    Returns:
+        Server instance; its base URL is http://{host}:{server.server_port}
+    """
+    handler = type('BoundMockUPSHandler', (MockUPSHandler,), {'state': MockState(behavior or MockBehavior())})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(
+    behavior: Optional[MockBehavior] = None,
+    host: str = '127.0.0.1',
+    port: int = 0
+) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the mock server in a daemon thread
+
+    Returns:
+        (server, base_url) - call server.shutdown() when done
+    """
+    server = make_server(behavior, host, port)
+    thread = threading.Thread(target=server.serve_forever, name='ups-mock-server', daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local UPS API mock server for load testing')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Mean response latency')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Uniform latency jitter (+/-)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of Rate calls failing (0-1)')
+    parser.add_argument('--error-mode', choices=['http500', 'timeout', 'business'], default='http500')
+    parser.add_argument('--timeout-sleep', type=float, default=60.0, help='Sleep (s) for error-mode=timeout')
+    parser.add_argument('--retail-only', action='store_true', help='Omit NegotiatedRateCharges')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    behavior = MockBehavior(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_mode=args.error_mode,
+        timeout_sleep_s=args.timeout_sleep,
+        negotiated=not args.retail_only,
+        seed=args.seed
+    )
+
+    server = make_server(behavior, args.host, args.port)
+    base_url = f"http://{args.host}:{server.server_port}"
+
+    print("=" * 70)
+    print(f"🧪 UPS mock server listening on {base_url}")
+    print("=" * 70)
+    print("Environment for the bot / debug_ups_api.py:")
+    print(f"   export UPS_API_BASE_URL={base_url}")
+    for key, value in MOCK_CREDENTIALS_ENV.items():
+        print(f"   export {key}={value}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Mock server stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
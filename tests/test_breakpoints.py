@@ -0,0 +1,119 @@
+"""
+Tests for cheapest-service breakpoint tables
+The lower envelope must agree with PricingEngine.price() at every weight
+"""
+
+import pytest
+from src.engine.engine import PricingEngine
+from src.engine.breakpoints import (
+    Breakpoint,
+    BreakpointTable,
+    compute_breakpoints,
+    load_csv,
+    write_csv,
+)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """Create pricing engine instance (loaded once for the module)"""
+    return PricingEngine()
+
+
+def cheapest_offer(engine, country, weight_kg):
+    offers = [o for o in engine.price(country, weight_kg) if not o.is_suspended]
+    return offers[0] if offers else None
+
+
+def sample_weights():
+    """Band boundaries, half-kilo points and in-between weights"""
+    return sorted({w / 4 for w in range(1, 160)} | {0.1, 0.33, 0.41, 1.01, 2.7, 7.3, 19.99})
+
+
+class TestEnvelope:
+    """Test that the envelope matches the engine"""
+
+    @pytest.mark.parametrize("country", ["DE", "US", "JP", "GB", "AU", "CH"])
+    def test_matches_engine(self, engine, country):
+        table = compute_breakpoints(engine, country)
+
+        for weight in sample_weights():
+            best = cheapest_offer(engine, country, weight)
+            bp = table.cheapest(weight)
+
+            if best is None:
+                assert bp is None
+                continue
+
+            assert bp is not None, f"{country} {weight}kg"
+            assert bp.total_at(weight) == pytest.approx(float(best.total), abs=1e-6)
+
+    def test_breakpoints_sorted_and_disjoint(self, engine):
+        table = compute_breakpoints(engine, "DE")
+
+        for previous, current in zip(table.breakpoints, table.breakpoints[1:]):
+            assert previous.max_weight_kg <= current.min_weight_kg
+            if previous.max_weight_kg == current.min_weight_kg:
+                assert not (previous.max_inclusive and current.min_inclusive)
+
+    def test_suspended_services_excluded(self, engine):
+        table = compute_breakpoints(engine, "US")
+        suspended = {
+            service_code for (service_code, iso2), r in engine.restrictions.items()
+            if iso2 == "US" and r.get("status") == "SUSPENDED"
+        }
+        assert suspended
+        assert not {bp.service_code for bp in table.breakpoints} & suspended
+
+    def test_unknown_country(self, engine):
+        assert engine.breakpoints("Atlantis") is None
+
+    def test_beyond_max_weight(self, engine):
+        table = compute_breakpoints(engine, "DE")
+        assert table.cheapest(500.0) is None
+        assert table.cheapest(0.0) is None
+
+
+class TestLookup:
+    """Test bisect lookup with open/closed bounds"""
+
+    @pytest.fixture
+    def table(self):
+        def bp(low, high, low_inc, high_inc, code, price):
+            return Breakpoint(low, high, low_inc, high_inc, code, "X", price, price, "EUR")
+
+        return BreakpointTable("DE", [
+            bp(0.0, 1.0, False, False, "A", 5.0),
+            bp(1.0, 1.0, True, True, "B", 4.0),
+            bp(1.0, 2.0, False, True, "A", 6.0),
+            bp(3.0, 4.0, True, True, "C", 9.0),
+        ])
+
+    def test_point_band(self, table):
+        assert table.cheapest(1.0).service_code == "B"
+
+    def test_open_bounds(self, table):
+        assert table.cheapest(0.999).service_code == "A"
+        assert table.cheapest(1.001).service_code == "A"
+        assert table.cheapest(2.0).service_code == "A"
+
+    def test_gap(self, table):
+        assert table.cheapest(2.5) is None
+        assert table.cheapest(3.0).service_code == "C"
+
+
+class TestCsvRoundTrip:
+
+    def test_round_trip(self, engine, tmp_path):
+        tables = [compute_breakpoints(engine, iso2) for iso2 in ("DE", "JP")]
+        path = tmp_path / "breakpoints.csv"
+
+        write_csv(tables, path)
+        loaded = load_csv(path)
+
+        assert set(loaded) == {"DE", "JP"}
+        for table in tables:
+            for weight in (0.3, 1.0, 2.5, 12.0):
+                original = table.cheapest(weight)
+                restored = loaded[table.country_iso2].cheapest(weight)
+                assert (original and original.service_code) == (restored and restored.service_code)
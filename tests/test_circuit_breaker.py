@@ -0,0 +1,127 @@
+"""
+Tests for the UPS API circuit breaker
+Validates state transitions and adaptive timeouts (no network calls)
+"""
+
+import pytest
+from src.integrations.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        "WWE",
+        failure_threshold=3,
+        open_duration=30.0,
+        slow_call_threshold=5.0,
+        min_timeout=2.0,
+        max_timeout=30.0,
+        min_samples=5,
+        clock=clock
+    )
+
+
+class TestStateTransitions:
+    """Test CLOSED → OPEN → HALF_OPEN → CLOSED cycle"""
+
+    def test_opens_after_consecutive_failures(self, breaker):
+        for _ in range(2):
+            breaker.record_failure(0.1)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record_failure(0.1)
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow_request() is False
+        assert breaker.short_circuited == 1
+
+    def test_success_resets_failure_count(self, breaker):
+        breaker.record_failure(0.1)
+        breaker.record_failure(0.1)
+        breaker.record_success(0.2)
+        breaker.record_failure(0.1)
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_slow_calls_count_as_failures(self, breaker):
+        for _ in range(3):
+            breaker.record_success(6.0)
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_allows_single_probe(self, breaker, clock):
+        for _ in range(3):
+            breaker.record_failure(0.1)
+
+        clock.now += 31.0
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False  # Probe already in flight
+
+    def test_probe_success_closes(self, breaker, clock):
+        for _ in range(3):
+            breaker.record_failure(0.1)
+
+        clock.now += 31.0
+        assert breaker.allow_request()
+        breaker.record_success(0.3)
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request() is True
+
+    def test_probe_failure_reopens(self, breaker, clock):
+        for _ in range(3):
+            breaker.record_failure(0.1)
+
+        clock.now += 31.0
+        assert breaker.allow_request()
+        breaker.record_failure(0.1)
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.times_opened == 2
+
+
+class TestAdaptiveTimeout:
+    """Test request timeout derived from latency percentiles"""
+
+    def test_max_timeout_until_enough_samples(self, breaker):
+        for _ in range(4):
+            breaker.record_success(0.5)
+
+        assert breaker.current_timeout() == 30.0
+
+    def test_timeout_follows_p95(self, breaker):
+        for _ in range(10):
+            breaker.record_success(1.0)
+
+        # p95 (1.0s) * multiplier (3.0)
+        assert breaker.current_timeout() == pytest.approx(3.0)
+
+    def test_timeout_clamped_to_minimum(self, breaker):
+        for _ in range(10):
+            breaker.record_success(0.1)
+
+        assert breaker.current_timeout() == 2.0
+
+    def test_stats_snapshot(self, breaker):
+        breaker.record_success(0.4)
+        stats = breaker.stats()
+
+        assert stats['name'] == "WWE"
+        assert stats['state'] == CircuitBreaker.CLOSED
+        assert stats['total_calls'] == 1
+        assert stats['latency']['count'] == 1
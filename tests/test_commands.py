@@ -0,0 +1,38 @@
+"""
+Tests for the slash command helpers (argument parsing, carrier filter)
+Needs discord.py installed
+"""
+
+import pytest
+
+pytest.importorskip("discord")
+
+from src.bot.commands import matches_carrier, parse_dimensions, parse_parcels, parse_weight
+
+
+class TestCarrierFilter:
+
+    @pytest.mark.parametrize("code,name", [
+        ("UPS", "United Parcel Service"),  # Code only
+        ("UPS_API", "UPS (Real-time)"),  # Name only
+    ])
+    def test_code_or_name(self, code, name):
+        assert matches_carrier(code, name, ["UPS"])
+
+    def test_no_match(self):
+        assert not matches_carrier("FEDEX", "FedEx", ["UPS", "SPRING"])
+
+
+class TestParsing:
+
+    def test_weight(self):
+        assert parse_weight("2.5kg") == 2.5
+        assert parse_weight("abc") is None
+
+    def test_parcels(self):
+        assert parse_parcels("2kg, 3.5") == [2.0, 3.5]
+        assert parse_parcels("2kg, x") is None
+
+    def test_dimensions(self):
+        assert parse_dimensions("40 x 30 x 20cm") == (40.0, 30.0, 20.0)
+        assert parse_dimensions("40x0x20") is None
@@ -0,0 +1,138 @@
+"""
+Tests for effective-dated tariff versions (pricing on a ship date)
+Runs against a copy of data/normalized with a second SPRING_EU_HOME grid
+"""
+
+import csv
+import shutil
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from src.engine.effective import EffectiveIndex
+from src.engine.engine import PricingEngine
+from src.engine.loader import DataLoader, Service
+
+
+NORMALIZED_DIR = Path(__file__).parent.parent / "data" / "normalized"
+
+NEW_SERVICE_ID = 900
+NEW_SCOPE_ID = 900
+
+
+def rewrite(path, update_rows=None, extra_rows=(), extra_columns=()):
+    with path.open(encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames) + list(extra_columns)
+        rows = list(reader)
+
+    if update_rows:
+        rows = [update_rows(row) for row in rows]
+
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows + list(extra_rows))
+
+
+def close_old_grid(row):
+    if row["code"] == "SPRING_EU_HOME":
+        row["active_to"] = "2025-12-31"
+    return row
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp("effective") / "normalized"
+    shutil.copytree(NORMALIZED_DIR, data_dir)
+
+    # 2026 grid: new SPRING_EU_HOME version, Germany only, flat 9.90
+    rewrite(data_dir / "services.csv", close_old_grid, [{
+        "service_id": NEW_SERVICE_ID, "carrier_id": 2, "code": "SPRING_EU_HOME",
+        "label": "Spring Europe domicile", "direction": "EXPORT", "origin_iso2": "FR",
+        "incoterm": "DAP", "service_type": "PARCEL", "max_weight_kg": 20.0,
+        "volumetric_divisor": 5000, "active_from": "2026-01-01", "active_to": "",
+    }])
+    rewrite(data_dir / "tariff_scopes.csv", extra_rows=[{
+        "scope_id": NEW_SCOPE_ID, "service_id": NEW_SERVICE_ID, "code": "SPRING_EU_2026_DE",
+        "description": "Spring 2026 → DE", "is_catch_all": False,
+    }])
+    rewrite(data_dir / "tariff_scope_countries.csv", extra_rows=[{"scope_id": NEW_SCOPE_ID, "country_iso2": "DE"}])
+    rewrite(data_dir / "tariff_bands.csv", extra_rows=[{
+        "band_id": 90000, "scope_id": NEW_SCOPE_ID, "min_weight_kg": 0.0, "max_weight_kg": 20.0,
+        "base_amount": 9.90, "amount_per_kg": 0.0, "is_min_charge": False,
+    }])
+
+    # Fuel surcharge of the 2026 grid: 10% from March 2026 (nothing before)
+    rewrite(
+        data_dir / "surcharge_rules.csv",
+        extra_columns=["active_from", "active_to"],
+        extra_rows=[{
+            "surcharge_id": 900, "service_id": NEW_SERVICE_ID, "name": "SPRING_EU_FUEL_2026",
+            "kind": "PERCENT", "basis": "FREIGHT", "value": 10.0, "conditions": "{}",
+            "active_from": "2026-03-01", "active_to": "",
+        }]
+    )
+
+    loader = DataLoader(data_dir=data_dir)
+    loader.load_all()
+    return PricingEngine(loader=loader)
+
+
+def spring_eu(engine, ship_date, dest="DE"):
+    offers = [o for o in engine.price(dest, 1.0, ship_date=ship_date) if o.service_code == "SPRING_EU_HOME"]
+    assert len(offers) <= 1
+    return offers[0] if offers else None
+
+
+class TestTimeTravelPricing:
+    """Test that each ship date uses the grid valid on that day"""
+
+    def test_old_grid(self, engine):
+        offer = spring_eu(engine, date(2025, 6, 1))
+        assert offer.scope_code != "SPRING_EU_2026_DE"
+
+    def test_new_grid_without_fuel(self, engine):
+        offer = spring_eu(engine, date(2026, 1, 15))
+        assert offer.scope_code == "SPRING_EU_2026_DE"
+        assert offer.total == Decimal("9.90")
+
+    def test_dated_surcharge(self, engine):
+        offer = spring_eu(engine, "2026-03-01")
+        assert offer.total == pytest.approx(Decimal("10.89"))
+
+    def test_boundary_days(self, engine):
+        assert spring_eu(engine, date(2025, 12, 31)).scope_code != "SPRING_EU_2026_DE"
+        assert spring_eu(engine, date(2026, 1, 1)).scope_code == "SPRING_EU_2026_DE"
+
+    def test_lane_dropped_by_new_grid(self, engine):
+        assert spring_eu(engine, date(2025, 6, 1), dest="IT") is not None
+        assert spring_eu(engine, date(2026, 6, 1), dest="IT") is None
+
+    def test_before_any_grid(self, engine):
+        assert engine.price("DE", 1.0, ship_date=date(2020, 1, 1)) == []
+
+
+class TestEffectiveIndex:
+
+    @staticmethod
+    def service(service_id, code, active_from=None, active_to=None):
+        return Service(
+            service_id=service_id, carrier_id=1, carrier_code="C", code=code, label=code,
+            direction="EXPORT", origin_iso2="FR", incoterm="DAP", service_type="PARCEL",
+            max_weight_kg=30.0, active_from=active_from, active_to=active_to
+        )
+
+    def test_one_version_per_code(self):
+        index = EffectiveIndex([
+            self.service(1, "A", date(2024, 1, 1)),
+            self.service(2, "A", date(2025, 1, 1)),  # Overlaps: newest wins
+            self.service(3, "B", None, date(2024, 6, 30)),
+        ])
+
+        assert list(index.at(date(2023, 1, 1))) == [3]
+        assert list(index.at(date(2024, 6, 30))) == [1, 3]
+        assert list(index.at(date(2024, 7, 1))) == [1]
+        assert list(index.at(date(2025, 1, 1))) == [2]
+        assert list(index.at(date.max)) == [2]
@@ -0,0 +1,286 @@
+"""
+Tests for the ETL pipeline runner
+Uses small stand-in stages on a temporary project root
+"""
+
+import csv
+from pathlib import Path
+
+import pytest
+from src.etl.pipeline import STAGES, Stage, run_pipeline, select_stages
+
+
+# Zone word of the intermediate data -> destination country
+ZONES = {"ALPHA": "DE", "BETA": "JP", "GAMMA": "US", "DELTA": "AU", "INVERTED": "BR"}
+
+
+def _log_call(name):
+    with open("calls.log", "a", encoding="utf-8") as f:
+        f.write(name + "\n")
+
+
+def _extract(carrier):
+    _log_call(f"{carrier}.extract")
+    text = Path(f"data/raw/{carrier}.txt").read_text(encoding="utf-8")
+    Path("data/intermediate").mkdir(parents=True, exist_ok=True)
+    Path(f"data/intermediate/{carrier}.csv").write_text(text.upper(), encoding="utf-8")
+
+
+def _append(file_name, row):
+    """Append a row numbered after the existing ones, like the legacy ETLs"""
+    path = Path("data/normalized") / file_name
+    with path.open(encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        count = len(list(reader))
+        fieldnames = reader.fieldnames
+
+    id_column = fieldnames[0]
+    if id_column.endswith("_id") and id_column not in row:
+        row = {id_column: count + 1, **row}
+
+    with path.open("a", encoding="utf-8", newline="") as f:
+        csv.DictWriter(f, fieldnames=fieldnames).writerow(row)
+    return row[id_column]
+
+
+def _normalize(carrier):
+    """Appends like the legacy ETLs (not idempotent on its own): one scope per zone word"""
+    _log_call(f"{carrier}.normalize")
+    value = Path(f"data/intermediate/{carrier}.csv").read_text(encoding="utf-8").strip()
+    if value == "BROKEN":
+        raise ValueError("bad intermediate data")
+
+    code = carrier.upper()
+    carrier_id = _append("carriers.csv", {"code": code, "name": code, "currency": "EUR"})
+    service_id = _append("services.csv", {
+        "carrier_id": carrier_id, "code": f"{code}_SVC", "label": value, "direction": "EXPORT",
+        "origin_iso2": "FR", "incoterm": "DAP", "service_type": "PARCEL", "max_weight_kg": "2.0",
+        "volumetric_divisor": "5000", "active_from": "", "active_to": ""
+    })
+    for zone in value.split():
+        scope_id = _append("tariff_scopes.csv", {
+            "service_id": service_id, "code": f"{code}_{zone}", "description": zone, "is_catch_all": "False"
+        })
+        _append("tariff_scope_countries.csv", {"scope_id": scope_id, "country_iso2": ZONES[zone]})
+        _append("tariff_bands.csv", {
+            "scope_id": scope_id, "min_weight_kg": "3.0" if zone == "INVERTED" else "0.0", "max_weight_kg": "2.0",
+            "base_amount": "10.0", "amount_per_kg": "0.0", "is_min_charge": "False"
+        })
+
+
+def extract_a():
+    _extract("a")
+
+
+def extract_b():
+    _extract("b")
+
+
+def normalize_a():
+    _normalize("a")
+
+
+def normalize_b():
+    _normalize("b")
+
+
+def make_stages():
+    return [
+        Stage("a.extract", f"{__name__}:extract_a",
+              inputs=["data/raw/a.txt"], outputs=["data/intermediate/a.csv"]),
+        Stage("b.extract", f"{__name__}:extract_b",
+              inputs=["data/raw/b.txt"], outputs=["data/intermediate/b.csv"]),
+        Stage("a.normalize", f"{__name__}:normalize_a",
+              inputs=["data/intermediate/a.csv"], deps=["a.extract"], writes_normalized=True),
+        Stage("b.normalize", f"{__name__}:normalize_b",
+              inputs=["data/intermediate/b.csv"], deps=["b.extract", "a.normalize"], writes_normalized=True),
+    ]
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "data" / "raw").mkdir(parents=True)
+    (tmp_path / "data" / "normalized").mkdir(parents=True)
+    (tmp_path / "data" / "raw" / "a.txt").write_text("alpha", encoding="utf-8")
+    (tmp_path / "data" / "raw" / "b.txt").write_text("beta", encoding="utf-8")
+    (tmp_path / "data" / "normalized" / "country_aliases.csv").write_text("alias,country_iso2\n", encoding="utf-8")
+    return tmp_path
+
+
+def run(root, workers=1):
+    return run_pipeline(stages=make_stages(), root=root, workers=workers, compile=False)
+
+
+def calls(root):
+    path = root / "calls.log"
+    return path.read_text(encoding="utf-8").split() if path.exists() else []
+
+
+def table(root, file_name):
+    with (root / "data" / "normalized" / file_name).open(encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def services(root):
+    return [(row["code"], row["label"]) for row in table(root, "services.csv")]
+
+
+def ids(root):
+    """Natural key -> ID of every service, scope and band"""
+    service_codes = {row["service_id"]: row["code"] for row in table(root, "services.csv")}
+    scope_codes = {row["scope_id"]: row["code"] for row in table(root, "tariff_scopes.csv")}
+    return {
+        **{("service", row["code"]): row["service_id"] for row in table(root, "services.csv")},
+        **{("scope", service_codes[row["service_id"]], row["code"]): row["scope_id"]
+           for row in table(root, "tariff_scopes.csv")},
+        **{("band", scope_codes[row["scope_id"]]): row["band_id"] for row in table(root, "tariff_bands.csv")},
+    }
+
+
+class TestChangeDetection:
+    """Test skipping on unchanged inputs and rebuild on change"""
+
+    def test_first_run(self, root):
+        report = run(root)
+
+        assert report.ok
+        assert {r.name for r in report.results if r.status == "ran"} == {s.name for s in make_stages()}
+        assert services(root) == [("A_SVC", "ALPHA"), ("B_SVC", "BETA")]
+
+    def test_rerun_skips_everything(self, root):
+        run(root)
+        before = calls(root)
+
+        report = run(root)
+
+        assert calls(root) == before
+        assert all(r.status == "skipped" for r in report.results)
+        assert services(root) == [("A_SVC", "ALPHA"), ("B_SVC", "BETA")]
+
+    def test_changed_raw_reruns_carrier_and_rebuilds(self, root):
+        run(root)
+        (root / "data" / "raw" / "a.txt").write_text("gamma", encoding="utf-8")
+        before = len(calls(root))
+
+        report = run(root)
+
+        assert calls(root)[before:] == ["a.extract", "a.normalize", "b.normalize"]
+        assert report.result("b.extract").status == "skipped"
+        # Full rebuild: no duplicated rows from the appending stages
+        assert services(root) == [("A_SVC", "GAMMA"), ("B_SVC", "BETA")]
+
+    def test_aliases_kept_on_rebuild(self, root):
+        run(root)
+        assert (root / "data" / "normalized" / "country_aliases.csv").exists()
+
+
+class TestStableIds:
+    """A rebuild keeps the IDs of unchanged rows (natural keys)"""
+
+    def test_changed_input_keeps_ids(self, root):
+        run(root)
+        before = ids(root)
+
+        # A new zone before ALPHA: the appending stand-ins renumber every later row
+        (root / "data" / "raw" / "a.txt").write_text("gamma alpha", encoding="utf-8")
+        assert run(root).ok
+
+        after = ids(root)
+        assert {key: after[key] for key in before} == before
+
+        new_ids = {after[("scope", "A_SVC", "A_GAMMA")], after[("band", "A_GAMMA")]}
+        assert all(int(new_id) > max(int(v) for v in before.values()) for new_id in new_ids)
+
+    def test_removed_ids_are_not_reused(self, root):
+        (root / "data" / "raw" / "a.txt").write_text("alpha gamma", encoding="utf-8")
+        run(root)
+        gamma_scope = ids(root)[("scope", "A_SVC", "A_GAMMA")]
+
+        (root / "data" / "raw" / "a.txt").write_text("alpha", encoding="utf-8")
+        run(root)
+        (root / "data" / "raw" / "a.txt").write_text("alpha delta", encoding="utf-8")
+        run(root)
+
+        assert int(ids(root)[("scope", "A_SVC", "A_DELTA")]) > int(gamma_scope)
+
+    def test_postal_zones_follow_their_scope(self, root):
+        run(root)
+        beta_scope = ids(root)[("scope", "B_SVC", "B_BETA")]
+        postal_path = root / "data" / "normalized" / "tariff_scope_postal_codes.csv"
+        postal_path.write_text(f"scope_id,country_iso2,postal_from,postal_to\n{beta_scope},JP,1,\n", encoding="utf-8")
+
+        (root / "data" / "raw" / "a.txt").write_text("gamma delta alpha", encoding="utf-8")
+        assert run(root).ok
+
+        [rule] = table(root, "tariff_scope_postal_codes.csv")
+        assert rule["scope_id"] == ids(root)[("scope", "B_SVC", "B_BETA")]
+
+    def test_integrity_errors_restore_tables(self, root):
+        run(root)
+        (root / "data" / "raw" / "a.txt").write_text("inverted", encoding="utf-8")
+
+        report = run(root)
+
+        assert not report.ok
+        assert "band_inverted" in report.result("normalize").detail
+        assert services(root) == [("A_SVC", "ALPHA"), ("B_SVC", "BETA")]
+
+
+class TestFailures:
+    """Test missing inputs and failed stages"""
+
+    def test_failed_stage_restores_tables(self, root):
+        run(root)
+        (root / "data" / "raw" / "b.txt").write_text("broken", encoding="utf-8")
+
+        report = run(root)
+
+        assert not report.ok
+        assert report.result("b.normalize").status == "failed"
+        assert services(root) == [("A_SVC", "ALPHA"), ("B_SVC", "BETA")]
+
+        # Fixed input: the rebuild is retried
+        (root / "data" / "raw" / "b.txt").write_text("delta", encoding="utf-8")
+        assert run(root).ok
+        assert services(root) == [("A_SVC", "ALPHA"), ("B_SVC", "DELTA")]
+
+    def test_missing_raw_keeps_intermediate(self, root):
+        run(root)
+        (root / "data" / "raw" / "a.txt").unlink()
+
+        report = run(root)
+
+        assert report.ok
+        assert report.result("a.extract").status == "kept"
+        assert report.result("a.normalize").status == "skipped"
+
+    def test_missing_input_leaves_normalized_untouched(self, root):
+        report = run_pipeline(
+            stages=make_stages()[2:], root=root, workers=1, compile=False
+        )
+
+        assert not report.ok
+        assert report.result("a.normalize").status == "failed"
+        assert not (root / "data" / "normalized" / "services.csv").exists()
+
+
+class TestParallel:
+
+    def test_process_pool_matches_serial(self, root):
+        report = run(root, workers=2)
+
+        assert report.ok
+        assert services(root) == [("A_SVC", "ALPHA"), ("B_SVC", "BETA")]
+        assert report.result("a.extract").seconds > 0
+
+
+class TestStageGraph:
+
+    def test_default_stages_are_consistent(self):
+        names = {stage.name for stage in STAGES}
+        for stage in STAGES:
+            assert set(stage.deps) <= names, stage.name
+
+        default = select_stages(STAGES)
+        assert all(stage.default for stage in default)
+        assert len(select_stages(STAGES, ["ups_economy_ddu"])) == len(default) + 2
@@ -0,0 +1,210 @@
+"""
+Tests for the idempotent normalized CSV writer used by the ETL scripts
+Runs against a copy of data/normalized
+"""
+
+import csv
+import shutil
+from pathlib import Path
+
+import pytest
+from src.engine.engine import PricingEngine
+from src.engine.loader import DataLoader
+from src.etl.writer import SEQUENCES_FILE, BandSpec, NormalizedWriter, ScopeSpec
+
+
+NORMALIZED_DIR = Path(__file__).parent.parent / "data" / "normalized"
+
+SERVICE = {
+    "carrier_id": 4,
+    "code": "TEST_EXPORT",
+    "label": "Test Export",
+    "direction": "EXPORT",
+    "origin_iso2": "FR",
+    "incoterm": "DAP",
+    "service_type": "PARCEL",
+    "max_weight_kg": 30,
+    "volumetric_divisor": 5000,
+    "active_from": "2025-01-01",
+    "active_to": "",
+}
+
+
+def make_scopes(price_de=10.0):
+    return [
+        ScopeSpec(
+            code="TEST_DE",
+            description="Test → DE",
+            countries=["DE"],
+            bands=[
+                BandSpec(0.0, 5.0, price_de),
+                BandSpec(5.0, 30.0, 20.0, amount_per_kg=1.5),
+            ],
+        ),
+        ScopeSpec(
+            code="TEST_EU",
+            description="Test → EU",
+            countries=["BE", "NL"],
+            bands=[BandSpec(0.0, 30.0, 12.0)],
+        ),
+    ]
+
+
+def read_rows(data_dir, file_name):
+    with (data_dir / file_name).open(encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def sync(data_dir, scopes):
+    writer = NormalizedWriter(data_dir)
+    writer.sync_service(SERVICE, scopes)
+    return writer.commit()
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    target = tmp_path / "normalized"
+    shutil.copytree(NORMALIZED_DIR, target)
+    return target
+
+
+class TestIdempotence:
+    """Test that reruns neither duplicate rows nor rewrite files"""
+
+    def test_first_run_writes(self, data_dir):
+        written = sync(data_dir, make_scopes())
+
+        assert set(written) == {
+            "services.csv", "tariff_scopes.csv", "tariff_scope_countries.csv", "tariff_bands.csv"
+        }
+        assert (data_dir / SEQUENCES_FILE).exists()
+
+    def test_rerun_is_noop(self, data_dir):
+        sync(data_dir, make_scopes())
+        snapshot = {p.name: p.read_bytes() for p in data_dir.iterdir()}
+
+        assert sync(data_dir, make_scopes()) == []
+        assert {p.name: p.read_bytes() for p in data_dir.iterdir()} == snapshot
+
+    def test_no_duplicates(self, data_dir):
+        for _ in range(3):
+            sync(data_dir, make_scopes())
+
+        services = [r for r in read_rows(data_dir, "services.csv") if r["code"] == "TEST_EXPORT"]
+        scopes = [r for r in read_rows(data_dir, "tariff_scopes.csv") if r["code"].startswith("TEST_")]
+        assert len(services) == 1
+        assert len(scopes) == 2
+
+    def test_existing_service_resynced_unchanged(self, data_dir):
+        """Re-publishing an existing service as loaded changes nothing"""
+        loader = DataLoader(data_dir=data_dir)
+        loader.load_all()
+        service = next(s for s in loader.services.values() if s.code == "SPRING_EU_HOME")
+        service_row = next(r for r in read_rows(data_dir, "services.csv") if r["code"] == "SPRING_EU_HOME")
+
+        scopes = [
+            ScopeSpec(
+                code=scope.code,
+                description=scope.description,
+                countries=list(scope.countries),
+                bands=[
+                    BandSpec(b.min_weight_kg, b.max_weight_kg, b.base_amount, b.amount_per_kg, b.is_min_charge)
+                    for b in scope.bands
+                ],
+                is_catch_all=scope.is_catch_all,
+            )
+            for scope in loader.scopes.values()
+            if scope.service_id == service.service_id
+        ]
+
+        writer = NormalizedWriter(data_dir)
+        stats = writer.sync_service(service_row, scopes)
+        assert stats.summary() == "no changes"
+        assert writer.commit() == []
+
+
+class TestIncremental:
+    """Test ID stability and partial rewrites"""
+
+    def test_price_change_keeps_ids(self, data_dir):
+        sync(data_dir, make_scopes())
+        before = read_rows(data_dir, "tariff_bands.csv")
+        services_before = (data_dir / "services.csv").read_bytes()
+
+        written = sync(data_dir, make_scopes(price_de=11.0))
+        after = read_rows(data_dir, "tariff_bands.csv")
+
+        assert written == ["tariff_bands.csv"]
+        assert (data_dir / "services.csv").read_bytes() == services_before
+        assert [r["band_id"] for r in after] == [r["band_id"] for r in before]
+        assert sum(1 for a, b in zip(before, after) if a != b) == 1
+
+    def test_removed_scope_is_pruned(self, data_dir):
+        sync(data_dir, make_scopes())
+        scope_id = next(
+            r["scope_id"] for r in read_rows(data_dir, "tariff_scopes.csv") if r["code"] == "TEST_EU"
+        )
+
+        sync(data_dir, make_scopes()[:1])
+
+        assert scope_id not in {r["scope_id"] for r in read_rows(data_dir, "tariff_scopes.csv")}
+        assert scope_id not in {r["scope_id"] for r in read_rows(data_dir, "tariff_scope_countries.csv")}
+        assert scope_id not in {r["scope_id"] for r in read_rows(data_dir, "tariff_bands.csv")}
+
+    def test_sequence_never_reuses_ids(self, data_dir):
+        sync(data_dir, make_scopes())
+        old_ids = {r["scope_id"] for r in read_rows(data_dir, "tariff_scopes.csv") if r["code"] == "TEST_EU"}
+
+        sync(data_dir, make_scopes()[:1])
+        sync(data_dir, make_scopes())
+        new_ids = {r["scope_id"] for r in read_rows(data_dir, "tariff_scopes.csv") if r["code"] == "TEST_EU"}
+
+        assert old_ids.isdisjoint(new_ids)
+
+    def test_engine_prices_synced_service(self, data_dir):
+        sync(data_dir, make_scopes())
+
+        loader = DataLoader(data_dir=data_dir)
+        loader.load_all()
+        engine = PricingEngine(loader=loader)
+
+        offer = next(o for o in engine.price("NL", 2.0) if o.service_code == "TEST_EXPORT")
+        assert offer.freight == pytest.approx(12.0)
+
+
+class NoScanList(list):
+    """Row list that fails if a sync scans the whole table"""
+
+    def __iter__(self):
+        raise AssertionError("full table scan")
+
+
+class TestIndexes:
+    """Test the natural-key indexes built once at load"""
+
+    def test_sync_does_not_scan_tables(self, data_dir):
+        writer = NormalizedWriter(data_dir)
+        for table in writer.rows:
+            writer.rows[table] = NoScanList(writer.rows[table])
+
+        writer.sync_service(SERVICE, make_scopes())
+        writer.sync_service(SERVICE, make_scopes(price_de=11.0)[:1])
+
+    def test_changes_within_one_session(self, data_dir):
+        writer = NormalizedWriter(data_dir)
+        writer.sync_service(SERVICE, make_scopes())
+
+        scopes = make_scopes()
+        scopes[1].countries = ["BE"]
+        writer.sync_service(SERVICE, scopes[:1])
+        stats = writer.sync_service(SERVICE, scopes)
+        writer.commit()
+
+        assert stats.inserted == {"tariff_scopes": 1, "tariff_scope_countries": 1, "tariff_bands": 1}
+        eu_ids = {r["scope_id"] for r in read_rows(data_dir, "tariff_scopes.csv") if r["code"] == "TEST_EU"}
+        [eu_id] = eu_ids
+        assert [r["country_iso2"] for r in read_rows(data_dir, "tariff_scope_countries.csv")
+                if r["scope_id"] == eu_id] == ["BE"]
+
+        # A fresh writer sees exactly what was committed
+        assert NormalizedWriter(data_dir).sync_service(SERVICE, scopes).summary() == "no changes"
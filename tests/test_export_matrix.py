@@ -0,0 +1,95 @@
+"""
+Tests for the price matrix export
+Rows must match PricingEngine.price() and parallel output must match serial output
+"""
+
+import csv
+
+import pytest
+from src.engine.engine import PricingEngine
+from src.cli.export_matrix import (
+    MATRIX_FIELDS,
+    CsvMatrixWriter,
+    export_matrix,
+    price_country,
+    weight_steps,
+)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """Create pricing engine instance (loaded once for the module)"""
+    return PricingEngine()
+
+
+def export_to_csv(engine, path, countries, weights, workers):
+    writer = CsvMatrixWriter(path)
+    try:
+        rows = export_matrix(engine, writer, countries, weights, workers)
+    finally:
+        writer.close()
+    return rows
+
+
+class TestWeightSteps:
+
+    def test_no_float_drift(self):
+        steps = weight_steps(70.0)
+        assert len(steps) == 700
+        assert steps[2] == 0.3
+        assert steps[-1] == 70.0
+
+    def test_custom_step(self):
+        assert weight_steps(2.0, 0.5) == [0.5, 1.0, 1.5, 2.0]
+
+
+class TestRows:
+    """Test matrix rows against the engine"""
+
+    def test_rows_match_price(self, engine):
+        rows = price_country(engine, "JP", [0.5, 2.0, 10.0])
+
+        for weight in (0.5, 2.0, 10.0):
+            expected = {
+                o.service_code: o.total for o in engine.price("JP", weight) if not o.is_suspended
+            }
+            actual = {row[3]: row[6] for row in rows if row[1] == weight}
+            assert actual == pytest.approx(expected)
+
+    def test_suspended_excluded(self, engine):
+        suspended = {
+            code for (code, iso2), r in engine.restrictions.items()
+            if iso2 == "US" and r.get("status") == "SUSPENDED"
+        }
+        rows = price_country(engine, "US", weight_steps(5.0, 0.5))
+        assert not {row[3] for row in rows} & suspended
+
+    def test_no_rows_beyond_bands(self, engine):
+        rows = price_country(engine, "DE", [1.0, 500.0])
+        assert rows
+        assert all(row[1] == 1.0 for row in rows)
+
+
+class TestExport:
+    """Test streamed CSV export (serial and parallel)"""
+
+    def test_csv_export(self, engine, tmp_path):
+        path = tmp_path / "matrix.csv"
+        count = export_to_csv(engine, path, ["DE", "JP"], weight_steps(3.0), workers=1)
+
+        with path.open(encoding="utf-8") as f:
+            reader = csv.reader(f)
+            assert next(reader) == MATRIX_FIELDS
+            rows = list(reader)
+
+        assert len(rows) == count > 0
+        assert [r[0] for r in rows] == sorted(r[0] for r in rows)
+
+    def test_parallel_matches_serial(self, engine, tmp_path):
+        countries = ["DE", "JP", "US", "AU"]
+        weights = weight_steps(5.0)
+
+        export_to_csv(engine, tmp_path / "serial.csv", countries, weights, workers=1)
+        export_to_csv(engine, tmp_path / "parallel.csv", countries, weights, workers=2)
+
+        assert (tmp_path / "serial.csv").read_bytes() == (tmp_path / "parallel.csv").read_bytes()
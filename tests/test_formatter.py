@@ -0,0 +1,97 @@
+"""
+Tests for the /price embed formatter (multi-zone offers, render cache)
+Needs discord.py installed
+"""
+
+from dataclasses import replace
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("discord")
+
+from src.bot.formatter import PricingFormatter
+from src.engine.engine import PriceOffer, PricingEngine
+
+
+def offer(scope_code, total, service_code="DELIVENGO_2025"):
+    return PriceOffer(
+        carrier_code="LAPOSTE", carrier_name="Delivengo", service_code=service_code,
+        service_label="Delivengo Profil 2025", freight=Decimal(total), surcharges=Decimal("0"),
+        total=Decimal(total), currency="EUR", scope_code=scope_code, band_details=""
+    )
+
+
+class TestZones:
+
+    def test_identical_zones_collapse(self):
+        engine = PricingEngine()
+        offers = sorted(engine.price("DE", 1.0), key=lambda o: float(o.total))
+
+        collapsed = PricingFormatter.collapse_zones(offers)
+        assert [o.service_code for o in collapsed].count("DELIVENGO_2025") == 1
+        assert len({o.service_code for o in offers}) == len(collapsed)
+
+    def test_different_zone_prices_are_labelled(self):
+        offers = [offer("DELIVENGO_DE_BOXABLE", "5.95"), offer("DELIVENGO_DE_NON_BOXABLE", "7.10")]
+        assert PricingFormatter.collapse_zones(offers) == offers
+
+        embed = PricingFormatter().create_offers_embed(offers, 1.0, "DE", "Germany (DE)")
+        values = [field.value for field in embed.fields]
+        assert "🗺️ Zone: `DELIVENGO_DE_BOXABLE`" in values[0]
+        assert "🗺️ Zone: `DELIVENGO_DE_NON_BOXABLE`" in values[1]
+
+    def test_single_zone_is_not_labelled(self):
+        embed = PricingFormatter().create_offers_embed(
+            [offer("DELIVENGO_ZONE1_BOXABLE", "6.20")], 1.0, "BE", "Belgium (BE)"
+        )
+        assert "Zone:" not in embed.fields[0].value
+
+
+class TestRenderCache:
+    """Rendered /price embeds are reused for identical offers and options"""
+
+    OFFERS = [offer("DELIVENGO_ZONE1_BOXABLE", "6.20"), offer("SPRING_EU_BE", "4.90", "SPRING_EU_HOME")]
+
+    def render(self, formatter, offers=None, **options):
+        return formatter.create_offers_embed(offers or self.OFFERS, 1.0, "BE", "Belgium (BE)", **options)
+
+    def test_identical_quote_hits(self):
+        formatter = PricingFormatter()
+        first = self.render(formatter)
+        second = self.render(formatter, offers=[replace(o) for o in self.OFFERS])
+
+        assert formatter.render_cache.stats()['hits'] == 1
+        assert second.to_dict() == first.to_dict()
+        # Callers get a copy, never the cached instance
+        second.title = "edited"
+        assert self.render(formatter).title == first.title
+
+    def test_new_price_misses(self):
+        formatter = PricingFormatter()
+        self.render(formatter)
+        changed = self.render(formatter, offers=[replace(self.OFFERS[0], total=Decimal("6.30")), self.OFFERS[1]])
+
+        assert formatter.render_cache.stats()['hits'] == 0
+        assert "6.30" in changed.fields[0].value
+        # The unchanged offer's field came from the fragment cache
+        assert formatter.fragment_cache.stats()['hits'] == 1
+
+    def test_display_options_miss(self):
+        formatter = PricingFormatter()
+        self.render(formatter)
+        self.render(formatter, is_freight=True)
+        self.render(formatter, parcel_weights=[0.5, 0.5])
+
+        assert formatter.render_cache.stats() == {'entries': 3, 'hits': 0, 'misses': 3, 'hit_ratio': 0.0}
+
+    def test_cache_size_bounds_entries(self):
+        formatter = PricingFormatter(cache_size=1)
+        self.render(formatter)
+        self.render(formatter, is_freight=True)
+        assert formatter.render_cache.stats()['entries'] == 1
+
+        disabled = PricingFormatter(cache_size=0)
+        self.render(disabled)
+        self.render(disabled)
+        assert disabled.render_cache.stats()['hits'] == 0
@@ -0,0 +1,130 @@
+"""
+Tests for freight pricing (pallets on the 1000 kg FedEx freight services)
+Runs against a copy of data/normalized with freight bands for Germany
+"""
+
+import csv
+import shutil
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from src.engine.engine import PricingEngine
+from src.engine.freight import chargeable_freight_weight, freight_amount
+from src.engine.loader import DataLoader
+
+
+NORMALIZED_DIR = Path(__file__).parent.parent / "data" / "normalized"
+
+IPF_ZONE_R = 242
+REF_ZONE_R = 243
+
+# (scope_id, min_kg, max_kg, base_amount, amount_per_kg, is_min_charge)
+FREIGHT_BANDS = [
+    (IPF_ZONE_R, 68.0, 99.0, 250.0, 3.10, True),
+    (IPF_ZONE_R, 100.0, 299.0, 300.0, 2.80, True),
+    (IPF_ZONE_R, 300.0, 1000.0, 840.0, 2.40, True),
+    (REF_ZONE_R, 68.0, 1000.0, 150.0, 1.20, True),
+]
+
+
+def band(base, per_kg, is_min_charge=True):
+    return SimpleNamespace(base_amount=Decimal(str(base)), amount_per_kg=Decimal(str(per_kg)),
+                           is_min_charge=is_min_charge)
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp("freight") / "normalized"
+    shutil.copytree(NORMALIZED_DIR, data_dir)
+
+    with (data_dir / "tariff_bands.csv").open("a", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        for band_id, row in enumerate(FREIGHT_BANDS, 90000):
+            writer.writerow((band_id,) + row)
+
+    loader = DataLoader(data_dir=data_dir)
+    loader.load_all()
+    return PricingEngine(loader=loader)
+
+
+def by_service(offers):
+    return {o.service_code: o for o in offers}
+
+
+class TestFreightHelpers:
+
+    def test_weight_rounded_up(self):
+        assert chargeable_freight_weight([120.2], None, 5000) == 121
+        assert chargeable_freight_weight([100.0, 20.0], None, 5000) == 120
+
+    def test_volumetric_per_piece(self):
+        # 120x80x150 = 1,440,000 cm³ / 5000 = 288 kg > 200 kg actual
+        volume = 120 * 80 * 150
+        assert chargeable_freight_weight([200.0, 300.0], [volume, None], 5000) == 588
+
+    def test_min_charge(self):
+        assert freight_amount(band(250, 3.10), 70) == Decimal("250")
+        assert freight_amount(band(250, 3.10), 90) == Decimal("279.00")
+
+    def test_without_min_charge(self):
+        assert freight_amount(band(10, 2, is_min_charge=False), 100) == Decimal("210")
+
+
+class TestPriceFreight:
+
+    def test_freight_services_only(self, engine):
+        offers = engine.price_freight("DE", [150.0])
+
+        assert set(by_service(offers)) == {"FDX_IPF_EXPORT", "FDX_REF_EXPORT"}
+        assert [o.total for o in offers] == sorted(o.total for o in offers)
+
+    def test_per_kg_band(self, engine):
+        offer = by_service(engine.price_freight("DE", [150.0]))["FDX_IPF_EXPORT"]
+
+        assert offer.freight == Decimal("420.00")
+        assert offer.chargeable_weight_kg == 150
+        assert "2.80/kg" in offer.band_details
+
+    def test_min_charge_applies(self, engine):
+        offer = by_service(engine.price_freight("DE", [70.0]))["FDX_REF_EXPORT"]
+        assert offer.freight == Decimal("150")
+
+    def test_multi_piece_priced_on_total(self, engine):
+        """Two pieces land in the 300+ kg band together, not in two lighter bands"""
+        offer = by_service(engine.price_freight("DE", [180.0, 170.0]))["FDX_IPF_EXPORT"]
+
+        assert offer.parcel_count == 2
+        assert offer.freight == Decimal("840")  # max(350 x 2.40, 840)
+
+    def test_volumetric(self, engine):
+        offer = by_service(
+            engine.price_freight("DE", [200.0], piece_dimensions=[(120, 80, 150)])
+        )["FDX_IPF_EXPORT"]
+        assert offer.chargeable_weight_kg == 288
+
+    def test_piece_over_limit(self, engine):
+        assert engine.price_freight("DE", [1200.0]) == []
+
+    def test_parcel_pricing_unchanged(self, engine):
+        assert "FDX_IPF_EXPORT" not in by_service(engine.price("DE", 2.0))
+
+    def test_unknown_country(self, engine):
+        assert engine.price_freight("Atlantis", [150.0]) == []
+
+
+class TestBandIndex:
+    """Test that the bisect band lookup matches a linear scan"""
+
+    def test_matches_linear_scan(self, engine):
+        for scope in list(engine.loader.scopes.values())[::7]:
+            if not scope.bands:
+                continue
+            weights = {b.min_weight_kg for b in scope.bands} | {b.max_weight_kg for b in scope.bands}
+            weights |= {w + 0.05 for w in weights}
+            for weight in weights:
+                expected = next(
+                    (b for b in scope.bands if b.min_weight_kg <= weight <= b.max_weight_kg), None
+                )
+                assert engine._find_band(scope, weight) is expected
@@ -0,0 +1,82 @@
+"""
+Tests for the /price load test fakes
+"""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+from src.bot.loop_monitor import LoopMonitor
+from src.cli.load_test import QUIET_LOGGERS, FakeInteraction, Query, quiet_logs, run_load, synthetic_queries
+
+
+class TestFakeInteraction:
+
+    def test_requester(self):
+        assert FakeInteraction(user_id=7).user.id == 7
+
+    def test_followup_message_only_when_waiting(self):
+        interaction = FakeInteraction()
+
+        async def scenario():
+            assert await interaction.followup.send(embed="page 1") is None
+
+            message = await interaction.followup.send(embed="page 1", view="buttons", wait=True)
+            await message.edit(view=None)
+            return message
+
+        message = asyncio.run(scenario())
+        assert (message.embed, message.view) == ("page 1", None)
+        assert interaction.sent == ["page 1", "page 1"]
+
+    def test_synthetic_queries_are_reproducible(self):
+        assert synthetic_queries(20, seed=1) == synthetic_queries(20, seed=1)
+
+
+def fake_bot(callback):
+    """Just what run_load uses: the /price callback and the loop monitor"""
+    command = SimpleNamespace(callback=callback)
+    return SimpleNamespace(
+        tree=SimpleNamespace(get_command=lambda name: command),
+        loop_monitor=LoopMonitor(interval=0.01)
+    )
+
+
+class TestRunLoad:
+
+    def test_errors_by_type(self):
+        async def price(interaction, weight, destination, carriers=None):
+            if destination == "XX":
+                raise ValueError(destination)
+            if destination == "YY":
+                raise KeyError(destination)
+            await interaction.followup.send(embed=destination)
+
+        queries = [Query("1", "DE"), Query("1", "XX"), Query("1", "XX"), Query("1", "YY")]
+        result = asyncio.run(run_load(fake_bot(price), queries, concurrency=2))
+
+        assert result['requests'] == 4
+        assert result['errors'] == 3
+        assert result['error_types'] == {"ValueError": 2, "KeyError": 1}
+
+
+@pytest.fixture
+def restore_levels():
+    levels = {name: logging.getLogger(name).level for name in QUIET_LOGGERS}
+    root = logging.getLogger().level
+    yield
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+    logging.getLogger().setLevel(root)
+
+
+class TestQuietLogs:
+
+    def test_survives_root_reconfiguration(self, restore_levels):
+        quiet_logs()
+        # What importing the bot does (basicConfig resets the root level)
+        logging.getLogger().setLevel(logging.INFO)
+
+        assert not logging.getLogger("src.bot.commands").isEnabledFor(logging.INFO)
+        assert logging.getLogger("src.bot.commands").isEnabledFor(logging.ERROR)
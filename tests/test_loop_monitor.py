@@ -0,0 +1,61 @@
+"""
+Tests for the event-loop monitor (lag probe and blocking stage attribution)
+"""
+
+import asyncio
+import logging
+import time
+
+from src.bot.loop_monitor import LoopMonitor
+
+
+def run_blocking_command(monitor, block_seconds):
+    """Start the probe, block the loop inside a stage, let the probe catch up"""
+
+    async def scenario():
+        monitor.start()
+        await asyncio.sleep(0.05)
+
+        with monitor.stage("price", "engine"):
+            time.sleep(block_seconds)
+
+        with monitor.stage("price", "embed"):
+            pass
+
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+    asyncio.run(scenario())
+
+
+class TestLoopMonitor:
+
+    def test_blocking_stage_is_recorded(self, caplog):
+        monitor = LoopMonitor(interval=0.01, block_threshold=0.05)
+
+        with caplog.at_level(logging.WARNING, logger="src.bot.loop_monitor"):
+            run_blocking_command(monitor, 0.15)
+
+        [blocked] = monitor.stats()['blocked_stages']
+        assert (blocked['command'], blocked['stage'], blocked['count']) == ("price", "engine", 1)
+        assert blocked['max'] >= 0.15
+
+        assert "/price [engine] blocked the event loop" in caplog.text
+        assert "Event loop lag" in caplog.text
+
+    def test_lag_percentiles(self):
+        monitor = LoopMonitor(interval=0.01, block_threshold=0.05)
+        run_blocking_command(monitor, 0.15)
+
+        lag = monitor.stats()['lag']
+        assert lag['count'] > 1
+        assert lag['p50'] is not None and lag['p50'] <= lag['p95'] <= lag['p99'] <= lag['max']
+        # The probe woke up late by (almost) the whole blocking section
+        assert lag['max'] >= 0.1
+
+    def test_fast_stages_are_not_recorded(self):
+        monitor = LoopMonitor(interval=0.01, block_threshold=0.05)
+        run_blocking_command(monitor, 0.0)
+
+        assert monitor.stats()['blocked_stages'] == []
+        assert monitor._task is None
@@ -0,0 +1,193 @@
+"""
+Tests for paginated /price results (stored quotes, page buttons)
+Needs discord.py installed
+"""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip("discord")
+
+from src.bot.config import config
+from src.bot.formatter import PricingFormatter
+from src.bot.pagination import OfferPagesView, QuotePageStore, StoredQuote
+from src.engine.engine import PriceOffer
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def offers(count):
+    return [
+        PriceOffer(
+            carrier_code="SPRING", carrier_name=f"Carrier {i}", service_code=f"SVC_{i}", service_label="",
+            freight=Decimal(i), surcharges=Decimal("0"), total=Decimal(i), currency="EUR",
+            scope_code="", band_details=""
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def stored_quote(count=25):
+    return StoredQuote(offers=offers(count), weight_kg=1.0, destination="DE", country_name="Germany (DE)")
+
+
+class CountingFormatter(PricingFormatter):
+    """Records which pages get rendered"""
+
+    def __init__(self):
+        super().__init__(cache_size=0)
+        self.pages = []
+
+    def create_offers_embed(self, *args, page=0, **kwargs):
+        self.pages.append(page)
+        return super().create_offers_embed(*args, page=page, **kwargs)
+
+
+class FakeResponse:
+
+    def __init__(self):
+        self.edits = []
+        self.messages = []
+
+    async def edit_message(self, **kwargs):
+        self.edits.append(kwargs)
+
+    async def send_message(self, content=None, **kwargs):
+        self.messages.append(content)
+
+
+class FakeFollowup:
+
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, content=None, **kwargs):
+        self.messages.append(content)
+
+
+class FakeUser:
+
+    def __init__(self, user_id):
+        self.id = user_id
+
+
+class FakeInteraction:
+
+    def __init__(self, user_id=1):
+        self.user = FakeUser(user_id)
+        self.response = FakeResponse()
+        self.followup = FakeFollowup()
+
+
+class TestQuotePageStore:
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        store = QuotePageStore(ttl=600.0, clock=clock)
+        quote_id = store.put(stored_quote())
+
+        clock.now = 600.0
+        assert store.get(quote_id) is not None
+
+        clock.now = 600.1
+        assert store.get(quote_id) is None
+        assert len(store) == 0
+
+    def test_oldest_evicted_beyond_max_entries(self):
+        store = QuotePageStore(max_entries=2, clock=FakeClock())
+        first, second, third = (store.put(stored_quote()) for _ in range(3))
+
+        assert store.get(first) is None
+        assert store.get(second) is not None and store.get(third) is not None
+
+    def test_expired_entries_dropped_on_put(self):
+        clock = FakeClock()
+        store = QuotePageStore(ttl=10.0, clock=clock)
+        store.put(stored_quote())
+
+        clock.now = 11.0
+        store.put(stored_quote())
+        assert len(store) == 1
+
+    def test_unknown_id(self):
+        assert QuotePageStore().get(42) is None
+
+
+def run_view(scenario, store, formatter, page_count=3, owner_id=1):
+    """Views need a running event loop"""
+
+    async def main():
+        view = OfferPagesView(store, formatter, store.put(stored_quote()), page_count, owner_id)
+        await scenario(view)
+        return view
+
+    return asyncio.run(main())
+
+
+class TestOfferPagesView:
+
+    def test_renders_only_the_requested_page(self):
+        formatter = CountingFormatter()
+        interaction = FakeInteraction()
+
+        async def scenario(view):
+            await view._show(interaction, 1)
+
+        view = run_view(scenario, QuotePageStore(), formatter)
+
+        assert formatter.pages == [1]
+        [edit] = interaction.response.edits
+        assert len(edit["embed"].fields) == min(config.max_offers, 25 - config.max_offers)
+        assert (view.previous_page.disabled, view.next_page.disabled) == (False, False)
+
+    def test_page_bounds(self):
+        formatter = CountingFormatter()
+
+        async def scenario(view):
+            await view._show(FakeInteraction(), 7)
+            await view._show(FakeInteraction(), -1)
+
+        view = run_view(scenario, QuotePageStore(), formatter)
+
+        assert formatter.pages == [2, 0]
+        assert view.page == 0
+        assert (view.previous_page.disabled, view.next_page.disabled) == (True, False)
+
+    def test_only_requester_can_page(self):
+        results = {}
+
+        async def scenario(view):
+            stranger = FakeInteraction(user_id=2)
+            results["stranger"] = (await view.interaction_check(stranger), stranger.response.messages)
+            results["owner"] = await view.interaction_check(FakeInteraction(user_id=1))
+
+        run_view(scenario, QuotePageStore(), PricingFormatter())
+
+        allowed, messages = results["stranger"]
+        assert not allowed and len(messages) == 1
+        assert results["owner"] is True
+
+    def test_expired_quote_disables_buttons(self):
+        clock = FakeClock()
+        store = QuotePageStore(ttl=60.0, clock=clock)
+        formatter = CountingFormatter()
+        interaction = FakeInteraction()
+
+        async def scenario(view):
+            clock.now = 61.0
+            await view._show(interaction, 1)
+
+        view = run_view(scenario, store, formatter)
+
+        assert formatter.pages == []
+        assert all(item.disabled for item in view.children)
+        assert "expired" in interaction.followup.messages[0]
@@ -0,0 +1,115 @@
+"""
+Tests for the PDF table cache (per-file index, per-page fingerprints, invalidation)
+pdfplumber is replaced by fakes of `_extract_pages` / `_fingerprint_pages`
+"""
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from src.etl import pdf_tables
+
+
+class FakePDF:
+    """Fake PDF: page index -> page content; records which pages get opened"""
+
+    def __init__(self, path, pages):
+        self.path = path
+        self.pages = dict(pages)
+        self.extracted = []
+        self.fingerprinted = []
+        self.write()
+
+    def write(self):
+        self.path.write_text(repr(sorted(self.pages.items())), encoding="utf-8")
+
+    def update(self, index, content):
+        self.pages[index] = content
+        self.write()
+
+    def extract_pages(self, pdf_path, page_indices):
+        self.extracted.extend(page_indices)
+        return {index: [[self.pages[index]]] for index in page_indices}
+
+    def fingerprint_pages(self, pdf_path, page_indices):
+        self.fingerprinted.extend(page_indices)
+        return {index: f"fp-{self.pages[index]}" for index in page_indices}
+
+    def reset(self):
+        self.extracted.clear()
+        self.fingerprinted.clear()
+
+
+@pytest.fixture
+def pdf(tmp_path, monkeypatch):
+    fake = FakePDF(tmp_path / "rates.pdf", {0: "cover", 1: "zone A", 2: "zone B"})
+    monkeypatch.setattr(pdf_tables, "_extract_pages", fake.extract_pages)
+    monkeypatch.setattr(pdf_tables, "_fingerprint_pages", fake.fingerprint_pages)
+    return fake
+
+
+def extract(pdf, tmp_path, **kwargs):
+    return pdf_tables.extract_tables(pdf.path, [1, 2], workers=1, cache_dir=tmp_path / "cache", **kwargs)
+
+
+class TestPageTableCache:
+
+    def test_unchanged_pdf_is_not_reopened(self, pdf, tmp_path):
+        first = extract(pdf, tmp_path)
+        assert first == {1: [["zone A"]], 2: [["zone B"]]}
+        assert pdf.extracted == [1, 2]
+
+        pdf.reset()
+        assert extract(pdf, tmp_path) == first
+        assert pdf.fingerprinted == [] and pdf.extracted == []
+
+    def test_only_changed_pages_are_extracted(self, pdf, tmp_path):
+        extract(pdf, tmp_path)
+        pdf.reset()
+
+        # Republished PDF: new file hash, page 1 unchanged
+        pdf.update(2, "zone B (2026)")
+        tables = extract(pdf, tmp_path)
+
+        assert tables == {1: [["zone A"]], 2: [["zone B (2026)"]]}
+        assert pdf.fingerprinted == [1, 2]
+        assert pdf.extracted == [2]
+
+    def test_new_pages_of_a_cached_pdf(self, pdf, tmp_path):
+        extract(pdf, tmp_path)
+        pdf.reset()
+
+        tables = pdf_tables.extract_tables(pdf.path, [0, 1], workers=1, cache_dir=tmp_path / "cache")
+        assert tables == {0: [["cover"]], 1: [["zone A"]]}
+        assert pdf.fingerprinted == [0] and pdf.extracted == [0]
+
+    def test_use_cache_false_forces_extraction(self, pdf, tmp_path):
+        extract(pdf, tmp_path)
+        pdf.reset()
+
+        assert extract(pdf, tmp_path, use_cache=False) == {1: [["zone A"]], 2: [["zone B"]]}
+        assert pdf.extracted == [1, 2]
+
+    def test_cache_version_invalidates_everything(self, pdf, tmp_path, monkeypatch):
+        extract(pdf, tmp_path)
+        pdf.reset()
+
+        monkeypatch.setattr(pdf_tables, "CACHE_VERSION", pdf_tables.CACHE_VERSION + 1)
+        extract(pdf, tmp_path)
+        assert pdf.extracted == [1, 2]
+
+        # Rewritten with the new version: hit again
+        pdf.reset()
+        extract(pdf, tmp_path)
+        assert pdf.extracted == []
+
+    def test_corrupt_index_is_a_miss(self, pdf, tmp_path):
+        extract(pdf, tmp_path)
+        pdf.reset()
+
+        index_path = tmp_path / "cache" / f"{pdf_tables.file_sha256(pdf.path)}.json"
+        index_path.write_text("{not json", encoding="utf-8")
+
+        assert extract(pdf, tmp_path) == {1: [["zone A"]], 2: [["zone B"]]}
+        # Per-page entries are still valid
+        assert pdf.fingerprinted == [1, 2] and pdf.extracted == []
@@ -0,0 +1,112 @@
+"""
+Tests for sub-country zones selected by postal code
+Trie lookups, range decomposition and multi-scope pricing
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+from src.engine.engine import PricingEngine
+from src.engine.loader import DataLoader
+from src.engine.postal_index import PostalIndex, normalize_postal_code, range_to_prefixes
+
+
+NORMALIZED_DIR = Path(__file__).parent.parent / "data" / "normalized"
+
+# Delivengo Germany: scope 1 = BOXABLE, scope 2 = NON_BOXABLE
+POSTAL_RULES = """scope_id,country_iso2,postal_from,postal_to
+1,DE,1,
+2,DE,20000,99999
+2,DE,101,
+"""
+
+
+class TestRangeToPrefixes:
+
+    def test_aligned_range(self):
+        assert range_to_prefixes("20000", "20999") == ["20"]
+
+    def test_unaligned_range(self):
+        assert range_to_prefixes("75001", "75020") == [
+            "75001", "75002", "75003", "75004", "75005", "75006", "75007", "75008", "75009",
+            "7501", "75020",
+        ]
+
+    def test_whole_country(self):
+        assert range_to_prefixes("0000", "9999") == [""]
+
+    @pytest.mark.parametrize("low,high", [("100", "99"), ("A1", "B2"), ("200", "100")])
+    def test_invalid_range(self, low, high):
+        with pytest.raises(ValueError):
+            range_to_prefixes(low, high)
+
+
+class TestPostalIndex:
+
+    @pytest.fixture
+    def index(self):
+        index = PostalIndex()
+        index.add_prefix("CA", "K", 10)
+        index.add_prefix("CA", "K1A", 11)
+        index.add_range("AU", "2000", "2999", 20)
+        return index
+
+    def test_deepest_match(self, index):
+        assert index.lookup("CA", "K1A 0B1") == {10: 1, 11: 3}
+        assert index.lookup("CA", "k2p-1l4") == {10: 1}
+
+    def test_range(self, index):
+        assert index.lookup("AU", "2000") == {20: 1}
+        assert index.lookup("AU", "3000") == {}
+
+    def test_unknown_country(self, index):
+        assert index.lookup("US", "10001") == {}
+        assert not index.has_zones("US")
+
+    def test_normalize(self):
+        assert normalize_postal_code(" k1a 0b1 ") == "K1A0B1"
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp("postal") / "normalized"
+    shutil.copytree(NORMALIZED_DIR, data_dir)
+    (data_dir / "tariff_scope_postal_codes.csv").write_text(POSTAL_RULES, encoding="utf-8")
+
+    loader = DataLoader(data_dir=data_dir)
+    loader.load_all()
+    return PricingEngine(loader=loader)
+
+
+def delivengo_scopes(offers):
+    return sorted(o.scope_code for o in offers if o.service_code.startswith("DELIVENGO"))
+
+
+class TestZonedPricing:
+    """Test that price() picks the zone of the postal code"""
+
+    def test_no_postal_code_returns_all_zones(self, engine):
+        assert delivengo_scopes(engine.price("DE", 1.0)) == [
+            "DELIVENGO_DE_BOXABLE", "DELIVENGO_DE_NON_BOXABLE"
+        ]
+
+    def test_postal_code_selects_zone(self, engine):
+        assert delivengo_scopes(engine.price("DE", 1.0, postal_code="12043")) == ["DELIVENGO_DE_BOXABLE"]
+        assert delivengo_scopes(engine.price("DE", 1.0, postal_code="80331")) == ["DELIVENGO_DE_NON_BOXABLE"]
+
+    def test_longest_prefix_wins(self, engine):
+        assert delivengo_scopes(engine.price("DE", 1.0, postal_code="10115")) == ["DELIVENGO_DE_NON_BOXABLE"]
+
+    def test_uncovered_postal_code(self, engine):
+        assert delivengo_scopes(engine.price("DE", 1.0, postal_code="01067")) == []
+
+    def test_country_without_zones(self, engine):
+        assert delivengo_scopes(engine.price("GB", 1.0, postal_code="SW1A 1AA")) == [
+            "DELIVENGO_GB_BOXABLE", "DELIVENGO_GB_NON_BOXABLE"
+        ]
+
+    def test_other_services_unaffected(self, engine):
+        with_code = {o.service_code for o in engine.price("DE", 1.0, postal_code="80331")}
+        without_code = {o.service_code for o in engine.price("DE", 1.0)}
+        assert with_code == without_code
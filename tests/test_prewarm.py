@@ -0,0 +1,195 @@
+"""
+Tests for the UPS live rate cache, request throttle and background pre-warmer
+No network calls: the UPS client is replaced by a fake
+"""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+from src.bot.prewarm import Lane, RatePrewarmer, load_lanes
+from src.integrations.rate_cache import RateCache
+from src.integrations.throttle import RequestThrottle
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+RATE = {"service_code": "07", "service_name": "UPS Worldwide Express", "price": Decimal("42.10"),
+        "currency": "EUR", "delivery_days": "2", "api_type": "WWE"}
+
+
+class TestRateCache:
+
+    def test_ttl_expiry(self, clock):
+        cache = RateCache(ttl=60.0, clock=clock)
+        key = RateCache.make_key("US", 2.0, "Main City", "00000")
+        cache.put(key, [RATE])
+
+        clock.now = 60.0
+        assert cache.get(key) == [RATE]
+
+        clock.now = 60.1
+        assert cache.get(key) is None
+        assert cache.stats() == {'entries': 1, 'hits': 1, 'misses': 1, 'hit_ratio': 0.5}
+
+    def test_entries_are_copies(self, clock):
+        cache = RateCache(clock=clock)
+        cache.put("lane", [RATE])
+
+        cache.get("lane")[0]["price"] = Decimal("0")
+        assert cache.get("lane")[0]["price"] == Decimal("42.10")
+
+    def test_weight_rounded_to_the_gram(self):
+        assert RateCache.make_key("US", 2.0, "c", "p") == RateCache.make_key("US", 2.0004, "c", "p")
+        assert RateCache.make_key("US", 2.0, "c", "p") != RateCache.make_key("US", 2.001, "c", "p")
+
+    def test_postal_code_normalised(self):
+        assert RateCache.make_key("ca", 1.0, "c", "K1A 0B1") == RateCache.make_key("CA", 1.0, "c", "k1a0b1")
+        assert RateCache.make_key("CA", 1.0, "c", "K1A0B1") != RateCache.make_key("CA", 1.0, "c", "K1A0B2")
+
+    def test_dimensions_are_part_of_the_lane(self):
+        base = RateCache.make_key("US", 2.0, "c", "p", (30, 30, 15))
+        assert base == RateCache.make_key("US", 2.0, "c", "p", (30.0, 30.0, 15.0))
+        assert base != RateCache.make_key("US", 2.0, "c", "p", (40, 30, 20))
+        assert base != RateCache.make_key("US", 2.0, "c", "p")
+
+
+class TestThrottle:
+
+    def test_spaces_every_request(self, clock):
+        throttle = RequestThrottle(2.0, clock=clock, sleep=clock.sleep)
+
+        sent_at = []
+        for _ in range(4):
+            throttle.wait()
+            sent_at.append(clock.now)
+
+        assert sent_at == [0.0, 0.5, 1.0, 1.5]
+        assert throttle.requests == 4
+
+    def test_no_wait_when_idle(self, clock):
+        throttle = RequestThrottle(2.0, clock=clock, sleep=clock.sleep)
+        throttle.wait()
+
+        clock.now = 10.0
+        throttle.wait()
+        assert clock.now == 10.0
+        assert throttle.waited_seconds == 0.0
+
+
+class FakeUPSClient:
+    """Lane refresh costing `requests_per_lane` UPS requests (Shop + fallbacks)"""
+
+    def __init__(self, clock, requests_per_lane=4, failing=()):
+        self.clock = clock
+        self.requests_per_lane = requests_per_lane
+        self.failing = set(failing)
+        self.sent_at = []
+
+    def refresh_rates(self, weight_kg, destination_country, before_request=None):
+        for _ in range(self.requests_per_lane):
+            if before_request:
+                before_request()
+            self.sent_at.append(self.clock.now)
+
+        if destination_country == "XX":
+            raise RuntimeError("UPS down")
+        return [] if destination_country in self.failing else [RATE]
+
+
+def prewarmer(clock, lanes, rate=2.0):
+    return RatePrewarmer(
+        lambda: None, lanes, max_requests_per_sec=rate,
+        throttle=RequestThrottle(rate, clock=clock, sleep=clock.sleep), clock=clock
+    )
+
+
+class TestPrewarmer:
+
+    def test_rate_limit_applies_to_ups_requests(self, clock):
+        """A lane with 3 fallbacks costs 4 requests: they are spaced too"""
+        client = FakeUPSClient(clock)
+        warmer = prewarmer(clock, [Lane("US", 2.0), Lane("JP", 1.0)])
+
+        asyncio.run(warmer.refresh_all(client))
+
+        gaps = [b - a for a, b in zip(client.sent_at, client.sent_at[1:])]
+        assert len(client.sent_at) == 8
+        assert min(gaps) >= 0.5
+        assert warmer.stats()['ups_requests'] == 8
+
+    def test_failure_counters(self, clock):
+        client = FakeUPSClient(clock, requests_per_lane=1, failing={"JP"})
+        warmer = prewarmer(clock, [Lane("US", 2.0), Lane("JP", 1.0), Lane("XX", 1.0)])
+
+        asyncio.run(warmer.refresh_all(client))
+
+        stats = warmer.stats()
+        assert (stats['refreshes'], stats['failures'], stats['warm_lanes']) == (1, 2, 1)
+        assert stats['last_error'] == "XX 1.0kg: UPS down"
+
+    def test_lag(self, clock):
+        client = FakeUPSClient(clock, requests_per_lane=1)
+        warmer = prewarmer(clock, [Lane("US", 2.0), Lane("JP", 1.0)])
+        assert warmer.stats()['max_lag'] is None
+
+        asyncio.run(warmer.refresh_all(client))
+        clock.now += 100.0
+
+        # US was refreshed first (0.5s before JP)
+        assert warmer.stats()['max_lag'] == pytest.approx(100.5)
+
+    def test_load_lanes(self, tmp_path):
+        path = tmp_path / "lanes.csv"
+        path.write_text("country_iso2,weight_kg\nus,2\nUS,2.0\nJP,oops\nJP,1\n", encoding="utf-8")
+
+        assert load_lanes(path) == [Lane("US", 2.0), Lane("JP", 1.0)]
+        assert load_lanes(tmp_path / "missing.csv") == []
+
+
+class TestClientCache:
+    """UPSAPIClient cache use (needs `requests` installed, UPS calls stubbed)"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        pytest.importorskip("requests")
+        from src.integrations.ups_api import UPSAPIClient
+
+        client = UPSAPIClient(credentials_manager=object(), base_url="http://127.0.0.1:1")
+        client.calls = []
+
+        def fake_rates(*args, **kwargs):
+            client.calls.append(kwargs.get("request_option"))
+            return [dict(RATE)]
+
+        monkeypatch.setattr(client, "_get_rates_internal", fake_rates)
+        return client
+
+    def test_cached_lookup(self, client):
+        client.get_shipping_rates(2.0, "US")
+        client.get_shipping_rates(2.0, "US")
+        assert client.calls == ["Shop"]
+
+    def test_refresh_bypasses_cache(self, client):
+        client.get_shipping_rates(2.0, "US")
+        client.refresh_rates(2.0, "US")
+        assert client.calls == ["Shop", "Shop"]
+
+        client.get_shipping_rates(2.0, "US")
+        assert client.calls == ["Shop", "Shop"]
@@ -4,7 +4,9 @@ Validates end-to-end pricing queries across all carriers
 """
 
 import pytest
+from decimal import Decimal
 from src.engine.engine import PricingEngine
+from src.engine.loader import SurchargeRule
 
 
 @pytest.fixture
@@ -342,6 +344,110 @@ class TestEdgeCases:
         assert len(offers) > 0
 
 
+class TestMultiParcel:
+    """Test shipment-level pricing with several parcels"""
+
+    def test_single_parcel_matches_price(self, engine):
+        """A one-parcel shipment is priced exactly like price()"""
+        single = engine.price("JP", 2.0)
+        shipment = engine.price_shipment("JP", [2.0])
+
+        assert [(o.service_code, o.total) for o in single] == \
+               [(o.service_code, o.total) for o in shipment]
+
+    def test_totals_are_sum_of_parcels(self, engine):
+        """Without FLAT surcharges, shipment total = sum of per-parcel totals"""
+        shipment = engine.price_shipment("DE", [0.5, 1.5])
+        first = {o.service_code: o.total for o in engine.price("DE", 0.5)}
+        second = {o.service_code: o.total for o in engine.price("DE", 1.5)}
+
+        assert len(shipment) > 0
+        for offer in shipment:
+            assert offer.parcel_count == 2
+            assert offer.total == pytest.approx(first[offer.service_code] + second[offer.service_code])
+
+    def test_flat_surcharge_applied_once(self, engine):
+        """FLAT surcharges are per shipment, not per parcel"""
+        spring_eu = next(s for s in engine.loader.services.values() if s.code == "SPRING_EU_HOME")
+        engine.loader.surcharges.setdefault(spring_eu.service_id, []).append(
+            SurchargeRule(
+                surcharge_id=999,
+                service_id=spring_eu.service_id,
+                name="TEST_HANDLING",
+                kind="FLAT",
+                basis="FREIGHT",
+                value=Decimal("2.00"),
+                conditions={}
+            )
+        )
+
+        single = next(o for o in engine.price("DE", 1.0) if o.service_code == "SPRING_EU_HOME")
+        shipment = next(
+            o for o in engine.price_shipment("DE", [1.0, 1.0, 1.0])
+            if o.service_code == "SPRING_EU_HOME"
+        )
+
+        # 3x freight with 5% fuel each, but the 2.00 handling fee only once
+        assert shipment.freight == single.freight * 3
+        assert shipment.total == pytest.approx((single.total - Decimal("2.00")) * 3 + Decimal("2.00"))
+
+    def test_service_excluded_if_any_parcel_too_heavy(self, engine):
+        """Delivengo (max 2kg) is excluded when one parcel exceeds its limit"""
+        offers = engine.price_shipment("DE", [1.0, 3.0])
+        assert not [o for o in offers if o.carrier_code == "LAPOSTE"]
+
+    def test_sorted_cheapest_first(self, engine):
+        offers = engine.price_shipment("JP", [2.0, 5.0])
+        totals = [o.total for o in offers]
+        assert totals == sorted(totals)
+
+    def test_empty_shipment(self, engine):
+        assert engine.price_shipment("JP", []) == []
+
+
+class TestVolumetric:
+    """Test dimension-aware (volumetric) chargeable weight"""
+
+    def test_no_dimensions_unchanged(self, engine):
+        """Without dimensions, offers are priced on actual weight only"""
+        offers = engine.price("JP", 2.0)
+        assert all(o.chargeable_weight_kg is None for o in offers)
+
+    def test_small_box_priced_on_actual_weight(self, engine):
+        """20x15x10 cm = 0.6kg volumetric < 2kg actual: same prices"""
+        plain = {o.service_code: o.total for o in engine.price("JP", 2.0)}
+        boxed = engine.price("JP", 2.0, dimensions_cm=(20, 15, 10))
+
+        assert {o.service_code: o.total for o in boxed} == plain
+        assert all(o.chargeable_weight_kg == pytest.approx(2.0) for o in boxed)
+
+    def test_large_box_uses_volumetric_weight(self, engine):
+        """60x40x40 cm / 5000 = 19.2kg is billed instead of 2kg"""
+        plain = {o.service_code: o.total for o in engine.price("JP", 2.0)}
+        boxed = engine.price("JP", 2.0, dimensions_cm=(60, 40, 40))
+
+        divisors = {s.code: s.volumetric_divisor for s in engine.loader.services.values()}
+
+        assert len(boxed) > 0
+        for offer in boxed:
+            divisor = divisors[offer.service_code]
+            assert offer.chargeable_weight_kg == pytest.approx(max(2.0, 96000 / divisor))
+            assert offer.total >= plain[offer.service_code]
+
+    def test_matches_price_at_chargeable_weight(self, engine):
+        """A bulky 1kg parcel costs the same as a 4.8kg parcel (40x30x20 / 5000)"""
+        boxed = {o.service_code: o.total for o in engine.price("DE", 1.0, dimensions_cm=(40, 30, 20))}
+        heavy = {o.service_code: o.total for o in engine.price("DE", 4.8)}
+
+        assert len(boxed) > 0
+        for code, total in boxed.items():
+            assert total == heavy[code]
+
+    def test_dimensions_length_mismatch(self, engine):
+        with pytest.raises(ValueError):
+            engine.price_shipment("JP", [1.0, 2.0], parcel_dimensions=[(10, 10, 10)])
+
+
 class TestPerformance:
     """Test that queries execute quickly"""
 
@@ -0,0 +1,80 @@
+"""
+Tests for structured quote traces (PricingEngine.explain / /explain)
+"""
+
+import pytest
+from src.engine.engine import PricingEngine
+from src.engine.trace import (
+    SCOPE_CATCH_ALL, SCOPE_COUNTRY, SCOPE_ZONES, SKIP_NO_BAND, SKIP_NO_SCOPE, SKIP_OVERWEIGHT, QuoteTrace
+)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return PricingEngine()
+
+
+def summary(offers):
+    return [(o.service_code, o.scope_code, o.total) for o in offers]
+
+
+class TestExplain:
+
+    def test_same_offers_as_price(self, engine):
+        trace = engine.explain("DE", [2.0])
+        assert summary(trace.offers) == summary(engine.price("DE", 2.0))
+
+    def test_skip_reasons(self, engine):
+        trace = engine.explain("DE", [2.0])
+
+        assert trace.service("SPRING_ROW_HOME").skip_reason == SKIP_NO_SCOPE
+        assert trace.service("FDX_IPF_EXPORT").skip_reason == SKIP_NO_BAND
+        assert engine.explain("DE", [30.0]).service("SPRING_EU_HOME").skip_reason == SKIP_OVERWEIGHT
+
+    def test_priced_service(self, engine):
+        trace = engine.explain("DE", [2.0])
+        offer = next(o for o in trace.offers if o.service_code == "SPRING_EU_HOME")
+        service = trace.service("SPRING_EU_HOME")
+
+        assert service.skip_reason is None
+        [scope] = service.scopes
+        assert scope.reason == SCOPE_COUNTRY
+        assert scope.bands[0].min_weight_kg <= 2.0 <= scope.bands[0].max_weight_kg
+        assert scope.freight == offer.freight
+        assert sum(s.amount for s in scope.surcharges) == offer.surcharges
+        assert [s.name for s in scope.surcharges] == ["SPRING_EU_FUEL"]
+
+    def test_scope_reasons(self, engine):
+        delivengo_de = engine.explain("DE", [1.0]).service("DELIVENGO_2025")
+        assert {s.reason for s in delivengo_de.scopes} == {SCOPE_ZONES}
+
+        delivengo_ca = engine.explain("CA", [1.0]).service("DELIVENGO_2025")
+        assert [s.reason for s in delivengo_ca.scopes] == [SCOPE_CATCH_ALL]
+
+    def test_unknown_country(self, engine):
+        trace = engine.explain("Atlantis", [1.0])
+
+        assert trace.dest_iso2 is None
+        assert trace.offers == []
+        assert trace.format() == "❌ Unknown country: Atlantis"
+
+
+class TestTraceCost:
+
+    def test_no_output_without_trace(self, engine, capsys):
+        engine.price("DE", 2.0)
+        assert capsys.readouterr().out == ""
+
+    def test_debug_prints_trace(self, engine, capsys):
+        engine.price("DE", 2.0, debug=True)
+        out = capsys.readouterr().out
+
+        assert "🌍 Resolved: DE → DE" in out
+        assert "⏭️  SPRING_ROW_HOME: no scope for DE" in out
+
+    def test_caller_trace_is_filled(self, engine):
+        trace = QuoteTrace("JP", [0.5])
+        offers = engine.price("JP", 0.5, trace=trace)
+
+        assert trace.dest_iso2 == "JP"
+        assert sum(1 for s in trace.services for scope in s.scopes if scope.priced) == len(offers)
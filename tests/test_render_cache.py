@@ -0,0 +1,77 @@
+"""
+Tests for the embed render cache (LRU, fingerprints, EMBED_CACHE_SIZE)
+"""
+
+from dataclasses import replace
+from decimal import Decimal
+
+from src.bot.config import BotConfig
+from src.bot.render_cache import RenderCache, offer_fingerprint
+from src.engine.engine import PriceOffer
+
+
+OFFER = PriceOffer(
+    carrier_code="SPRING", carrier_name="Spring", service_code="SPRING_EU_HOME",
+    service_label="Spring EU Home", freight=Decimal("4.50"), surcharges=Decimal("0.23"),
+    total=Decimal("4.73"), currency="EUR", scope_code="SPRING_EU_DE", band_details=""
+)
+
+
+class TestRenderCache:
+
+    def test_hit_and_miss(self):
+        cache = RenderCache(max_entries=4)
+        assert cache.get("a") is None
+
+        cache.put("a", "embed")
+        assert cache.get("a") == "embed"
+        assert cache.stats() == {'entries': 1, 'hits': 1, 'misses': 1, 'hit_ratio': 0.5}
+
+    def test_lru_eviction(self):
+        cache = RenderCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "b" is now the least recently used
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert cache.stats()['entries'] == 2
+
+    def test_zero_disables(self):
+        cache = RenderCache(max_entries=0)
+        cache.put("a", 1)
+        assert cache.get("a") is None
+        assert cache.stats()['entries'] == 0
+
+    def test_clear(self):
+        cache = RenderCache()
+        cache.put("a", 1)
+        cache.clear()
+        assert cache.get("a") is None
+
+
+class TestFingerprint:
+
+    def test_same_offer_same_key(self):
+        assert offer_fingerprint(OFFER) == offer_fingerprint(replace(OFFER))
+
+    def test_displayed_values_change_the_key(self):
+        for changes in ({"total": Decimal("4.74")}, {"surcharges": Decimal("0")},
+                        {"carrier_name": "Spring GDS"}, {"chargeable_weight_kg": 2.5}):
+            assert offer_fingerprint(replace(OFFER, **changes)) != offer_fingerprint(OFFER), changes
+
+    def test_zone_only_when_shown(self):
+        other_zone = replace(OFFER, scope_code="SPRING_EU_DE_2")
+        assert offer_fingerprint(other_zone) == offer_fingerprint(OFFER)
+        assert offer_fingerprint(other_zone, show_zone=True) != offer_fingerprint(OFFER, show_zone=True)
+
+
+class TestConfig:
+
+    def test_cache_size(self, monkeypatch):
+        monkeypatch.delenv("EMBED_CACHE_SIZE", raising=False)
+        assert BotConfig().embed_cache_size == 256
+
+        monkeypatch.setenv("EMBED_CACHE_SIZE", "0")
+        assert BotConfig().embed_cache_size == 0
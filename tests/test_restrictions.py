@@ -0,0 +1,177 @@
+"""
+Tests for the service restriction index (suspensions by service and country)
+"""
+
+import json
+import pickle
+import shutil
+from datetime import date
+from pathlib import Path
+
+import pytest
+from src.engine.engine import PricingEngine
+from src.engine.loader import DataLoader
+from src.engine.restrictions import RestrictionIndex, ServiceRestriction
+from src.engine.tariff_store import SQLiteDataLoader, build_store
+from src.engine.trace import SKIP_SUSPENDED
+from src.engine.validator import ERROR, WARNING, validate_tables
+
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+NORMALIZED_DIR = DATA_DIR / "normalized"
+
+SUSPENDED_US = {"UPS_ECONOMY_DDU_EXPORT_FR", "UPS_ECONOMY_DDU_IMPORT_NL", "UPS_EXPRESS_DDP_IMPORT_NL"}
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return PricingEngine()
+
+
+def restriction(service_code="SVC", iso2="US", status="SUSPENDED", **entry):
+    return {"service_code": service_code, "country_iso2": iso2, "status": status, **entry}
+
+
+class TestIndex:
+
+    def test_applies_to_every_service_version(self):
+        class Service:
+            def __init__(self, service_id, code):
+                self.service_id, self.code = service_id, code
+
+        index = RestrictionIndex(
+            [ServiceRestriction.from_json(restriction(effective_date="2025-01-20"))],
+            [Service(1, "SVC"), Service(2, "SVC"), Service(3, "OTHER")]
+        )
+
+        assert index.lookup(1, "US", date(2025, 6, 1)).is_suspended
+        assert index.lookup(2, "US", date(2025, 6, 1)) is not None
+        assert index.lookup(3, "US", date(2025, 6, 1)) is None
+        assert index.lookup(1, "US", date(2025, 1, 19)) is None
+
+    def test_legacy_view(self, engine):
+        assert {code for (code, iso2) in engine.restrictions} == SUSPENDED_US
+        assert all(entry["status"] == "SUSPENDED" for entry in engine.restrictions.values())
+
+
+class TestPricing:
+
+    def test_suspended_services_are_skipped(self, engine):
+        trace = engine.explain("US", [2.0])
+
+        assert not SUSPENDED_US & {o.service_code for o in trace.offers}
+        for code in SUSPENDED_US:
+            service = trace.service(code)
+            assert service.skip_reason == SKIP_SUSPENDED
+            assert service.is_suspended and service.restriction
+            assert service.scopes == []
+
+    def test_other_countries_unaffected(self, engine):
+        codes = {o.service_code for o in engine.price("CA", 2.0)}
+        assert "UPS_ECONOMY_DDU_EXPORT_FR" in codes
+
+    def test_ship_date_before_suspension(self, engine):
+        codes = {o.service_code for o in engine.price("US", 2.0, ship_date="2025-01-10")}
+        assert SUSPENDED_US <= codes
+
+
+class TestAlternatives:
+
+    def test_cheapest_alternative_from_same_offers(self, engine):
+        quote = engine.quote("US", [2.0])
+        by_code = {s.service_code: s for s in quote.suspended}
+
+        assert set(by_code) == SUSPENDED_US
+        suspended = by_code["UPS_ECONOMY_DDU_EXPORT_FR"]
+        assert suspended.alternative_services == ["FDX_IP_EXPORT", "SPRING_ROW_HOME"]
+
+        candidates = [o for o in quote.offers if o.service_code in suspended.alternative_services]
+        assert suspended.alternative is min(candidates, key=lambda o: o.total)
+
+    def test_carrier_of_suspended_service(self, engine):
+        """Carrier code and name, so the /price carriers filter treats it like an offer"""
+        quote = engine.quote("US", [2.0])
+        ups = next(c for c in engine.loader.carriers.values() if c.code == "UPS")
+        assert {(s.carrier_code, s.carrier_name) for s in quote.suspended} == {(ups.code, ups.name)}
+
+    def test_alternative_only_when_priced(self, engine):
+        quote = engine.quote("US", [2.0])
+        by_code = {s.service_code: s for s in quote.suspended}
+
+        fedex_priced = "FDX_IP_EXPORT" in {o.service_code for o in quote.offers}
+        assert (by_code["UPS_ECONOMY_DDU_IMPORT_NL"].alternative is not None) == fedex_priced
+
+    def test_same_offers_as_price(self, engine):
+        quote = engine.quote("US", [2.0, 1.0])
+        assert [(o.service_code, o.total) for o in quote.offers] == \
+            [(o.service_code, o.total) for o in engine.price_shipment("US", [2.0, 1.0])]
+
+    def test_nothing_suspended(self, engine):
+        assert engine.quote("DE", [2.0]).suspended == []
+        assert engine.quote("US", [2.0], ship_date="2025-01-10").suspended == []
+
+    def test_picklable(self, engine):
+        """Quotes come back from process pool workers"""
+        quote = engine.quote("US", [2.0])
+        assert pickle.loads(pickle.dumps(quote)) == quote
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    target = tmp_path / "normalized"
+    shutil.copytree(NORMALIZED_DIR, target)
+    shutil.copy(DATA_DIR / "service_restrictions.json", tmp_path / "service_restrictions.json")
+    return target
+
+
+def write_restrictions(data_dir, entries):
+    path = data_dir.parent / "service_restrictions.json"
+    path.write_text(json.dumps({"restrictions": entries}), encoding="utf-8")
+
+
+class TestReload:
+
+    def test_reload_picks_up_restrictions(self, data_dir):
+        loader = DataLoader(data_dir=data_dir)
+        loader.load_all()
+        engine = PricingEngine(loader=loader)
+        assert "UPS_ECONOMY_DDU_EXPORT_FR" not in {o.service_code for o in engine.price("US", 2.0)}
+
+        write_restrictions(data_dir, [restriction("SPRING_ROW_HOME", effective_date="2025-01-20")])
+        engine.reload(force=True)
+
+        codes = {o.service_code for o in engine.price("US", 2.0)}
+        assert "UPS_ECONOMY_DDU_EXPORT_FR" in codes
+        assert "SPRING_ROW_HOME" not in codes
+
+    def test_sqlite_store(self, data_dir, tmp_path):
+        loader = SQLiteDataLoader(build_store(data_dir, tmp_path / "tariffs.sqlite"))
+        loader.load_all()
+
+        assert len(loader.restriction_index) == len(SUSPENDED_US)
+        assert SUSPENDED_US.isdisjoint(o.service_code for o in PricingEngine(loader=loader).price("US", 2.0))
+
+
+class TestValidation:
+
+    @staticmethod
+    def tables(*entries):
+        return {
+            "services": [{"service_id": "1", "carrier_id": "1", "code": "SVC", "max_weight_kg": "2.0",
+                          "active_from": "", "active_to": ""}],
+            "carriers": [{"carrier_id": "1", "code": "C", "name": "Carrier", "currency": "EUR"}],
+            "service_restrictions": list(entries),
+        }
+
+    def test_valid(self):
+        report = validate_tables(self.tables(restriction(effective_date="2025-01-20")))
+        assert [i for i in report.issues if "restriction" in i.subject] == []
+
+    def test_bad_dates(self):
+        report = validate_tables(self.tables(restriction(effective_date="20/01/2025")))
+        assert [(i.severity, i.check) for i in report.issues if "restriction" in i.subject] == [(ERROR, "invalid_value")]
+
+    def test_unknown_services(self):
+        report = validate_tables(self.tables(restriction("GONE"), restriction(alternative_services=["NOPE"])))
+        checks = [(i.severity, i.check) for i in report.issues if "restriction" in i.subject]
+        assert checks == [(WARNING, "orphan_restriction"), (WARNING, "unknown_alternative")]
@@ -0,0 +1,84 @@
+"""
+Tests for reverse queries (lanes under a price cap, max weight under a cap)
+Results must agree with brute-force PricingEngine.price() calls
+"""
+
+import pytest
+from decimal import Decimal
+from src.engine.engine import PricingEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """Create pricing engine instance (loaded once for the module)"""
+    return PricingEngine()
+
+
+def brute_force_lanes(engine, weight_kg, max_total):
+    lanes = set()
+    for iso2 in sorted(set(engine.resolver.alias_map.values())):
+        for offer in engine.price(iso2, weight_kg):
+            if not offer.is_suspended and offer.total <= Decimal(str(max_total)):
+                lanes.add((iso2, offer.service_code, offer.total))
+    return lanes
+
+
+class TestLanesUnder:
+    """Test all (country, service) pairs under a cap"""
+
+    @pytest.mark.parametrize("weight_kg,max_total", [(1.0, 15), (0.5, 8), (2.0, 25), (10.0, 60)])
+    def test_matches_brute_force(self, engine, weight_kg, max_total):
+        resolvable = set(engine.resolver.alias_map.values())
+        lanes = {
+            (lane.country_iso2, lane.service_code, lane.total)
+            for lane in engine.lanes_under(weight_kg, max_total)
+            if lane.country_iso2 in resolvable
+        }
+        assert lanes == brute_force_lanes(engine, weight_kg, max_total)
+
+    def test_sorted_by_total(self, engine):
+        totals = [lane.total for lane in engine.lanes_under(1.0, 20)]
+        assert totals == sorted(totals)
+
+    def test_cap_too_low(self, engine):
+        assert engine.lanes_under(1.0, 0.5) == []
+
+    def test_suspended_excluded(self, engine):
+        suspended = {
+            code for (code, iso2), r in engine.restrictions.items()
+            if iso2 == "US" and r.get("status") == "SUSPENDED"
+        }
+        lanes = engine.lanes_under(2.0, 1000)
+        assert not [l for l in lanes if l.country_iso2 == "US" and l.service_code in suspended]
+
+
+class TestMaxWeightUnder:
+    """Test the max weight budget per service"""
+
+    @pytest.mark.parametrize("country,max_total", [("JP", 30), ("DE", 15), ("US", 40), ("AU", 80)])
+    def test_budget_is_priced_under_cap(self, engine, country, max_total):
+        budgets = engine.max_weight_under(country, max_total)
+        assert budgets
+
+        for budget in budgets:
+            offer = next(o for o in engine.price(country, budget.weight_kg)
+                         if o.service_code == budget.service_code)
+            assert offer.total == budget.total
+            assert offer.total <= Decimal(str(max_total))
+
+    @pytest.mark.parametrize("country,max_total", [("JP", 30), ("DE", 15)])
+    def test_no_heavier_weight_under_cap(self, engine, country, max_total):
+        budgets = {b.service_code: b.weight_kg for b in engine.max_weight_under(country, max_total)}
+
+        for step in range(1, 281):
+            weight = step / 4
+            for offer in engine.price(country, weight):
+                if not offer.is_suspended and offer.total <= Decimal(str(max_total)):
+                    assert budgets[offer.service_code] >= weight
+
+    def test_sorted_heaviest_first(self, engine):
+        weights = [b.weight_kg for b in engine.max_weight_under("DE", 30)]
+        assert weights == sorted(weights, reverse=True)
+
+    def test_unknown_country(self, engine):
+        assert engine.max_weight_under("Atlantis", 100) == []
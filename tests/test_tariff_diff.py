@@ -0,0 +1,166 @@
+"""
+Tests for the tariff diff between two normalized data versions
+Builds a modified copy of data/normalized and checks the reported deltas
+"""
+
+import csv
+import shutil
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from src.engine.engine import PricingEngine
+from src.engine.loader import DataLoader
+from src.engine.diff import diff_tariffs
+
+
+NORMALIZED_DIR = Path(__file__).parent.parent / "data" / "normalized"
+
+
+def load_engine(data_dir):
+    loader = DataLoader(data_dir=data_dir)
+    loader.load_all()
+    return PricingEngine(loader=loader)
+
+
+def rewrite_csv(path, transform):
+    """Rewrite a CSV, transform(row) returns the new row or None to drop it"""
+    with path.open(encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = [transform(row) for row in reader]
+
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(row for row in rows if row is not None)
+
+
+@pytest.fixture(scope="module")
+def old_engine():
+    return load_engine(NORMALIZED_DIR)
+
+
+def scope_id_for(engine, service_code, iso2):
+    service_id = next(sid for sid, s in engine.loader.services.items() if s.code == service_code)
+    return engine._find_scope(service_id, iso2).scope_id
+
+
+@pytest.fixture
+def new_data_dir(tmp_path):
+    data_dir = tmp_path / "normalized"
+    shutil.copytree(NORMALIZED_DIR, data_dir)
+    return data_dir
+
+
+class TestDiff:
+    """Test deltas, lane changes and grouping"""
+
+    def test_identical_versions(self, old_engine):
+        diff = diff_tariffs(old_engine, old_engine)
+
+        assert diff.changed == []
+        assert diff.lanes_added == [] and diff.lanes_lost == []
+        assert diff.unchanged_lanes > 0
+
+    def test_band_price_increase(self, old_engine, new_data_dir):
+        scope_id = scope_id_for(old_engine, "SPRING_EU_HOME", "DE")
+        band = next(b for b in old_engine.loader.scopes[scope_id].bands
+                    if b.min_weight_kg < 1.0 <= b.max_weight_kg)
+
+        def bump(row):
+            if int(row["band_id"]) == band.band_id:
+                row["base_amount"] = str(Decimal(row["base_amount"]) + Decimal("1.00"))
+            return row
+
+        rewrite_csv(new_data_dir / "tariff_bands.csv", bump)
+        diff = diff_tariffs(old_engine, load_engine(new_data_dir))
+
+        delta = next(d for d in diff.changed if d.service_code == "SPRING_EU_HOME" and "DE" in d.countries)
+        # +1.00 freight, +5% fuel surcharge on freight
+        assert delta.max_increase == pytest.approx(1.05)
+        assert band.min_weight_kg <= delta.max_increase_weight <= band.max_weight_kg
+        assert delta.max_decrease == 0.0
+        assert diff.top_increases(1)[0] is delta
+
+    def test_lane_lost(self, old_engine, new_data_dir):
+        scope_id = scope_id_for(old_engine, "SPRING_ROW_HOME", "JP")
+
+        rewrite_csv(
+            new_data_dir / "tariff_scope_countries.csv",
+            lambda row: None if (int(row["scope_id"]), row["country_iso2"]) == (scope_id, "JP") else row
+        )
+        diff = diff_tariffs(old_engine, load_engine(new_data_dir))
+
+        assert ("SPRING_ROW_HOME", "JP") in diff.lanes_lost
+        assert diff.lanes_added == []
+
+    def test_weight_coverage_lost(self, old_engine, new_data_dir):
+        scope_id = scope_id_for(old_engine, "SPRING_EU_HOME", "DE")
+        last = old_engine.loader.scopes[scope_id].bands[-1]
+
+        rewrite_csv(
+            new_data_dir / "tariff_bands.csv",
+            lambda row: None if int(row["band_id"]) == last.band_id else row
+        )
+        diff = diff_tariffs(old_engine, load_engine(new_data_dir))
+
+        delta = next(d for d in diff.changed if d.service_code == "SPRING_EU_HOME" and "DE" in d.countries)
+        assert delta.weights_lost
+        assert delta.weights_lost[-1][1] == pytest.approx(min(last.max_weight_kg, 20.0))
+        assert delta.max_increase == 0.0
+
+    def test_countries_grouped_by_scope_pair(self, old_engine):
+        diff = diff_tariffs(old_engine, old_engine)
+        # Every served (service, country) lane is counted exactly once
+        lanes = sum(
+            1
+            for sid, service in old_engine.loader.services.items()
+            for iso2 in set(old_engine.resolver.alias_map.values()) | {
+                c for s in old_engine.loader.scopes.values() for c in s.countries
+            }
+            for scope in old_engine._find_scopes(sid, iso2)
+            if scope.bands
+        )
+        assert diff.unchanged_lanes == lanes
+
+
+class TestMultiZone:
+    """Countries split into several zones (Delivengo DE: BOXABLE / NON_BOXABLE)"""
+
+    def test_each_zone_is_compared(self, old_engine, new_data_dir):
+        zones = [s for s in old_engine.loader.scopes.values() if s.code.startswith("DELIVENGO_DE_")]
+        bumps = {
+            next(b for b in zone.bands if b.min_weight_kg < 1.0 <= b.max_weight_kg).band_id
+            for zone in zones
+        }
+
+        def bump(row):
+            if int(row["band_id"]) in bumps:
+                row["base_amount"] = str(Decimal(row["base_amount"]) + Decimal("1.00"))
+            return row
+
+        rewrite_csv(new_data_dir / "tariff_bands.csv", bump)
+        diff = diff_tariffs(old_engine, load_engine(new_data_dir))
+
+        deltas = [d for d in diff.changed if d.service_code == "DELIVENGO_2025" and "DE" in d.countries]
+        assert sorted((d.old_scope_code, d.new_scope_code) for d in deltas) == [
+            ("DELIVENGO_DE_BOXABLE", "DELIVENGO_DE_BOXABLE"),
+            ("DELIVENGO_DE_NON_BOXABLE", "DELIVENGO_DE_NON_BOXABLE"),
+        ]
+        assert all(d.max_increase == pytest.approx(1.0) for d in deltas)
+        assert diff.zones_added == [] and diff.zones_lost == []
+
+    def test_zone_lost(self, old_engine, new_data_dir):
+        boxable = next(s for s in old_engine.loader.scopes.values() if s.code == "DELIVENGO_DE_BOXABLE")
+
+        rewrite_csv(
+            new_data_dir / "tariff_scope_countries.csv",
+            lambda row: None if (int(row["scope_id"]), row["country_iso2"]) == (boxable.scope_id, "DE") else row
+        )
+        diff = diff_tariffs(old_engine, load_engine(new_data_dir))
+
+        assert diff.zones_lost == [("DELIVENGO_2025", "DE", "DELIVENGO_DE_BOXABLE")]
+        # Germany is still served (NON_BOXABLE zone)
+        assert ("DELIVENGO_2025", "DE") not in diff.lanes_lost
+        assert not any(d.service_code == "DELIVENGO_2025" and "DE" in d.countries for d in diff.changed)
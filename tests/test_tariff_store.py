@@ -0,0 +1,146 @@
+"""
+Tests for the SQLite tariff store and its lazy DataLoader backend
+Prices from the SQLite loader must match the CSV loader exactly
+"""
+
+import csv
+import pickle
+import shutil
+from pathlib import Path
+
+import pytest
+from src.engine.engine import PricingEngine
+from src.engine.loader import DataLoader
+from src.engine.tariff_store import SQLiteDataLoader, TariffStore, build_store, store_is_current
+from src.engine.validator import TariffValidationError, validate_dir
+
+
+NORMALIZED_DIR = Path(__file__).parent.parent / "data" / "normalized"
+
+QUERIES = [
+    ("US", 1.0), ("DE", 2.0), ("JP", 0.5), ("GB", 5.0), ("AU", 10.0),
+    ("FR", 1.0), ("IT", 30.0), ("BR", 3.0), ("CH", 0.25), ("CA", 15.0),
+]
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    return build_store(NORMALIZED_DIR, tmp_path_factory.mktemp("store") / "tariffs.sqlite")
+
+
+@pytest.fixture(scope="module")
+def csv_engine():
+    loader = DataLoader()
+    loader.load_all()
+    return PricingEngine(loader=loader)
+
+
+def sqlite_engine(db_path):
+    loader = SQLiteDataLoader(db_path)
+    loader.load_all()
+    return PricingEngine(loader=loader)
+
+
+def summary(offers):
+    return [(o.service_code, o.scope_code, o.total) for o in offers]
+
+
+class TestBuild:
+
+    def test_store_is_current(self, tmp_path):
+        data_dir = tmp_path / "normalized"
+        shutil.copytree(NORMALIZED_DIR, data_dir)
+        db = tmp_path / "tariffs.sqlite"
+
+        assert not store_is_current(db, data_dir)
+        build_store(data_dir, db)
+        assert store_is_current(db, data_dir)
+
+        with (data_dir / "services.csv").open("a", encoding="utf-8") as f:
+            f.write("\n")
+        assert not store_is_current(db, data_dir)
+
+    def test_missing_store(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            TariffStore(tmp_path / "missing.sqlite")
+
+
+class TestQueries:
+
+    def test_bands_sorted(self, db_path, csv_engine):
+        scope = csv_engine.loader.scopes[1]
+        rows = TariffStore(db_path).bands(1)
+
+        assert [r["min_weight_kg"] for r in rows] == [b.min_weight_kg for b in scope.bands]
+
+    def test_services_for_country(self, db_path, csv_engine):
+        expected = sorted({s.service_id for s in csv_engine.loader.scopes.values() if "JP" in s.countries})
+        assert [r["service_id"] for r in TariffStore(db_path).services_for_country("JP")] == expected
+
+    def test_query_plan_uses_index(self, db_path):
+        plan = TariffStore(db_path).query(
+            "EXPLAIN QUERY PLAN SELECT * FROM tariff_bands WHERE scope_id = ? ORDER BY min_weight_kg", (1,)
+        )
+        assert any("USING INDEX" in row["detail"] for row in plan)
+
+
+class TestSQLiteLoader:
+
+    def test_same_prices_as_csv(self, db_path, csv_engine):
+        engine = sqlite_engine(db_path)
+        for dest, weight in QUERIES:
+            assert summary(engine.price(dest, weight)) == summary(csv_engine.price(dest, weight)), dest
+
+    def test_scopes_loaded_on_demand(self, db_path):
+        engine = sqlite_engine(db_path)
+        assert engine.loader.scopes.cached == 0
+
+        engine.price("DE", 2.0)
+        assert 0 < engine.loader.scopes.cached < len(engine.loader.scopes)
+
+    def test_unknown_country(self, db_path):
+        assert sqlite_engine(db_path).price("Atlantis", 1.0) == []
+
+    def test_snapshot_round_trip(self, db_path, csv_engine):
+        engine = sqlite_engine(db_path)
+        engine.price("DE", 2.0)
+
+        restored = PricingEngine(loader=pickle.loads(engine.loader.snapshot()))
+        assert summary(restored.price("US", 1.0)) == summary(csv_engine.price("US", 1.0))
+
+
+class TestValidation:
+    """build_store keeps the CSV validation report: reload gates on SQLite too"""
+
+    def test_report_stored(self, db_path):
+        loader = SQLiteDataLoader(db_path)
+        loader.load_all()
+
+        expected = validate_dir(NORMALIZED_DIR)
+        assert loader.validation is not None
+        assert [issue.key for issue in loader.validation.issues] == [issue.key for issue in expected.issues]
+
+    def test_reload_refuses_new_warnings_unless_forced(self, tmp_path):
+        data_dir = tmp_path / "normalized"
+        shutil.copytree(NORMALIZED_DIR, data_dir)
+        db = build_store(data_dir, tmp_path / "tariffs.sqlite")
+        engine = sqlite_engine(db)
+        loader = engine.loader
+
+        # Bands of an unknown scope: orphan_bands warning
+        with (data_dir / "tariff_bands.csv").open(encoding="utf-8") as f:
+            fieldnames = csv.DictReader(f).fieldnames
+        with (data_dir / "tariff_bands.csv").open("a", encoding="utf-8", newline="") as f:
+            csv.DictWriter(f, fieldnames=fieldnames).writerow({
+                "band_id": "90000", "scope_id": "9999", "min_weight_kg": "0.0", "max_weight_kg": "1.0",
+                "base_amount": "10.0", "amount_per_kg": "0.0", "is_min_charge": "False"
+            })
+        build_store(data_dir, db)
+
+        with pytest.raises(TariffValidationError) as excinfo:
+            engine.reload()
+        assert [issue.check for issue in excinfo.value.issues] == ["orphan_bands"]
+        assert engine.loader is loader
+
+        engine.reload(force=True)
+        assert engine.loader is not loader
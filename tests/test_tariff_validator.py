@@ -0,0 +1,226 @@
+"""
+Tests for the tariff integrity validator and hot reload
+"""
+
+import csv
+import logging
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+from src.engine.engine import PricingEngine
+from src.engine.loader import DataLoader
+from src.engine.validator import ERROR, WARNING, TariffValidationError, validate_dir, validate_tables
+
+
+NORMALIZED_DIR = Path(__file__).parent.parent / "data" / "normalized"
+
+
+def band(band_id, scope_id, low, high, base="10.0"):
+    return {"band_id": str(band_id), "scope_id": str(scope_id), "min_weight_kg": str(low),
+            "max_weight_kg": str(high), "base_amount": base, "amount_per_kg": "0.0", "is_min_charge": "False"}
+
+
+def scope(scope_id, service_id=1, catch_all=False):
+    return {"scope_id": str(scope_id), "service_id": str(service_id), "code": f"S{scope_id}",
+            "description": "", "is_catch_all": str(catch_all)}
+
+
+def tables(bands=(), scopes=None, scope_countries=(), surcharges=(), postal_codes=()):
+    return {
+        "carriers": [{"carrier_id": "1", "code": "C", "name": "Carrier", "currency": "EUR"}],
+        "services": [{"service_id": "1", "carrier_id": "1", "code": "SVC", "max_weight_kg": "2.0",
+                      "active_from": "", "active_to": ""}],
+        "tariff_scopes": [scope(1)] if scopes is None else list(scopes),
+        "tariff_scope_countries": list(scope_countries),
+        "tariff_bands": list(bands),
+        "surcharge_rules": list(surcharges),
+        "tariff_scope_postal_codes": list(postal_codes),
+    }
+
+
+def surcharge(conditions="{}", kind="PERCENT", basis="FREIGHT", value="5.0", service_id="1"):
+    return {"surcharge_id": "1", "service_id": service_id, "name": "FUEL", "kind": kind,
+            "basis": basis, "value": value, "conditions": conditions}
+
+
+def checks(report, severity):
+    return {issue.check for issue in report.issues if issue.severity == severity}
+
+
+class TestBands:
+
+    def test_continuous_grid(self):
+        report = validate_tables(tables([band(1, 1, 0.0, 1.0), band(2, 1, 1.0, 2.0)]))
+        assert report.issues == []
+
+    def test_overlap(self):
+        report = validate_tables(tables([band(1, 1, 0.0, 1.5), band(2, 1, 1.0, 2.0)]))
+        assert checks(report, ERROR) == {"band_overlap"}
+
+    def test_gap(self):
+        report = validate_tables(tables([band(1, 1, 0.0, 0.5), band(2, 1, 1.0, 2.0)]))
+        assert checks(report, ERROR) == {"band_gap"}
+
+    def test_stepped_grid_is_not_a_gap(self):
+        """Point bands (0.5, 1.0, ...) are discontinuous by design"""
+        report = validate_tables(tables([band(1, 1, 0.5, 0.5), band(2, 1, 1.0, 1.0), band(3, 1, 2.0, 2.0)]))
+        assert report.issues == []
+
+    def test_inverted(self):
+        report = validate_tables(tables([band(1, 1, 2.0, 1.0)]))
+        assert "band_inverted" in checks(report, ERROR)
+
+    def test_short_of_max_weight(self):
+        report = validate_tables(tables([band(1, 1, 0.0, 1.0)]))
+        assert checks(report, WARNING) == {"band_coverage"}
+
+    def test_orphan_bands(self):
+        report = validate_tables(tables([band(1, 1, 0.0, 2.0), band(2, 99, 0.0, 2.0), band(3, 99, 2.0, 5.0)]))
+        assert [issue.message for issue in report.warnings] == ["2 band(s) for unknown scope 99 (ignored)"]
+
+
+class TestReferences:
+
+    def test_unknown_service(self):
+        report = validate_tables(tables([band(1, 1, 0.0, 2.0)], scopes=[scope(1, service_id=7)]))
+        assert "unknown_service" in checks(report, ERROR)
+
+    def test_duplicate_scopes_with_different_prices(self):
+        report = validate_tables(tables(
+            [band(1, 1, 0.0, 2.0), band(2, 2, 0.0, 2.0, base="12.0")],
+            scopes=[scope(1), scope(2)],
+            scope_countries=[{"scope_id": "1", "country_iso2": "DE"}, {"scope_id": "2", "country_iso2": "DE"}]
+        ))
+        assert checks(report, ERROR) == {"duplicate_scope"}
+
+    def test_duplicate_scopes_split_by_postal_zones(self):
+        report = validate_tables(tables(
+            [band(1, 1, 0.0, 2.0), band(2, 2, 0.0, 2.0, base="12.0")],
+            scopes=[scope(1), scope(2)],
+            scope_countries=[{"scope_id": "1", "country_iso2": "DE"}, {"scope_id": "2", "country_iso2": "DE"}],
+            postal_codes=[{"scope_id": "2", "country_iso2": "DE", "postal_from": "1", "postal_to": ""}]
+        ))
+        assert report.issues == []
+
+
+class TestSurcharges:
+
+    def test_malformed_conditions(self):
+        report = validate_tables(tables([band(1, 1, 0.0, 2.0)], surcharges=[surcharge('{"delivery_type": ')]))
+        assert checks(report, ERROR) == {"surcharge_conditions"}
+
+    def test_unknown_kind(self):
+        report = validate_tables(tables([band(1, 1, 0.0, 2.0)], surcharges=[surcharge(kind="PERCENTAGE")]))
+        assert checks(report, ERROR) == {"surcharge_kind"}
+
+    def test_discount_is_valid(self):
+        report = validate_tables(tables([band(1, 1, 0.0, 2.0)], surcharges=[surcharge(value="-30.0")]))
+        assert report.issues == []
+
+
+class TestShippedData:
+
+    def test_no_errors(self):
+        report = validate_dir(NORMALIZED_DIR)
+
+        assert report.errors == []
+        assert report.rows > 10000
+        assert report.elapsed_s < 1.0
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    target = tmp_path / "normalized"
+    shutil.copytree(NORMALIZED_DIR, target)
+    return target
+
+
+def append_row(path, row):
+    with path.open(encoding="utf-8") as f:
+        fieldnames = csv.DictReader(f).fieldnames
+    with path.open("a", encoding="utf-8", newline="") as f:
+        csv.DictWriter(f, fieldnames=fieldnames).writerow(row)
+
+
+class TestReload:
+
+    @staticmethod
+    def engine(data_dir):
+        loader = DataLoader(data_dir=data_dir)
+        loader.load_all()
+        return PricingEngine(loader=loader)
+
+    def test_load_fails_fast(self, data_dir):
+        append_row(data_dir / "surcharge_rules.csv", surcharge("not json", service_id="2"))
+
+        with pytest.raises(TariffValidationError):
+            self.engine(data_dir)
+
+    def test_known_warnings_are_logged_not_printed(self, capsys, caplog):
+        with caplog.at_level(logging.INFO, logger="src.engine.loader"):
+            loader = DataLoader()
+            loader.load_all()
+
+        assert loader.validation.warnings
+        assert "integrity warnings" not in capsys.readouterr().out
+        assert f"{len(loader.validation.warnings)} integrity warnings" in caplog.text
+
+    def test_reload_picks_up_changes(self, data_dir):
+        engine = self.engine(data_dir)
+        before = {o.service_code: o.total for o in engine.price("DE", 1.0)}
+
+        append_row(data_dir / "surcharge_rules.csv", {**surcharge(value="10.0", service_id="2"), "surcharge_id": "900"})
+        engine.reload()
+
+        after = {o.service_code: o.total for o in engine.price("DE", 1.0)}
+        assert after["SPRING_EU_HOME"] > before["SPRING_EU_HOME"]
+
+    def test_reload_refuses_errors(self, data_dir):
+        engine = self.engine(data_dir)
+        loader = engine.loader
+
+        append_row(data_dir / "surcharge_rules.csv", surcharge("not json", service_id="2"))
+        with pytest.raises(TariffValidationError):
+            engine.reload(force=True)
+
+        assert engine.loader is loader
+
+    def test_reload_refuses_new_warnings_unless_forced(self, data_dir):
+        engine = self.engine(data_dir)
+        loader = engine.loader
+
+        append_row(data_dir / "tariff_bands.csv", band(90000, 9999, 0.0, 1.0))
+        with pytest.raises(TariffValidationError) as excinfo:
+            engine.reload()
+
+        assert [issue.check for issue in excinfo.value.issues] == ["orphan_bands"]
+        assert engine.loader is loader
+
+        engine.reload(force=True)
+        assert engine.loader is not loader
+
+    def test_reload_during_quote_keeps_one_snapshot(self, data_dir, monkeypatch):
+        engine = self.engine(data_dir)
+        before = {o.service_code: o.total for o in engine.quote("DE", [1.0]).offers}
+        append_row(data_dir / "surcharge_rules.csv", {**surcharge(value="10.0", service_id="2"), "surcharge_id": "900"})
+
+        # Another thread reloads once the quote has started reading the tariffs
+        services_on = engine.loader.services_on
+
+        def reload_then_list(*args, **kwargs):
+            reloader = threading.Thread(target=engine.reload)
+            reloader.start()
+            reloader.join()
+            return services_on(*args, **kwargs)
+
+        monkeypatch.setattr(engine.loader, "services_on", reload_then_list)
+        loader = engine.loader
+
+        during = {o.service_code: o.total for o in engine.quote("DE", [1.0]).offers}
+        assert engine.loader is not loader
+        assert during == before
+
+        after = {o.service_code: o.total for o in engine.quote("DE", [1.0]).offers}
+        assert after["SPRING_EU_HOME"] > before["SPRING_EU_HOME"]
@@ -0,0 +1,143 @@
+"""
+Tests for the UPS client circuit breaker against the local mock server
+Real UPSAPIClient over HTTP (mock credentials), breaker clock driven by hand
+Needs requests installed
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from src.integrations.circuit_breaker import CircuitBreaker
+from src.integrations.ups_api import UPSAPIClient
+from src.integrations.ups_mock_server import MOCK_CREDENTIALS_ENV, MockBehavior, start_in_thread
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def behavior():
+    return MockBehavior(latency_ms=0)
+
+
+@pytest.fixture
+def server(behavior):
+    server, base_url = start_in_thread(behavior)
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server, clock, monkeypatch):
+    for key, value in MOCK_CREDENTIALS_ENV.items():
+        monkeypatch.setenv(key, value)
+
+    client = UPSAPIClient(base_url=server[1])
+    client.breakers['WWE'] = CircuitBreaker(
+        'WWE', failure_threshold=2, open_duration=30.0, slow_call_threshold=5.0, clock=clock
+    )
+    return client
+
+
+def rate_calls(server):
+    return server[0].RequestHandlerClass.state.counters['rate']
+
+
+def shop(client):
+    """One Shop request to a WWE destination (no fallback, no cache)"""
+    return client.get_shipping_rates(2.0, 'US', fallback_to_individual=False, use_cache=False)
+
+
+class TestBreakerCycle:
+    """CLOSED → OPEN → HALF_OPEN → CLOSED through real HTTP calls"""
+
+    def test_server_errors_open_then_probe_closes(self, client, server, behavior, clock):
+        breaker = client.breakers['WWE']
+        behavior.error_rate = 1.0
+
+        assert shop(client) == []
+        assert shop(client) == []
+        assert breaker.state == CircuitBreaker.OPEN
+
+        # Open: short-circuited without reaching the server
+        calls = rate_calls(server)
+        assert shop(client) == []
+        assert rate_calls(server) == calls
+        assert breaker.short_circuited == 1
+
+        clock.now += 30.0
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        # UPS recovered: the probe succeeds and closes the breaker
+        behavior.error_rate = 0.0
+        assert {rate['service_code'] for rate in shop(client)} == {'11', '65', '07', '08'}
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self, client, behavior, clock):
+        breaker = client.breakers['WWE']
+        behavior.error_rate = 1.0
+        shop(client)
+        shop(client)
+
+        clock.now += 30.0
+        assert shop(client) == []
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_slow_responses_open(self, client, behavior):
+        breaker = client.breakers['WWE']
+        breaker.slow_call_threshold = 0.05
+        behavior.latency_ms = 100
+
+        # Rates still come back, but UPS is too slow: the breaker opens
+        assert shop(client)
+        assert shop(client)
+        assert breaker.state == CircuitBreaker.OPEN
+
+
+class TestClientErrors:
+    """4xx are request problems, not a degraded UPS"""
+
+    def test_business_errors_keep_breaker_closed(self, client, behavior):
+        breaker = client.breakers['WWE']
+        behavior.error_rate = 1.0
+        behavior.error_mode = 'business'
+
+        for _ in range(3):
+            assert shop(client) == []
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.total_failures == 0
+        assert breaker.total_calls == 3
+
+    def test_latency_excludes_token_request(self, client, monkeypatch):
+        breaker = client.breakers['WWE']
+        breaker.slow_call_threshold = 0.05
+        get_access_token = client.get_access_token
+
+        def slow_token(api_type):
+            time.sleep(0.1)
+            return get_access_token(api_type)
+
+        monkeypatch.setattr(client, 'get_access_token', slow_token)
+
+        # Only the rating request is timed: a slow OAuth call is not a slow UPS rating
+        assert shop(client)
+        assert shop(client)
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.latencies.percentile(100) < 0.05
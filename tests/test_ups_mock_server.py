@@ -0,0 +1,112 @@
+"""
+Tests for the local UPS API mock server
+Exercises the HTTP endpoints with urllib (no UPS credentials needed)
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+from src.integrations.ups_mock_server import MockBehavior, start_in_thread
+
+
+def rate_payload(option="Shop", service_code=None, weight=2.0):
+    """Minimal RateRequest as built by UPSAPIClient"""
+    shipment = {
+        "Package": [{"PackageWeight": {"Weight": str(weight)}}],
+        "ShipTo": {"Address": {"CountryCode": "US"}},
+    }
+    if service_code:
+        shipment["Service"] = {"Code": service_code}
+    return {"RateRequest": {"Request": {"RequestOption": option}, "Shipment": shipment}}
+
+
+def post(url, payload=None, headers=None, data=None):
+    """POST helper returning (status, json body)"""
+    body = data if data is not None else json.dumps(payload).encode()
+    req = urllib.request.Request(url, data=body, headers=headers or {}, method="POST")
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.fixture
+def mock_server(request):
+    behavior = getattr(request, "param", None) or MockBehavior(latency_ms=0)
+    server, base_url = start_in_thread(behavior)
+    yield base_url
+    server.shutdown()
+    server.server_close()
+
+
+BEARER = {"Authorization": "Bearer mock-token-1", "Content-Type": "application/json"}
+
+
+class TestEndpoints:
+    """Test token and rating endpoints"""
+
+    def test_token(self, mock_server):
+        status, body = post(
+            f"{mock_server}/security/v1/oauth/token",
+            data=b"grant_type=client_credentials",
+            headers={"Authorization": "Basic eDp5"}
+        )
+        assert status == 200
+        assert body["access_token"].startswith("mock-token-")
+        assert int(body["expires_in"]) > 0
+
+    def test_token_requires_basic_auth(self, mock_server):
+        status, _ = post(f"{mock_server}/security/v1/oauth/token", data=b"")
+        assert status == 401
+
+    def test_shop_returns_all_services(self, mock_server):
+        status, body = post(f"{mock_server}/api/rating/v1/Rate", rate_payload(), BEARER)
+
+        assert status == 200
+        rated = body["RateResponse"]["RatedShipment"]
+        assert {s["Service"]["Code"] for s in rated} == {"11", "65", "07", "08"}
+
+    def test_rate_single_service_negotiated(self, mock_server):
+        status, body = post(f"{mock_server}/api/rating/v1/Rate", rate_payload("Rate", "11"), BEARER)
+
+        assert status == 200
+        rated = body["RateResponse"]["RatedShipment"]
+        retail = float(rated["TotalCharges"]["MonetaryValue"])
+        negotiated = float(rated["NegotiatedRateCharges"]["TotalCharge"]["MonetaryValue"])
+
+        # 12.50 + 1.80 * 2kg, negotiated 20% off
+        assert retail == pytest.approx(16.10)
+        assert negotiated == pytest.approx(12.88)
+
+    def test_unknown_service_is_business_error(self, mock_server):
+        status, body = post(f"{mock_server}/api/rating/v1/Rate", rate_payload("Rate", "96"), BEARER)
+
+        assert status == 400
+        assert body["response"]["errors"][0]["code"] == "111210"
+
+
+class TestInjection:
+    """Test error injection and retail-only mode"""
+
+    @pytest.mark.parametrize("mock_server", [MockBehavior(latency_ms=0, error_rate=1.0)], indirect=True)
+    def test_http500_injection(self, mock_server):
+        status, _ = post(f"{mock_server}/api/rating/v1/Rate", rate_payload(), BEARER)
+        assert status == 500
+
+    @pytest.mark.parametrize(
+        "mock_server",
+        [MockBehavior(latency_ms=0, error_rate=1.0, error_mode="business")],
+        indirect=True
+    )
+    def test_business_error_injection(self, mock_server):
+        status, body = post(f"{mock_server}/api/rating/v1/Rate", rate_payload(), BEARER)
+        assert status == 400
+        assert body["response"]["errors"][0]["code"] == "111100"
+
+    @pytest.mark.parametrize("mock_server", [MockBehavior(latency_ms=0, negotiated=False)], indirect=True)
+    def test_retail_only(self, mock_server):
+        _, body = post(f"{mock_server}/api/rating/v1/Rate", rate_payload("Rate", "65"), BEARER)
+        assert "NegotiatedRateCharges" not in body["RateResponse"]["RatedShipment"]
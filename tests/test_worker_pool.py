@@ -0,0 +1,112 @@
+"""
+Tests for the pricing worker pool (backpressure, stats, refresh after reload)
+"""
+
+import asyncio
+import csv
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+from src.bot.worker_pool import PoolBusyError, PricingWorkerPool
+from src.engine.engine import PricingEngine
+from src.engine.loader import DataLoader
+
+
+NORMALIZED_DIR = Path(__file__).parent.parent / "data" / "normalized"
+
+
+class SlowEngine:
+    """Engine stand-in whose calls block until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Semaphore(0)
+
+    def price(self, dest, weight_kg):
+        self.started.release()
+        self.release.wait(timeout=5)
+        return [(dest, weight_kg)]
+
+
+class TestBackpressure:
+
+    def test_busy_when_workers_and_queue_are_full(self):
+        engine = SlowEngine()
+        pool = PricingWorkerPool(engine, max_workers=1, max_queue=1)
+
+        async def scenario():
+            running = asyncio.create_task(pool.call("price", "US", 1.0))
+            queued = asyncio.create_task(pool.call("price", "JP", 2.0))
+            await asyncio.to_thread(engine.started.acquire)
+
+            saturated = pool.stats()
+            with pytest.raises(PoolBusyError):
+                await pool.call("price", "DE", 3.0)
+
+            engine.release.set()
+            return saturated, await running, await queued
+
+        try:
+            saturated, first, second = asyncio.run(scenario())
+        finally:
+            pool.shutdown()
+
+        assert (saturated['in_flight'], saturated['queue_depth'], saturated['saturation']) == (2, 1, 1.0)
+        assert first == [("US", 1.0)] and second == [("JP", 2.0)]
+
+        stats = pool.stats()
+        assert (stats['completed'], stats['rejected'], stats['in_flight'], stats['peak_in_flight']) == (2, 1, 0, 2)
+        # The queued call waited for the running one
+        assert stats['wait']['count'] == 2
+        assert stats['wait']['max'] > 0
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            PricingWorkerPool(SlowEngine(), mode="fiber")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    target = tmp_path / "normalized"
+    shutil.copytree(NORMALIZED_DIR, target)
+    return target
+
+
+def add_fuel_surcharge(data_dir, service_id, percent):
+    path = data_dir / "surcharge_rules.csv"
+    with path.open(encoding="utf-8") as f:
+        fieldnames = csv.DictReader(f).fieldnames
+    with path.open("a", encoding="utf-8", newline="") as f:
+        csv.DictWriter(f, fieldnames=fieldnames).writerow({
+            "surcharge_id": "900", "service_id": str(service_id), "name": "TEST_FUEL", "kind": "PERCENT",
+            "basis": "FREIGHT", "value": str(percent), "conditions": "{}"
+        })
+
+
+class TestProcessRefresh:
+
+    def test_workers_price_from_refreshed_snapshot(self, data_dir):
+        loader = DataLoader(data_dir=data_dir)
+        loader.load_all()
+        engine = PricingEngine(loader=loader)
+        pool = PricingWorkerPool(engine, mode="process", max_workers=1)
+
+        def spring_total():
+            offers = asyncio.run(pool.call("price", "DE", 1.0))
+            return next(o.total for o in offers if o.service_code == "SPRING_EU_HOME")
+
+        try:
+            before = spring_total()
+
+            # Same sequence as PricingBot.reload_tariffs
+            add_fuel_surcharge(data_dir, 2, 10.0)
+            engine.reload()
+            assert spring_total() == before  # Workers still hold the old snapshot
+
+            pool.refresh()
+            assert spring_total() > before
+            assert spring_total() == next(o.total for o in engine.price("DE", 1.0) if o.service_code == "SPRING_EU_HOME")
+        finally:
+            pool.shutdown()